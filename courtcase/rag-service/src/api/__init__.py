@@ -0,0 +1,15 @@
+"""
+Async retrieval API: ASGI app, admission control, query batching, pools
+"""
+from .admission import AdmissionController, Overloaded
+from .app import RetrievalAPI
+from .batching import BatchingEncoder
+from .pools import ConnectionPools
+
+__all__ = [
+    'AdmissionController',
+    'Overloaded',
+    'RetrievalAPI',
+    'BatchingEncoder',
+    'ConnectionPools'
+]
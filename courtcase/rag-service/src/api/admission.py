@@ -0,0 +1,66 @@
+"""
+Admission control for the query API
+At most max_concurrency queries run at once and at most max_queue wait for a
+slot; anything beyond that is rejected immediately (HTTP 503 with
+Retry-After) instead of piling up behind a saturated index and timing out
+for everyone.
+"""
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+
+class Overloaded(Exception):
+    """Raised when the wait queue is full"""
+
+    def __init__(self, queued: int):
+        super().__init__(f"Server busy: {queued} requests already queued")
+        self.queued = queued
+
+
+class AdmissionController:
+    """Bounded concurrency with a bounded wait queue (one per event loop)"""
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 32):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.running = 0
+        self.queued = 0
+        self.admitted = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold a query slot; yields the seconds spent queued
+
+        Raises:
+            Overloaded: max_queue requests are already waiting
+        """
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded(self.queued)
+        start = time.perf_counter()
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+        self.running += 1
+        self.admitted += 1
+        try:
+            yield time.perf_counter() - start
+        finally:
+            self.running -= 1
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
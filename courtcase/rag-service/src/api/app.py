@@ -0,0 +1,546 @@
+"""
+Async retrieval API (ASGI)
+Serves hybrid search over the BM25, vector and citation graph retrievers
+without holding a worker per request: queries run on the FusionEngine's
+thread pool while the event loop keeps accepting connections. Admission
+control caps running and queued queries, results can be streamed as
+Server-Sent Events as each retriever finishes, and every response carries a
+Server-Timing breakdown (queue wait, each retriever, fusion, hydration and,
+with a cross-encoder configured, reranking). Repeated and near-duplicate
+queries are answered from the QueryCache before admission, skipping
+retrieval and reranking. With a ChunkHierarchy, the leaf hits of a document
+are returned as the smallest section covering them. With a FacetIndex,
+searches take facet filters (pushed into every retriever as a document
+mask) and /facets returns document counts per facet value.
+
+Endpoints:
+    GET  /health
+    GET  /stats
+    GET  /search?q=...&k=10          POST /search {"query": ..., "k": 10}
+    GET  /search/stream?q=...&k=10   POST /search/stream (text/event-stream)
+    GET  /facets?court=...           POST /facets {"filters": {...}}
+    POST /cache/invalidate {"courts": [...], "statutes": [...]}   (called by ingest jobs)
+
+Filters (POST "filters", or GET parameters of the same names):
+    {"court": [...], "year_from": 1990, "year_to": 2020, "jurisdiction": ["BD"],
+     "subject_primary": [...], "legal_status": [...], "exclude": {"legal_status": [...]}}
+
+Usage:
+    python -m src.api.app --bm25 data/index/bm25 --vectors data/index/vectors --port 8000
+    python -m src.api.app --bm25 data/index/bm25 --vectors data/index/vectors --graph data/index/graph
+    python -m src.api.app --bm25 data/index/bm25 --dsn postgresql://... --neo4j-uri bolt://localhost:7687
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+from .admission import AdmissionController, Overloaded
+from .batching import BatchingEncoder
+from .pools import ConnectionPools
+from ..cache.query_cache import CacheHit, QueryCache
+from ..filters.bitmaps import DocumentFilter, FacetIndex
+from ..fusion.engine import FusedHit, FusionEngine, FusionResult
+from ..rerank.cross_encoder import DEFAULT_DEPTH as RERANK_DEPTH, Reranker
+from ..retrievers.hierarchy import COLLAPSE_OVERFETCH, ChunkHierarchy
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_K = 10
+MAX_K = 100
+FACET_LIMIT = 20  # values per facet returned by /facets
+MAX_BODY = 64 * 1024
+
+
+class BadRequest(Exception):
+    pass
+
+
+def server_timing(timings: List[Tuple[str, float, str]]) -> str:
+    """Server-Timing header value from (metric, milliseconds, description)"""
+    parts = []
+    for metric, duration, description in timings:
+        part = f"{metric};dur={duration:.1f}"
+        if description:
+            part += f';desc="{description}"'
+        parts.append(part)
+    return ", ".join(parts)
+
+
+class RetrievalAPI:
+    """ASGI application serving a FusionEngine"""
+
+    def __init__(
+        self,
+        engine: FusionEngine,
+        pools: Optional[ConnectionPools] = None,
+        admission: Optional[AdmissionController] = None,
+        encoder: Optional[BatchingEncoder] = None,
+        reranker: Optional[Reranker] = None,
+        rerank_depth: int = RERANK_DEPTH,
+        cache: Optional[QueryCache] = None,
+        max_k: int = MAX_K,
+        hierarchy: Optional[ChunkHierarchy] = None,
+        facets: Optional[FacetIndex] = None
+    ):
+        """
+        Args:
+            engine: Fusion engine over the configured retrievers
+            pools: Database pools; with PostgreSQL, hits carry text and titles
+            admission: Concurrency / queue limits (default 8 running, 32 queued)
+            encoder: Batching query encoder, for /stats and shutdown
+            reranker: Cross-encoder stage applied to /search results
+            rerank_depth: Fused candidates handed to the reranker
+            cache: Query result cache (complete results only)
+            max_k: Largest k a client may ask for
+            hierarchy: Chunk parent links; hits are collapsed to covering ancestors
+                (the engine must fuse by chunk, by_document=False)
+            facets: Facet index for filtered search and /facets
+        """
+        self.engine = engine
+        self.pools = pools
+        self.admission = admission or AdmissionController()
+        self.encoder = encoder
+        self.reranker = reranker
+        self.rerank_depth = rerank_depth
+        self.cache = cache
+        self.max_k = max_k
+        self.hierarchy = hierarchy
+        self.facets = facets
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+
+        start = time.perf_counter()
+        path, method = scope["path"].rstrip("/") or "/", scope["method"]
+        try:
+            if path == "/health":
+                await self._json(send, 200, {"status": "ok"})
+            elif path == "/stats":
+                await self._json(send, 200, self.stats())
+            elif path == "/cache/invalidate":
+                if method != "POST":
+                    await self._json(send, 405, {"error": f"{method} not allowed"})
+                    return
+                await self._invalidate(send, await self._read_json(receive))
+            elif path in ("/search", "/search/stream"):
+                if method not in ("GET", "POST"):
+                    await self._json(send, 405, {"error": f"{method} not allowed"})
+                    return
+                query, k, document_filter = await self._read_query(scope, receive)
+                if path == "/search":
+                    await self._search(send, query, k, start, document_filter)
+                else:
+                    await self._stream(send, query, k, start, document_filter)
+            elif path == "/facets":
+                if method not in ("GET", "POST"):
+                    await self._json(send, 405, {"error": f"{method} not allowed"})
+                    return
+                await self._facets(send, await self._read_filter(scope, receive), start)
+            else:
+                await self._json(send, 404, {"error": f"No route {path}"})
+        except BadRequest as e:
+            await self._json(send, 400, {"error": str(e)})
+        except Overloaded as e:
+            await self._json(send, 503, {"error": str(e)}, [(b"retry-after", b"1")])
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                self.close()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    @staticmethod
+    async def _read_json(receive) -> dict:
+        body = b""
+        while True:
+            message = await receive()
+            body += message.get("body", b"")
+            if len(body) > MAX_BODY:
+                raise BadRequest("Request body too large")
+            if not message.get("more_body"):
+                break
+        try:
+            params = json.loads(body or b"{}")
+        except ValueError:
+            raise BadRequest("Body is not valid JSON")
+        if not isinstance(params, dict):
+            raise BadRequest("Body must be a JSON object")
+        return params
+
+    def _document_filter(self, filters) -> Optional[DocumentFilter]:
+        if not filters:
+            return None
+        if not isinstance(filters, dict):
+            raise BadRequest("filters must be a JSON object")
+        if self.facets is None:
+            raise BadRequest("Filters are not available: the server has no facet index")
+        try:
+            document_filter = DocumentFilter.from_dict(filters)
+        except ValueError as e:
+            raise BadRequest(str(e))
+        return None if document_filter.is_empty() else document_filter
+
+    @staticmethod
+    def _query_filters(params: Dict[str, List[str]]) -> Dict:
+        """Filters given as GET parameters (court=...&court=...&year_from=...)"""
+        filters = {name: params[name] for name in ("court", "jurisdiction", "subject_primary", "legal_status")
+                   if name in params}
+        filters.update({name: params[name][0] for name in ("year_from", "year_to") if name in params})
+        return filters
+
+    async def _read_filter(self, scope, receive) -> Optional[DocumentFilter]:
+        if scope["method"] == "POST":
+            return self._document_filter((await self._read_json(receive)).get("filters"))
+        params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+        return self._document_filter(self._query_filters(params))
+
+    async def _read_query(self, scope, receive) -> Tuple[str, int, Optional[DocumentFilter]]:
+        if scope["method"] == "POST":
+            params = await self._read_json(receive)
+            query, k = params.get("query"), params.get("k", DEFAULT_K)
+            filters = params.get("filters")
+        else:
+            params = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+            query, k = params.get("q", [None])[0], params.get("k", [DEFAULT_K])[0]
+            filters = self._query_filters(params)
+
+        if not isinstance(query, str) or not query.strip():
+            raise BadRequest("Missing query")
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            raise BadRequest("k must be an integer")
+        if not 1 <= k <= self.max_k:
+            raise BadRequest(f"k must be between 1 and {self.max_k}")
+        return query.strip(), k, self._document_filter(filters)
+
+    def _timings(self, result: FusionResult) -> List[Tuple[str, float, str]]:
+        timings = []
+        for name, report in result.reports.items():
+            if report.latency_ms is not None:
+                timings.append((name, report.latency_ms, "" if report.status == "ok" else report.status))
+        timings.append(("fusion", result.elapsed_ms, ""))
+        return timings
+
+    def _fetch(self, k: int) -> int:
+        """Fused hits to retrieve for k results"""
+        return k * COLLAPSE_OVERFETCH if self.hierarchy is not None else k
+
+    def _collapse(self, hits: List[FusedHit], k: int) -> List[FusedHit]:
+        """Top k hits, leaf hits replaced by their covering ancestors"""
+        if self.hierarchy is None:
+            return hits[:k]
+        return self.hierarchy.collapse(hits)[:k]
+
+    def _hydrate(self, hits: List[FusedHit]) -> List[dict]:
+        """Hits as JSON objects, with chunk text and titles when PostgreSQL is configured"""
+        chunks, titles = {}, {}
+        if self.pools is not None and self.pools.pg is not None:
+            chunks = self.pools.chunk_texts(hit.chunk_id for hit in hits if hit.chunk_id is not None)
+            titles = self.pools.document_titles(
+                hit.document_id for hit in hits if hit.chunk_id is None and hit.document_id is not None
+            )
+        rendered = []
+        for hit in hits:
+            item = {
+                "chunk_id": hit.chunk_id,
+                "document_id": hit.document_id,
+                "score": round(hit.score, 6),
+                "sources": {name: round(part, 6) for name, part in hit.sources.items()},
+            }
+            if hit.chunk_id in chunks:
+                item.update(chunks[hit.chunk_id])
+            elif hit.document_id in titles:
+                item["title"] = titles[hit.document_id]
+            rendered.append(item)
+        return rendered
+
+    def _payload(self, query: str, k: int, result: FusionResult, hits: List[dict],
+                 document_filter: Optional[DocumentFilter] = None) -> dict:
+        payload = {
+            "query": query,
+            "k": k,
+            "complete": result.complete,
+            "hits": hits,
+            "retrievers": {
+                name: {key: value for key, value in vars(report).items() if key != "name"}
+                for name, report in result.reports.items()
+            },
+        }
+        if document_filter is not None:
+            payload["filters"] = document_filter.to_dict()
+        return payload
+
+    def _rerank(self, query: str, hits: List[dict], k: int) -> List[dict]:
+        """Top k hits by cross-encoder score (documents without text are scored on their title)"""
+        texts = [hit.get("text") or hit.get("title") or "" for hit in hits]
+        if not any(texts):
+            return hits[:k]  # nothing to score without PostgreSQL
+        reranked = self.reranker.rerank(query, texts, k)
+        top = []
+        for i in reranked.order[:k]:
+            hit = dict(hits[i], fused_score=hits[i]["score"])
+            if reranked.scores[i] is not None:
+                hit["score"] = round(reranked.scores[i], 6)
+            top.append(hit)
+        return top
+
+    def _cache_lookup(self, query: str, k: int,
+                      filters: Optional[Dict] = None) -> Tuple[Optional[CacheHit], Optional[object]]:
+        """(usable cache hit, query vector for a later put)"""
+        vector = self.cache.embed(query)
+        hit = self.cache.get(query, filters, vector)
+        if hit is not None and hit.value["k"] < k:
+            hit = None  # cached for fewer results than asked for
+        return hit, vector
+
+    def _cached_payload(self, query: str, k: int, hit: CacheHit) -> dict:
+        payload = dict(hit.value, query=query, k=k, hits=hit.value["hits"][:k])
+        payload["cache"] = {"level": hit.level, "similarity": round(hit.similarity, 4), "query": hit.query}
+        return payload
+
+    async def _invalidate(self, send, params: dict):
+        courts, statutes = params.get("courts") or [], params.get("statutes") or []
+        if not all(isinstance(value, list) for value in (courts, statutes)):
+            raise BadRequest("courts and statutes must be lists")
+        dropped = self.cache.invalidate(courts, statutes) if self.cache is not None else 0
+        await self._json(send, 200, {"invalidated": dropped})
+
+    async def _facets(self, send, document_filter: Optional[DocumentFilter], start: float):
+        if self.facets is None:
+            await self._json(send, 404, {"error": "No facet index configured"})
+            return
+        mask = await asyncio.to_thread(self.facets.mask, document_filter)
+        counts = await asyncio.to_thread(self.facets.facet_counts, document_filter, FACET_LIMIT)
+        payload = {"documents": len(self.facets) if mask is None else int(mask.sum()), "facets": counts}
+        if document_filter is not None:
+            payload["filters"] = document_filter.to_dict()
+        timing = server_timing([("facets", (time.perf_counter() - start) * 1000, "")])
+        await self._json(send, 200, payload, [(b"server-timing", timing.encode())])
+
+    async def _search(self, send, query: str, k: int, start: float, document_filter: Optional[DocumentFilter] = None):
+        vector = None
+        filters = document_filter.to_dict() if document_filter is not None else None
+        if self.cache is not None:
+            hit, vector = await asyncio.to_thread(self._cache_lookup, query, k, filters)
+            if hit is not None:
+                timings = [("cache", (time.perf_counter() - start) * 1000, hit.level)]
+                await self._json(send, 200, self._cached_payload(query, k, hit), [
+                    (b"server-timing", server_timing(timings).encode()),
+                    (b"x-cache", hit.level.encode()),
+                ])
+                return
+
+        depth = max(k, self.rerank_depth) if self.reranker is not None else k
+        async with self.admission.slot() as waited:
+            allowed = await asyncio.to_thread(self.facets.mask, document_filter) if document_filter else None
+            result = await asyncio.to_thread(self.engine.search, query, self._fetch(depth), allowed)
+            hydrate_start = time.perf_counter()
+            hits = await asyncio.to_thread(self._hydrate, self._collapse(result.hits, depth))
+            hydrate_ms = (time.perf_counter() - hydrate_start) * 1000
+            if self.reranker is not None:
+                rerank_start = time.perf_counter()
+                hits = await asyncio.to_thread(self._rerank, query, hits, k)
+                rerank_ms = (time.perf_counter() - rerank_start) * 1000
+
+        timings = [("queue", waited * 1000, "")] + self._timings(result) + [("hydrate", hydrate_ms, "")]
+        if self.reranker is not None:
+            timings.append(("rerank", rerank_ms, ""))
+        timings.append(("total", (time.perf_counter() - start) * 1000, ""))
+        payload = self._payload(query, k, result, hits, document_filter)
+        if self.cache is not None and all(report.status == "ok" for report in result.reports.values()):
+            self.cache.put(query, filters, payload, vector)
+        await self._json(send, 200, payload, [
+            (b"server-timing", server_timing(timings).encode()),
+            (b"x-queue-depth", str(self.admission.queued).encode()),
+            (b"x-cache", b"miss" if self.cache is not None else b"off"),
+        ])
+
+    async def _stream(self, send, query: str, k: int, start: float, document_filter: Optional[DocumentFilter] = None):
+        filters = document_filter.to_dict() if document_filter is not None else None
+        if self.cache is not None:
+            hit, _ = await asyncio.to_thread(self._cache_lookup, query, k, filters)
+            if hit is not None:
+                await send({
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"text/event-stream"), (b"cache-control", b"no-cache"),
+                                (b"x-cache", hit.level.encode())],
+                })
+                data = f"event: done\ndata: {json.dumps(self._cached_payload(query, k, hit))}\n\n".encode()
+                await send({"type": "http.response.body", "body": data})
+                return
+
+        async with self.admission.slot() as waited:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"server-timing", server_timing([("queue", waited * 1000, "")]).encode()),
+                    (b"x-queue-depth", str(self.admission.queued).encode()),
+                ],
+            })
+            allowed = await asyncio.to_thread(self.facets.mask, document_filter) if document_filter else None
+            results = self.engine.stream(query, self._fetch(k), allowed)
+            while True:
+                result = await asyncio.to_thread(next, results, None)
+                if result is None:
+                    break
+                hits = await asyncio.to_thread(self._hydrate, self._collapse(result.hits, k))
+                payload = self._payload(query, k, result, hits, document_filter)
+                payload["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 3)
+                event = "done" if result.complete else "partial"
+                data = f"event: {event}\ndata: {json.dumps(payload)}\n\n".encode()
+                await send({"type": "http.response.body", "body": data, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    @staticmethod
+    async def _json(send, status: int, payload: dict, headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        body = json.dumps(payload).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode())] + (headers or []),
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    def stats(self) -> Dict:
+        stats = {
+            "admission": self.admission.stats(),
+            "retrievers": sorted(self.engine.retrievers),
+            "deadlines_ms": {name: deadline * 1000 for name, deadline in self.engine.deadlines.items()},
+        }
+        if self.encoder is not None:
+            stats["embedding_batches"] = self.encoder.stats()
+        if self.reranker is not None:
+            stats["rerank"] = self.reranker.stats()
+        if self.cache is not None:
+            stats["cache"] = self.cache.stats()
+        if self.facets is not None:
+            stats["facets"] = self.facets.stats()
+        return stats
+
+    def close(self):
+        self.engine.close()
+        if self.encoder is not None:
+            self.encoder.close()
+        if self.pools is not None:
+            self.pools.close()
+
+
+def create_app(args) -> RetrievalAPI:
+    """Build the API from command-line options"""
+    from ..embeddings.ann_index import VectorIndex
+    from ..embeddings.encoders import create_encoder
+    from ..retrievers.bm25 import BM25Index
+    from ..graph.csr import CitationGraph
+    from ..retrievers.graph import CitationGraphRetriever, CSRGraphRetriever
+    from ..retrievers.vector import VectorRetriever
+    from ..rerank.cross_encoder import CrossEncoderScorer
+    from ..utils.corpus import load_case_documents
+
+    pools = ConnectionPools(args.dsn, args.neo4j_uri, args.neo4j_user, args.neo4j_password,
+                            pg_max=args.pg_pool, neo4j_max=args.neo4j_pool)
+    retrievers, encoder = [], None
+    if args.bm25:
+        retrievers.append(BM25Index(args.bm25))
+    if args.vectors:
+        encoder = BatchingEncoder(create_encoder(args.encoder), args.batch_size, args.batch_wait_ms)
+        retrievers.append(VectorRetriever(VectorIndex(args.vectors), encoder))
+    if args.graph:
+        retrievers.append(CSRGraphRetriever(CitationGraph.load(args.graph), fanout=args.graph_fanout))
+    elif pools.neo4j is not None:
+        if not args.dsn:
+            raise SystemExit("--neo4j-uri needs --dsn to map graph cases to documents")
+        retrievers.append(CitationGraphRetriever(pools.neo4j, load_case_documents(args.dsn)))
+    if not retrievers:
+        raise SystemExit("Configure at least one of --bm25, --vectors, --graph, --neo4j-uri")
+
+    hierarchy = None
+    if args.collapse_chunks:
+        if not args.dsn:
+            raise SystemExit("--collapse-chunks needs --dsn to read chunk parents")
+        hierarchy = ChunkHierarchy.load(args.dsn)
+
+    deadlines = {}
+    for item in args.deadline:
+        name, _, ms = item.partition("=")
+        deadlines[name] = float(ms) / 1000
+    # Collapsing needs every chunk hit of a document, not just its best one
+    engine = FusionEngine(retrievers, method=args.fusion, deadlines=deadlines,
+                          default_deadline=args.default_deadline_ms / 1000, by_document=hierarchy is None)
+    reranker = Reranker(CrossEncoderScorer(args.rerank_model)) if args.rerank_model else None
+    cache = None
+    if args.cache_ttl > 0:
+        cache = QueryCache(encoder, ttl=args.cache_ttl, capacity=args.cache_size, threshold=args.cache_threshold)
+    return RetrievalAPI(engine, pools, AdmissionController(args.max_concurrency, args.max_queue), encoder,
+                        reranker, args.rerank_depth, cache, hierarchy=hierarchy,
+                        facets=FacetIndex.load(args.facets) if args.facets else None)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Serve the hybrid retrieval API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--bm25", help="BM25 index directory")
+    parser.add_argument("--vectors", help="Vector index directory")
+    parser.add_argument("--encoder", default="hashing", help='"hashing" or a sentence-transformers model')
+    parser.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="PostgreSQL connection string")
+    parser.add_argument("--graph", help="Precomputed citation graph directory (src.graph.csr export)")
+    parser.add_argument("--graph-fanout", type=int, default=20, help="Graph neighbours followed per seed case")
+    parser.add_argument("--neo4j-uri", default=os.getenv("NEO4J_URI"))
+    parser.add_argument("--neo4j-user", default=os.getenv("NEO4J_USER", "neo4j"))
+    parser.add_argument("--neo4j-password", default=os.getenv("NEO4J_PASSWORD", ""))
+    parser.add_argument("--fusion", choices=["rrf", "minmax"], default="rrf")
+    parser.add_argument("--deadline", action="append", default=["graph=150"],
+                        help="Per-retriever deadline, e.g. graph=150 (ms)")
+    parser.add_argument("--default-deadline-ms", type=float, default=500)
+    parser.add_argument("--max-concurrency", type=int, default=8)
+    parser.add_argument("--max-queue", type=int, default=32)
+    parser.add_argument("--batch-size", type=int, default=32, help="Query embedding batch size")
+    parser.add_argument("--batch-wait-ms", type=float, default=2.0)
+    parser.add_argument("--facets", help="Facet index directory (src.filters.bitmaps build) for filtered search")
+    parser.add_argument("--collapse-chunks", action="store_true",
+                        help="Return the smallest section covering a document's paragraph hits")
+    parser.add_argument("--rerank-model", help="Cross-encoder model for reranking /search results")
+    parser.add_argument("--rerank-depth", type=int, default=RERANK_DEPTH)
+    parser.add_argument("--cache-ttl", type=float, default=600, help="Query cache TTL in seconds (0: no cache)")
+    parser.add_argument("--cache-size", type=int, default=10_000)
+    parser.add_argument("--cache-threshold", type=float, default=0.92,
+                        help="Cosine similarity for a semantic cache hit (needs --vectors)")
+    parser.add_argument("--pg-pool", type=int, default=10)
+    parser.add_argument("--neo4j-pool", type=int, default=50)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    try:
+        import uvicorn
+    except ImportError:
+        raise ImportError("uvicorn not installed. Install with: pip install uvicorn")
+    if args.bm25 and not Path(args.bm25).exists():
+        raise SystemExit(f"No BM25 index at {args.bm25}")
+    uvicorn.run(create_app(args), host=args.host, port=args.port, log_level="info")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Request batching for query embeddings
+Concurrent requests each need one query vector; encoding them one at a time
+wastes most of a model forward pass. BatchingEncoder queues encode() calls
+from any thread and runs them through the wrapped encoder together, waiting
+at most max_wait_ms for a batch to fill.
+"""
+import time
+import queue
+import logging
+import threading
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from ..embeddings.encoders import Encoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BATCH = 32
+DEFAULT_MAX_WAIT_MS = 2.0
+
+
+class _Request:
+    __slots__ = ("texts", "vectors", "error", "done")
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.vectors: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+        self.done = threading.Event()
+
+
+class BatchingEncoder(Encoder):
+    """Thread-safe Encoder that coalesces concurrent calls into batches"""
+
+    def __init__(self, encoder: Encoder, max_batch: int = DEFAULT_MAX_BATCH, max_wait_ms: float = DEFAULT_MAX_WAIT_MS):
+        """
+        Args:
+            encoder: Encoder doing the work
+            max_batch: Texts per batch
+            max_wait_ms: Longest a request waits for others to join its batch
+        """
+        self.encoder = encoder
+        self.dimension = encoder.dimension
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.texts = 0
+        self._queue: "queue.Queue[Optional[_Request]]" = queue.Queue()
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        if self._closed:
+            raise RuntimeError("BatchingEncoder is closed")
+        request = _Request(list(texts))
+        if not request.texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.vectors
+
+    def _collect(self, first: _Request) -> List[_Request]:
+        batch, size = [first], len(first.texts)
+        deadline = time.monotonic() + self.max_wait
+        while size < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is None:
+                self._queue.put(None)  # stop after this batch
+                break
+            batch.append(request)
+            size += len(request.texts)
+        return batch
+
+    def _run(self):
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = self._collect(first)
+            try:
+                vectors = self.encoder.encode([text for request in batch for text in request.texts])
+                offset = 0
+                for request in batch:
+                    request.vectors = vectors[offset:offset + len(request.texts)]
+                    offset += len(request.texts)
+            except Exception as e:
+                logger.warning(f"Batch of {len(batch)} encode requests failed: {e}")
+                for request in batch:
+                    request.error = e
+            finally:
+                self.batches += 1
+                self.texts += sum(len(request.texts) for request in batch)
+                for request in batch:
+                    request.done.set()
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "texts": self.texts,
+            "mean_batch": round(self.texts / self.batches, 2) if self.batches else 0.0,
+            "queued": self._queue.qsize(),
+        }
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._worker.join(timeout=5)
@@ -0,0 +1,161 @@
+"""
+Load test for the retrieval API
+Fires queries at a running server from a fixed number of concurrent clients
+and reports throughput, status counts, latency percentiles and the mean
+Server-Timing breakdown. Queries come from a file (one per line) or a
+built-in mix of citation, section and fact-pattern queries.
+
+Usage:
+    python -m src.api.loadtest --url http://127.0.0.1:8000 --concurrency 16 --requests 2000
+    python -m src.api.loadtest --queries queries.txt --stream --json loadtest.json
+"""
+import json
+import time
+import random
+import logging
+import argparse
+import urllib.error
+import urllib.request
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+from ..embeddings.benchmark import percentiles
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERIES = [
+    "58 DLR (AD) 211",
+    "bail under section 497 CrPC",
+    "murder conviction s. 302 Penal Code",
+    "Article 102 writ petition maintainability",
+    "AIR 1950 SC 27",
+    "land acquisition compensation enhancement",
+    "pre-emption under section 96 State Acquisition and Tenancy Act",
+    "dowry death evidence of dying declaration",
+    "specific performance of contract for sale of land",
+    "quashing of proceedings under section 561A",
+]
+
+
+def parse_server_timing(header: Optional[str]) -> Dict[str, float]:
+    """{"bm25": 3.1, ...} from a Server-Timing header"""
+    timings = {}
+    for entry in (header or "").split(","):
+        metric, *params = [part.strip() for part in entry.split(";")]
+        for param in params:
+            if param.startswith("dur="):
+                timings[metric] = float(param[4:])
+    return timings
+
+
+def send_query(url: str, query: str, k: int, stream: bool, timeout: float) -> dict:
+    """One request; returns status, latency and (for streams) time to first event"""
+    endpoint = "/search/stream" if stream else "/search"
+    request = urllib.request.Request(
+        url.rstrip("/") + endpoint, data=json.dumps({"query": query, "k": k}).encode(),
+        headers={"Content-Type": "application/json"}, method="POST"
+    )
+    start = time.perf_counter()
+    first_event = None
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            status, timing = response.status, response.headers.get("Server-Timing")
+            if stream:
+                for line in response:
+                    if first_event is None and line.startswith(b"event:"):
+                        first_event = (time.perf_counter() - start) * 1000
+            else:
+                response.read()
+    except urllib.error.HTTPError as e:
+        status, timing = e.code, None
+    except (urllib.error.URLError, TimeoutError, ConnectionError) as e:
+        logger.debug(f"Request failed: {e}")
+        status, timing = 0, None
+    return {
+        "status": status,
+        "latency_ms": (time.perf_counter() - start) * 1000,
+        "first_event_ms": first_event,
+        "timings": parse_server_timing(timing),
+    }
+
+
+def run_load(
+    url: str,
+    queries: Sequence[str],
+    requests: int = 1000,
+    concurrency: int = 8,
+    k: int = 10,
+    stream: bool = False,
+    timeout: float = 30.0,
+    seed: int = 0
+) -> dict:
+    """
+    Send `requests` queries from `concurrency` clients
+
+    Returns:
+        Report with throughput, status counts, latency percentiles (successful
+        requests) and mean Server-Timing per metric
+    """
+    rng = random.Random(seed)
+    chosen = [rng.choice(list(queries)) for _ in range(requests)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda query: send_query(url, query, k, stream, timeout), chosen))
+    elapsed = time.perf_counter() - start
+
+    ok = [result for result in results if result["status"] == 200]
+    timing_sums: Dict[str, List[float]] = defaultdict(list)
+    for result in ok:
+        for metric, duration in result["timings"].items():
+            timing_sums[metric].append(duration)
+    report = {
+        "url": url,
+        "requests": requests,
+        "concurrency": concurrency,
+        "stream": stream,
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 2),
+        "status": {str(status): count for status, count in sorted(Counter(r["status"] for r in results).items())},
+        "latency_ms": percentiles([r["latency_ms"] for r in ok]) if ok else {},
+        "server_timing_ms": {metric: round(sum(values) / len(values), 3) for metric, values in timing_sums.items()},
+    }
+    first_events = [r["first_event_ms"] for r in ok if r["first_event_ms"] is not None]
+    if first_events:
+        report["first_event_ms"] = percentiles(first_events)
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the retrieval API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--queries", help="File with one query per line (default: built-in mix)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--stream", action="store_true", help="Use the SSE endpoint")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    queries = DEFAULT_QUERIES
+    if args.queries:
+        with open(args.queries) as f:
+            queries = [line.strip() for line in f if line.strip()]
+
+    report = run_load(args.url, queries, args.requests, args.concurrency, args.k, args.stream, args.timeout)
+    latency = report["latency_ms"]
+    print(f"{report['requests']} requests, concurrency {report['concurrency']}: "
+          f"{report['throughput_rps']} req/s, status {report['status']}")
+    if latency:
+        print(f"latency ms  p50 {latency['p50']:.1f}  p95 {latency['p95']:.1f}  p99 {latency['p99']:.1f}")
+    for metric, mean in report["server_timing_ms"].items():
+        print(f"  {metric:<10} {mean:8.2f} ms")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Shared database connections for the query API
+One PostgreSQL ThreadedConnectionPool (chunk text and titles for results)
+and one Neo4j driver (its own connection pool, used by the graph retriever)
+per process, instead of a connection per request.
+"""
+import logging
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNK_TEXT_QUERY = """
+    SELECT c.id, c.document_id, c.chunk_text, d.title_full
+    FROM document_chunks c
+    JOIN documents d ON d.id = c.document_id
+    WHERE c.id = ANY(%s)
+"""
+
+DOCUMENT_TITLE_QUERY = "SELECT id, title_full FROM documents WHERE id = ANY(%s)"
+
+
+class ConnectionPools:
+    """PostgreSQL and Neo4j connection pools"""
+
+    def __init__(
+        self,
+        pg_dsn: Optional[str] = None,
+        neo4j_uri: Optional[str] = None,
+        neo4j_user: str = "neo4j",
+        neo4j_password: str = "",
+        pg_min: int = 1,
+        pg_max: int = 10,
+        neo4j_max: int = 50
+    ):
+        """
+        Args:
+            pg_dsn: PostgreSQL connection string (None: no result hydration)
+            neo4j_uri: Bolt URI (None: no graph retriever)
+            neo4j_user: Neo4j user
+            neo4j_password: Neo4j password
+            pg_min: Connections opened up front
+            pg_max: Most connections held at once
+            neo4j_max: Neo4j driver connection pool size
+        """
+        self.pg = None
+        self.neo4j = None
+        if pg_dsn:
+            try:
+                from psycopg2.pool import ThreadedConnectionPool
+            except ImportError:
+                raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+            self.pg = ThreadedConnectionPool(pg_min, pg_max, pg_dsn)
+        if neo4j_uri:
+            try:
+                from neo4j import GraphDatabase
+            except ImportError:
+                raise ImportError("neo4j not installed. Install with: pip install neo4j")
+            self.neo4j = GraphDatabase.driver(
+                neo4j_uri, auth=(neo4j_user, neo4j_password), max_connection_pool_size=neo4j_max
+            )
+
+    @contextmanager
+    def pg_connection(self):
+        """Borrow a PostgreSQL connection; it is rolled back and returned afterwards"""
+        if self.pg is None:
+            raise RuntimeError("No PostgreSQL pool configured")
+        conn = self.pg.getconn()
+        try:
+            yield conn
+        finally:
+            conn.rollback()
+            self.pg.putconn(conn)
+
+    def chunk_texts(self, chunk_ids: Iterable[int]) -> Dict[int, dict]:
+        """Chunk ID -> {"document_id", "text", "title"}"""
+        chunk_ids = list(chunk_ids)
+        if not chunk_ids or self.pg is None:
+            return {}
+        with self.pg_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(CHUNK_TEXT_QUERY, (chunk_ids,))
+            return {
+                chunk_id: {"document_id": document_id, "text": text, "title": title}
+                for chunk_id, document_id, text, title in cursor.fetchall()
+            }
+
+    def document_titles(self, document_ids: Iterable[int]) -> Dict[int, str]:
+        document_ids = list(document_ids)
+        if not document_ids or self.pg is None:
+            return {}
+        with self.pg_connection() as conn, conn.cursor() as cursor:
+            cursor.execute(DOCUMENT_TITLE_QUERY, (document_ids,))
+            return dict(cursor.fetchall())
+
+    def close(self):
+        if self.pg is not None:
+            self.pg.closeall()
+        if self.neo4j is not None:
+            self.neo4j.close()
@@ -0,0 +1,11 @@
+"""
+Query result caching: exact and semantic levels with ingest invalidation
+"""
+from .query_cache import CacheHit, IngestScope, QueryCache, canonical_filters
+
+__all__ = [
+    'CacheHit',
+    'IngestScope',
+    'QueryCache',
+    'canonical_filters'
+]
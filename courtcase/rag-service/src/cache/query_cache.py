@@ -0,0 +1,274 @@
+"""
+Two-level query result cache
+Level 1 is exact: the normalized query ("Bail under Section 497 CrPC" and
+"bail under s. 497 crpc" normalize alike) plus the canonical filters. Level 2 is
+semantic: a query whose embedding is within `threshold` cosine similarity of
+a cached query with the same filters reuses its results - but only when both
+cite exactly the same citations, sections and articles, since "s.497" and
+"s.498" embed closely and answer different questions.
+
+Entries expire after a TTL and are tagged with the courts and statutes they
+depend on, so ingesting new documents for a court or statute drops exactly
+the answers that may have changed (invalidate / invalidate_chunks).
+"""
+import json
+import time
+import logging
+import threading
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from ..embeddings.encoders import Encoder
+from ..utils.corpus import CorpusChunk
+from ..utils.legal_text import STATUTE_ABBREVIATIONS, legal_references, tokenize
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 600.0
+DEFAULT_CAPACITY = 10_000
+DEFAULT_THRESHOLD = 0.92
+
+# Tag of entries not restricted to particular courts: any court's ingest may change them
+ANY_COURT = "court:*"
+
+_STATUTES = frozenset(name.lower() for name in STATUTE_ABBREVIATIONS)
+
+
+def canonical_filters(filters: Optional[Dict[str, Any]]) -> str:
+    """Order-independent string form of a filters dict (lists are sorted, empty values dropped)"""
+    canonical = {}
+    for name, value in (filters or {}).items():
+        if value is None or value == [] or value == ():
+            continue
+        canonical[name] = sorted(value) if isinstance(value, (list, tuple, set, frozenset)) else value
+    return json.dumps(canonical, sort_keys=True, default=str)
+
+
+def statute_tags(tokens: Iterable[str]) -> Set[str]:
+    """statute:<token> tags for section/article references and statute abbreviations"""
+    return {f"statute:{token}" for token in tokens if token.startswith(("s.", "art.")) or token in _STATUTES}
+
+
+def court_tags(filters: Optional[Dict[str, Any]]) -> Set[str]:
+    courts = (filters or {}).get("courts") or (filters or {}).get("court")
+    if not courts:
+        return {ANY_COURT}
+    if isinstance(courts, str):
+        courts = [courts]
+    return {f"court:{court.lower()}" for court in courts}
+
+
+class IngestScope:
+    """Courts and statutes touched by a stream of ingested chunks"""
+
+    def __init__(self):
+        self.courts: Set[str] = set()
+        self.statutes: Set[str] = set()
+
+    def add(self, chunk: CorpusChunk):
+        if chunk.metadata.get("court"):
+            self.courts.add(chunk.metadata["court"])
+        self.statutes.update(tag[len("statute:"):] for tag in statute_tags(tokenize(chunk.text)))
+
+    def observe(self, chunks: Iterable[CorpusChunk]) -> Iterator[CorpusChunk]:
+        """Pass chunks through (e.g. into an index build) while recording their scope"""
+        for chunk in chunks:
+            self.add(chunk)
+            yield chunk
+
+    def notify(self, url: str, timeout: float = 10.0) -> int:
+        """POST the scope to a running API's /cache/invalidate; returns entries dropped"""
+        if not self.courts and not self.statutes:
+            return 0
+        body = json.dumps({"courts": sorted(self.courts), "statutes": sorted(self.statutes)}).encode()
+        request = urllib.request.Request(url.rstrip("/") + "/cache/invalidate", data=body,
+                                         headers={"Content-Type": "application/json"}, method="POST")
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.load(response)["invalidated"]
+
+
+@dataclass
+class _Entry:
+    value: Any
+    filters: str
+    references: FrozenSet[str]
+    tags: FrozenSet[str]
+    expires: float
+    vector: Optional[np.ndarray] = None
+
+
+@dataclass
+class CacheHit:
+    value: Any
+    level: str  # "exact" | "semantic"
+    similarity: float = 1.0
+    query: str = ""  # normalized query of the entry that answered
+
+
+class QueryCache:
+    """Exact + semantic query cache with TTL and court/statute invalidation"""
+
+    def __init__(
+        self,
+        encoder: Optional[Encoder] = None,
+        ttl: float = DEFAULT_TTL,
+        capacity: int = DEFAULT_CAPACITY,
+        threshold: float = DEFAULT_THRESHOLD,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Args:
+            encoder: Query encoder for the semantic level (None: exact level only)
+            ttl: Seconds an entry lives
+            capacity: Entries kept (least recently used are evicted)
+            threshold: Cosine similarity for a semantic hit
+            clock: Time source (tests)
+        """
+        self.encoder = encoder
+        self.ttl = ttl
+        self.capacity = capacity
+        self.threshold = threshold
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], _Entry]" = OrderedDict()
+        # (filters, references) -> keys: the only entries a semantic hit may come from
+        self._groups: Dict[Tuple[str, FrozenSet[str]], Set[Tuple[str, str]]] = {}
+        self._lock = threading.Lock()
+        self.counts = {"exact": 0, "semantic": 0, "miss": 0, "expired": 0, "invalidated": 0, "evicted": 0}
+
+    def embed(self, query: str) -> Optional[np.ndarray]:
+        """Query vector for the semantic level (None without an encoder)"""
+        if self.encoder is None:
+            return None
+        return self.encoder.encode([query])[0]
+
+    def get(self, query: str, filters: Optional[Dict[str, Any]] = None,
+            vector: Optional[np.ndarray] = None) -> Optional[CacheHit]:
+        """
+        Cached value for a query, exact match first, then the most similar entry
+
+        Args:
+            query: Raw query
+            filters: Filters the results were computed with
+            vector: Query embedding, if already computed (see embed)
+        """
+        tokens = tokenize(query)
+        key = (" ".join(tokens), canonical_filters(filters))
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry.expires > now:
+                    self._entries.move_to_end(key)
+                    self.counts["exact"] += 1
+                    return CacheHit(entry.value, "exact", 1.0, key[0])
+                self._remove(key)
+                self.counts["expired"] += 1
+
+        if self.encoder is not None:
+            if vector is None:
+                vector = self.embed(query)
+            hit = self._semantic(key[1], frozenset(legal_references(tokens)), vector, now)
+            if hit is not None:
+                return hit
+        with self._lock:
+            self.counts["miss"] += 1
+        return None
+
+    def _semantic(self, filters: str, references: FrozenSet[str], vector: np.ndarray, now: float) -> Optional[CacheHit]:
+        with self._lock:
+            candidates = [
+                (key, self._entries[key]) for key in self._groups.get((filters, references), ())
+                if self._entries[key].vector is not None and self._entries[key].expires > now
+            ]
+            if not candidates:
+                return None
+            similarities = np.vstack([entry.vector for _, entry in candidates]) @ vector
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                return None
+            key, entry = candidates[best]
+            self._entries.move_to_end(key)
+            self.counts["semantic"] += 1
+            return CacheHit(entry.value, "semantic", float(similarities[best]), key[0])
+
+    def put(self, query: str, filters: Optional[Dict[str, Any]], value: Any, vector: Optional[np.ndarray] = None):
+        """Cache the results of a query"""
+        tokens = tokenize(query)
+        if self.encoder is not None and vector is None:
+            vector = self.embed(query)
+        entry = _Entry(
+            value=value,
+            filters=canonical_filters(filters),
+            references=frozenset(legal_references(tokens)),
+            tags=frozenset(court_tags(filters) | statute_tags(tokens)),
+            expires=self.clock() + self.ttl,
+            vector=None if vector is None else np.asarray(vector, dtype=np.float32),
+        )
+        with self._lock:
+            key = (" ".join(tokens), entry.filters)
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._groups.setdefault((entry.filters, entry.references), set()).add(key)
+            while len(self._entries) > self.capacity:
+                self._remove(next(iter(self._entries)))
+                self.counts["evicted"] += 1
+
+    def _remove(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key)
+        group = (entry.filters, entry.references)
+        self._groups[group].discard(key)
+        if not self._groups[group]:
+            del self._groups[group]
+
+    def invalidate(self, courts: Sequence[str] = (), statutes: Sequence[str] = ()) -> int:
+        """
+        Drop entries that new documents for these courts or statutes may change
+
+        Args:
+            courts: Court names; also drops entries not filtered by court
+            statutes: Statute references as tokens or text ("s.497", "Section 497", "CrPC")
+
+        Returns:
+            Number of entries dropped
+        """
+        tags = {f"court:{court.lower()}" for court in courts}
+        if tags:
+            tags.add(ANY_COURT)
+        tags |= statute_tags(token for statute in statutes for token in tokenize(statute))
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry.tags & tags]
+            for key in stale:
+                self._remove(key)
+            self.counts["invalidated"] += len(stale)
+        if stale:
+            logger.info(f"Invalidated {len(stale)} cached queries for {sorted(tags)}")
+        return len(stale)
+
+    def invalidate_chunks(self, chunks: Iterable[CorpusChunk]) -> int:
+        """Ingest hook: invalidate for the courts and statutes of newly indexed chunks"""
+        scope = IngestScope()
+        for chunk in chunks:
+            scope.add(chunk)
+        return self.invalidate(sorted(scope.courts), sorted(scope.statutes))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.counts["exact"] + self.counts["semantic"] + self.counts["miss"]
+        hits = self.counts["exact"] + self.counts["semantic"]
+        return {
+            "entries": len(self._entries),
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            **self.counts,
+        }
@@ -0,0 +1,14 @@
+"""
+Embeddings: encoders and the approximate nearest-neighbour chunk index
+"""
+from .encoders import Encoder, HashingEncoder, SentenceTransformerEncoder, create_encoder
+from .ann_index import VectorIndex, VectorFilter
+
+__all__ = [
+    'Encoder',
+    'HashingEncoder',
+    'SentenceTransformerEncoder',
+    'create_encoder',
+    'VectorIndex',
+    'VectorFilter'
+]
@@ -0,0 +1,543 @@
+"""
+Approximate nearest-neighbour index for chunk embeddings
+An IVF (inverted file) index: vectors are clustered by k-means into
+`nlist` lists and a query scans only the `nprobe` lists nearest to it.
+Vectors live in an append-only memory-mapped matrix, float32 or int8
+(symmetric per-vector scale, 4x smaller), next to a row table holding the
+chunk ID map, parent document and filter facets (country, court, year);
+a document mask from filters.bitmaps restricts rows by their document.
+
+Inserts append rows assigned to their nearest list; deletes and updates
+tombstone rows, which compact() drops. Appended rows become searchable when
+the files are reopened: after every add(), or once at the end of a bulk()
+block (index_chunks loads through one). Filters are applied before scoring;
+when the probed lists hold fewer than k allowed rows (or the filter allows
+fewer rows than the lists hold) the allowed rows are scanned exactly
+instead, so selective filters never return short result lists.
+
+Until TRAIN_SIZE vectors are present the index is searched exhaustively;
+it clusters itself then, and again whenever it has grown fourfold since
+the last training.
+
+Usage:
+    python -m src.embeddings.ann_index build --index data/index/vectors --dsn "$DATABASE_URL"
+    python -m src.embeddings.ann_index search --index data/index/vectors "anticipatory bail" --country BD
+"""
+import os
+import json
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .encoders import Encoder, create_encoder, encode_batched, normalize
+from ..filters.bitmaps import allowed_rows
+from ..utils.hits import SearchHit
+from ..utils.corpus import CorpusChunk, iter_document_chunks, read_jsonl
+
+logger = logging.getLogger(__name__)
+
+ROW_DTYPE = np.dtype([
+    ("chunk_id", "<i8"),
+    ("document_id", "<i8"),
+    ("list", "<i4"),
+    ("country", "<i2"),
+    ("court", "<i4"),
+    ("year", "<i2"),
+    ("scale", "<f4"),
+])
+
+UNASSIGNED = -1
+UNKNOWN = -1  # facet code / ID for missing values
+DEFAULT_NPROBE = 8
+TRAIN_SIZE = 20_000
+RETRAIN_GROWTH = 4
+KMEANS_SAMPLE_PER_LIST = 64
+
+META = "index.json"
+
+
+def quantize(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """int8 codes and per-row scales with codes * scale ~= vectors"""
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return codes, scales
+
+
+def nearest_lists(vectors: np.ndarray, centroids: np.ndarray, batch: int = 65536) -> np.ndarray:
+    """Index of the most similar centroid for every row"""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), batch):
+        block = np.asarray(vectors[start:start + batch], dtype=np.float32)
+        out[start:start + batch] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+def kmeans(vectors: np.ndarray, nlist: int, iterations: int = 12, seed: int = 0) -> np.ndarray:
+    """Spherical k-means (unit-length centroids) on a sample of vectors"""
+    rng = np.random.default_rng(seed)
+    vectors = normalize(vectors)
+    nlist = min(nlist, len(vectors))
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = nearest_lists(vectors, centroids)
+        order = np.argsort(assign, kind="stable")
+        counts = np.bincount(assign, minlength=nlist)
+        filled = np.flatnonzero(counts)
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+        centroids[filled] = normalize(np.add.reduceat(vectors[order], starts, axis=0))
+        empty = np.flatnonzero(counts == 0)
+        if len(empty):
+            centroids[empty] = vectors[rng.choice(len(vectors), len(empty), replace=False)]
+    return centroids
+
+
+@dataclass
+class VectorFilter:
+    """Metadata restrictions applied before scoring"""
+    countries: Optional[Sequence[str]] = None
+    courts: Optional[Sequence[str]] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    documents: Optional[np.ndarray] = None  # boolean mask over document IDs (FacetIndex.mask)
+
+    def is_empty(self) -> bool:
+        return not (self.countries or self.courts or self.year_from or self.year_to) and self.documents is None
+
+
+class VectorIndex:
+    """
+    Memory-mapped IVF index keyed by chunk ID
+
+    Example:
+        index = VectorIndex("data/index/vectors", dimension=384, dtype="int8")
+        index.add(chunk_ids, vectors, document_ids, metadata)
+        hits = index.search(query_vector, k=10, filters=VectorFilter(countries=["BD"]))
+    """
+
+    def __init__(
+        self,
+        path,
+        dimension: Optional[int] = None,
+        dtype: str = "float32",
+        train_size: int = TRAIN_SIZE
+    ):
+        """
+        Args:
+            path: Index directory (created if missing)
+            dimension: Vector length (required for a new index)
+            dtype: "float32" or "int8" storage (new index only)
+            train_size: Vectors needed before the index clusters itself
+        """
+        self.path = Path(path)
+        self.train_size = train_size
+        self._lock = threading.RLock()
+        self._bulk_depth = 0
+        # Chunk IDs and tombstones of rows appended since the files were opened
+        self._pending_ids: List[np.ndarray] = []
+        self._pending_deleted: List[np.ndarray] = []
+        meta_path = self.path / META
+        if meta_path.exists():
+            with open(meta_path) as f:
+                self.meta = json.load(f)
+        else:
+            if dimension is None:
+                raise ValueError(f"No vector index at {self.path}; pass dimension to create one")
+            if dtype not in ("float32", "int8"):
+                raise ValueError(f"Unsupported vector dtype: {dtype}")
+            self.path.mkdir(parents=True, exist_ok=True)
+            self.meta = {"dimension": dimension, "dtype": dtype, "nlist": 0, "trained_on": 0,
+                         "countries": [], "courts": []}
+            self._save_meta()
+        self.dimension = self.meta["dimension"]
+        self.dtype = np.dtype(self.meta["dtype"])
+        self._open()
+
+    # Storage
+
+    def _open(self) -> None:
+        vectors_path, rows_path = self.path / "vectors.bin", self.path / "rows.bin"
+        row_count = os.path.getsize(rows_path) // ROW_DTYPE.itemsize if rows_path.exists() else 0
+        vector_count = (os.path.getsize(vectors_path) // (self.dtype.itemsize * self.dimension)
+                        if vectors_path.exists() else 0)
+        n = min(row_count, vector_count)  # a torn append leaves one file longer
+        if n:
+            self.vectors = np.memmap(vectors_path, dtype=self.dtype, mode="r", shape=(n, self.dimension))
+            self.rows = np.memmap(rows_path, dtype=ROW_DTYPE, mode="r", shape=(n,))
+        else:
+            self.vectors = np.zeros((0, self.dimension), dtype=self.dtype)
+            self.rows = np.zeros(0, dtype=ROW_DTYPE)
+
+        deleted_path = self.path / "deleted.npy"
+        deleted = np.load(deleted_path) if deleted_path.exists() else np.zeros(0, dtype=bool)
+        self.deleted = np.concatenate((deleted[:n], np.zeros(max(0, n - len(deleted)), dtype=bool)))
+        centroids_path = self.path / "centroids.npy"
+        self.centroids = np.load(centroids_path) if self.meta["nlist"] else None
+        self._max_chunk_id = int(self.rows["chunk_id"].max()) if n else UNKNOWN
+        self._build_lists()
+
+    def _apply_pending(self, retrain: bool = True) -> None:
+        """Make the rows appended since the last open visible (and retrain if the index has grown)"""
+        if not self._pending_ids:
+            return
+        self.deleted = np.concatenate([self.deleted] + self._pending_deleted)
+        self._pending_ids, self._pending_deleted = [], []
+        self._save_deleted()
+        self._save_meta()
+        self._open()
+        live = len(self)
+        if retrain and live >= self.train_size and live >= RETRAIN_GROWTH * self.meta["trained_on"]:
+            self.train()
+
+    def _build_lists(self) -> None:
+        if self.centroids is None:
+            self._list_rows, self._list_bounds = None, None
+            return
+        lists = np.asarray(self.rows["list"])
+        self._list_rows = np.argsort(lists, kind="stable")
+        self._list_bounds = np.searchsorted(lists[self._list_rows], np.arange(len(self.centroids) + 1))
+
+    def _save_meta(self) -> None:
+        tmp = self.path / f"{META}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.meta, f)
+        os.replace(tmp, self.path / META)
+
+    def _save_deleted(self) -> None:
+        tmp = self.path / "deleted.tmp.npy"
+        np.save(tmp, self.deleted)
+        os.replace(tmp, self.path / "deleted.npy")
+
+    def _code(self, vocabulary: str, value) -> int:
+        if value is None or value == "":
+            return UNKNOWN
+        values = self.meta[vocabulary]
+        if value not in values:
+            values.append(value)
+        return values.index(value)
+
+    # Statistics
+
+    def __len__(self) -> int:
+        return int(len(self.rows) - self.deleted.sum())
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    def stats(self) -> Dict:
+        return {
+            "vectors": len(self),
+            "deleted": int(self.deleted.sum()),
+            "dimension": self.dimension,
+            "dtype": self.dtype.name,
+            "lists": self.meta["nlist"],
+            "bytes": sum(f.stat().st_size for f in self.path.iterdir() if f.is_file()),
+        }
+
+    # Writes
+
+    @contextmanager
+    def bulk(self):
+        """
+        Load many batches with one reopen at the end
+
+        Rows added inside the block are not searchable (and the index does
+        not retrain) until it ends.
+        """
+        with self._lock:
+            self._bulk_depth += 1
+            try:
+                yield self
+            finally:
+                self._bulk_depth -= 1
+                if not self._bulk_depth:
+                    self._apply_pending()
+
+    def add(
+        self,
+        chunk_ids: Sequence[int],
+        vectors: np.ndarray,
+        document_ids: Optional[Sequence[Optional[int]]] = None,
+        metadata: Optional[Sequence[Dict]] = None
+    ) -> int:
+        """
+        Insert (or replace) vectors
+
+        Args:
+            chunk_ids: Chunk ID per vector
+            vectors: (n, dimension) embeddings; normalized on insert
+            document_ids: Parent document per vector
+            metadata: Per vector dict with optional "country_code", "court", "year"
+
+        Returns:
+            Number of vectors added
+        """
+        vectors = normalize(np.asarray(vectors, dtype=np.float32).reshape(-1, self.dimension))
+        n = len(vectors)
+        if n != len(chunk_ids):
+            raise ValueError(f"{len(chunk_ids)} chunk IDs for {n} vectors")
+        if n == 0:
+            return 0
+        document_ids = document_ids or [None] * n
+        metadata = metadata or [{}] * n
+
+        with self._lock:
+            chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+            self._tombstone(chunk_ids)
+
+            rows = np.zeros(n, dtype=ROW_DTYPE)
+            rows["chunk_id"] = chunk_ids
+            rows["document_id"] = [UNKNOWN if d is None else d for d in document_ids]
+            rows["country"] = [self._code("countries", m.get("country_code")) for m in metadata]
+            rows["court"] = [self._code("courts", m.get("court")) for m in metadata]
+            rows["year"] = [m.get("year") or 0 for m in metadata]
+            rows["list"] = nearest_lists(vectors, self.centroids) if self.trained else UNASSIGNED
+            if self.dtype == np.int8:
+                stored, rows["scale"] = quantize(vectors)
+            else:
+                stored, rows["scale"] = vectors, 1.0
+
+            with open(self.path / "vectors.bin", "ab") as f:
+                f.write(np.ascontiguousarray(stored, dtype=self.dtype).tobytes())
+            with open(self.path / "rows.bin", "ab") as f:
+                f.write(rows.tobytes())
+            self._pending_ids.append(chunk_ids)
+            self._pending_deleted.append(np.zeros(n, dtype=bool))
+            self._max_chunk_id = max(self._max_chunk_id, int(chunk_ids.max()))
+            if not self._bulk_depth:
+                self._apply_pending()
+        return n
+
+    def delete(self, chunk_ids: Iterable[int]) -> int:
+        """Tombstone vectors; returns how many were live"""
+        with self._lock:
+            count = self._tombstone(np.fromiter(chunk_ids, dtype=np.int64))
+            if count:
+                self._save_deleted()
+        return count
+
+    def _tombstone(self, chunk_ids: np.ndarray) -> int:
+        if not len(chunk_ids) or int(chunk_ids.min()) > self._max_chunk_id:
+            return 0  # only new chunks, e.g. an incremental build
+        count = 0
+        if len(self.rows):
+            hit = np.isin(self.rows["chunk_id"], chunk_ids) & ~self.deleted
+            self.deleted = self.deleted | hit
+            count += int(hit.sum())
+        for pending_ids, pending_deleted in zip(self._pending_ids, self._pending_deleted):
+            hit = np.isin(pending_ids, chunk_ids) & ~pending_deleted
+            pending_deleted |= hit
+            count += int(hit.sum())
+        return count
+
+    def _dequantize(self, rows: np.ndarray) -> np.ndarray:
+        vectors = np.asarray(self.vectors[rows], dtype=np.float32)
+        if self.dtype == np.int8:
+            vectors *= self.rows["scale"][rows][:, None]
+        return vectors
+
+    def train(self, nlist: Optional[int] = None) -> None:
+        """(Re)cluster the live vectors into nlist lists (default sqrt(n)) and reassign every row"""
+        with self._lock:
+            self._apply_pending(retrain=False)
+            live = np.flatnonzero(~self.deleted)
+            if not len(live):
+                return
+            nlist = nlist or max(1, int(np.sqrt(len(live))))
+            rng = np.random.default_rng(0)
+            sample = rng.choice(live, min(len(live), nlist * KMEANS_SAMPLE_PER_LIST), replace=False)
+            centroids = kmeans(self._dequantize(np.sort(sample)), nlist)
+
+            rows = np.array(self.rows)
+            for start in range(0, len(rows), 65536):
+                block = np.arange(start, min(start + 65536, len(rows)))
+                rows["list"][block] = nearest_lists(self._dequantize(block), centroids)
+            np.save(self.path / "centroids.npy", centroids)
+            self._replace("rows.bin", rows.tobytes())
+            self.meta.update(nlist=len(centroids), trained_on=len(live))
+            self._save_meta()
+            self._open()
+        logger.info(f"Clustered {len(live)} vectors into {len(centroids)} lists")
+
+    def compact(self) -> None:
+        """Drop tombstoned rows and store each list contiguously"""
+        with self._lock:
+            self._apply_pending(retrain=False)
+            live = np.flatnonzero(~self.deleted)
+            if self.trained:
+                live = live[np.argsort(self.rows["list"][live], kind="stable")]
+            self._replace("vectors.bin", np.ascontiguousarray(self.vectors[live]).tobytes())
+            self._replace("rows.bin", np.asarray(self.rows[live]).tobytes())
+            self.deleted = np.zeros(len(live), dtype=bool)
+            self._save_deleted()
+            self._open()
+
+    def _replace(self, name: str, data: bytes) -> None:
+        tmp = self.path / f"{name}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, self.path / name)
+
+    # Search
+
+    def _allowed(self, filters: Optional[VectorFilter]) -> Optional[np.ndarray]:
+        """Boolean row mask for the filter (None when unfiltered)"""
+        if filters is None or filters.is_empty():
+            return None
+        mask = ~self.deleted
+        for field_name, vocabulary, values in (("country", "countries", filters.countries),
+                                               ("court", "courts", filters.courts)):
+            if values:
+                codes = [self.meta[vocabulary].index(v) for v in values if v in self.meta[vocabulary]]
+                mask &= np.isin(self.rows[field_name], codes)
+        if filters.year_from:
+            mask &= self.rows["year"] >= filters.year_from
+        if filters.year_to:
+            mask &= (self.rows["year"] <= filters.year_to) & (self.rows["year"] > 0)
+        if filters.documents is not None:
+            mask &= allowed_rows(filters.documents, self.rows["document_id"])
+        return mask
+
+    def search(
+        self,
+        vector: np.ndarray,
+        k: int = 10,
+        nprobe: int = DEFAULT_NPROBE,
+        filters: Optional[VectorFilter] = None
+    ) -> List[SearchHit]:
+        """
+        Approximate top-k chunks by cosine similarity
+
+        Args:
+            vector: Query embedding
+            k: Number of hits
+            nprobe: Lists scanned (more = higher recall, slower)
+            filters: Metadata restrictions
+
+        Returns:
+            Hits, most similar first
+        """
+        query = normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        allowed = self._allowed(filters)
+        if not self.trained:
+            rows = np.flatnonzero(~self.deleted if allowed is None else allowed)
+        else:
+            probes = np.argsort(-(self.centroids @ query))[:nprobe]
+            candidates = np.concatenate(
+                [self._list_rows[self._list_bounds[p]:self._list_bounds[p + 1]] for p in probes]
+            )
+            if allowed is None:
+                rows = candidates[~self.deleted[candidates]]
+            else:
+                rows = candidates[allowed[candidates]]
+                if len(rows) < k or allowed.sum() <= len(candidates):
+                    rows = np.flatnonzero(allowed)  # selective filter: exact scan is complete (and cheap)
+        return self._top(rows, query, k)
+
+    def exact_search(self, vector: np.ndarray, k: int = 10, filters: Optional[VectorFilter] = None) -> List[SearchHit]:
+        """Exhaustive search (ground truth for recall measurements)"""
+        query = normalize(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        allowed = self._allowed(filters)
+        return self._top(np.flatnonzero(~self.deleted if allowed is None else allowed), query, k)
+
+    def _top(self, rows: np.ndarray, query: np.ndarray, k: int) -> List[SearchHit]:
+        if not len(rows) or k <= 0:
+            return []
+        rows = np.sort(rows)  # sequential reads from the memory map
+        scores = np.asarray(self.vectors[rows], dtype=np.float32) @ query
+        if self.dtype == np.int8:
+            scores *= self.rows["scale"][rows]
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top], kind="stable")]
+        table = self.rows[rows[top]]
+        return [
+            SearchHit(int(row["chunk_id"]), float(score),
+                      None if row["document_id"] == UNKNOWN else int(row["document_id"]), "vector")
+            for row, score in zip(table, scores[top])
+        ]
+
+
+def index_chunks(index: VectorIndex, chunks: Iterable[CorpusChunk], encoder: Encoder, batch_size: int = 1024) -> int:
+    """Encode and insert chunks in batches (one bulk load); returns the number indexed"""
+    count, batch = 0, []
+
+    def flush():
+        vectors = encode_batched(encoder, [chunk.text for chunk in batch])
+        return index.add([c.chunk_id for c in batch], vectors, [c.document_id for c in batch],
+                         [c.metadata for c in batch])
+
+    with index.bulk():
+        for chunk in chunks:
+            batch.append(chunk)
+            if len(batch) >= batch_size:
+                count += flush()
+                batch = []
+        if batch:
+            count += flush()
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the chunk vector index")
+    parser.add_argument("--index", default="data/index/vectors", help="Index directory")
+    parser.add_argument("--encoder", default="hashing", help='"hashing" or a sentence-transformers model')
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Encode and index chunks")
+    source = build.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dsn", help="PostgreSQL connection string (document_chunks)")
+    source.add_argument("--jsonl", help="JSON Lines chunk export")
+    build.add_argument("--dtype", choices=["float32", "int8"], default="float32")
+    build.add_argument("--notify", metavar="API_URL",
+                       help="Invalidate the running API's query cache for the ingested courts and statutes")
+
+    search = commands.add_parser("search", help="Run a query")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=10)
+    search.add_argument("--nprobe", type=int, default=DEFAULT_NPROBE)
+    search.add_argument("--country", action="append")
+    search.add_argument("--court", action="append")
+    search.add_argument("--year-from", type=int)
+    search.add_argument("--year-to", type=int)
+
+    commands.add_parser("compact", help="Drop deleted vectors")
+    commands.add_parser("stats", help="Show index statistics")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    encoder = create_encoder(args.encoder)
+
+    if args.command == "build":
+        index = VectorIndex(args.index, dimension=encoder.dimension, dtype=args.dtype)
+        after_id = int(index.rows["chunk_id"].max()) if len(index.rows) else 0
+        chunks = iter_document_chunks(args.dsn, after_id=after_id) if args.dsn else read_jsonl(args.jsonl)
+        from ..cache.query_cache import IngestScope
+        scope = IngestScope()
+        print(f"Indexed {index_chunks(index, scope.observe(chunks), encoder)} chunks")
+        if args.notify:
+            print(f"Invalidated {scope.notify(args.notify)} cached queries")
+        print(json.dumps(index.stats(), indent=2))
+        return
+
+    index = VectorIndex(args.index)
+    if args.command == "search":
+        filters = VectorFilter(args.country, args.court, args.year_from, args.year_to)
+        hits = index.search(encoder.encode([args.query])[0], args.k, args.nprobe, filters)
+        for rank, hit in enumerate(hits, 1):
+            print(f"{rank:3d}. chunk {hit.chunk_id} (document {hit.document_id})  {hit.score:.4f}")
+    elif args.command == "compact":
+        index.compact()
+        print(json.dumps(index.stats(), indent=2))
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Recall / latency benchmark for the vector index
+Compares VectorIndex (per storage type and nprobe) with brute-force NumPy
+search over the same float32 vectors: recall@k against the exact top k,
+query latency percentiles and index size.
+
+Usage:
+    python -m src.embeddings.benchmark --vectors 200000 --dimension 384 --nprobe 4 8 16 32
+    python -m src.embeddings.benchmark --vectors 100000 --dtype float32 int8 --json report.json
+"""
+import json
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from .ann_index import VectorIndex
+from .encoders import normalize
+
+logger = logging.getLogger(__name__)
+
+
+def clustered_vectors(n: int, dimension: int, clusters: int = 256, spread: float = 0.35, seed: int = 0) -> np.ndarray:
+    """Synthetic unit vectors drawn around random topic centres (embeddings are clustered, not uniform)"""
+    rng = np.random.default_rng(seed)
+    centres = normalize(rng.standard_normal((clusters, dimension)))
+    noise = rng.standard_normal((n, dimension)) * spread / np.sqrt(dimension)
+    return normalize(centres[rng.integers(0, clusters, n)] + noise)
+
+
+def exact_top_k(data: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """Brute-force top-k row indices per query"""
+    scores = queries @ data.T
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1)
+
+
+def percentiles(latencies_ms: Sequence[float]) -> Dict[str, float]:
+    values = np.asarray(latencies_ms)
+    return {f"p{p}": round(float(np.percentile(values, p)), 3) for p in (50, 95, 99)}
+
+
+def benchmark(
+    data: np.ndarray,
+    queries: np.ndarray,
+    k: int = 10,
+    nprobes: Sequence[int] = (1, 4, 8, 16),
+    dtypes: Sequence[str] = ("float32", "int8")
+) -> List[Dict]:
+    """
+    Measure recall@k and latency for every (dtype, nprobe) configuration
+
+    Args:
+        data: (n, dimension) unit vectors; row i is indexed as chunk i
+        queries: (q, dimension) query vectors
+        k: Hits per query
+        nprobes: IVF lists scanned per query
+        dtypes: Storage types to build
+
+    Returns:
+        One result dict per configuration, brute force first
+    """
+    truth = exact_top_k(data, queries, k)
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        exact_top_k(data, query[None, :], k)
+        latencies.append((time.perf_counter() - start) * 1000)
+    results = [{"method": "brute_force", "recall": 1.0, "bytes": int(data.nbytes), **percentiles(latencies)}]
+
+    for dtype in dtypes:
+        directory = tempfile.mkdtemp(prefix="ann_bench_")
+        try:
+            index = VectorIndex(directory, dimension=data.shape[1], dtype=dtype, train_size=len(data) + 1)
+            start = time.perf_counter()
+            index.add(np.arange(len(data)), data)
+            index.train()
+            index.compact()
+            build_seconds = time.perf_counter() - start
+
+            for nprobe in nprobes:
+                found, latencies = [], []
+                for query in queries:
+                    start = time.perf_counter()
+                    hits = index.search(query, k, nprobe=nprobe)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    found.append([hit.chunk_id for hit in hits])
+                recall = np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth.tolist())])
+                results.append({
+                    "method": "ivf", "dtype": dtype, "nprobe": nprobe, "lists": index.meta["nlist"],
+                    "recall": round(float(recall), 4), "bytes": index.stats()["bytes"],
+                    "build_seconds": round(build_seconds, 2), **percentiles(latencies)
+                })
+                logger.info(f"{dtype} nprobe={nprobe}: recall@{k}={recall:.3f}")
+        finally:
+            shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the IVF vector index against brute-force search")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimension", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    parser.add_argument("--dtype", nargs="+", default=["float32", "int8"], choices=["float32", "int8"])
+    parser.add_argument("--json", help="Also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    data = clustered_vectors(args.vectors, args.dimension)
+    queries = clustered_vectors(args.queries, args.dimension, seed=1)
+    results = benchmark(data, queries, args.k, args.nprobe, args.dtype)
+
+    print(f"\n{'method':<12} {'dtype':<8} {'nprobe':>6} {'recall':>7} {'p50 ms':>8} {'p95 ms':>8} {'MB':>8}")
+    for result in results:
+        print(f"{result['method']:<12} {result.get('dtype', 'float32'):<8} {result.get('nprobe', '-'):>6} "
+              f"{result['recall']:>7.3f} {result['p50']:>8.2f} {result['p95']:>8.2f} {result['bytes'] / 1e6:>8.1f}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"vectors": args.vectors, "dimension": args.dimension, "k": args.k, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
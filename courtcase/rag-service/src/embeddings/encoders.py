@@ -0,0 +1,87 @@
+"""
+Text encoders for the vector index
+HashingEncoder needs no model (feature hashing of legal tokens), so indexes,
+tests and benchmarks run offline; SentenceTransformerEncoder wraps a local
+sentence-transformers model for real semantic retrieval.
+"""
+import logging
+import zlib
+from abc import ABC, abstractmethod
+from typing import List, Sequence
+
+import numpy as np
+
+from ..utils.legal_text import tokenize
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import SentenceTransformer
+    SENTENCE_TRANSFORMERS_AVAILABLE = True
+except ImportError:
+    SENTENCE_TRANSFORMERS_AVAILABLE = False
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length (zero rows stay zero)"""
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class Encoder(ABC):
+    """Maps texts to unit-length float32 vectors"""
+
+    dimension: int
+
+    @abstractmethod
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts), dimension) float32 array"""
+
+
+class HashingEncoder(Encoder):
+    """Signed feature hashing of tokens: deterministic, model-free"""
+
+    def __init__(self, dimension: int = 256):
+        self.dimension = dimension
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in tokenize(text):
+                digest = zlib.crc32(token.encode("utf-8"))
+                vectors[row, digest % self.dimension] += 1.0 if digest & 0x80000000 else -1.0
+        return normalize(vectors)
+
+
+class SentenceTransformerEncoder(Encoder):
+    """Local sentence-transformers model"""
+
+    def __init__(self, model: str = DEFAULT_MODEL, device: str = "cpu", batch_size: int = 64):
+        if not SENTENCE_TRANSFORMERS_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers not installed. Install with: pip install sentence-transformers"
+            )
+        self.model = SentenceTransformer(model, device=device)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.batch_size = batch_size
+
+    def encode(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = self.model.encode(list(texts), batch_size=self.batch_size, convert_to_numpy=True)
+        return normalize(vectors)
+
+
+def create_encoder(name: str = "hashing", **kwargs) -> Encoder:
+    """Encoder by name: "hashing" or a sentence-transformers model name"""
+    if name == "hashing":
+        return HashingEncoder(**kwargs)
+    return SentenceTransformerEncoder(name, **kwargs)
+
+
+def encode_batched(encoder: Encoder, texts: List[str], batch_size: int = 256) -> np.ndarray:
+    """Encode a long list of texts in batches"""
+    if not texts:
+        return np.zeros((0, encoder.dimension), dtype=np.float32)
+    return np.vstack([encoder.encode(texts[i:i + batch_size]) for i in range(0, len(texts), batch_size)])
@@ -0,0 +1,13 @@
+"""
+Retrieval evaluation: ranking metrics, synthetic labelled corpus, benchmark harness
+"""
+from .metrics import evaluate, ndcg_at_k, recall_at_k, reciprocal_rank
+from .synthetic import synthetic_corpus
+
+__all__ = [
+    'evaluate',
+    'ndcg_at_k',
+    'recall_at_k',
+    'reciprocal_rank',
+    'synthetic_corpus'
+]
@@ -0,0 +1,298 @@
+"""
+Retrieval benchmark harness
+Builds every configured index from one corpus, runs a labelled query set
+through each retriever and fusion configuration and writes a JSON report:
+recall@k, MRR and nDCG (overall and per query type), indexing throughput,
+index size, build peak memory and query latency percentiles. Reports use
+stable keys and rounding so they can be diffed between commits; `compare`
+prints the metric deltas between two reports.
+
+Config (JSON):
+    {
+      "corpus": {"synthetic": {"documents": 2000, "seed": 0}}
+                | {"jsonl": "chunks.jsonl", "queries": "queries.jsonl"},
+      "k": [1, 5, 10],
+      "retrievers": {"bm25": {}, "vector": {"encoder": "hashing", "dimension": 256, "dtype": "int8", "nprobe": 8}},
+      "fusion": [{"name": "rrf", "method": "rrf"}, {"name": "minmax", "method": "minmax", "weights": {"bm25": 2}}]
+    }
+Query files hold one {"query", "type", "relevant": {document_id: grade}} per line.
+
+Usage:
+    python -m src.evaluation.harness run --config data/sample/benchmark.json --output report.json
+    python -m src.evaluation.harness compare base.json report.json
+"""
+import gc
+import sys
+import json
+import time
+import shutil
+import logging
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from .metrics import evaluate, ranked_documents
+from .synthetic import synthetic_corpus
+from ..embeddings.ann_index import DEFAULT_NPROBE, VectorIndex, index_chunks
+from ..embeddings.benchmark import percentiles
+from ..embeddings.encoders import create_encoder
+from ..fusion.engine import FusionEngine
+from ..retrievers.base import Retriever
+from ..retrievers.bm25 import BM25Index
+from ..retrievers.vector import VectorRetriever
+from ..utils.corpus import CorpusChunk, read_jsonl
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = {
+    "corpus": {"synthetic": {"documents": 1000, "seed": 0}},
+    "k": [1, 5, 10],
+    "retrievers": {"bm25": {}, "vector": {"encoder": "hashing", "dimension": 256, "dtype": "float32"}},
+    "fusion": [{"name": "rrf", "method": "rrf"}],
+}
+
+# Evaluation wants every retriever's answer: deadlines far above any query
+EVALUATION_DEADLINE = 60.0
+
+# Chunks fetched per document rank evaluated (several chunks of a judgment often rank together)
+CHUNK_OVERFETCH = 5
+
+
+def load_corpus(config: Dict) -> Tuple[List[CorpusChunk], List[dict], str]:
+    """(chunks, queries, description) from the corpus section of a config"""
+    corpus = config["corpus"]
+    if "synthetic" in corpus:
+        options = corpus["synthetic"]
+        chunks, queries = synthetic_corpus(**options)
+        return chunks, queries, f"synthetic {json.dumps(options, sort_keys=True)}"
+    chunks = list(read_jsonl(corpus["jsonl"]))
+    with open(corpus["queries"], encoding="utf-8") as f:
+        queries = [json.loads(line) for line in f if line.strip()]
+    for query in queries:
+        query["relevant"] = {int(doc): grade for doc, grade in query["relevant"].items()}
+    return chunks, queries, corpus["jsonl"]
+
+
+def directory_bytes(path: Path) -> int:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def measure_build(build: Callable[[], object], chunks: int, path: Path) -> Tuple[object, Dict]:
+    """Run an index build under tracemalloc; returns (its result, build stats)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = build()
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return result, {
+        "chunks": chunks,
+        "build_seconds": round(seconds, 3),
+        "chunks_per_second": round(chunks / seconds, 1) if seconds else None,
+        "bytes": directory_bytes(path),
+        "peak_memory_mb": round(peak / 1e6, 2),
+    }
+
+
+def build_retrievers(config: Dict, chunks: List[CorpusChunk], workdir: Path) -> Tuple[Dict[str, Retriever], Dict]:
+    """Build the configured indexes; returns (retrievers by name, per-index build stats)"""
+    retrievers, indexes = {}, {}
+    settings = config.get("retrievers", {})
+    if "bm25" in settings:
+        options = settings["bm25"]
+        path = workdir / "bm25"
+
+        def build_bm25():
+            index = BM25Index(path, **{key: options[key] for key in ("k1", "b", "segment_size") if key in options})
+            index.add(chunks)
+            if options.get("optimize", True):
+                index.optimize()
+            return index
+
+        retrievers["bm25"], indexes["bm25"] = measure_build(build_bm25, len(chunks), path)
+    if "vector" in settings:
+        options = settings["vector"]
+        path = workdir / "vectors"
+        encoder_options = {"dimension": options["dimension"]} if "dimension" in options else {}
+        encoder = create_encoder(options.get("encoder", "hashing"), **encoder_options)
+
+        def build_vectors():
+            index = VectorIndex(path, dimension=encoder.dimension, dtype=options.get("dtype", "float32"))
+            index_chunks(index, chunks, encoder)
+            index.train()
+            index.compact()
+            return VectorRetriever(index, encoder, options.get("nprobe", DEFAULT_NPROBE))
+
+        retrievers["vector"], indexes["vector"] = measure_build(build_vectors, len(chunks), path)
+        indexes["vector"].update(dtype=options.get("dtype", "float32"), encoder=options.get("encoder", "hashing"))
+    return retrievers, indexes
+
+
+def run_queries(search: Callable[[str, int], List], queries: Sequence[dict], ks: Sequence[int],
+                warmup: int = 5) -> Dict:
+    """Metrics (overall and per query type) and latency percentiles of one system"""
+    depth = max(ks)
+    for query in queries[:warmup]:
+        search(query["query"], depth * CHUNK_OVERFETCH)
+
+    rankings, latencies = [], []
+    for query in queries:
+        start = time.perf_counter()
+        hits = search(query["query"], depth * CHUNK_OVERFETCH)
+        latencies.append((time.perf_counter() - start) * 1000)
+        rankings.append(ranked_documents(hits)[:depth])
+
+    labels = [query["relevant"] for query in queries]
+    by_type = defaultdict(list)
+    for i, query in enumerate(queries):
+        by_type[query.get("type", "other")].append(i)
+    metrics = {"all": evaluate(rankings, labels, ks)}
+    for query_type, members in sorted(by_type.items()):
+        metrics[query_type] = evaluate([rankings[i] for i in members], [labels[i] for i in members], ks)
+    return {"metrics": metrics, "latency_ms": percentiles(latencies)}
+
+
+def fusion_search(engine: FusionEngine) -> Callable[[str, int], List]:
+    return lambda query, k: engine.search(query, k).hits
+
+
+def environment() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine()}
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0.0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1e6 if sys.platform == "darwin" else 1e3), 1)
+
+
+def run_benchmark(config: Dict, workdir: Path = None) -> Dict:
+    """
+    Build, query and report
+
+    Args:
+        config: Benchmark configuration (see module docstring)
+        workdir: Where indexes are built (default: a temporary directory, removed afterwards)
+
+    Returns:
+        The report
+    """
+    ks = sorted(config.get("k", DEFAULT_CONFIG["k"]))
+    chunks, queries, source = load_corpus(config)
+    owned = workdir is None
+    workdir = Path(workdir or tempfile.mkdtemp(prefix="retrieval_bench_"))
+    try:
+        retrievers, indexes = build_retrievers(config, chunks, workdir)
+        systems = {}
+        for name, retriever in retrievers.items():
+            logger.info(f"Querying {name}")
+            systems[name] = run_queries(retriever.search, queries, ks)
+
+        for fusion in config.get("fusion", []):
+            members = [retrievers[name] for name in fusion.get("retrievers", list(retrievers))]
+            engine = FusionEngine(members, method=fusion.get("method", "rrf"), weights=fusion.get("weights"),
+                                  default_deadline=fusion.get("deadline", EVALUATION_DEADLINE),
+                                  depth=fusion.get("depth", 50))
+            try:
+                logger.info(f"Querying fusion:{fusion['name']}")
+                systems[f"fusion:{fusion['name']}"] = run_queries(fusion_search(engine), queries, ks)
+            finally:
+                engine.close()
+    finally:
+        if owned:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "corpus": {
+            "source": source,
+            "documents": len({chunk.document_id for chunk in chunks}),
+            "chunks": len(chunks),
+            "queries": dict(sorted(Counter(query.get("type", "other") for query in queries).items())),
+        },
+        "k": ks,
+        "indexes": indexes,
+        "systems": systems,
+        "environment": environment(),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def compare(base: Dict, current: Dict) -> List[str]:
+    """Lines describing metric and latency changes from base to current"""
+    lines = []
+    for system, result in current["systems"].items():
+        before = base["systems"].get(system)
+        if before is None:
+            lines.append(f"{system}: new")
+            continue
+        for metric, value in result["metrics"]["all"].items():
+            old = before["metrics"]["all"].get(metric)
+            if metric != "queries" and old is not None and value != old:
+                lines.append(f"{system} {metric}: {old:.4f} -> {value:.4f} ({value - old:+.4f})")
+        for percentile, value in result["latency_ms"].items():
+            old = before["latency_ms"][percentile]
+            lines.append(f"{system} {percentile} ms: {old:.2f} -> {value:.2f} ({(value - old) / old * 100 if old else 0:+.0f}%)")
+    for name, stats in current["indexes"].items():
+        old = base["indexes"].get(name)
+        if old:
+            lines.append(f"index {name} MB: {old['bytes'] / 1e6:.1f} -> {stats['bytes'] / 1e6:.1f}, "
+                         f"chunks/s: {old['chunks_per_second']} -> {stats['chunks_per_second']}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark retrieval quality and performance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    run = commands.add_parser("run", help="Build indexes, run the query set, write a report")
+    run.add_argument("--config", help="Benchmark config (default: 1000 synthetic documents, BM25 + vector + RRF)")
+    run.add_argument("--output", default="benchmark_report.json")
+    run.add_argument("--workdir", help="Keep indexes here instead of a temporary directory")
+    diff = commands.add_parser("compare", help="Show changes between two reports")
+    diff.add_argument("base")
+    diff.add_argument("current")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "compare":
+        with open(args.base) as f, open(args.current) as g:
+            print("\n".join(compare(json.load(f), json.load(g))))
+        return
+
+    config = DEFAULT_CONFIG
+    if args.config:
+        with open(args.config) as f:
+            config = json.load(f)
+    report = run_benchmark(config, args.workdir)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+    ks = report["k"]
+    print(f"\n{'system':<22} {'recall@' + str(ks[-1]):>10} {'mrr':>7} {'ndcg@' + str(ks[-1]):>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for name, result in report["systems"].items():
+        metrics = result["metrics"]["all"]
+        print(f"{name:<22} {metrics[f'recall@{ks[-1]}']:>10.3f} {metrics['mrr']:>7.3f} "
+              f"{metrics[f'ndcg@{ks[-1]}']:>8.3f} {result['latency_ms']['p50']:>8.2f} {result['latency_ms']['p99']:>8.2f}")
+    print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
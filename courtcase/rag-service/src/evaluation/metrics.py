@@ -0,0 +1,59 @@
+"""
+Ranking metrics over graded relevance labels
+Relevance is a mapping of document ID -> grade (1 relevant, 2 the answer);
+rankings are document IDs best first, with chunk hits already collapsed to
+their documents.
+"""
+import math
+from typing import Dict, Iterable, List, Sequence
+
+from ..utils.hits import SearchHit
+
+
+def ranked_documents(hits: Iterable[SearchHit]) -> List[int]:
+    """Document IDs in rank order, each once (hits without a document are skipped)"""
+    seen, ranking = set(), []
+    for hit in hits:
+        if hit.document_id is not None and hit.document_id not in seen:
+            seen.add(hit.document_id)
+            ranking.append(hit.document_id)
+    return ranking
+
+
+def recall_at_k(ranking: Sequence[int], relevant: Dict[int, int], k: int) -> float:
+    if not relevant:
+        return 0.0
+    return sum(1 for doc in ranking[:k] if relevant.get(doc, 0) > 0) / len(relevant)
+
+
+def reciprocal_rank(ranking: Sequence[int], relevant: Dict[int, int], k: int) -> float:
+    for rank, doc in enumerate(ranking[:k], 1):
+        if relevant.get(doc, 0) > 0:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranking: Sequence[int], relevant: Dict[int, int], k: int) -> float:
+    """nDCG@k with exponential gains (2^grade - 1)"""
+    dcg = sum((2 ** relevant.get(doc, 0) - 1) / math.log2(rank + 1) for rank, doc in enumerate(ranking[:k], 1))
+    ideal = sorted(relevant.values(), reverse=True)[:k]
+    idcg = sum((2 ** grade - 1) / math.log2(rank + 1) for rank, grade in enumerate(ideal, 1))
+    return dcg / idcg if idcg else 0.0
+
+
+def evaluate(rankings: Sequence[Sequence[int]], labels: Sequence[Dict[int, int]], ks: Sequence[int]) -> Dict[str, float]:
+    """
+    Mean recall@k and nDCG@k for every k, and MRR at the largest k
+
+    Args:
+        rankings: One document ranking per query
+        labels: One relevance mapping per query
+        ks: Cutoffs
+    """
+    n = len(rankings) or 1
+    depth = max(ks)
+    metrics = {"queries": len(rankings), "mrr": sum(reciprocal_rank(r, l, depth) for r, l in zip(rankings, labels)) / n}
+    for k in ks:
+        metrics[f"recall@{k}"] = sum(recall_at_k(r, l, k) for r, l in zip(rankings, labels)) / n
+        metrics[f"ndcg@{k}"] = sum(ndcg_at_k(r, l, k) for r, l in zip(rankings, labels)) / n
+    return {name: value if name == "queries" else round(value, 4) for name, value in metrics.items()}
@@ -0,0 +1,129 @@
+"""
+Synthetic labelled legal corpus
+Generates judgments (as chunks) with law report citations, statute sections,
+citations between cases and distinctive fact patterns, together with the
+three query types the benchmark labels: citation lookup ("58 DLR 211"),
+section lookup ("section 302 Penal Code murder") and fact pattern (a
+paraphrase of one judgment's facts). Deterministic for a given seed, so
+reports from different commits are comparable.
+"""
+import random
+from typing import List, Tuple
+
+from ..utils.corpus import CorpusChunk
+
+# topic -> (statute, sections, fact vocabulary)
+TOPICS = {
+    "murder": ("Penal Code", ["302", "304", "34"],
+               "deceased stabbed knife injuries post-mortem eyewitness homicide inquest blood weapon"),
+    "bail": ("CrPC", ["497", "498", "439"],
+             "bail custody accused surety bond anticipatory detention remand investigation chargesheet"),
+    "land": ("State Acquisition and Tenancy Act", ["96", "117", "143"],
+             "pre-emption khatian mutation plot homestead tenancy purchase deed raiyat record"),
+    "dowry": ("Dowry Prohibition Act", ["4", "11"],
+              "dowry wife husband demand torture harassment marriage cruelty in-laws suicide"),
+    "writ": ("Constitution", ["102", "44"],
+             "writ petitioner respondent government notification arbitrary fundamental rights mandamus certiorari"),
+    "contract": ("Specific Relief Act", ["12", "21", "42"],
+                 "agreement sale earnest money specific performance vendor purchaser registration breach"),
+    "narcotics": ("Narcotics Control Act", ["19", "23"],
+                  "heroin seizure recovery yaba tablets raid search witnesses chemical examiner"),
+    "service": ("Service Rules", ["7", "10"],
+                "dismissal service employee inquiry disciplinary pension promotion seniority tribunal"),
+}
+
+FILLER = ("the court considered the submissions of the learned advocates and the materials on record "
+          "held that the findings below are not sustainable in law appeal allowed rule made absolute "
+          "judgment and order set aside costs no order as to costs").split()
+
+NAMES = ("Rahim Karim Hossain Begum Akter Chowdhury Uddin Islam Rahman Sarkar Mia Khatun Haque Alam "
+         "Talukder Mondal Sheikh Biswas Das Roy").split()
+PLACES = ("Dhaka Chittagong Khulna Rajshahi Sylhet Barisal Rangpur Mymensingh Comilla Bogra Jessore "
+          "Noakhali Pabna Tangail Faridpur Dinajpur").split()
+REPORTERS = ("DLR", "BLD", "BLC", "MLR", "ADC", "BLT")
+DIVISIONS = ("AD", "HCD")
+
+
+def _citation(rng: random.Random, used: set) -> str:
+    while True:
+        citation = f"{rng.randint(40, 75)} {rng.choice(REPORTERS)} ({rng.choice(DIVISIONS)}) {rng.randint(1, 600)}"
+        if citation not in used:
+            used.add(citation)
+            return citation
+
+
+def synthetic_corpus(documents: int = 1000, seed: int = 0, chunks_per_document: Tuple[int, int] = (3, 8),
+                     queries_per_type: int = 100) -> Tuple[List[CorpusChunk], List[dict]]:
+    """
+    Chunks and labelled queries
+
+    Args:
+        documents: Judgments to generate
+        seed: Random seed
+        chunks_per_document: (min, max) chunks per judgment
+        queries_per_type: Queries of each type (citation, section, fact)
+
+    Returns:
+        (chunks, queries); each query is {"query", "type", "relevant": {document_id: grade}}
+    """
+    rng = random.Random(seed)
+    used: set = set()
+    docs = []
+    for document_id in range(1, documents + 1):
+        topic = rng.choice(list(TOPICS))
+        statute, sections, vocabulary = TOPICS[topic]
+        docs.append({
+            "id": document_id,
+            "topic": topic,
+            "statute": statute,
+            "sections": rng.sample(sections, rng.randint(1, len(sections))),
+            "citation": _citation(rng, used),
+            "facts": rng.sample(vocabulary.split(), 5) + [rng.choice(NAMES), rng.choice(NAMES), rng.choice(PLACES)],
+            "court": rng.choice(DIVISIONS),
+            "year": rng.randint(1985, 2024),
+            "cites": [],
+        })
+    for doc in docs:
+        earlier = [other for other in docs[:doc["id"] - 1] if other["topic"] == doc["topic"]]
+        doc["cites"] = [other["id"] for other in rng.sample(earlier, min(len(earlier), rng.randint(0, 3)))]
+
+    chunks, chunk_id = [], 0
+    for doc in docs:
+        count = rng.randint(*chunks_per_document)
+        for index in range(count):
+            words = rng.sample(TOPICS[doc["topic"]][2].split(), 4) + rng.sample(FILLER, 12)
+            if index == 0:
+                words = [f"{doc['citation']}", doc["facts"][5], "v", doc["facts"][6], doc["facts"][7]] + words
+            if index == 1 or rng.random() < 0.3:
+                section = rng.choice(doc["sections"])
+                words += ["under", "section", section, "of", "the", doc["statute"]]
+            if index == count - 1:
+                words += doc["facts"][:5]
+                for cited in doc["cites"]:
+                    words += ["relied", "on", docs[cited - 1]["citation"]]
+            chunk_id += 1
+            chunks.append(CorpusChunk(chunk_id, doc["id"], " ".join(words), {
+                "court": doc["court"], "year": doc["year"], "country_code": "BD", "chunk_index": index,
+            }))
+
+    queries = []
+    for doc in rng.sample(docs, min(queries_per_type, len(docs))):
+        relevant = {doc["id"]: 2}
+        relevant.update({other["id"]: 1 for other in docs if doc["id"] in other["cites"]})
+        queries.append({"query": doc["citation"], "type": "citation", "relevant": relevant})
+
+    for doc in rng.sample(docs, min(queries_per_type, len(docs))):
+        section = rng.choice(doc["sections"])
+        word = rng.choice(doc["facts"][:5])
+        relevant = {
+            other["id"]: 1 for other in docs
+            if other["statute"] == doc["statute"] and section in other["sections"] and word in other["facts"]
+        }
+        queries.append({"query": f"{word} section {section} {doc['statute']}", "type": "section",
+                        "relevant": relevant})
+
+    for doc in rng.sample(docs, min(queries_per_type, len(docs))):
+        facts = rng.sample(doc["facts"][:5], 3) + [doc["facts"][7], doc["facts"][5]]
+        rng.shuffle(facts)
+        queries.append({"query": " ".join(facts), "type": "fact", "relevant": {doc["id"]: 2}})
+    return chunks, queries
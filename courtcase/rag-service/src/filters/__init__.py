@@ -0,0 +1,12 @@
+"""
+Metadata filters: facet posting sets composed into document masks
+"""
+from .bitmaps import FACETS, DocumentFilter, FacetIndex, allowed_rows, document_allowed
+
+__all__ = [
+    'FACETS',
+    'DocumentFilter',
+    'FacetIndex',
+    'allowed_rows',
+    'document_allowed'
+]
@@ -0,0 +1,417 @@
+"""
+Facet posting sets for metadata-filtered retrieval
+For every value of the facets lawyers filter on (court, year, jurisdiction,
+subject_primary, legal_status) the index keeps the sorted IDs of the
+`documents` rows carrying it, as uint32 arrays in CSR layout (the array
+containers of a roaring bitmap). A DocumentFilter is evaluated with set
+algebra - union within a facet, intersection across facets, difference for
+exclusions - into a boolean mask indexed by document ID. The retrievers
+test candidates against that mask while scoring (BM25 postings, ANN rows),
+so a filtered query touches no more data than an unfiltered one. Masks of
+recent filters are cached, and facet counts are one gather per facet.
+
+Usage:
+    python -m src.filters.bitmaps build --dsn postgresql://... --index data/index/facets
+    python -m src.filters.bitmaps counts --index data/index/facets --court "High Court Division"
+"""
+import json
+import logging
+import argparse
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+FACETS = ("court", "year", "jurisdiction", "subject_primary", "legal_status")
+
+FACETS_QUERY = """
+    SELECT id, metadata->>'court', doc_year, country_code, subject_primary, legal_status
+    FROM documents
+    ORDER BY id
+"""
+
+MASK_CACHE_SIZE = 256
+
+META = "facets.json"
+
+
+def allowed_rows(mask: np.ndarray, document_ids: np.ndarray) -> np.ndarray:
+    """Which of document_ids a document mask allows (IDs outside it, and missing IDs, are not)"""
+    document_ids = np.asarray(document_ids)
+    inside = (document_ids >= 0) & (document_ids < len(mask))
+    allowed = np.zeros(len(document_ids), dtype=bool)
+    allowed[inside] = mask[document_ids[inside]]
+    return allowed
+
+
+def document_allowed(mask: np.ndarray, document_id: Optional[int]) -> bool:
+    return document_id is not None and 0 <= document_id < len(mask) and bool(mask[document_id])
+
+
+def _key(value) -> Optional[str]:
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value.casefold() if value else None
+
+
+@dataclass
+class DocumentFilter:
+    """
+    Facet restrictions: any of the listed values within a facet, every facet
+    given, none of the excluded values
+    """
+    court: List[str] = field(default_factory=list)
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    jurisdiction: List[str] = field(default_factory=list)
+    subject_primary: List[str] = field(default_factory=list)
+    legal_status: List[str] = field(default_factory=list)
+    exclude: Dict[str, List[str]] = field(default_factory=dict)
+
+    @classmethod
+    def from_dict(cls, params: Optional[Dict]) -> "DocumentFilter":
+        """
+        Parse request filters ({"court": [...], "year_from": 1990, "exclude": {"legal_status": [...]}})
+
+        Raises:
+            ValueError: On unknown facets or malformed values
+        """
+        params = dict(params or {})
+        unknown = set(params) - {"court", "year_from", "year_to", "jurisdiction", "subject_primary",
+                                 "legal_status", "exclude"}
+        if unknown:
+            raise ValueError(f"Unknown filters: {', '.join(sorted(unknown))}")
+
+        def values(name, value):
+            if value is None:
+                return []
+            if isinstance(value, (str, int)):
+                value = [value]
+            if not isinstance(value, (list, tuple)) or not all(isinstance(v, (str, int)) for v in value):
+                raise ValueError(f"{name} must be a value or a list of values")
+            return [str(v) for v in value]
+
+        def year(name):
+            value = params.get(name)
+            if value is None or value == "":
+                return None
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                raise ValueError(f"{name} must be a year")
+
+        exclude = params.get("exclude") or {}
+        excludable = [facet for facet in FACETS if facet != "year"]
+        if not isinstance(exclude, dict) or set(exclude) - set(excludable):
+            raise ValueError(f"exclude must map facets ({', '.join(excludable)}) to values")
+        return cls(
+            court=values("court", params.get("court")),
+            year_from=year("year_from"),
+            year_to=year("year_to"),
+            jurisdiction=values("jurisdiction", params.get("jurisdiction")),
+            subject_primary=values("subject_primary", params.get("subject_primary")),
+            legal_status=values("legal_status", params.get("legal_status")),
+            exclude={facet: values(facet, v) for facet, v in exclude.items() if v},
+        )
+
+    def clauses(self) -> Dict[str, Tuple]:
+        """Facet -> restriction, for the facets this filter restricts"""
+        clauses = {facet: tuple(getattr(self, facet)) for facet in FACETS if facet != "year" and getattr(self, facet)}
+        if self.year_from is not None or self.year_to is not None:
+            clauses["year"] = (self.year_from, self.year_to)
+        return clauses
+
+    def is_empty(self) -> bool:
+        return not self.clauses() and not any(self.exclude.values())
+
+    def to_dict(self) -> Dict:
+        """Canonical form, for cache keys and responses"""
+        params = {facet: sorted(getattr(self, facet)) for facet in FACETS if facet != "year" and getattr(self, facet)}
+        for name in ("year_from", "year_to"):
+            if getattr(self, name) is not None:
+                params[name] = getattr(self, name)
+        if self.exclude:
+            params["exclude"] = {facet: sorted(values) for facet, values in sorted(self.exclude.items()) if values}
+        return params
+
+    def key(self) -> str:
+        """Case-insensitive identity of the filter"""
+        params = self.to_dict()
+        for name, value in params.items():
+            if isinstance(value, list):
+                params[name] = sorted(_key(v) for v in value)
+        if "exclude" in params:
+            params["exclude"] = {facet: sorted(_key(v) for v in values) for facet, values in params["exclude"].items()}
+        return json.dumps(params, sort_keys=True)
+
+
+class FacetIndex:
+    """Per-facet posting sets over document IDs"""
+
+    def __init__(self, values: Dict[str, List[str]], indptr: Dict[str, np.ndarray], ids: Dict[str, np.ndarray],
+                 documents: np.ndarray, meta: Optional[Dict] = None, cache_size: int = MASK_CACHE_SIZE):
+        """
+        Args:
+            values: Facet -> display values
+            indptr: Facet -> posting boundaries (len(values) + 1)
+            ids: Facet -> concatenated sorted posting arrays (uint32)
+            documents: Every indexed document ID, sorted
+            meta: Build information
+            cache_size: Filter masks kept (least recently used dropped)
+        """
+        self.values = values
+        self.indptr = indptr
+        self.ids = ids
+        self.documents = documents
+        self.meta = meta or {}
+        self.size = int(documents[-1]) + 1 if len(documents) else 0
+        self._lookup = {facet: {_key(v): i for i, v in enumerate(vals)} for facet, vals in values.items()}
+        self._universe = np.zeros(self.size, dtype=bool)
+        self._universe[documents] = True
+        self._universe.setflags(write=False)
+        self._masks: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.counts = {"hits": 0, "misses": 0}
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    @classmethod
+    def build(cls, rows: Iterable[Sequence]) -> "FacetIndex":
+        """
+        Build from (document_id, court, year, jurisdiction, subject_primary, legal_status) rows
+
+        Values are matched case-insensitively; the first spelling seen is kept.
+        """
+        postings = {facet: {} for facet in FACETS}
+        spellings = {facet: {} for facet in FACETS}
+        documents = []
+        for row in rows:
+            document_id = int(row[0])
+            documents.append(document_id)
+            for facet, value in zip(FACETS, row[1:]):
+                if facet == "year" and not value:
+                    continue  # unknown year (NULL or 0)
+                key = _key(value)
+                if key is not None:
+                    spellings[facet].setdefault(key, str(value).strip())
+                    postings[facet].setdefault(key, []).append(document_id)
+
+        values, indptr, ids = {}, {}, {}
+        for facet in FACETS:
+            keys = sorted(postings[facet], key=lambda k: int(k) if facet == "year" else k)
+            values[facet] = [spellings[facet][key] for key in keys]
+            lists = [np.unique(np.asarray(postings[facet][key], dtype=np.uint32)) for key in keys]
+            indptr[facet] = np.zeros(len(lists) + 1, dtype=np.int64)
+            np.cumsum([len(ids_) for ids_ in lists], out=indptr[facet][1:])
+            ids[facet] = np.concatenate(lists) if lists else np.zeros(0, dtype=np.uint32)
+        documents = np.unique(np.asarray(documents, dtype=np.uint32))
+        meta = {"documents": len(documents), "values": {facet: len(values[facet]) for facet in FACETS},
+                "built_at": datetime.now().isoformat()}
+        return cls(values, indptr, ids, documents, meta)
+
+    @classmethod
+    def from_database(cls, dsn: str, batch_size: int = 50_000) -> "FacetIndex":
+        """Build from the `documents` table"""
+        try:
+            import psycopg2
+        except ImportError:
+            raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+        conn = psycopg2.connect(dsn)
+        try:
+            with conn.cursor(name="rag_facets") as cursor:
+                cursor.itersize = batch_size
+                cursor.execute(FACETS_QUERY)
+                index = cls.build(cursor)
+        finally:
+            conn.close()
+        logger.info(f"Built facet index over {len(index)} documents")
+        return index
+
+    # Persistence
+
+    def save(self, path):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for facet in FACETS:
+            np.save(path / f"{facet}_indptr.npy", self.indptr[facet])
+            np.save(path / f"{facet}_ids.npy", self.ids[facet])
+        np.save(path / "documents.npy", self.documents)
+        with open(path / META, "w", encoding="utf-8") as f:
+            json.dump({"values": self.values, "meta": self.meta}, f, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path, **kwargs) -> "FacetIndex":
+        """Open a saved index; posting arrays are memory-mapped"""
+        path = Path(path)
+        with open(path / META, encoding="utf-8") as f:
+            saved = json.load(f)
+        indptr = {facet: np.load(path / f"{facet}_indptr.npy") for facet in FACETS}
+        ids = {facet: np.load(path / f"{facet}_ids.npy", mmap_mode="r") for facet in FACETS}
+        return cls(saved["values"], indptr, ids, np.load(path / "documents.npy"), saved["meta"], **kwargs)
+
+    # Set algebra
+
+    def postings(self, facet: str, value: str) -> np.ndarray:
+        """Sorted document IDs with a facet value"""
+        row = self._lookup[facet].get(_key(value))
+        if row is None:
+            return np.zeros(0, dtype=np.uint32)
+        return self.ids[facet][self.indptr[facet][row]:self.indptr[facet][row + 1]]
+
+    def _rows(self, facet: str, clause: Tuple) -> List[int]:
+        if facet == "year":
+            low, high = clause
+            return [row for row, value in enumerate(self.values["year"])
+                    if (low is None or int(value) >= low) and (high is None or int(value) <= high)]
+        lookup = self._lookup[facet]
+        return [lookup[_key(value)] for value in clause if _key(value) in lookup]
+
+    def union(self, facet: str, clause: Tuple) -> np.ndarray:
+        """Mask of the documents matching any value of a clause (a value list, or (from, to) years)"""
+        mask = np.zeros(self.size, dtype=bool)
+        indptr, ids = self.indptr[facet], self.ids[facet]
+        for row in self._rows(facet, clause):
+            mask[ids[indptr[row]:indptr[row + 1]]] = True
+        return mask
+
+    def _clause_masks(self, document_filter: DocumentFilter) -> Dict[str, np.ndarray]:
+        return {facet: self.union(facet, clause) for facet, clause in document_filter.clauses().items()}
+
+    def _excluded(self, document_filter: DocumentFilter) -> Optional[np.ndarray]:
+        excluded = None
+        for facet, values in document_filter.exclude.items():
+            if values:
+                mask = self.union(facet, tuple(values))
+                excluded = mask if excluded is None else excluded | mask
+        return excluded
+
+    def mask(self, document_filter: Optional[DocumentFilter]) -> Optional[np.ndarray]:
+        """
+        Read-only boolean mask over document IDs of the documents a filter allows
+
+        Returns:
+            The mask, or None for an empty filter (everything allowed)
+        """
+        if document_filter is None or document_filter.is_empty():
+            return None
+        key = document_filter.key()
+        with self._lock:
+            cached = self._masks.get(key)
+            if cached is not None:
+                self._masks.move_to_end(key)
+                self.counts["hits"] += 1
+                return cached
+
+        mask = self._universe.copy()
+        for clause in self._clause_masks(document_filter).values():
+            mask &= clause
+        excluded = self._excluded(document_filter)
+        if excluded is not None:
+            mask &= ~excluded
+        mask.setflags(write=False)
+        with self._lock:
+            self.counts["misses"] += 1
+            self._masks[key] = mask
+            while len(self._masks) > self._cache_size:
+                self._masks.popitem(last=False)
+        return mask
+
+    # Facet counts
+
+    def facet_counts(self, document_filter: Optional[DocumentFilter] = None,
+                     limit: Optional[int] = None) -> Dict[str, Dict[str, int]]:
+        """
+        Documents per facet value under a filter
+
+        Counts for a facet ignore that facet's own clause (the other values of
+        a filtered facet still show how many documents selecting them adds).
+
+        Args:
+            document_filter: Current filter (None: whole corpus)
+            limit: Most frequent values returned per facet (years are all kept)
+
+        Returns:
+            Facet -> {value: count}, non-zero counts, most frequent first (years in order)
+        """
+        document_filter = document_filter or DocumentFilter()
+        clauses = self._clause_masks(document_filter)
+        excluded = self._excluded(document_filter)
+        full = None
+        if clauses or excluded is not None:
+            full = self._universe.copy() if excluded is None else self._universe & ~excluded
+            for clause in clauses.values():
+                full &= clause
+
+        counts = {}
+        for facet in FACETS:
+            indptr = self.indptr[facet]
+            if full is None:
+                totals = np.diff(indptr)  # unfiltered: posting lengths
+            else:
+                allowed = full
+                if facet in clauses:  # widen back over the facet's own clause
+                    allowed = self._universe.copy() if excluded is None else self._universe & ~excluded
+                    for other, clause in clauses.items():
+                        if other != facet:
+                            allowed &= clause
+                running = np.concatenate(([0], np.cumsum(allowed[self.ids[facet]], dtype=np.int64)))
+                totals = running[indptr[1:]] - running[indptr[:-1]]
+            rows = np.flatnonzero(totals)
+            if facet != "year":
+                rows = rows[np.argsort(-totals[rows], kind="stable")][:limit]
+            counts[facet] = {self.values[facet][row]: int(totals[row]) for row in rows}
+        return counts
+
+    def stats(self) -> Dict:
+        return {**self.meta, "cached_masks": len(self._masks), **self.counts,
+                "bytes": sum(self.ids[f].nbytes + self.indptr[f].nbytes for f in FACETS) + self.documents.nbytes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the facet filter index")
+    commands = parser.add_subparsers(dest="command", required=True)
+    build = commands.add_parser("build", help="Build from the documents table")
+    build.add_argument("--dsn", required=True, help="PostgreSQL connection string")
+    build.add_argument("--index", required=True, help="Output directory")
+    counts = commands.add_parser("counts", help="Facet counts under a filter")
+    counts.add_argument("--index", required=True)
+    counts.add_argument("--court", action="append")
+    counts.add_argument("--year-from", type=int)
+    counts.add_argument("--year-to", type=int)
+    counts.add_argument("--jurisdiction", action="append")
+    counts.add_argument("--subject", action="append")
+    counts.add_argument("--status", action="append")
+    counts.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "build":
+        index = FacetIndex.from_database(args.dsn)
+        index.save(args.index)
+        print(json.dumps(index.stats(), indent=2))
+        return
+
+    index = FacetIndex.load(args.index)
+    document_filter = DocumentFilter(court=args.court or [], year_from=args.year_from, year_to=args.year_to,
+                                     jurisdiction=args.jurisdiction or [], subject_primary=args.subject or [],
+                                     legal_status=args.status or [])
+    mask = index.mask(document_filter)
+    print(f"Documents: {len(index) if mask is None else int(mask.sum())}")
+    for facet, values in index.facet_counts(document_filter, args.limit).items():
+        print(f"\n{facet}")
+        for value, count in values.items():
+            print(f"  {value:<40} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
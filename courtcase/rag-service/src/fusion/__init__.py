@@ -0,0 +1,12 @@
+"""
+Hybrid retrieval: concurrent retrievers merged by rank fusion
+"""
+from .engine import FusedHit, FusionEngine, FusionResult, RetrieverReport, fuse
+
+__all__ = [
+    'FusedHit',
+    'FusionEngine',
+    'FusionResult',
+    'RetrieverReport',
+    'fuse'
+]
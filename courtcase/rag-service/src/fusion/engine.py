@@ -0,0 +1,260 @@
+"""
+Hybrid retrieval: concurrent retrievers merged by rank fusion
+Every retriever (BM25, vector, citation graph) runs on a shared thread pool
+with its own deadline. A fused ranking is produced each time one finishes,
+so callers can show keyword hits while the graph hop is still running, and a
+retriever that misses its deadline is left out rather than delaying the
+answer. Chunks of the same document are merged into one result.
+
+Usage:
+    engine = FusionEngine([bm25, vector, graph], deadlines={"graph": 0.15})
+    for result in engine.stream("bail under s.497 CrPC 58 DLR 211", k=10):
+        render(result.hits)            # progressively better rankings
+    print(result.reports)              # latency / status / contribution per retriever
+"""
+import time
+import logging
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..retrievers.base import Retriever
+from ..utils.hits import SearchHit
+
+logger = logging.getLogger(__name__)
+
+RRF_K = 60
+DEFAULT_DEADLINE = 0.5
+DEFAULT_DEPTH = 50
+METHODS = ("rrf", "minmax")
+
+
+@dataclass
+class FusedHit:
+    """A fused result; sources holds each retriever's share of the score"""
+    chunk_id: Optional[int]
+    document_id: Optional[int]
+    score: float
+    sources: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class RetrieverReport:
+    """How one retriever fared on one query"""
+    name: str
+    status: str = "pending"  # pending | ok | timeout | error
+    latency_ms: Optional[float] = None
+    hits: int = 0
+    contributed: int = 0  # final results it contributed to
+    share: float = 0.0  # fraction of the final results' total score
+    error: Optional[str] = None
+
+
+@dataclass
+class FusionResult:
+    hits: List[FusedHit]
+    reports: Dict[str, RetrieverReport]
+    complete: bool
+    elapsed_ms: float
+
+
+def _key(hit: SearchHit, by_document: bool) -> Tuple[str, int]:
+    if hit.document_id is not None and (by_document or hit.chunk_id is None):
+        return ("document", hit.document_id)
+    return ("chunk", hit.chunk_id)
+
+
+def _rank_parts(hits: Sequence[SearchHit], by_document: bool, weight: float, rrf_k: int) -> Dict[tuple, float]:
+    """weight / (rrf_k + rank), ranking each key at its best hit"""
+    parts = {}
+    for hit in hits:
+        key = _key(hit, by_document)
+        if key not in parts:
+            parts[key] = weight / (rrf_k + len(parts) + 1)
+    return parts
+
+
+def _score_parts(hits: Sequence[SearchHit], by_document: bool, weight: float) -> Dict[tuple, float]:
+    """weight * min-max normalized score, keeping each key's best hit"""
+    if not hits:
+        return {}
+    scores = [hit.score for hit in hits]
+    low, spread = min(scores), max(scores) - min(scores)
+    parts = {}
+    for hit in hits:
+        key = _key(hit, by_document)
+        part = weight * ((hit.score - low) / spread if spread > 0 else 1.0)
+        parts[key] = max(parts.get(key, 0.0), part)
+    return parts
+
+
+def fuse(
+    results: Dict[str, Sequence[SearchHit]],
+    k: int = 10,
+    method: str = "rrf",
+    weights: Optional[Dict[str, float]] = None,
+    rrf_k: int = RRF_K,
+    by_document: bool = True
+) -> List[FusedHit]:
+    """
+    Merge ranked lists from several retrievers
+
+    Args:
+        results: Retriever name -> its hits, best first
+        k: Results to return
+        method: "rrf" (reciprocal rank fusion) or "minmax" (weighted sum of
+            per-retriever min-max normalized scores)
+        weights: Retriever name -> weight (default 1.0)
+        rrf_k: RRF rank offset
+        by_document: One result per document, represented by its best chunk
+
+    Returns:
+        Top-k fused hits, best first
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown fusion method {method!r}, expected one of {METHODS}")
+    weights = weights or {}
+
+    totals: Dict[tuple, Dict[str, float]] = defaultdict(dict)
+    representative: Dict[tuple, Tuple[float, SearchHit]] = {}
+    for name, hits in results.items():
+        weight = weights.get(name, 1.0)
+        if method == "rrf":
+            parts = _rank_parts(hits, by_document, weight, rrf_k)
+        else:
+            parts = _score_parts(hits, by_document, weight)
+        for key, part in parts.items():
+            totals[key][name] = part
+        for hit in hits:
+            key = _key(hit, by_document)
+            if hit.chunk_id is not None and parts[key] > representative.get(key, (-1.0, None))[0]:
+                representative[key] = (parts[key], hit)
+
+    ranked = sorted(totals.items(), key=lambda item: (-sum(item[1].values()), item[0]))[:k]
+    fused = []
+    for key, sources in ranked:
+        hit = representative.get(key, (None, None))[1]
+        chunk_id = hit.chunk_id if hit else None
+        document_id = key[1] if key[0] == "document" else (hit.document_id if hit else None)
+        fused.append(FusedHit(chunk_id, document_id, sum(sources.values()), dict(sources)))
+    return fused
+
+
+class FusionEngine:
+    """Runs retrievers concurrently under deadlines and fuses their rankings"""
+
+    def __init__(
+        self,
+        retrievers: Sequence[Retriever],
+        method: str = "rrf",
+        weights: Optional[Dict[str, float]] = None,
+        deadlines: Optional[Dict[str, float]] = None,
+        default_deadline: float = DEFAULT_DEADLINE,
+        depth: int = DEFAULT_DEPTH,
+        rrf_k: int = RRF_K,
+        by_document: bool = True,
+        max_workers: Optional[int] = None
+    ):
+        """
+        Args:
+            retrievers: Retrievers with distinct names
+            method: "rrf" or "minmax" (see fuse)
+            weights: Retriever name -> fusion weight
+            deadlines: Retriever name -> seconds allowed per query
+            default_deadline: Deadline for retrievers not in deadlines
+            depth: Hits requested from each retriever
+            rrf_k: RRF rank offset
+            by_document: Merge chunks of the same document
+            max_workers: Thread pool size (default: 4 queries in flight)
+        """
+        if method not in METHODS:
+            raise ValueError(f"Unknown fusion method {method!r}, expected one of {METHODS}")
+        self.retrievers = {retriever.name: retriever for retriever in retrievers}
+        if not retrievers or len(self.retrievers) != len(retrievers):
+            raise ValueError("Need at least one retriever, with distinct names")
+        self.method = method
+        self.weights = dict(weights or {})
+        self.deadlines = {name: (deadlines or {}).get(name, default_deadline) for name in self.retrievers}
+        self.depth = depth
+        self.rrf_k = rrf_k
+        self.by_document = by_document
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers or 4 * len(self.retrievers), thread_name_prefix="fusion"
+        )
+
+    @staticmethod
+    def _timed(retriever: Retriever, query: str, depth: int,
+               allowed: Optional[np.ndarray]) -> Tuple[List[SearchHit], float]:
+        start = time.perf_counter()
+        hits = retriever.search(query, depth) if allowed is None else retriever.search_filtered(query, depth, allowed)
+        return hits, (time.perf_counter() - start) * 1000
+
+    def _result(self, results, reports, k, complete, start) -> FusionResult:
+        hits = fuse(results, k, self.method, self.weights, self.rrf_k, self.by_document)
+        total = sum(hit.score for hit in hits) or 1.0
+        for name, report in reports.items():
+            report.contributed = sum(1 for hit in hits if name in hit.sources)
+            report.share = round(sum(hit.sources.get(name, 0.0) for hit in hits) / total, 4)
+        snapshot = {name: RetrieverReport(**vars(report)) for name, report in reports.items()}
+        return FusionResult(hits, snapshot, complete, (time.perf_counter() - start) * 1000)
+
+    def stream(self, query: str, k: int = 10, allowed: Optional[np.ndarray] = None) -> Iterator[FusionResult]:
+        """
+        Fused rankings as retrievers finish
+
+        Yields a new FusionResult each time a retriever completes, fails or
+        misses its deadline; the last one has complete=True. Retrievers that
+        miss their deadline keep running in the background but are ignored.
+        With an allowed document mask (FacetIndex.mask) every retriever
+        searches only the documents it admits.
+        """
+        start = time.perf_counter()
+        reports = {name: RetrieverReport(name) for name in self.retrievers}
+        results: Dict[str, List[SearchHit]] = {}
+        futures: Dict[Future, str] = {
+            self._executor.submit(self._timed, retriever, query, self.depth, allowed): name
+            for name, retriever in self.retrievers.items()
+        }
+        pending = set(futures)
+
+        while pending:
+            elapsed = time.perf_counter() - start
+            timeout = max(0.0, min(self.deadlines[futures[future]] for future in pending) - elapsed)
+            done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                report = reports[futures[future]]
+                try:
+                    hits, report.latency_ms = future.result()
+                except Exception as e:
+                    logger.warning(f"Retriever {report.name} failed: {e}")
+                    report.status, report.error = "error", str(e)
+                    report.latency_ms = (time.perf_counter() - start) * 1000
+                    continue
+                results[report.name] = hits
+                report.status, report.hits = "ok", len(hits)
+
+            elapsed = time.perf_counter() - start
+            expired = {future for future in pending if elapsed >= self.deadlines[futures[future]]}
+            for future in expired:
+                future.cancel()
+                report = reports[futures[future]]
+                report.status, report.latency_ms = "timeout", elapsed * 1000
+                logger.info(f"Retriever {report.name} missed its {self.deadlines[report.name] * 1000:.0f} ms deadline")
+            pending -= expired
+
+            if done or expired:
+                yield self._result(results, reports, k, not pending, start)
+
+    def search(self, query: str, k: int = 10, allowed: Optional[np.ndarray] = None) -> FusionResult:
+        """The final fused ranking (waits for every retriever or its deadline)"""
+        result = None
+        for result in self.stream(query, k, allowed):
+            pass
+        return result
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
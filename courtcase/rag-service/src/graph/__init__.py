@@ -0,0 +1,11 @@
+"""
+Precomputed legal citation graph for query-time expansion
+"""
+from .csr import EDGE_TYPES, EDGE_WEIGHTS, CitationGraph, export_from_neo4j
+
+__all__ = [
+    'EDGE_TYPES',
+    'EDGE_WEIGHTS',
+    'CitationGraph',
+    'export_from_neo4j'
+]
@@ -0,0 +1,303 @@
+"""
+Precomputed citation graph in compressed sparse row form
+The Case -> Case relationships (CITES / CITES_PRECEDENT, FOLLOWS, OVERRULES,
+DISTINGUISHES) and Case -> Section (APPLIES_SECTION) are exported from Neo4j
+once into CSR arrays: an int64 row pointer per node, int32 neighbour indices
+and int8 edge types, for outgoing and incoming edges, plus a section -> case
+list. Every neighbour list is pre-sorted by its static expansion score (edge
+weight x authority), so bounded fan-out is a slice. Arrays are saved as .npy
+and memory-mapped, like the BM25 segments; query-time expansion never runs
+Cypher.
+
+Usage:
+    python -m src.graph.csr --graph data/index/graph export --neo4j-uri bolt://localhost:7687 --dsn postgresql://...
+    python -m src.graph.csr --graph data/index/graph stats
+"""
+import os
+import json
+import logging
+import argparse
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.legal_text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Edge types (int8 codes); CITES_PRECEDENT is the loader's name for CITES
+EDGE_TYPES = ("cites", "follows", "overrules", "distinguishes")
+RELATIONSHIP_TYPES = {
+    "CITES": "cites",
+    "CITES_PRECEDENT": "cites",
+    "FOLLOWS": "follows",
+    "OVERRULES": "overrules",
+    "DISTINGUISHES": "distinguishes",
+}
+
+# Expansion weight per (edge type, direction); "out" follows the edge from the seed
+EDGE_WEIGHTS = {
+    ("cites", "out"): 0.6,        # precedent the seed relies on
+    ("cites", "in"): 0.5,         # later cases citing the seed
+    ("follows", "out"): 0.7,
+    ("follows", "in"): 0.7,
+    ("overrules", "in"): 1.0,     # the seed was overruled: the overruling case is essential
+    ("overrules", "out"): 0.6,
+    ("distinguishes", "out"): 0.3,
+    ("distinguishes", "in"): 0.4,
+}
+
+NO_DOCUMENT = -1
+
+# Cases loaded by neo4j/add_indian_cases.py are keyed by `id`, not `case_id` (as in neo4j/utils/graph_metrics.py)
+CASES_QUERY = """
+    MATCH (c:Case)
+    RETURN coalesce(c.case_id, c.id) AS case_id, c.citation AS citation, coalesce(c.authority, 0.0) AS authority
+"""
+
+EDGES_QUERY = """
+    MATCH (a:Case)-[r:CITES|CITES_PRECEDENT|FOLLOWS|OVERRULES|DISTINGUISHES]->(b:Case)
+    RETURN coalesce(a.case_id, a.id) AS source, coalesce(b.case_id, b.id) AS target, type(r) AS type
+"""
+
+SECTIONS_QUERY = """
+    MATCH (c:Case)-[:APPLIES_SECTION]->(s:Section)
+    RETURN coalesce(c.case_id, c.id) AS case_id, s.section_number AS section
+"""
+
+
+def citation_key(citation: Optional[str]) -> Optional[str]:
+    """A stored citation in the token form tokenize() gives query citations ("58 dlr ad 211")"""
+    for token in tokenize(citation or ""):
+        if " " in token:
+            return token
+    return None
+
+
+def section_key(section: Optional[str]) -> Optional[str]:
+    """A Section.section_number ("Section 302", "302") as the query token "s.302" """
+    if not section:
+        return None
+    text = section if not section[:1].isdigit() else f"s. {section}"
+    for token in tokenize(text):
+        if token.startswith("s.") and "(" not in token:
+            return token
+    return None
+
+
+def _csr(rows: np.ndarray, order_key: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Row pointer and row-sorted permutation (within a row, by descending order_key)"""
+    order = np.lexsort((-order_key, rows))
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+    return indptr, order
+
+
+class CitationGraph:
+    """Case citation network and case-section links as CSR arrays"""
+
+    def __init__(self, case_ids: List[str], authority: np.ndarray, document_ids: np.ndarray,
+                 citations: Dict[str, int], sections: Dict[str, int], arrays: Dict[str, np.ndarray],
+                 meta: Optional[Dict] = None):
+        self.case_ids = case_ids
+        self.authority = authority
+        self.document_ids = document_ids
+        self.citations = citations
+        self.sections = sections
+        self.out_indptr, self.out_indices, self.out_types = arrays["out_indptr"], arrays["out_indices"], arrays["out_types"]
+        self.in_indptr, self.in_indices, self.in_types = arrays["in_indptr"], arrays["in_indices"], arrays["in_types"]
+        self.section_indptr, self.section_cases = arrays["section_indptr"], arrays["section_cases"]
+        self.meta = meta or {}
+        self.case_index = {case_id: i for i, case_id in enumerate(case_ids)}
+        self.document_cases: Dict[int, int] = {
+            int(document_id): i for i, document_id in enumerate(document_ids) if document_id != NO_DOCUMENT
+        }
+        peak = float(authority.max()) if len(authority) else 0.0
+        self.authority_weight = 0.5 + 0.5 * (authority / peak if peak > 0 else np.zeros(len(authority), np.float32))
+
+    @property
+    def num_cases(self) -> int:
+        return len(self.case_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.out_indices)
+
+    @classmethod
+    def build(
+        cls,
+        cases: Sequence[Tuple[str, Optional[str], float]],
+        edges: Iterable[Tuple[str, str, str]],
+        applies: Iterable[Tuple[str, str]] = (),
+        case_documents: Optional[Dict[str, int]] = None
+    ) -> "CitationGraph":
+        """
+        Build from exported rows
+
+        Args:
+            cases: (case_id, citation, authority)
+            edges: (source case_id, target case_id, relationship type)
+            applies: (case_id, section_number)
+            case_documents: Case ID -> documents.id
+        """
+        case_documents = case_documents or {}
+        case_ids = [case_id for case_id, _, _ in cases]
+        index = {case_id: i for i, case_id in enumerate(case_ids)}
+        n = len(case_ids)
+        authority = np.asarray([float(a or 0.0) for _, _, a in cases], dtype=np.float32)
+        document_ids = np.asarray([case_documents.get(case_id, NO_DOCUMENT) for case_id in case_ids], dtype=np.int64)
+        citations = {}
+        for i, (_, citation, _) in enumerate(cases):
+            key = citation_key(citation)
+            if key and key not in citations:
+                citations[key] = i
+
+        sources, targets, types = [], [], []
+        for source, target, relationship in edges:
+            edge_type = RELATIONSHIP_TYPES.get(relationship)
+            if edge_type is None or source not in index or target not in index or source == target:
+                continue
+            sources.append(index[source])
+            targets.append(index[target])
+            types.append(EDGE_TYPES.index(edge_type))
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int32)
+        types = np.asarray(types, dtype=np.int8)
+
+        out_weight = np.asarray([EDGE_WEIGHTS[(t, "out")] for t in EDGE_TYPES], dtype=np.float32)
+        in_weight = np.asarray([EDGE_WEIGHTS[(t, "in")] for t in EDGE_TYPES], dtype=np.float32)
+        peak = float(authority.max()) if n else 0.0
+        authority_weight = 0.5 + 0.5 * (authority / peak if peak > 0 else np.zeros(n, np.float32))
+
+        arrays = {}
+        out_indptr, order = _csr(sources, out_weight[types] * authority_weight[targets], n)
+        arrays.update(out_indptr=out_indptr, out_indices=targets[order], out_types=types[order])
+        in_indptr, order = _csr(targets.astype(np.int64), in_weight[types] * authority_weight[sources], n)
+        arrays.update(in_indptr=in_indptr, in_indices=sources[order].astype(np.int32), in_types=types[order])
+
+        sections: Dict[str, int] = {}
+        section_rows, section_cases = [], []
+        for case_id, section in applies:
+            key = section_key(section)
+            if key is None or case_id not in index:
+                continue
+            section_rows.append(sections.setdefault(key, len(sections)))
+            section_cases.append(index[case_id])
+        section_rows = np.asarray(section_rows, dtype=np.int64)
+        section_cases = np.asarray(section_cases, dtype=np.int32)
+        section_indptr, order = _csr(section_rows, authority[section_cases], len(sections))
+        arrays.update(section_indptr=section_indptr, section_cases=section_cases[order])
+
+        meta = {"cases": n, "edges": int(len(targets)), "sections": len(sections),
+                "section_links": int(len(section_cases)), "built_at": datetime.now().isoformat()}
+        return cls(case_ids, authority, document_ids, citations, sections, arrays, meta)
+
+    # Persistence
+
+    ARRAYS = ("out_indptr", "out_indices", "out_types", "in_indptr", "in_indices", "in_types",
+              "section_indptr", "section_cases", "authority", "document_ids")
+
+    def save(self, path):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        for name in self.ARRAYS:
+            np.save(path / f"{name}.npy", np.asarray(getattr(self, name)))
+        with open(path / "cases.json", "w", encoding="utf-8") as f:
+            json.dump(self.case_ids, f)
+        with open(path / "keys.json", "w", encoding="utf-8") as f:
+            json.dump({"citations": self.citations, "sections": self.sections}, f)
+        with open(path / "graph.json", "w") as f:
+            json.dump(self.meta, f, indent=2)
+
+    @classmethod
+    def load(cls, path) -> "CitationGraph":
+        """Open a saved graph; the arrays are memory-mapped"""
+        path = Path(path)
+        arrays = {name: np.load(path / f"{name}.npy", mmap_mode="r") for name in cls.ARRAYS}
+        with open(path / "cases.json", encoding="utf-8") as f:
+            case_ids = json.load(f)
+        with open(path / "keys.json", encoding="utf-8") as f:
+            keys = json.load(f)
+        with open(path / "graph.json") as f:
+            meta = json.load(f)
+        return cls(case_ids, np.asarray(arrays.pop("authority")), np.asarray(arrays.pop("document_ids")),
+                   keys["citations"], keys["sections"], arrays, meta)
+
+    # Queries
+
+    def neighbours(self, case: int, direction: str, fanout: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(neighbour indices, edge type codes), best expansion candidates first, at most fanout"""
+        if direction == "out":
+            start = self.out_indptr[case]
+            end = min(self.out_indptr[case + 1], start + fanout)
+            return self.out_indices[start:end], self.out_types[start:end]
+        start = self.in_indptr[case]
+        end = min(self.in_indptr[case + 1], start + fanout)
+        return self.in_indices[start:end], self.in_types[start:end]
+
+    def section_cases_for(self, section: str, fanout: int) -> np.ndarray:
+        """Most authoritative cases applying a section ("s.302")"""
+        row = self.sections.get(section)
+        if row is None:
+            return np.zeros(0, dtype=np.int32)
+        start = self.section_indptr[row]
+        return self.section_cases[start:min(self.section_indptr[row + 1], start + fanout)]
+
+    def stats(self) -> Dict:
+        return {
+            **self.meta,
+            "citations": len(self.citations),
+            "mapped_documents": len(self.document_cases),
+            "bytes": sum(np.asarray(getattr(self, name)).nbytes for name in self.ARRAYS),
+        }
+
+
+def export_from_neo4j(driver, case_documents: Dict[str, int], database: str = "neo4j") -> CitationGraph:
+    """Read cases, citation edges and section links from Neo4j and build the CSR graph"""
+    with driver.session(database=database) as session:
+        cases = [(r["case_id"], r["citation"], r["authority"]) for r in session.run(CASES_QUERY)]
+        logger.info(f"Exported {len(cases)} cases")
+        edges = [(r["source"], r["target"], r["type"]) for r in session.run(EDGES_QUERY)]
+        logger.info(f"Exported {len(edges)} citation edges")
+        applies = [(r["case_id"], r["section"]) for r in session.run(SECTIONS_QUERY)]
+        logger.info(f"Exported {len(applies)} section links")
+    return CitationGraph.build(cases, edges, applies, case_documents)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export or inspect the precomputed citation graph")
+    parser.add_argument("--graph", default="data/index/graph", help="Graph directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="Export from Neo4j into CSR arrays")
+    export.add_argument("--neo4j-uri", default=os.getenv("NEO4J_URI", "bolt://localhost:7687"))
+    export.add_argument("--neo4j-user", default=os.getenv("NEO4J_USER", "neo4j"))
+    export.add_argument("--neo4j-password", default=os.getenv("NEO4J_PASSWORD", ""))
+    export.add_argument("--database", default="neo4j")
+    export.add_argument("--dsn", default=os.getenv("DATABASE_URL"), help="PostgreSQL, to map cases to documents")
+    commands.add_parser("stats", help="Show graph statistics")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    if args.command == "export":
+        try:
+            from neo4j import GraphDatabase
+        except ImportError:
+            raise ImportError("neo4j not installed. Install with: pip install neo4j")
+        from ..utils.corpus import load_case_documents
+
+        case_documents = load_case_documents(args.dsn) if args.dsn else {}
+        driver = GraphDatabase.driver(args.neo4j_uri, auth=(args.neo4j_user, args.neo4j_password))
+        try:
+            graph = export_from_neo4j(driver, case_documents, args.database)
+        finally:
+            driver.close()
+        graph.save(args.graph)
+    else:
+        graph = CitationGraph.load(args.graph)
+    print(json.dumps(graph.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+"""
+Reranking: cross-encoder scoring of retrieved chunks
+"""
+from .cross_encoder import (
+    CrossEncoderScorer, OverlapScorer, PairScorer, Reranker, RerankResult, ScoreCache, normalize_query
+)
+
+__all__ = [
+    'CrossEncoderScorer',
+    'OverlapScorer',
+    'PairScorer',
+    'Reranker',
+    'RerankResult',
+    'ScoreCache',
+    'normalize_query'
+]
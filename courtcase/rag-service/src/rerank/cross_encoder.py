@@ -0,0 +1,225 @@
+"""
+Cross-encoder reranking of retrieved chunks
+Scores (query, chunk) pairs with a small local cross-encoder, in first-stage
+order and in batches sized to a latency target, stopping once the top k has
+not changed for a few batches. Pair scores are kept in an LRU cache keyed by
+the normalized query and a hash of the chunk text, so repeated research
+queries ("s. 302 Penal Code", "Section 302 of the Penal Code") are reranked
+from cache. A semaphore bounds how many model calls run at once.
+"""
+import time
+import hashlib
+import logging
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..utils.legal_text import normalize_query, tokenize
+
+logger = logging.getLogger(__name__)
+
+try:
+    from sentence_transformers import CrossEncoder
+    CROSS_ENCODER_AVAILABLE = True
+except ImportError:
+    CROSS_ENCODER_AVAILABLE = False
+
+DEFAULT_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+DEFAULT_CACHE_SIZE = 100_000
+DEFAULT_DEPTH = 50
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+
+class PairScorer(ABC):
+    """Scores how well each text answers a query (higher is better)"""
+
+    @abstractmethod
+    def score(self, query: str, texts: Sequence[str]) -> np.ndarray:
+        """(len(texts),) float array"""
+
+
+class CrossEncoderScorer(PairScorer):
+    """sentence-transformers CrossEncoder on CPU"""
+
+    def __init__(self, model: str = DEFAULT_MODEL, device: str = "cpu", max_length: int = 512):
+        if not CROSS_ENCODER_AVAILABLE:
+            raise ImportError(
+                "sentence-transformers not installed. Install with: pip install sentence-transformers"
+            )
+        self.model = CrossEncoder(model, device=device, max_length=max_length)
+
+    def score(self, query: str, texts: Sequence[str]) -> np.ndarray:
+        pairs = [(query, text) for text in texts]
+        return np.asarray(self.model.predict(pairs, batch_size=max(1, len(pairs)), show_progress_bar=False),
+                          dtype=np.float32)
+
+
+class OverlapScorer(PairScorer):
+    """Model-free scorer: share of query tokens in the text, citations and sections counted double"""
+
+    def score(self, query: str, texts: Sequence[str]) -> np.ndarray:
+        weights = {token: 2.0 if " " in token or "." in token else 1.0 for token in tokenize(query)}
+        total = sum(weights.values()) or 1.0
+        scores = []
+        for text in texts:
+            present = set(tokenize(text))
+            scores.append(sum(weight for token, weight in weights.items() if token in present) / total)
+        return np.asarray(scores, dtype=np.float32)
+
+
+class ScoreCache:
+    """Thread-safe LRU map of (normalized query, chunk hash) -> score"""
+
+    def __init__(self, capacity: int = DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self._scores: "OrderedDict[Tuple[str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Tuple[str, str]) -> Optional[float]:
+        with self._lock:
+            score = self._scores.get(key)
+            if score is None:
+                self.misses += 1
+                return None
+            self._scores.move_to_end(key)
+            self.hits += 1
+            return score
+
+    def put(self, key: Tuple[str, str], score: float):
+        with self._lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.capacity:
+                self._scores.popitem(last=False)
+
+    def __len__(self):
+        return len(self._scores)
+
+
+@dataclass
+class RerankResult:
+    """Candidate indices in reranked order; unscored candidates follow in first-stage order"""
+    order: List[int]
+    scores: List[Optional[float]] = field(default_factory=list)  # per candidate, None if not scored
+    computed: int = 0
+    cached: int = 0
+    batches: int = 0
+    early_stop: bool = False
+    elapsed_ms: float = 0.0
+
+
+class Reranker:
+    """Batched, cached, early-stopping cross-encoder reranking"""
+
+    def __init__(
+        self,
+        scorer: PairScorer,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        min_batch: int = 4,
+        max_batch: int = 64,
+        target_batch_ms: float = 40.0,
+        patience: int = 2,
+        max_concurrent: int = 2
+    ):
+        """
+        Args:
+            scorer: Pair scorer (CrossEncoderScorer in production)
+            cache_size: Pair scores kept
+            min_batch: Smallest (and first) batch
+            max_batch: Largest batch
+            target_batch_ms: Batch size adapts so one model call takes about this long
+            patience: Stop after this many batches leave the top k unchanged
+            max_concurrent: Model calls allowed at once across threads
+        """
+        self.scorer = scorer
+        self.cache = ScoreCache(cache_size)
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.target_batch_ms = target_batch_ms
+        self.patience = patience
+        self._batch = min_batch
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.pairs = 0
+        self.early_stops = 0
+
+    def _score_batch(self, query: str, texts: List[str]) -> np.ndarray:
+        with self._slots:
+            start = time.perf_counter()
+            scores = self.scorer.score(query, texts)
+            per_pair_ms = (time.perf_counter() - start) * 1000 / len(texts)
+        with self._lock:
+            self.calls += 1
+            self.pairs += len(texts)
+            wanted = int(self.target_batch_ms / max(per_pair_ms, 1e-3))
+            # move halfway towards the size that meets the latency target
+            self._batch = int(np.clip((self._batch + wanted) // 2, self.min_batch, self.max_batch))
+        return scores
+
+    def rerank(self, query: str, texts: Sequence[str], k: int = 10) -> RerankResult:
+        """
+        Rerank first-stage candidates
+
+        Args:
+            query: User query
+            texts: Candidate chunk texts, best first-stage candidate first
+            k: Results that must be stable before stopping early
+
+        Returns:
+            RerankResult with the order over all candidates
+        """
+        start = time.perf_counter()
+        key = normalize_query(query)
+        hashes = [chunk_hash(text) for text in texts]
+        scores: List[Optional[float]] = [self.cache.get((key, h)) for h in hashes]
+        result = RerankResult([], scores, cached=sum(score is not None for score in scores))
+
+        pending = [i for i, score in enumerate(scores) if score is None]
+        top, unchanged = None, 0
+        while pending:
+            batch, pending = pending[:self._batch], pending[self._batch:]
+            for i, score in zip(batch, self._score_batch(query, [texts[i] for i in batch])):
+                scores[i] = float(score)
+                self.cache.put((key, hashes[i]), float(score))
+            result.computed += len(batch)
+            result.batches += 1
+
+            current = self._top(scores, k)
+            unchanged = unchanged + 1 if current == top else 0
+            top = current
+            if pending and len(current) >= k and unchanged >= self.patience:
+                result.early_stop = True
+                with self._lock:
+                    self.early_stops += 1
+                break
+
+        scored = sorted((i for i, score in enumerate(scores) if score is not None), key=lambda i: (-scores[i], i))
+        result.order = scored + [i for i, score in enumerate(scores) if score is None]
+        result.elapsed_ms = (time.perf_counter() - start) * 1000
+        return result
+
+    @staticmethod
+    def _top(scores: List[Optional[float]], k: int) -> frozenset:
+        scored = [(score, -i) for i, score in enumerate(scores) if score is not None]
+        return frozenset(-i for _, i in sorted(scored, reverse=True)[:k])
+
+    def stats(self) -> dict:
+        return {
+            "model_calls": self.calls,
+            "pairs_scored": self.pairs,
+            "batch_size": self._batch,
+            "early_stops": self.early_stops,
+            "cache_entries": len(self.cache),
+            "cache_hits": self.cache.hits,
+            "cache_misses": self.cache.misses,
+        }
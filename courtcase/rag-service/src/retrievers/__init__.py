@@ -0,0 +1,19 @@
+"""
+Retrievers: each maps a query to ranked chunks (SearchHit)
+"""
+from .base import Retriever, SearchHit
+from .bm25 import BM25Index
+from .graph import CitationGraphRetriever, CSRGraphRetriever
+from .hierarchy import ChunkHierarchy, HierarchicalRetriever
+from .vector import VectorRetriever
+
+__all__ = [
+    'Retriever',
+    'SearchHit',
+    'BM25Index',
+    'CitationGraphRetriever',
+    'CSRGraphRetriever',
+    'ChunkHierarchy',
+    'HierarchicalRetriever',
+    'VectorRetriever'
+]
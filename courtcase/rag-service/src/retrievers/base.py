@@ -0,0 +1,29 @@
+"""
+Common retriever interface
+"""
+from abc import ABC, abstractmethod
+from typing import List
+
+import numpy as np
+
+from ..filters.bitmaps import document_allowed
+from ..utils.hits import SearchHit
+
+
+class Retriever(ABC):
+    """Anything that maps a query to ranked chunks"""
+
+    name: str = "retriever"
+
+    @abstractmethod
+    def search(self, query: str, k: int = 10) -> List[SearchHit]:
+        """Top-k chunks for a query, best first"""
+
+    def search_filtered(self, query: str, k: int, allowed: np.ndarray) -> List[SearchHit]:
+        """
+        Top-k chunks of the documents a mask allows (boolean, indexed by document ID)
+
+        Indexes override this to test the mask while scoring; this default
+        drops disallowed hits afterwards, so it may return fewer than k.
+        """
+        return [hit for hit in self.search(query, k) if document_allowed(allowed, hit.document_id)]
@@ -0,0 +1,605 @@
+"""
+BM25 keyword retriever over an on-disk inverted index
+The index is a directory of immutable segments plus a manifest. Each
+segment stores, per term, postings in blocks of BLOCK_SIZE documents:
+delta-coded document numbers and term frequencies as varints, with a skip
+entry (last document, byte offset) per block. Segments are memory-mapped
+at query time; only the postings a query touches are decoded.
+
+Search is term-at-a-time with MaxScore pruning: terms are visited in order
+of decreasing score upper bound, and once the remaining terms cannot lift
+an unseen document into the top k they only score existing candidates,
+decoding just the blocks that may contain them. Candidates that can no
+longer reach the k-th best score are dropped as the threshold rises.
+A document mask (filters.bitmaps) is tested on the decoded postings, so a
+filtered search skips disallowed chunks before they are scored.
+
+Updates add new segments; deletes are tombstones; small segments are
+merged in tiers (MERGE_FACTOR at a time) so the segment count stays
+logarithmic. Document frequencies include tombstoned documents until
+their segment is merged, as in Lucene. Incremental builds read only
+chunks newer than the index; a re-chunked document gets new chunk IDs,
+so its older chunks are tombstoned by document when the new ones arrive.
+
+Usage:
+    python -m src.retrievers.bm25 build --index data/index/bm25 --dsn "$DATABASE_URL"
+    python -m src.retrievers.bm25 search --index data/index/bm25 "bail s.497 58 DLR 211"
+"""
+import os
+import json
+import math
+import heapq
+import shutil
+import logging
+import argparse
+import threading
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .base import Retriever, SearchHit
+from ..filters.bitmaps import allowed_rows
+from ..utils.corpus import CorpusChunk, iter_document_chunks, read_jsonl
+from ..utils.legal_text import tokenize
+from ..utils.varint import decode_varints, encode_varints
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 128
+DEFAULT_SEGMENT_SIZE = 50_000
+MERGE_FACTOR = 8
+K1 = 1.2
+B = 0.75
+
+MANIFEST = "index.json"
+NO_DOCUMENT = -1
+
+
+def idf(df, num_docs: int):
+    """BM25 inverse document frequency (Lucene variant, always positive)"""
+    # df still counts tombstoned documents, so it can exceed the live num_docs
+    df = np.minimum(df, num_docs)
+    return np.log1p((num_docs - df + 0.5) / (df + 0.5))
+
+
+def term_scores(weight: float, tf, doc_length, avgdl: float, k1: float = K1, b: float = B):
+    """BM25 contribution of one term for documents with the given tf and length"""
+    tf = np.asarray(tf, dtype=np.float64)
+    return weight * tf * (k1 + 1.0) / (tf + k1 * (1.0 - b + b * np.asarray(doc_length) / avgdl))
+
+
+def write_segment(
+    path: Path,
+    postings: Iterable[Tuple[str, np.ndarray, np.ndarray]],
+    doc_lengths: np.ndarray,
+    chunk_ids: np.ndarray,
+    document_ids: np.ndarray
+) -> None:
+    """
+    Write one immutable segment
+
+    Args:
+        path: Segment directory (must not exist)
+        postings: (term, document numbers, term frequencies) in term order,
+            document numbers ascending; terms without documents are skipped
+        doc_lengths: Token count per document
+        chunk_ids: External chunk ID per document
+        document_ids: Parent document ID per document (NO_DOCUMENT if unknown)
+    """
+    path.mkdir(parents=True)
+    terms = []
+    term_blocks = [0]
+    df, max_tf, min_length = [], [], []
+    block_last, block_offset = [], [0]
+
+    with open(path / "postings.bin", "wb") as out:
+        for term, docs, tfs in postings:
+            if not len(docs):
+                continue
+            terms.append(term)
+            df.append(len(docs))
+            max_tf.append(int(tfs.max()))
+            min_length.append(int(doc_lengths[docs].min()))
+            previous = 0
+            for start in range(0, len(docs), BLOCK_SIZE):
+                block_docs = docs[start:start + BLOCK_SIZE]
+                deltas = np.diff(block_docs, prepend=previous)
+                data = encode_varints(deltas) + encode_varints(tfs[start:start + BLOCK_SIZE])
+                out.write(data)
+                previous = int(block_docs[-1])
+                block_last.append(previous)
+                block_offset.append(block_offset[-1] + len(data))
+            term_blocks.append(len(block_last))
+
+    with open(path / "terms.json", "w", encoding="utf-8") as f:
+        json.dump(terms, f, ensure_ascii=False)
+    np.save(path / "term_blocks.npy", np.asarray(term_blocks, dtype=np.int64))
+    np.save(path / "df.npy", np.asarray(df, dtype=np.uint32))
+    np.save(path / "max_tf.npy", np.asarray(max_tf, dtype=np.uint32))
+    np.save(path / "min_length.npy", np.asarray(min_length, dtype=np.uint32))
+    np.save(path / "block_last.npy", np.asarray(block_last, dtype=np.uint32))
+    np.save(path / "block_offset.npy", np.asarray(block_offset, dtype=np.int64))
+    np.save(path / "doc_lengths.npy", np.asarray(doc_lengths, dtype=np.uint32))
+    np.save(path / "chunk_ids.npy", np.asarray(chunk_ids, dtype=np.int64))
+    np.save(path / "document_ids.npy", np.asarray(document_ids, dtype=np.int64))
+    with open(path / "segment.json", "w") as f:
+        json.dump({"num_docs": len(doc_lengths), "total_length": int(np.sum(doc_lengths, dtype=np.int64)),
+                   "num_terms": len(terms)}, f)
+
+
+def invert(chunks: Sequence[CorpusChunk]):
+    """Tokenize chunks into (postings per term in term order, doc lengths)"""
+    vocabulary: Dict[str, int] = {}
+    term_ids, frequencies, doc_lengths = [], [], np.zeros(len(chunks), dtype=np.uint32)
+    for doc, chunk in enumerate(chunks):
+        counts = Counter(tokenize(chunk.text))
+        doc_lengths[doc] = sum(counts.values())
+        term_ids.append(np.fromiter((vocabulary.setdefault(t, len(vocabulary)) for t in counts), np.int64, len(counts)))
+        frequencies.append(np.fromiter(counts.values(), np.uint32, len(counts)))
+
+    sizes = [len(ids) for ids in term_ids]
+    term_ids = np.concatenate(term_ids) if term_ids else np.zeros(0, dtype=np.int64)
+    frequencies = np.concatenate(frequencies) if frequencies else np.zeros(0, dtype=np.uint32)
+    docs = np.repeat(np.arange(len(chunks), dtype=np.int64), sizes)
+
+    # Group by term; the stable sort keeps documents ascending within a term
+    order = np.argsort(term_ids, kind="stable")
+    bounds = np.concatenate(([0], np.cumsum(np.bincount(term_ids, minlength=len(vocabulary)))))
+    docs, frequencies = docs[order], frequencies[order]
+
+    postings = (
+        (term, docs[bounds[i]:bounds[i + 1]], frequencies[bounds[i]:bounds[i + 1]])
+        for term, i in sorted(vocabulary.items())
+    )
+    return postings, doc_lengths
+
+
+class Segment:
+    """Read side of one segment (arrays memory-mapped)"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = self.path.name
+        with open(self.path / "segment.json") as f:
+            meta = json.load(f)
+        self.num_docs = meta["num_docs"]
+        self.total_length = meta["total_length"]
+        with open(self.path / "terms.json", encoding="utf-8") as f:
+            self.terms = {term: i for i, term in enumerate(json.load(f))}
+
+        load = lambda name: np.load(self.path / f"{name}.npy", mmap_mode="r")
+        self.term_blocks = load("term_blocks")
+        self.df = load("df")
+        self.max_tf = load("max_tf")
+        self.min_length = load("min_length")
+        self.block_last = load("block_last")
+        self.block_offset = load("block_offset")
+        self.doc_lengths = load("doc_lengths")
+        self.chunk_ids = load("chunk_ids")
+        self.document_ids = load("document_ids")
+        size = os.path.getsize(self.path / "postings.bin")
+        self.data = np.memmap(self.path / "postings.bin", dtype=np.uint8, mode="r") if size else np.zeros(0, np.uint8)
+
+        deleted = self.path / "deleted.npy"
+        self.deleted = np.load(deleted) if deleted.exists() else np.zeros(self.num_docs, dtype=bool)
+        self._refresh_live()
+
+    def _refresh_live(self) -> None:
+        self.live_docs = int(self.num_docs - self.deleted.sum())
+        self.live_length = int(self.total_length - np.sum(self.doc_lengths[self.deleted], dtype=np.int64))
+
+    def delete(self, chunk_ids: np.ndarray) -> int:
+        """Tombstone documents with these chunk IDs; returns how many were live"""
+        return self._tombstone(np.isin(self.chunk_ids, chunk_ids))
+
+    def delete_documents(self, document_ids: np.ndarray) -> int:
+        """Tombstone every chunk of these parent documents; returns how many were live"""
+        return self._tombstone(np.isin(self.document_ids, document_ids))
+
+    def _tombstone(self, hit: np.ndarray) -> int:
+        hit = hit & ~self.deleted
+        count = int(hit.sum())
+        if count:
+            self.deleted = self.deleted | hit
+            tmp = self.path / "deleted.tmp.npy"
+            np.save(tmp, self.deleted)
+            os.replace(tmp, self.path / "deleted.npy")
+            self._refresh_live()
+        return count
+
+    def _block_count(self, term: int, block: int) -> int:
+        first = int(self.term_blocks[term])
+        return min(BLOCK_SIZE, int(self.df[term]) - (block - first) * BLOCK_SIZE)
+
+    def block(self, term: int, block: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode one block: (document numbers, term frequencies)"""
+        values = decode_varints(self.data[self.block_offset[block]:self.block_offset[block + 1]])
+        n = self._block_count(term, block)
+        base = int(self.block_last[block - 1]) if block > self.term_blocks[term] else 0
+        return base + np.cumsum(values[:n].astype(np.int64)), values[n:2 * n]
+
+    def postings(self, term: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Decode a whole postings list"""
+        first, last = int(self.term_blocks[term]), int(self.term_blocks[term + 1])
+        values = decode_varints(self.data[self.block_offset[first]:self.block_offset[last]])
+        df = int(self.df[term])
+        full = (last - first - 1) * BLOCK_SIZE
+        head = values[:2 * full].reshape(-1, 2, BLOCK_SIZE)
+        tail = values[2 * full:].reshape(2, df - full)
+        deltas = np.concatenate((head[:, 0, :].ravel(), tail[0]))
+        return np.cumsum(deltas.astype(np.int64)), np.concatenate((head[:, 1, :].ravel(), tail[1]))
+
+    def lookup(self, term: int, docs: np.ndarray) -> np.ndarray:
+        """Term frequencies of the given (ascending) documents, 0 where absent; skips unneeded blocks"""
+        first, last = int(self.term_blocks[term]), int(self.term_blocks[term + 1])
+        blocks = np.searchsorted(self.block_last[first:last], docs)
+        needed = np.unique(blocks[blocks < last - first])
+        if len(needed) == 0:
+            return np.zeros(len(docs), dtype=np.uint64)
+        if len(needed) * 2 > last - first:
+            found_docs, found_tfs = self.postings(term)
+        else:
+            decoded = [self.block(term, first + int(block)) for block in needed]
+            found_docs = np.concatenate([d for d, _ in decoded])
+            found_tfs = np.concatenate([t for _, t in decoded])
+        position = np.minimum(np.searchsorted(found_docs, docs), len(found_docs) - 1)
+        return np.where(found_docs[position] == docs, found_tfs[position], 0)
+
+
+class BM25Index(Retriever):
+    """
+    Segmented, memory-mapped BM25 index
+
+    Example:
+        index = BM25Index("data/index/bm25")
+        index.add(iter_document_chunks(dsn))
+        hits = index.search("murder s.302 58 DLR 211", k=10)
+    """
+
+    name = "bm25"
+
+    def __init__(
+        self,
+        path,
+        k1: float = K1,
+        b: float = B,
+        segment_size: int = DEFAULT_SEGMENT_SIZE,
+        merge_factor: int = MERGE_FACTOR
+    ):
+        """
+        Args:
+            path: Index directory (created if missing)
+            k1, b: BM25 parameters
+            segment_size: Chunks per segment written by add()
+            merge_factor: Segments of one size tier merged together
+        """
+        self.path = Path(path)
+        self.k1 = k1
+        self.b = b
+        self.segment_size = segment_size
+        self.merge_factor = merge_factor
+        self._lock = threading.RLock()
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        manifest = self.path / MANIFEST
+        if manifest.exists():
+            with open(manifest) as f:
+                state = json.load(f)
+            self._next_segment = state["next_segment"]
+            self.segments = [Segment(self.path / name) for name in state["segments"]]
+        else:
+            self._next_segment = 0
+            self.segments: List[Segment] = []
+            self._commit()
+
+    # Statistics
+
+    @property
+    def num_docs(self) -> int:
+        return sum(segment.live_docs for segment in self.segments)
+
+    @property
+    def avgdl(self) -> float:
+        docs = self.num_docs
+        return sum(segment.live_length for segment in self.segments) / docs if docs else 0.0
+
+    def stats(self) -> Dict:
+        return {
+            "segments": len(self.segments),
+            "docs": self.num_docs,
+            "deleted": sum(segment.num_docs - segment.live_docs for segment in self.segments),
+            "terms": sum(len(segment.terms) for segment in self.segments),
+            "bytes": sum(f.stat().st_size for f in self.path.rglob("*") if f.is_file()),
+        }
+
+    def max_chunk_id(self) -> int:
+        """Largest indexed chunk ID (for incremental builds), 0 when empty"""
+        return max((int(segment.chunk_ids.max()) for segment in self.segments if segment.num_docs), default=0)
+
+    # Writes
+
+    def add(self, chunks: Iterable[CorpusChunk], replace_documents: bool = False) -> int:
+        """
+        Index chunks (replacing earlier versions with the same chunk ID)
+
+        Args:
+            chunks: Chunks to index
+            replace_documents: Also drop the already indexed chunks of every
+                document these chunks belong to (all of a document's chunks
+                must then come in this call, as after re-chunking)
+
+        Returns:
+            Number of chunks indexed
+        """
+        count = 0
+        replaced: Optional[Set[int]] = set() if replace_documents else None
+        batch: Dict[int, CorpusChunk] = {}
+        for chunk in chunks:
+            batch[chunk.chunk_id] = chunk
+            if len(batch) >= self.segment_size:
+                count += self._flush(list(batch.values()), replaced)
+                batch = {}
+        if batch:
+            count += self._flush(list(batch.values()), replaced)
+        return count
+
+    def delete(self, chunk_ids: Iterable[int]) -> int:
+        """Tombstone chunks; returns how many were removed"""
+        ids = np.fromiter(chunk_ids, dtype=np.int64)
+        with self._lock:
+            count = sum(segment.delete(ids) for segment in self.segments)
+        if count:
+            self.maybe_merge()
+        return count
+
+    def _flush(self, chunks: List[CorpusChunk], replaced: Optional[Set[int]] = None) -> int:
+        """Write one segment; `replaced` collects documents already replaced by earlier flushes of this add()"""
+        postings, doc_lengths = invert(chunks)
+        chunk_ids = np.array([chunk.chunk_id for chunk in chunks], dtype=np.int64)
+        document_ids = np.array(
+            [NO_DOCUMENT if chunk.document_id is None else chunk.document_id for chunk in chunks], dtype=np.int64
+        )
+        stale = np.zeros(0, dtype=np.int64)
+        if replaced is not None:
+            stale = np.asarray(sorted(set(document_ids.tolist()) - replaced - {NO_DOCUMENT}), dtype=np.int64)
+            replaced.update(stale.tolist())
+        with self._lock:
+            for segment in self.segments:
+                segment.delete(chunk_ids)
+                if len(stale):
+                    segment.delete_documents(stale)
+            segment = self._write(postings, doc_lengths, chunk_ids, document_ids)
+            self.segments = self.segments + [segment]
+            self._commit()
+        logger.info(f"Indexed {len(chunks)} chunks into {segment.name} ({len(segment.terms)} terms)")
+        self.maybe_merge()
+        return len(chunks)
+
+    def _write(self, postings, doc_lengths, chunk_ids, document_ids) -> Segment:
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        tmp = self.path / f"{name}.tmp"
+        if tmp.exists():
+            shutil.rmtree(tmp)
+        write_segment(tmp, postings, doc_lengths, chunk_ids, document_ids)
+        os.replace(tmp, self.path / name)
+        return Segment(self.path / name)
+
+    def _commit(self) -> None:
+        state = {"segments": [segment.name for segment in self.segments], "next_segment": self._next_segment,
+                 "k1": self.k1, "b": self.b}
+        tmp = self.path / f"{MANIFEST}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp, self.path / MANIFEST)
+
+    def _merge_candidates(self) -> List[Segment]:
+        tiers = defaultdict(list)
+        for segment in self.segments:
+            if segment.num_docs and segment.live_docs * 2 < segment.num_docs:
+                return [segment]  # mostly tombstones: rewrite on its own
+            tiers[int(math.log(max(segment.live_docs, 1), self.merge_factor))].append(segment)
+        for tier in sorted(tiers):
+            if len(tiers[tier]) >= self.merge_factor:
+                return tiers[tier][:self.merge_factor]
+        return []
+
+    def maybe_merge(self) -> int:
+        """Apply the tiered merge policy; returns the number of merges done"""
+        merges = 0
+        with self._lock:
+            while True:
+                candidates = self._merge_candidates()
+                if not candidates:
+                    return merges
+                self.merge(candidates)
+                merges += 1
+
+    def optimize(self) -> None:
+        """Merge everything into one segment (best query speed, e.g. after a full build)"""
+        with self._lock:
+            if len(self.segments) > 1 or any(s.live_docs < s.num_docs for s in self.segments):
+                self.merge(list(self.segments))
+
+    def merge(self, segments: List[Segment]) -> Optional[Segment]:
+        """Rewrite the given segments as one, dropping tombstoned documents"""
+        with self._lock:
+            remaps, offset = [], 0
+            for segment in segments:
+                live = ~segment.deleted
+                remaps.append(np.where(live, np.cumsum(live) - 1 + offset, -1))
+                offset += segment.live_docs
+
+            def postings():
+                for term in sorted(set().union(*(segment.terms for segment in segments))):
+                    docs, tfs = [], []
+                    for segment, remap in zip(segments, remaps):
+                        index = segment.terms.get(term)
+                        if index is not None:
+                            d, t = segment.postings(index)
+                            d = remap[d]
+                            docs.append(d[d >= 0])
+                            tfs.append(t[d >= 0])
+                    yield term, np.concatenate(docs), np.concatenate(tfs)
+
+            concat = lambda name: np.concatenate([getattr(s, name)[~s.deleted] for s in segments])
+            merged = None
+            if offset:
+                merged = self._write(postings(), concat("doc_lengths"), concat("chunk_ids"), concat("document_ids"))
+
+            position = self.segments.index(segments[0])
+            remaining = [segment for segment in self.segments if segment not in segments]
+            self.segments = remaining[:position] + ([merged] if merged else []) + remaining[position:]
+            self._commit()
+            for segment in segments:
+                shutil.rmtree(segment.path, ignore_errors=True)
+        logger.info(f"Merged {len(segments)} segments ({offset} live chunks)")
+        return merged
+
+    # Search
+
+    def search(self, query: str, k: int = 10, allowed: Optional[np.ndarray] = None) -> List[SearchHit]:
+        """
+        Top-k chunks by BM25
+
+        Args:
+            query: Free text; citations and section references are matched as units
+            k: Number of hits
+            allowed: Boolean mask over document IDs restricting the hits
+
+        Returns:
+            Hits, best first
+        """
+        segments = self.segments  # snapshot: writers replace the list, never mutate it
+        num_docs = sum(segment.live_docs for segment in segments)
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or not num_docs or k <= 0:
+            return []
+        avgdl = sum(segment.live_length for segment in segments) / num_docs
+        df = {term: sum(int(s.df[s.terms[term]]) for s in segments if term in s.terms) for term in terms}
+        weights = {term: float(idf(df[term], num_docs)) for term in terms if df[term]}
+
+        heap: List[Tuple[float, int, int]] = []  # (score, -chunk id, document id), k best
+        # Largest segments first: they raise the threshold that prunes the rest
+        for segment in sorted(segments, key=lambda s: -s.live_docs):
+            threshold = heap[0][0] if len(heap) >= k else 0.0
+            docs, scores = self._search_segment(segment, weights, k, threshold, avgdl, allowed)
+            for doc, score in zip(docs.tolist(), scores.tolist()):
+                entry = (score, -int(segment.chunk_ids[doc]), int(segment.document_ids[doc]))
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry > heap[0]:
+                    heapq.heapreplace(heap, entry)
+
+        return [
+            SearchHit(-neg_id, score, None if document_id == NO_DOCUMENT else document_id, self.name)
+            for score, neg_id, document_id in sorted(heap, reverse=True)
+        ]
+
+    def search_filtered(self, query: str, k: int, allowed: np.ndarray) -> List[SearchHit]:
+        return self.search(query, k, allowed)
+
+    def _search_segment(
+        self,
+        segment: Segment,
+        weights: Dict[str, float],
+        k: int,
+        threshold: float,
+        avgdl: float,
+        allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Top-k (document numbers, scores) of one segment that beat `threshold`"""
+        present = [(segment.terms[t], w) for t, w in weights.items() if t in segment.terms]
+        if not present:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        bounds = [
+            float(term_scores(w, segment.max_tf[i], segment.min_length[i], avgdl, self.k1, self.b))
+            for i, w in present
+        ]
+        order = np.argsort(bounds)[::-1]
+        remaining = np.concatenate((np.cumsum(np.asarray(bounds)[order][::-1])[::-1], [0.0]))
+
+        candidates = np.zeros(0, dtype=np.int64)
+        scores = np.zeros(0)
+        for position, term_position in enumerate(order):
+            term, weight = present[term_position]
+            if remaining[position] <= threshold:
+                # No unseen document can make the top k: score existing candidates only
+                if not len(candidates):
+                    break
+                tfs = segment.lookup(term, candidates)
+                found = tfs > 0
+                scores[found] += term_scores(weight, tfs[found], segment.doc_lengths[candidates[found]],
+                                             avgdl, self.k1, self.b)
+            else:
+                docs, tfs = segment.postings(term)
+                live = ~segment.deleted[docs]
+                if allowed is not None:
+                    live &= allowed_rows(allowed, segment.document_ids[docs])
+                docs, tfs = docs[live], tfs[live]
+                term_score = term_scores(weight, tfs, segment.doc_lengths[docs], avgdl, self.k1, self.b)
+                candidates, inverse = np.unique(np.concatenate((candidates, docs)), return_inverse=True)
+                scores = np.bincount(inverse, weights=np.concatenate((scores, term_score)),
+                                     minlength=len(candidates))
+
+            if len(scores) >= k:
+                threshold = max(threshold, float(np.partition(scores, -k)[-k]))
+            keep = scores + remaining[position + 1] >= threshold
+            candidates, scores = candidates[keep], scores[keep]
+
+        if len(scores) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            candidates, scores = candidates[top], scores[top]
+        return candidates, scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or query the BM25 chunk index")
+    parser.add_argument("--index", default="data/index/bm25", help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="Index chunks (incrementally: only chunks newer than the index)")
+    source = build.add_mutually_exclusive_group(required=True)
+    source.add_argument("--dsn", help="PostgreSQL connection string (document_chunks)")
+    source.add_argument("--jsonl", help="JSON Lines chunk export")
+    build.add_argument("--segment-size", type=int, default=DEFAULT_SEGMENT_SIZE)
+    build.add_argument("--optimize", action="store_true", help="Merge into one segment afterwards")
+    build.add_argument("--notify", metavar="API_URL",
+                       help="Invalidate the running API's query cache for the ingested courts and statutes")
+
+    search = commands.add_parser("search", help="Run a query")
+    search.add_argument("query")
+    search.add_argument("-k", type=int, default=10)
+
+    commands.add_parser("optimize", help="Merge all segments")
+    commands.add_parser("stats", help="Show index statistics")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    index = BM25Index(args.index, segment_size=getattr(args, "segment_size", DEFAULT_SEGMENT_SIZE))
+
+    if args.command == "build":
+        chunks = iter_document_chunks(args.dsn, after_id=index.max_chunk_id()) if args.dsn else read_jsonl(args.jsonl)
+        from ..cache.query_cache import IngestScope
+        scope = IngestScope()
+        # New chunks from the database replace the older chunks of re-chunked documents
+        print(f"Indexed {index.add(scope.observe(chunks), replace_documents=bool(args.dsn))} chunks")
+        if args.notify:
+            print(f"Invalidated {scope.notify(args.notify)} cached queries")
+        if args.optimize:
+            index.optimize()
+        print(json.dumps(index.stats(), indent=2))
+    elif args.command == "search":
+        for rank, hit in enumerate(index.search(args.query, args.k), 1):
+            print(f"{rank:3d}. chunk {hit.chunk_id} (document {hit.document_id})  {hit.score:.3f}")
+    elif args.command == "optimize":
+        index.optimize()
+        print(json.dumps(index.stats(), indent=2))
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
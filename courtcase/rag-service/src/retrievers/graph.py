@@ -0,0 +1,229 @@
+"""
+Citation-neighbourhood retrievers over the legal knowledge graph
+Law report citations and section references in the query ("58 DLR 211",
+"s. 302") seed the search: the cited cases themselves, the cases they cite
+or are cited by and the cases applying a queried section (APPLIES_SECTION).
+Cases are mapped back to `documents` rows, so hits are document-level
+(chunk_id is None).
+
+CSRGraphRetriever expands over the precomputed CSR graph (src.graph.csr) in
+memory and is the one to serve; CitationGraphRetriever runs the same idea as
+live Cypher and needs no export step.
+"""
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .base import Retriever, SearchHit
+from ..graph.csr import EDGE_TYPES, EDGE_WEIGHTS, NO_DOCUMENT, CitationGraph
+from ..utils.legal_text import tokenize
+
+try:
+    from neo4j import GraphDatabase
+    NEO4J_AVAILABLE = True
+except ImportError:
+    NEO4J_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FANOUT = 50
+
+# Hop weights: a case cited by the query outranks its neighbours
+SEED_WEIGHT = 1.0
+CITATION_WEIGHT = 0.5
+SECTION_WEIGHT = 0.3
+
+# Case.citation normalized the way tokenize() normalizes citations in text
+_NORMALIZED_CITATION = """
+    reduce(out = '', word IN [word IN split(
+        reduce(s = toLower(coalesce(c.citation, '')), ch IN ['(', ')', '.', ','] | replace(s, ch, ' ')), ' '
+    ) WHERE word <> ''] | out + CASE out WHEN '' THEN '' ELSE ' ' END + word)
+"""
+
+CITATION_QUERY = f"""
+    MATCH (c:Case)
+    WITH c, {_NORMALIZED_CITATION} AS citation
+    WHERE citation IN $citations
+    RETURN c.case_id AS case_id, COLLECT {{
+        MATCH (c)-[:CITES|CITES_PRECEDENT]-(neighbour:Case)
+        RETURN DISTINCT neighbour.case_id LIMIT $fanout
+    }} AS neighbours
+"""
+
+SECTION_QUERY = """
+    MATCH (s:Section) WHERE s.section_number IN $sections
+    RETURN s.section_number AS section, COLLECT {
+        MATCH (c:Case)-[:APPLIES_SECTION]->(s)
+        RETURN c.case_id ORDER BY coalesce(c.authority, 0.0) DESC LIMIT $fanout
+    } AS cases
+"""
+
+
+def query_references(query: str) -> Tuple[List[str], List[str]]:
+    """
+    Citations and section numbers mentioned in a query
+
+    Returns:
+        (normalized citations such as "58 dlr 211", section numbers such as "302")
+    """
+    citations, sections = [], []
+    for token in tokenize(query):
+        if " " in token:
+            citations.append(token)
+        elif token.startswith("s.") and "(" not in token:
+            sections.append(token[2:])
+    return list(dict.fromkeys(citations)), list(dict.fromkeys(sections))
+
+
+def section_spellings(numbers: Sequence[str]) -> List[str]:
+    """Section.section_number values a section number may be stored as"""
+    return [spelling for number in numbers for spelling in (f"Section {number}", number, f"s. {number}")]
+
+
+class CitationGraphRetriever(Retriever):
+    """Document-level hits from the citation neighbourhood of the query's references"""
+
+    name = "graph"
+
+    def __init__(
+        self,
+        driver,
+        case_documents: Dict[str, int],
+        database: str = "neo4j",
+        fanout: int = DEFAULT_FANOUT
+    ):
+        """
+        Args:
+            driver: neo4j.Driver (see from_uri)
+            case_documents: Case ID -> documents.id (utils.corpus.load_case_documents)
+            database: Neo4j database name
+            fanout: Neighbours followed per seed case or section
+        """
+        self.driver = driver
+        self.case_documents = case_documents
+        self.database = database
+        self.fanout = fanout
+
+    @classmethod
+    def from_uri(cls, uri: str, user: str, password: str, case_documents: Dict[str, int], **kwargs):
+        if not NEO4J_AVAILABLE:
+            raise ImportError("neo4j not installed. Install with: pip install neo4j")
+        return cls(GraphDatabase.driver(uri, auth=(user, password)), case_documents, **kwargs)
+
+    def case_scores(self, citations: Sequence[str], sections: Sequence[str]) -> Dict[str, float]:
+        """Score every case reachable from the references"""
+        scores = defaultdict(float)
+        with self.driver.session(database=self.database) as session:
+            if citations:
+                for record in session.run(CITATION_QUERY, citations=list(citations), fanout=self.fanout):
+                    scores[record["case_id"]] += SEED_WEIGHT
+                    for neighbour in record["neighbours"]:
+                        scores[neighbour] += CITATION_WEIGHT
+            if sections:
+                for record in session.run(SECTION_QUERY, sections=section_spellings(sections), fanout=self.fanout):
+                    for case_id in record["cases"]:
+                        scores[case_id] += SECTION_WEIGHT
+        return scores
+
+    def search(self, query: str, k: int = 10) -> List[SearchHit]:
+        citations, sections = query_references(query)
+        if not citations and not sections:
+            return []
+
+        best: Dict[int, float] = {}
+        for case_id, score in self.case_scores(citations, sections).items():
+            document_id = self.case_documents.get(case_id)
+            if document_id is not None and score > best.get(document_id, 0.0):
+                best[document_id] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [SearchHit(None, score, document_id, self.name) for document_id, score in ranked]
+
+    def close(self):
+        self.driver.close()
+
+
+class CSRGraphRetriever(Retriever):
+    """Authority-weighted, bounded fan-out expansion over the precomputed citation graph"""
+
+    name = "graph"
+
+    def __init__(self, graph: CitationGraph, fanout: int = 20, section_fanout: int = DEFAULT_FANOUT):
+        """
+        Args:
+            graph: Loaded CitationGraph
+            fanout: Neighbours followed per seed and direction
+            section_fanout: Cases taken per queried section (most authoritative first)
+        """
+        self.graph = graph
+        self.fanout = fanout
+        self.section_fanout = section_fanout
+        self._out_weights = np.asarray([EDGE_WEIGHTS[(t, "out")] for t in EDGE_TYPES], dtype=np.float32)
+        self._in_weights = np.asarray([EDGE_WEIGHTS[(t, "in")] for t in EDGE_TYPES], dtype=np.float32)
+
+    def case_scores(self, seeds: Dict[int, float], section_seeds: Iterable[str] = ()) -> Dict[int, float]:
+        """
+        Score cases around weighted seed cases
+
+        Each seed scores twice its weight (SEED_WEIGHT x 2); each neighbour
+        scores seed weight x edge weight (EDGE_WEIGHTS) x authority weight,
+        summed over the seeds that reach it. Edge and authority weights are at
+        most 1, so a seed outranks any neighbour reached from one seed alone.
+        Cases applying a queried section score SECTION_WEIGHT x authority
+        weight.
+        """
+        graph = self.graph
+        nodes, scores = [], []
+        for case, weight in seeds.items():
+            nodes.append(np.asarray([case]))
+            scores.append(np.asarray([weight * SEED_WEIGHT * 2], dtype=np.float32))
+            for direction, edge_weights in (("out", self._out_weights), ("in", self._in_weights)):
+                neighbours, types = graph.neighbours(case, direction, self.fanout)
+                if len(neighbours):
+                    nodes.append(np.asarray(neighbours))
+                    scores.append(weight * edge_weights[types] * graph.authority_weight[neighbours])
+        for section in section_seeds:
+            cases = graph.section_cases_for(section, self.section_fanout)
+            if len(cases):
+                nodes.append(np.asarray(cases))
+                scores.append(SECTION_WEIGHT * graph.authority_weight[cases])
+        if not nodes:
+            return {}
+        unique, inverse = np.unique(np.concatenate(nodes), return_inverse=True)
+        totals = np.bincount(inverse, weights=np.concatenate(scores).astype(np.float64), minlength=len(unique))
+        return dict(zip(unique.tolist(), totals.tolist()))
+
+    def _hits(self, scores: Dict[int, float], k: int) -> List[SearchHit]:
+        best: Dict[int, float] = {}
+        for case, score in scores.items():
+            document_id = int(self.graph.document_ids[case])
+            if document_id != NO_DOCUMENT and score > best.get(document_id, 0.0):
+                best[document_id] = score
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:k]
+        return [SearchHit(None, score, document_id, self.name) for document_id, score in ranked]
+
+    def search(self, query: str, k: int = 10) -> List[SearchHit]:
+        citations, sections = query_references(query)
+        seeds = {self.graph.citations[c]: 1.0 for c in citations if c in self.graph.citations}
+        section_seeds = [f"s.{number}" for number in sections]
+        if not seeds and not section_seeds:
+            return []
+        return self._hits(self.case_scores(seeds, section_seeds), k)
+
+    def expand(self, document_ids: Sequence[int], k: int = 10,
+               weights: Optional[Sequence[float]] = None) -> List[SearchHit]:
+        """
+        Graph neighbourhood of first-stage results (e.g. the top BM25 documents)
+
+        Args:
+            document_ids: Seed documents, best first
+            k: Hits to return
+            weights: Seed weights (default 1 / rank)
+        """
+        seeds = {}
+        for rank, document_id in enumerate(document_ids):
+            case = self.graph.document_cases.get(document_id)
+            if case is not None and case not in seeds:
+                seeds[case] = weights[rank] if weights is not None else 1.0 / (rank + 1)
+        return self._hits(self.case_scores(seeds), k) if seeds else []
@@ -0,0 +1,138 @@
+"""
+Parent-chunk resolution over the document -> section -> paragraph hierarchy
+Only leaf chunks are indexed (see utils.corpus.CHUNKS_QUERY). ChunkHierarchy
+follows `document_chunks.parent_chunk_id` back up, so the hits of one
+document come back as the smallest ancestor covering all of them: one
+section instead of three of its paragraphs, the paragraph itself when it is
+the only hit. Chunks outside any hierarchy (flat chunking) pass through.
+"""
+import logging
+from dataclasses import replace
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from .base import Retriever, SearchHit
+
+logger = logging.getLogger(__name__)
+
+HIERARCHY_QUERY = """
+    SELECT id, parent_chunk_id FROM document_chunks
+    WHERE parent_chunk_id IS NOT NULL
+    ORDER BY id
+"""
+
+NO_PARENT = -1
+
+# Leaves fetched per result wanted (several leaves collapse into one ancestor)
+COLLAPSE_OVERFETCH = 3
+
+
+class ChunkHierarchy:
+    """Child -> parent links of hierarchical chunks, as sorted arrays"""
+
+    def __init__(self, chunk_ids: np.ndarray, parent_ids: np.ndarray):
+        """
+        Args:
+            chunk_ids: Chunk IDs with a parent, ascending
+            parent_ids: Parent of each
+        """
+        self.chunk_ids = np.asarray(chunk_ids, dtype=np.int64)
+        self.parent_ids = np.asarray(parent_ids, dtype=np.int64)
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[Tuple[int, int]]) -> "ChunkHierarchy":
+        """From (chunk_id, parent_chunk_id) pairs in any order"""
+        links = np.asarray(sorted(pairs), dtype=np.int64).reshape(-1, 2)
+        return cls(links[:, 0], links[:, 1])
+
+    @classmethod
+    def load(cls, dsn: str) -> "ChunkHierarchy":
+        """Read the parent links of `document_chunks`"""
+        try:
+            import psycopg2
+        except ImportError:
+            raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+        conn = psycopg2.connect(dsn)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(HIERARCHY_QUERY)
+                hierarchy = cls.from_pairs(cursor.fetchall())
+        finally:
+            conn.close()
+        logger.info(f"Loaded {len(hierarchy)} chunk parent links")
+        return hierarchy
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def parent(self, chunk_id: int) -> int:
+        """Parent chunk ID, or NO_PARENT for a root or a flat chunk"""
+        i = int(np.searchsorted(self.chunk_ids, chunk_id))
+        if i < len(self.chunk_ids) and self.chunk_ids[i] == chunk_id:
+            return int(self.parent_ids[i])
+        return NO_PARENT
+
+    def path(self, chunk_id: int) -> List[int]:
+        """The chunk and its ancestors, root first"""
+        path = [chunk_id]
+        parent = self.parent(chunk_id)
+        while parent != NO_PARENT and parent not in path:
+            path.append(parent)
+            parent = self.parent(parent)
+        return path[::-1]
+
+    def collapse(self, hits: Sequence, min_depth: int = 1) -> List:
+        """
+        Replace the hits of each subtree by the smallest ancestor covering them
+
+        Hits are grouped under their ancestor at min_depth (depth 0 is the
+        document chunk; 1 keeps whole-judgment chunks out of results) and each
+        group becomes one hit on the deepest chunk common to all its paths,
+        ranked and scored as its best hit.
+
+        Args:
+            hits: Ranked hits with chunk_id (SearchHit, FusedHit), best first
+            min_depth: Shallowest ancestor a group may be widened to
+
+        Returns:
+            Collapsed hits, best first
+        """
+        groups, order = {}, []
+        for hit in hits:
+            if hit.chunk_id is None:
+                order.append((None, hit))
+                continue
+            path = self.path(hit.chunk_id)
+            key = (hit.document_id, path[min(min_depth, len(path) - 1)])
+            if key in groups:
+                common = groups[key]
+                size = 0
+                while size < min(len(common), len(path)) and common[size] == path[size]:
+                    size += 1
+                groups[key] = common[:size]
+            else:
+                groups[key] = path
+                order.append((key, hit))
+        return [hit if key is None else replace(hit, chunk_id=groups[key][-1]) for key, hit in order]
+
+
+class HierarchicalRetriever(Retriever):
+    """A leaf-chunk retriever whose hits are collapsed to covering ancestors"""
+
+    def __init__(self, retriever: Retriever, hierarchy: ChunkHierarchy, min_depth: int = 1,
+                 overfetch: int = COLLAPSE_OVERFETCH):
+        self.retriever = retriever
+        self.hierarchy = hierarchy
+        self.min_depth = min_depth
+        self.overfetch = overfetch
+        self.name = retriever.name
+
+    def search(self, query: str, k: int = 10) -> List[SearchHit]:
+        hits = self.retriever.search(query, k * self.overfetch)
+        return self.hierarchy.collapse(hits, self.min_depth)[:k]
+
+    def search_filtered(self, query: str, k: int, allowed: np.ndarray) -> List[SearchHit]:
+        hits = self.retriever.search_filtered(query, k * self.overfetch, allowed)
+        return self.hierarchy.collapse(hits, self.min_depth)[:k]
@@ -0,0 +1,32 @@
+"""
+Semantic retriever: encoder + VectorIndex
+"""
+from dataclasses import replace
+from typing import List, Optional
+
+import numpy as np
+
+from .base import Retriever, SearchHit
+from ..embeddings.ann_index import DEFAULT_NPROBE, VectorFilter, VectorIndex
+from ..embeddings.encoders import Encoder
+
+
+class VectorRetriever(Retriever):
+    """Encodes the query and searches the ANN index"""
+
+    name = "vector"
+
+    def __init__(self, index: VectorIndex, encoder: Encoder, nprobe: int = DEFAULT_NPROBE):
+        if encoder.dimension != index.dimension:
+            raise ValueError(f"Encoder dimension {encoder.dimension} != index dimension {index.dimension}")
+        self.index = index
+        self.encoder = encoder
+        self.nprobe = nprobe
+
+    def search(self, query: str, k: int = 10, filters: Optional[VectorFilter] = None) -> List[SearchHit]:
+        return self.index.search(self.encoder.encode([query])[0], k, self.nprobe, filters)
+
+    def search_filtered(self, query: str, k: int, allowed: np.ndarray,
+                        filters: Optional[VectorFilter] = None) -> List[SearchHit]:
+        filters = replace(filters, documents=allowed) if filters is not None else VectorFilter(documents=allowed)
+        return self.search(query, k, filters)
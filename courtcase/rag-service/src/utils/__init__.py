@@ -0,0 +1,20 @@
+"""
+Shared helpers for rag-service
+"""
+from .corpus import (
+    CorpusChunk, case_key, document_case_key, iter_document_chunks, load_case_documents, read_jsonl, write_jsonl
+)
+from .hits import SearchHit
+from .legal_text import tokenize
+
+__all__ = [
+    'CorpusChunk',
+    'case_key',
+    'document_case_key',
+    'iter_document_chunks',
+    'load_case_documents',
+    'read_jsonl',
+    'write_jsonl',
+    'SearchHit',
+    'tokenize'
+]
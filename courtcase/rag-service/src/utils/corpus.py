@@ -0,0 +1,121 @@
+"""
+Corpus access for the retrieval indexes
+Chunks come from the `document_chunks` table (data-collection schema) or
+from JSON Lines exports of it, so indexes can be built and tested without a
+database. Only leaf chunks are indexed: the section and document chunks of
+a hierarchically chunked document are reached through their leaves
+(retrievers.hierarchy).
+"""
+import json
+import hashlib
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CHUNKS_QUERY = """
+    SELECT c.id, c.document_id, c.chunk_text, c.country_code, c.chunk_index, c.section_title,
+           d.doc_year, d.metadata->>'court'
+    FROM document_chunks c
+    JOIN documents d ON d.id = c.document_id
+    WHERE c.id > %s AND c.has_meaningful_content AND coalesce(c.child_chunk_count, 0) = 0
+    ORDER BY c.id
+"""
+
+CASE_DOCUMENTS_QUERY = "SELECT id, title_full FROM documents WHERE doc_type = 'CAS'"
+
+
+@dataclass
+class CorpusChunk:
+    """One retrievable chunk (`document_chunks` row)"""
+    chunk_id: int
+    document_id: Optional[int]
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def iter_document_chunks(dsn: str, after_id: int = 0, batch_size: int = 5000) -> Iterator[CorpusChunk]:
+    """
+    Stream chunks from PostgreSQL in id order
+
+    Args:
+        dsn: PostgreSQL connection string
+        after_id: Only chunks with a larger id (resume an incremental build)
+        batch_size: Rows fetched per round trip (server-side cursor)
+    """
+    try:
+        import psycopg2
+    except ImportError:
+        raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor(name="rag_chunks") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(CHUNKS_QUERY, (after_id,))
+            for chunk_id, document_id, text, country, index, section_title, year, court in cursor:
+                yield CorpusChunk(chunk_id, document_id, text, {
+                    "country_code": country, "chunk_index": index, "section_title": section_title,
+                    "year": year, "court": court
+                })
+    finally:
+        conn.close()
+
+
+def case_key(title: str) -> str:
+    """Knowledge-graph Case ID for a document title (neo4j/utils/case_rows.generate_id)"""
+    return hashlib.md5(title.encode()).hexdigest()[:16]
+
+
+def document_case_key(document_id: int) -> str:
+    """Knowledge-graph Case ID of a synced `documents` row (neo4j/build_offline.postgres_case_id)"""
+    return f"document_{document_id}"
+
+
+def load_case_documents(dsn: str) -> Dict[str, int]:
+    """
+    Map knowledge-graph Case IDs to `documents` IDs
+
+    Cases loaded by neo4j/sync_graph.py and build_offline.py are keyed by
+    their row; cases from the LLM builder by their title.
+    """
+    try:
+        import psycopg2
+    except ImportError:
+        raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CASE_DOCUMENTS_QUERY)
+            case_documents = {}
+            for document_id, title in cursor.fetchall():
+                case_documents[case_key(title)] = document_id
+                case_documents[document_case_key(document_id)] = document_id
+            return case_documents
+    finally:
+        conn.close()
+
+
+def read_jsonl(path) -> Iterator[CorpusChunk]:
+    """Chunks from a JSON Lines file ({"chunk_id", "document_id", "text", "metadata"} per line)"""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield CorpusChunk(
+                    int(record["chunk_id"]), record.get("document_id"), record["text"], record.get("metadata") or {}
+                )
+
+
+def write_jsonl(chunks: Iterable[CorpusChunk], path) -> int:
+    """Write chunks as JSON Lines; returns the number written"""
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(json.dumps(asdict(chunk), ensure_ascii=False) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,17 @@
+"""
+Result type shared by retrievers and indexes
+"""
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class SearchHit:
+    """
+    A retrieved chunk with the score of the retriever that found it;
+    document-level retrievers (the citation graph) leave chunk_id None
+    """
+    chunk_id: Optional[int]
+    score: float
+    document_id: Optional[int] = None
+    source: str = ""
@@ -0,0 +1,79 @@
+"""
+Legal-aware tokenization
+Splits judgment text into keyword-retrieval tokens while keeping the units
+lawyers search for intact: law report citations ("58 DLR 211",
+"AIR 1950 SC 27", "(2004) 5 SCC 123") become one token each, and section
+and article references ("s. 302", "Section 497", "u/s 302", "Art. 21")
+are normalized to "s.302" / "art.21" so every spelling matches.
+"""
+import re
+from typing import List
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by for from had has have he her his i if in into is it its
+of on or our she so such that the their them then there these they this those to was we
+were which who will with would
+""".split())
+
+# Statute abbreviations that look like law reports after a section number ("302 IPC 1860")
+STATUTE_ABBREVIATIONS = ("IPC", "CPC", "CRPC", "PC", "BNS", "BNSS")
+
+# Law reports recognised in any case (queries are often typed in lowercase);
+# other reporters are recognised when written in capitals
+REPORTERS = ("DLR", "BLD", "BLC", "BLT", "MLR", "ADC", "SCC", "SCR", "SCMR", "PLD", "AIR", "WLR", "All ER")
+
+_TOKEN_PATTERN = re.compile(
+    r"(?P<air>\b(?i:AIR)\s+\d{4}\s+[A-Za-z]{2,6}\.?\s+\d{1,5}\b)"
+    r"|(?P<cite>(?:\(\d{4}\)\s*)?\b\d{1,4}\s+"
+    r"(?:(?i:" + "|".join(r"\s".join(name.split()) for name in REPORTERS) + r")\b"
+    r"|(?!(?:" + "|".join(STATUTE_ABBREVIATIONS) + r")\b)(?:[A-Z][a-z]{0,2}\s)?[A-Z]{2,6}\b)\.?"
+    r"(?:\s*\((?i:AD|HCD|SC|HC|Cri|Civ)\))?\s+\d{1,5}\b)"
+    r"|(?i:\b(?:sections?|secs?\.?|ss?\.|u/s\.?)\s*"
+    r"(?P<section>\d+[a-z]?)(?P<subsection>(?:\(\w{1,4}\))*))"
+    r"|(?i:\b(?:articles?|arts?\.)\s*(?P<article>\d+[a-z]?))"
+    r"|(?P<word>[A-Za-z0-9]+)"
+)
+
+_PUNCTUATION = re.compile(r"[^\w]+")
+
+
+def tokenize(text: str, keep_stopwords: bool = False) -> List[str]:
+    """
+    Tokens of a chunk or query, in text order
+
+    Args:
+        text: Raw text
+        keep_stopwords: Keep function words (they are dropped for indexing)
+
+    Returns:
+        Lowercase tokens; citations are single tokens such as "58 dlr 211"
+        and "air 1950 sc 27", sections "s.302" (plus "s.302(1)" when a
+        subsection is given), articles "art.21"
+    """
+    tokens = []
+    for match in _TOKEN_PATTERN.finditer(text or ""):
+        kind = match.lastgroup
+        if kind in ("air", "cite"):
+            tokens.append(_PUNCTUATION.sub(" ", match.group(kind)).strip().lower())
+        elif match.group("section"):
+            section = "s." + match.group("section").lower()
+            tokens.append(section)
+            if match.group("subsection"):
+                tokens.append(section + match.group("subsection").lower())
+        elif kind == "article":
+            tokens.append("art." + match.group("article").lower())
+        else:
+            word = match.group("word").lower()
+            if keep_stopwords or word not in STOPWORDS:
+                tokens.append(word)
+    return tokens
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a query: its tokens, so spellings of a citation or section agree"""
+    return " ".join(tokenize(query))
+
+
+def legal_references(tokens: List[str]) -> List[str]:
+    """Citation, section and article tokens among `tokens`"""
+    return [token for token in tokens if " " in token or token.startswith(("s.", "art."))]
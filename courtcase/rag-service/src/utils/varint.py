@@ -0,0 +1,67 @@
+"""
+Vectorized varint (LEB128) coding for postings lists
+Seven payload bits per byte, high bit set on every byte but the last of a
+value. Encoding and decoding run as NumPy array operations (one pass per
+byte position, at most ten), not per-value Python loops.
+"""
+import numpy as np
+
+MAX_BYTES = 10  # uint64
+
+
+def encode_varints(values) -> bytes:
+    """
+    Encode non-negative integers
+
+    Args:
+        values: Sequence or array of integers >= 0
+
+    Returns:
+        Concatenated varint bytes
+    """
+    values = np.asarray(values, dtype=np.uint64).ravel()
+    if len(values) == 0:
+        return b""
+
+    lengths = np.ones(len(values), dtype=np.int64)
+    rest = values >> np.uint64(7)
+    while rest.any():
+        lengths += rest > 0
+        rest >>= np.uint64(7)
+
+    out = np.empty(int(lengths.sum()), dtype=np.uint8)
+    starts = np.cumsum(lengths) - lengths
+    for position in range(int(lengths.max())):
+        mask = lengths > position
+        payload = (values[mask] >> np.uint64(7 * position)) & np.uint64(0x7F)
+        more = (lengths[mask] > position + 1).astype(np.uint64) << np.uint64(7)
+        out[starts[mask] + position] = (payload | more).astype(np.uint8)
+    return out.tobytes()
+
+
+def decode_varints(data) -> np.ndarray:
+    """
+    Decode concatenated varints
+
+    Args:
+        data: bytes, memoryview or uint8 array (e.g. a slice of a memory map)
+
+    Returns:
+        uint64 array of the decoded values
+    """
+    data = np.frombuffer(data, dtype=np.uint8) if not isinstance(data, np.ndarray) else data
+    ends = np.flatnonzero(data < 0x80)
+    if len(ends) == 0:
+        return np.zeros(0, dtype=np.uint64)
+
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+
+    values = (data[starts] & 0x7F).astype(np.uint64)
+    for position in range(1, int(lengths.max())):
+        mask = lengths > position
+        payload = (data[starts[mask] + position] & 0x7F).astype(np.uint64)
+        values[mask] |= payload << np.uint64(7 * position)
+    return values
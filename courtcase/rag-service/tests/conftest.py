@@ -0,0 +1,40 @@
+"""
+Shared fixtures for rag-service tests
+PostgreSQL tests run against scratch databases built from the
+data-collection migrations (TEST_POSTGRES_URL or a local pgserver).
+"""
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+
+def _load_postgres_fixtures():
+    path = Path(__file__).resolve().parents[3] / "data-collection" / "tests" / "fixtures.py"
+    spec = importlib.util.spec_from_file_location("data_collection_fixtures", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_postgres_fixtures = _load_postgres_fixtures()
+postgres_server_url = _postgres_fixtures.postgres_server_url
+
+
+@pytest.fixture
+def postgres_database(postgres_server_url):
+    """
+    Create scratch databases with the given migrations applied
+    Call with a list of data-collection migration files; returns the DSN.
+    Databases are dropped after the test.
+    """
+    created = []
+
+    def create(migrations):
+        name = f"rag_test_{len(created)}"
+        created.append(name)
+        return _postgres_fixtures.create_migrated_database(postgres_server_url, name, migrations)
+
+    yield create
+    for name in created:
+        _postgres_fixtures.drop_database(postgres_server_url, name)
@@ -0,0 +1,122 @@
+"""
+Tests for the IVF vector index, encoders and VectorRetriever
+"""
+import numpy as np
+import pytest
+
+from src.embeddings.ann_index import VectorFilter, VectorIndex, index_chunks, quantize
+from src.embeddings.benchmark import benchmark, clustered_vectors, exact_top_k
+from src.embeddings.encoders import HashingEncoder
+from src.retrievers.vector import VectorRetriever
+from src.utils.corpus import CorpusChunk
+
+
+@pytest.fixture
+def data():
+    return clustered_vectors(3000, 32, clusters=20)
+
+
+def metadata(n):
+    return [{"country_code": "BD" if i % 2 else "IN", "court": f"court{i % 5}", "year": 1990 + i % 30}
+            for i in range(n)]
+
+
+def test_untrained_index_is_exact(tmp_path, data):
+    index = VectorIndex(tmp_path / "vectors", dimension=32)
+    index.add(range(len(data)), data)
+    assert not index.trained
+    truth = exact_top_k(data, data[:5], 10)
+    for query, expected in zip(data[:5], truth):
+        assert [hit.chunk_id for hit in index.search(query, 10)] == expected.tolist()
+
+
+def test_ivf_recall_and_full_probe(tmp_path, data):
+    index = VectorIndex(tmp_path / "vectors", dimension=32, train_size=1000)
+    index.add(range(len(data)), data)
+    assert index.trained and index.meta["nlist"] == int(np.sqrt(len(data)))
+
+    queries = clustered_vectors(20, 32, clusters=20, seed=3)
+    truth = exact_top_k(data, queries, 10)
+    everything = [[h.chunk_id for h in index.search(q, 10, nprobe=index.meta["nlist"])] for q in queries]
+    assert everything == truth.tolist()
+    recall = np.mean([len({h.chunk_id for h in index.search(q, 10, nprobe=8)} & set(t)) / 10
+                      for q, t in zip(queries, truth.tolist())])
+    assert recall > 0.8
+
+
+def test_int8_storage(tmp_path, data):
+    codes, scales = quantize(data)
+    assert codes.dtype == np.int8
+    assert np.abs(codes * scales[:, None] - data).max() < 0.01
+
+    index = VectorIndex(tmp_path / "vectors", dimension=32, dtype="int8")
+    index.add(range(len(data)), data)
+    assert (tmp_path / "vectors" / "vectors.bin").stat().st_size == len(data) * 32
+    hits = index.search(data[7], 5)
+    assert hits[0].chunk_id == 7 and hits[0].score == pytest.approx(1.0, abs=0.01)
+
+
+def test_updates_deletes_compact_and_reopen(tmp_path, data):
+    index = VectorIndex(tmp_path / "vectors", dimension=32, train_size=1000)
+    index.add(range(len(data)), data, document_ids=[i // 3 for i in range(len(data))])
+    index.add([10], data[20:21])  # replace chunk 10's vector
+    assert index.delete([20, 99999]) == 1
+    assert len(index) == len(data) - 1
+
+    hit = index.search(data[20], 1, nprobe=1000)[0]
+    assert (hit.chunk_id, hit.document_id) == (10, None)
+
+    index.compact()
+    reopened = VectorIndex(tmp_path / "vectors")
+    assert len(reopened.rows) == len(data) - 1 and reopened.trained
+    assert reopened.search(data[5], 1)[0].document_id == 1
+
+
+def test_filters_are_applied_before_scoring(tmp_path, data):
+    index = VectorIndex(tmp_path / "vectors", dimension=32, train_size=1000)
+    index.add(range(len(data)), data, metadata=metadata(len(data)))
+
+    hits = index.search(data[0], 10, filters=VectorFilter(countries=["BD"], year_from=2010))
+    assert len(hits) == 10
+    assert all(i % 2 and 1990 + i % 30 >= 2010 for i in (hit.chunk_id for hit in hits))
+
+    # Very selective filter: still a complete (exact) answer
+    rare = VectorFilter(courts=["court3"], year_from=2018, year_to=2018)
+    allowed = [i for i in range(len(data)) if i % 5 == 3 and 1990 + i % 30 == 2018]
+    expected = exact_top_k(data[allowed], data[:1], 10)[0]
+    assert [hit.chunk_id for hit in index.search(data[0], 10, nprobe=1, filters=rare)] == [allowed[i] for i in expected]
+    assert index.search(data[0], 10, filters=VectorFilter(countries=["PK"])) == []
+
+
+def test_vector_retriever_with_hashing_encoder(tmp_path):
+    texts = ["bail under s.497 of the code", "murder conviction under section 302", "land acquisition compensation"]
+    encoder = HashingEncoder(dimension=64)
+    index = VectorIndex(tmp_path / "vectors", dimension=64)
+    index.add([1, 2, 3], encoder.encode(texts))
+    retriever = VectorRetriever(index, encoder)
+    assert retriever.search("section 302 murder", k=1)[0].chunk_id == 2
+    with pytest.raises(ValueError):
+        VectorRetriever(index, HashingEncoder(dimension=32))
+
+
+def test_bulk_load_reopens_once(tmp_path, monkeypatch):
+    encoder = HashingEncoder(dimension=32)
+    chunks = [CorpusChunk(i, i // 4, f"bail application {i} under s.{i % 40}") for i in range(1500)]
+    # Chunk 5 again in a later batch: replaces the version added earlier in the same load
+    chunks.append(CorpusChunk(5, 1, "murder conviction under section 302"))
+    index = VectorIndex(tmp_path / "vectors", dimension=32, train_size=1000)
+    opens = []
+    monkeypatch.setattr(index, "_open", lambda original=index._open: opens.append(1) or original())
+
+    assert index_chunks(index, chunks, encoder, batch_size=100) == 1501
+    assert len(opens) == 2  # the reopen after the load, and one after training
+    assert index.trained and len(index) == 1500 and len(index.rows) == 1501
+    hit = index.search(encoder.encode(["murder conviction under section 302"])[0], 1, nprobe=1000)[0]
+    assert (hit.chunk_id, hit.document_id) == (5, 1)
+    assert len(VectorIndex(tmp_path / "vectors")) == 1500
+
+
+def test_benchmark_reports_every_configuration(data):
+    results = benchmark(data[:1500], data[1500:1510], k=5, nprobes=(2, 40), dtypes=("float32",))
+    assert [r["method"] for r in results] == ["brute_force", "ivf", "ivf"]
+    assert results[2]["recall"] == 1.0 and {"p50", "p95", "p99"} <= set(results[1])
@@ -0,0 +1,190 @@
+"""
+Tests for the ASGI retrieval API, admission control and query batching
+"""
+import json
+import time
+import asyncio
+import threading
+
+import numpy as np
+import pytest
+
+from src.api.admission import AdmissionController, Overloaded
+from src.api.app import RetrievalAPI
+from src.api.batching import BatchingEncoder
+from src.api.loadtest import parse_server_timing
+from src.embeddings.encoders import HashingEncoder
+from src.fusion.engine import FusionEngine
+from src.retrievers.base import Retriever, SearchHit
+
+
+class SlowRetriever(Retriever):
+    def __init__(self, name, delay=0.0):
+        self.name, self.delay = name, delay
+
+    def search(self, query, k=10):
+        time.sleep(self.delay)
+        return [SearchHit(i, 1.0 / (i + 1), i) for i in range(k)]
+
+
+async def request(app, method, path, body=None, query_string=b""):
+    scope = {"type": "http", "method": method, "path": path, "query_string": query_string}
+    messages = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    headers = {name.decode(): value.decode() for name, value in sent[0]["headers"]}
+    return sent[0]["status"], headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+def make_app(**kwargs):
+    engine = FusionEngine([SlowRetriever("bm25"), SlowRetriever("graph", delay=1.0)], deadlines={"graph": 0.05})
+    return RetrievalAPI(engine, **kwargs)
+
+
+def test_search_returns_hits_and_timing_headers():
+    app = make_app()
+    status, headers, body = asyncio.run(request(app, "POST", "/search", {"query": "s.302", "k": 3}))
+    assert status == 200
+    payload = json.loads(body)
+    assert [hit["chunk_id"] for hit in payload["hits"]] == [0, 1, 2]
+    assert payload["retrievers"]["graph"]["status"] == "timeout"
+    timings = parse_server_timing(headers["server-timing"])
+    assert {"queue", "bm25", "graph", "fusion", "hydrate", "total"} <= set(timings)
+    assert 'desc="timeout"' in headers["server-timing"]
+
+    status, _, body = asyncio.run(request(app, "GET", "/search", query_string=b"q=bail&k=2"))
+    assert status == 200 and len(json.loads(body)["hits"]) == 2
+    for bad in ({"k": 3}, {"query": "x", "k": 0}, {"query": "x", "k": "many"}):
+        assert asyncio.run(request(app, "POST", "/search", bad))[0] == 400
+    assert asyncio.run(request(app, "GET", "/nowhere"))[0] == 404
+    app.close()
+
+
+def test_stream_sends_partial_then_done():
+    app = make_app()
+    status, headers, body = asyncio.run(request(app, "POST", "/search/stream", {"query": "bail"}))
+    assert status == 200 and headers["content-type"] == "text/event-stream"
+    events = [block.split("\n") for block in body.decode().strip().split("\n\n")]
+    assert [lines[0] for lines in events] == ["event: partial", "event: done"]
+    final = json.loads(events[-1][1][len("data: "):])
+    assert final["complete"] and len(final["hits"]) == 10
+    app.close()
+
+
+def test_admission_rejects_beyond_queue_depth():
+    async def scenario():
+        controller = AdmissionController(max_concurrency=1, max_queue=1)
+        release = asyncio.Event()
+
+        async def hold():
+            async with controller.slot():
+                await release.wait()
+
+        running = asyncio.create_task(hold())
+        waiting = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        assert (controller.running, controller.queued) == (1, 1)
+        with pytest.raises(Overloaded):
+            async with controller.slot():
+                pass
+        release.set()
+        await asyncio.gather(running, waiting)
+        return controller.stats()
+
+    stats = asyncio.run(scenario())
+    assert stats["admitted"] == 2 and stats["rejected"] == 1 and stats["running"] == 0
+
+
+def test_overloaded_api_answers_503():
+    app = make_app(admission=AdmissionController(max_concurrency=1, max_queue=0))
+
+    async def scenario():
+        slow = asyncio.create_task(request(app, "POST", "/search", {"query": "a"}))
+        await asyncio.sleep(0.01)
+        rejected = await request(app, "POST", "/search", {"query": "b"})
+        return (await slow)[0], rejected
+
+    first, (status, headers, _) = asyncio.run(scenario())
+    assert first == 200 and status == 503 and headers["retry-after"] == "1"
+    app.close()
+
+
+def test_batching_encoder_coalesces_concurrent_calls():
+    class CountingEncoder(HashingEncoder):
+        calls = 0
+
+        def encode(self, texts):
+            CountingEncoder.calls += 1
+            return super().encode(texts)
+
+    inner = CountingEncoder(dimension=32)
+    encoder = BatchingEncoder(inner, max_batch=64, max_wait_ms=50)
+    texts = [f"section {i} of the penal code" for i in range(16)]
+    results = [None] * len(texts)
+
+    def work(i):
+        results[i] = encoder.encode([texts[i]])
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert CountingEncoder.calls < len(texts)
+    assert np.allclose(np.vstack(results), HashingEncoder(dimension=32).encode(texts))
+    assert encoder.stats()["texts"] == len(texts)
+    encoder.close()
+    with pytest.raises(RuntimeError):
+        encoder.encode(["closed"])
+
+
+def test_search_reranks_hydrated_hits():
+    from src.rerank.cross_encoder import OverlapScorer, Reranker
+
+    class TextAPI(RetrievalAPI):
+        def _hydrate(self, hits):
+            rendered = super()._hydrate(hits)
+            for item in rendered:
+                item["text"] = "murder under section 302" if item["chunk_id"] == 7 else "unrelated"
+            return rendered
+
+    engine = FusionEngine([SlowRetriever("bm25")])
+    app = TextAPI(engine, reranker=Reranker(OverlapScorer()), rerank_depth=20)
+    status, headers, body = asyncio.run(request(app, "POST", "/search", {"query": "s.302 murder", "k": 3}))
+    hits = json.loads(body)["hits"]
+    assert status == 200 and len(hits) == 3
+    assert hits[0]["chunk_id"] == 7 and hits[0]["score"] == 1.0 and "fused_score" in hits[0]
+    assert "rerank" in parse_server_timing(headers["server-timing"])
+    app.close()
+
+
+def test_cache_answers_repeats_and_is_invalidated():
+    from src.cache.query_cache import QueryCache
+
+    class CountingRetriever(SlowRetriever):
+        calls = 0
+
+        def search(self, query, k=10):
+            CountingRetriever.calls += 1
+            return super().search(query, k)
+
+    app = RetrievalAPI(FusionEngine([CountingRetriever("bm25")]), cache=QueryCache())
+    status, headers, _ = asyncio.run(request(app, "POST", "/search", {"query": "bail u/s 497", "k": 5}))
+    assert status == 200 and headers["x-cache"] == "miss"
+    status, headers, body = asyncio.run(request(app, "POST", "/search", {"query": "Bail Section 497", "k": 3}))
+    assert headers["x-cache"] == "exact" and len(json.loads(body)["hits"]) == 3
+    assert CountingRetriever.calls == 1
+
+    _, _, body = asyncio.run(request(app, "POST", "/cache/invalidate", {"statutes": ["s.497"]}))
+    assert json.loads(body) == {"invalidated": 1}
+    _, headers, _ = asyncio.run(request(app, "POST", "/search", {"query": "bail u/s 497", "k": 5}))
+    assert headers["x-cache"] == "miss" and CountingRetriever.calls == 2
+    app.close()
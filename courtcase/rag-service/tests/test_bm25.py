@@ -0,0 +1,134 @@
+"""
+Tests for the BM25 inverted index, its varint codec and legal tokenization
+"""
+import math
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from src.retrievers.bm25 import BLOCK_SIZE, BM25Index, idf
+from src.utils.corpus import CorpusChunk
+from src.utils.legal_text import tokenize
+from src.utils.varint import decode_varints, encode_varints
+
+
+def corpus(n, seed=7, start=0):
+    rng = random.Random(seed)
+    vocabulary = [f"term{i}" for i in range(300)]
+    chunks = []
+    for chunk_id in range(start, start + n):
+        words = [vocabulary[min(int(rng.paretovariate(1.0)) - 1, 299)] for _ in range(rng.randint(5, 60))]
+        if chunk_id % 17 == 0:
+            words.append("relying on 58 DLR 211 under section 302")
+        chunks.append(CorpusChunk(chunk_id, chunk_id // 4, " ".join(words)))
+    return chunks
+
+
+def brute_force(chunks, query, k, k1=1.2, b=0.75):
+    docs = {chunk.chunk_id: Counter(tokenize(chunk.text)) for chunk in chunks}
+    avgdl = sum(sum(counts.values()) for counts in docs.values()) / len(docs)
+    scores = Counter()
+    for term in dict.fromkeys(tokenize(query)):
+        df = sum(1 for counts in docs.values() if term in counts)
+        weight = math.log1p((len(docs) - df + 0.5) / (df + 0.5))
+        for chunk_id, counts in docs.items():
+            tf = counts.get(term, 0)
+            if tf:
+                length = sum(counts.values())
+                scores[chunk_id] += weight * tf * (k1 + 1) / (tf + k1 * (1 - b + b * length / avgdl))
+    return scores
+
+
+def assert_same_ranking(index, chunks, query, k=10):
+    """Same top-k scores as exhaustive scoring (ties may come in any order)"""
+    hits = index.search(query, k)
+    expected = brute_force(chunks, query, k)
+    assert [hit.score for hit in hits] == pytest.approx(sorted(expected.values(), reverse=True)[:k])
+    assert [hit.score for hit in hits] == pytest.approx([expected[hit.chunk_id] for hit in hits])
+
+
+def test_varints_round_trip():
+    values = np.array([0, 1, 127, 128, 300, 2 ** 35, 2 ** 63], dtype=np.uint64)
+    data = encode_varints(values)
+    assert len(data) == 1 + 1 + 1 + 2 + 2 + 6 + 10
+    assert decode_varints(data).tolist() == values.tolist()
+    assert decode_varints(b"").tolist() == []
+
+
+def test_tokenize_keeps_citations_and_sections():
+    assert tokenize("Relying on 58 DLR 211 and AIR 1950 SC 27") == ["relying", "58 dlr 211", "air 1950 sc 27"]
+    assert tokenize("(2004) 5 SCC 123; 58 DLR (AD) 211") == ["2004 5 scc 123", "58 dlr ad 211"]
+    assert tokenize("bail u/s 497 CrPC") == ["bail", "s.497", "crpc"]
+    assert tokenize("Section 302(1) and s. 34, Art. 21") == ["s.302", "s.302(1)", "s.34", "art.21"]
+    assert tokenize("under 302 IPC") == ["under", "302", "ipc"]
+
+
+def test_search_matches_brute_force_across_segments(tmp_path):
+    chunks = corpus(900)
+    index = BM25Index(tmp_path / "bm25", segment_size=250, merge_factor=10)
+    assert index.add(chunks) == 900
+    assert index.stats()["segments"] == 4
+
+    for query in ("term0 term1", "term3 term40 term250", "58 DLR 211 term2", "s. 302 term0 term5"):
+        assert_same_ranking(index, chunks, query)
+    assert index.search("58 dlr 211", 1)[0].document_id is not None
+
+
+def test_long_postings_use_block_lookups(tmp_path):
+    chunks = [CorpusChunk(i, None, "common " + ("rare" if i % 300 == 0 else "filler")) for i in range(BLOCK_SIZE * 10)]
+    index = BM25Index(tmp_path / "bm25")
+    index.add(chunks)
+    segment = index.segments[0]
+    common = segment.terms["common"]
+    assert segment.term_blocks[common + 1] - segment.term_blocks[common] == 10
+    assert segment.lookup(common, np.array([0, 300, 1279])).tolist() == [1, 1, 1]
+    assert_same_ranking(index, chunks, "rare common", k=3)
+
+
+def test_updates_deletes_and_merges(tmp_path):
+    chunks = corpus(600)
+    index = BM25Index(tmp_path / "bm25", segment_size=100, merge_factor=3)
+    index.add(chunks)
+    assert index.stats()["segments"] < 6  # tiers merged on the way
+
+    replaced = [CorpusChunk(5, 1, "term0 replacement text"), CorpusChunk(6, 1, "term1 other")]
+    index.add(replaced)
+    assert index.delete([7, 8, 9999]) == 2
+    live = [chunk for chunk in chunks if chunk.chunk_id not in (5, 6, 7, 8)] + replaced
+    assert index.num_docs == len(live)
+
+    index.optimize()
+    assert index.stats() | {"bytes": 0} == {"segments": 1, "docs": len(live), "deleted": 0,
+                                           "terms": index.stats()["terms"], "bytes": 0}
+    for query in ("term0 replacement", "term1 term2 term7"):
+        assert_same_ranking(index, live, query)
+
+    reopened = BM25Index(tmp_path / "bm25")
+    assert [hit.chunk_id for hit in reopened.search("replacement", 1)] == [5]
+    assert reopened.max_chunk_id() == 599
+
+
+def test_idf_stays_positive_with_tombstones(tmp_path):
+    index = BM25Index(tmp_path / "bm25", merge_factor=100)
+    index.add([CorpusChunk(i, i, "common" + (" rare" if i < 2 else "")) for i in range(10)])
+    index.add([CorpusChunk(10, 10, "common rare")])
+    # Under half tombstoned: not merged, so df("common") is still 11 of 7 live chunks
+    index.delete(range(2, 6))
+    assert index.stats()["deleted"] == 4
+
+    assert idf(11, 7) > 0
+    assert all(hit.score > 0 for hit in index.search("common", 3))
+
+
+def test_rechunked_documents_replace_their_chunks(tmp_path):
+    index = BM25Index(tmp_path / "bm25", segment_size=2)
+    index.add([CorpusChunk(1, 7, "old bail text"), CorpusChunk(2, 7, "old bail tail"), CorpusChunk(3, 8, "bail")])
+
+    # Document 7 re-chunked: new IDs, spread over two segments of this add
+    index.add([CorpusChunk(4, 7, "new bail text"), CorpusChunk(5, 7, "new bail"), CorpusChunk(6, 7, "new tail")],
+              replace_documents=True)
+
+    assert sorted(hit.chunk_id for hit in index.search("bail tail text", 10)) == [3, 4, 5, 6]
+    assert index.search("old", 10) == []
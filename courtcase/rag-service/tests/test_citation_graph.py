@@ -0,0 +1,99 @@
+"""
+Tests for the CSR citation graph and graph-expansion retrieval
+"""
+import time
+
+import numpy as np
+import pytest
+
+from src.graph.csr import CitationGraph, citation_key, section_key
+from src.retrievers.graph import CSRGraphRetriever
+
+CASES = [
+    ("seed", "58 DLR (AD) 211", 0.2),
+    ("precedent", "40 BLD 10", 0.9),
+    ("overruling", "70 DLR (AD) 5", 0.5),
+    ("later", "65 BLC 300", 0.1),
+    ("distinguishing", "66 BLC 12", 1.0),
+    ("unmapped", "50 MLR 1", 0.3),
+]
+EDGES = [
+    ("seed", "precedent", "CITES_PRECEDENT"),
+    ("overruling", "seed", "OVERRULES"),
+    ("later", "seed", "CITES"),
+    ("distinguishing", "seed", "DISTINGUISHES"),
+    ("unmapped", "seed", "CITES"),
+    ("seed", "seed", "CITES"),
+    ("seed", "nowhere", "CITES"),
+]
+APPLIES = [("seed", "Section 302"), ("precedent", "302"), ("later", "Section 302"), ("overruling", "497")]
+DOCUMENTS = {"seed": 1, "precedent": 2, "overruling": 3, "later": 4, "distinguishing": 5}
+
+
+@pytest.fixture
+def graph():
+    return CitationGraph.build(CASES, EDGES, APPLIES, DOCUMENTS)
+
+
+def test_keys_match_query_tokens():
+    assert citation_key("58 DLR (AD) 211") == "58 dlr ad 211"
+    assert section_key("Section 302") == section_key("302") == "s.302"
+    assert citation_key(None) is None and section_key("") is None
+
+
+def test_build_drops_self_loops_and_unknown_cases(graph):
+    assert graph.num_cases == 6 and graph.num_edges == 5
+    assert graph.stats()["sections"] == 2 and graph.stats()["mapped_documents"] == 5
+
+
+def test_neighbour_lists_are_presorted_and_bounded(graph):
+    seed = graph.case_index["seed"]
+    cases, _ = graph.neighbours(seed, "in", fanout=10)
+    assert [graph.case_ids[c] for c in cases][0] == "overruling"
+    assert len(graph.neighbours(seed, "in", fanout=2)[0]) == 2
+    # most authoritative appliers first
+    assert [graph.case_ids[c] for c in graph.section_cases_for("s.302", 10)] == ["precedent", "seed", "later"]
+
+
+def test_save_load_round_trip(graph, tmp_path):
+    graph.save(tmp_path / "graph")
+    loaded = CitationGraph.load(tmp_path / "graph")
+    assert isinstance(loaded.out_indices, np.memmap)
+    assert loaded.citations == graph.citations and loaded.document_cases == graph.document_cases
+    retriever, reloaded = CSRGraphRetriever(graph), CSRGraphRetriever(loaded)
+    assert reloaded.search("58 DLR (AD) 211", 10) == retriever.search("58 DLR (AD) 211", 10)
+
+
+def test_citation_query_expands_neighbourhood(graph):
+    hits = CSRGraphRetriever(graph).search("Is 58 DLR (AD) 211 still good law?", 10)
+    documents = [hit.document_id for hit in hits]
+    assert documents[:2] == [1, 3]  # the cited case, then the case overruling it
+    assert set(documents) == {1, 2, 3, 4, 5}
+    assert all(hit.chunk_id is None and hit.source == "graph" for hit in hits)
+
+
+def test_fanout_bounds_expansion(graph):
+    hits = CSRGraphRetriever(graph, fanout=1).search("58 DLR (AD) 211", 10)
+    assert [hit.document_id for hit in hits] == [1, 3, 2]
+
+
+def test_section_query_and_expand(graph):
+    retriever = CSRGraphRetriever(graph)
+    assert [hit.document_id for hit in retriever.search("murder under section 302", 10)] == [2, 1, 4]
+    assert retriever.search("no references here", 10) == []
+    expanded = [hit.document_id for hit in retriever.expand([2], 10)]
+    assert expanded == [2, 1]
+
+
+def test_expansion_is_fast_on_a_large_graph():
+    rng = np.random.default_rng(0)
+    n = 50000
+    cases = [(f"c{i}", f"{i} DLR 1", float(rng.random())) for i in range(n)]
+    edges = [(f"c{s}", f"c{t}", "CITES") for s, t in rng.integers(0, n, size=(300000, 2))]
+    graph = CitationGraph.build(cases, edges, case_documents={f"c{i}": i for i in range(n)})
+    retriever = CSRGraphRetriever(graph)
+    retriever.expand(list(range(10)), 10)
+    start = time.perf_counter()
+    for _ in range(20):
+        hits = retriever.expand(list(range(10)), 10)
+    assert hits and (time.perf_counter() - start) / 20 < 0.01
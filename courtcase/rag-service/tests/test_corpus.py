@@ -0,0 +1,63 @@
+"""
+Tests for reading the chunk corpus from PostgreSQL
+"""
+import pytest
+
+from src.utils.corpus import document_case_key, iter_document_chunks, load_case_documents
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+MIGRATIONS = [
+    "001_create_core_tables.sql",
+    "002_create_content_tables.sql",
+    "005_create_rag_tables.sql",
+    "013_partition_documents.sql",
+]
+
+
+@pytest.fixture
+def corpus_dsn(postgres_database):
+    dsn = postgres_database(MIGRATIONS)
+    conn = psycopg2.connect(dsn)
+    with conn, conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code, doc_type, doc_subtype,
+                                   title_full, doc_year, source_url, source_domain, metadata)
+            VALUES ('BD00000001', 'a.pdf', 'h', 'BD', 'CAS', 'HCD', 'A vs State', 2019, 'https://a', 'a',
+                    '{"court": "High Court Division"}'),
+                   ('BD00000002', 'b.pdf', 'h', 'BD', 'ACT', NULL, 'Penal Code', 1860, 'https://b', 'b', '{}')
+            RETURNING id
+        """)
+        case_id, act_id = (row[0] for row in cursor.fetchall())
+        cursor.execute("""
+            INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text, chunk_level,
+                                         section_title, child_chunk_count)
+            VALUES (%(case)s, 'BD', 0, 'JUDGMENT', 'section', 'JUDGMENT', 1),
+                   (%(case)s, 'BD', 1, 'The appeal is dismissed.', 'paragraph', 'JUDGMENT', 0),
+                   (%(act)s, 'BD', 0, 'Whoever commits murder', 'paragraph', NULL, NULL)
+        """, {"case": case_id, "act": act_id})
+    conn.close()
+    return dsn, case_id, act_id
+
+
+def test_chunks_stream_leaves_with_document_facets(corpus_dsn):
+    dsn, case_id, act_id = corpus_dsn
+
+    chunks = list(iter_document_chunks(dsn, batch_size=1))
+
+    assert [(c.document_id, c.text) for c in chunks] == [
+        (case_id, "The appeal is dismissed."), (act_id, "Whoever commits murder")
+    ]
+    assert chunks[0].metadata == {"country_code": "BD", "chunk_index": 1, "section_title": "JUDGMENT",
+                                  "year": 2019, "court": "High Court Division"}
+    assert chunks[1].metadata["court"] is None
+    assert list(iter_document_chunks(dsn, after_id=chunks[0].chunk_id)) == chunks[1:]
+
+
+def test_case_documents_map_row_and_title_keys(corpus_dsn):
+    dsn, case_id, _act_id = corpus_dsn
+
+    case_documents = load_case_documents(dsn)
+
+    assert case_documents[document_case_key(case_id)] == case_id
+    assert len(case_documents) == 2  # the act is not a case
@@ -0,0 +1,64 @@
+"""
+Tests for retrieval metrics, the synthetic corpus and the benchmark harness
+"""
+import json
+
+import pytest
+
+from src.evaluation.harness import compare, run_benchmark
+from src.evaluation.metrics import evaluate, ndcg_at_k, ranked_documents, recall_at_k, reciprocal_rank
+from src.evaluation.synthetic import synthetic_corpus
+from src.utils.hits import SearchHit
+
+
+def test_metrics():
+    relevant = {1: 2, 2: 1, 9: 1}
+    ranking = [5, 1, 2, 7]
+    assert recall_at_k(ranking, relevant, 3) == pytest.approx(2 / 3)
+    assert reciprocal_rank(ranking, relevant, 10) == 0.5
+    assert reciprocal_rank(ranking, relevant, 1) == 0.0
+    assert ndcg_at_k([1, 2, 9], relevant, 3) == pytest.approx(1.0)
+    assert 0 < ndcg_at_k(ranking, relevant, 3) < ndcg_at_k([1, 5, 2], relevant, 3) < 1
+    assert ranked_documents([SearchHit(1, 1.0, 7), SearchHit(2, 0.9, 7), SearchHit(3, 0.8, None),
+                             SearchHit(None, 0.5, 3)]) == [7, 3]
+    assert evaluate([[1], [5]], [{1: 1}, {1: 1}], [1]) == {"queries": 2, "mrr": 0.5, "recall@1": 0.5, "ndcg@1": 0.5}
+
+
+def test_synthetic_corpus_is_deterministic_and_labelled():
+    chunks, queries = synthetic_corpus(documents=50, seed=3, queries_per_type=10)
+    again, same_queries = synthetic_corpus(documents=50, seed=3, queries_per_type=10)
+    assert [c.text for c in chunks] == [c.text for c in again] and queries == same_queries
+    assert {q["type"] for q in queries} == {"citation", "section", "fact"}
+    documents = {c.document_id for c in chunks}
+    for query in queries:
+        assert query["relevant"] and set(query["relevant"]) <= documents
+    citation = next(q for q in queries if q["type"] == "citation")
+    answer = next(doc for doc, grade in citation["relevant"].items() if grade == 2)
+    assert any(citation["query"] in c.text for c in chunks if c.document_id == answer)
+
+
+def test_harness_report(tmp_path):
+    config = {
+        "corpus": {"synthetic": {"documents": 120, "seed": 1, "queries_per_type": 15}},
+        "k": [5, 1],
+        "retrievers": {"bm25": {}, "vector": {"encoder": "hashing", "dimension": 64, "dtype": "int8"}},
+        "fusion": [{"name": "rrf", "method": "rrf"}, {"name": "bm25-only", "retrievers": ["bm25"]}],
+    }
+    report = run_benchmark(config, tmp_path / "work")
+    assert report["k"] == [1, 5]
+    assert set(report["systems"]) == {"bm25", "vector", "fusion:rrf", "fusion:bm25-only"}
+    assert report["corpus"]["queries"] == {"citation": 15, "fact": 15, "section": 15}
+
+    bm25 = report["systems"]["bm25"]
+    assert set(bm25["metrics"]) == {"all", "citation", "fact", "section"}
+    assert bm25["metrics"]["citation"]["mrr"] > 0.9  # citations are single BM25 tokens
+    assert {"p50", "p95", "p99"} == set(bm25["latency_ms"])
+    for stats in report["indexes"].values():
+        assert stats["bytes"] > 0 and stats["chunks_per_second"] > 0 and stats["peak_memory_mb"] > 0
+    # same corpus and index: fusing one retriever reproduces its ranking
+    assert report["systems"]["fusion:bm25-only"]["metrics"] == bm25["metrics"]
+
+    json.dumps(report)
+    changed = json.loads(json.dumps(report))
+    changed["systems"]["bm25"]["metrics"]["all"]["mrr"] -= 0.1
+    assert any(line.startswith("bm25 mrr:") for line in compare(report, changed))
@@ -0,0 +1,156 @@
+"""
+Tests for facet posting sets, filter masks and their pushdown into the retrievers
+"""
+import asyncio
+import json
+
+import numpy as np
+import pytest
+
+from src.api.app import RetrievalAPI
+from src.embeddings.ann_index import VectorFilter, VectorIndex
+from src.embeddings.benchmark import clustered_vectors
+from src.filters.bitmaps import DocumentFilter, FacetIndex
+from src.fusion.engine import FusionEngine
+from src.retrievers.base import Retriever, SearchHit
+from src.retrievers.bm25 import BM25Index
+from src.utils.corpus import CorpusChunk
+
+from tests.test_api import request
+
+COURTS = ["High Court Division", "Appellate Division", "Supreme Court"]
+STATUSES = ["GOOD", "OVR", "GOOD", None]
+
+
+def rows(n=200):
+    """(id, court, year, jurisdiction, subject_primary, legal_status); IDs are sparse"""
+    return [(3 * i + 1, COURTS[i % 3], 1990 + i % 30 if i % 25 else None, "BD" if i % 2 else "IN",
+             "CRM" if i % 4 else "CIV", STATUSES[i % 4]) for i in range(n)]
+
+
+@pytest.fixture
+def facets():
+    return FacetIndex.build(rows())
+
+
+def expected(predicate):
+    return {row[0] for row in rows() if predicate(row)}
+
+
+def allowed_ids(mask):
+    return set(np.flatnonzero(mask).tolist())
+
+
+def test_masks_compose_facets(facets):
+    mask = facets.mask(DocumentFilter(court=["high court division", "Supreme Court"], year_from=2000,
+                                      jurisdiction=["BD"], exclude={"legal_status": ["OVR"]}))
+    assert allowed_ids(mask) == expected(lambda r: r[1] != "Appellate Division" and r[2] and r[2] >= 2000
+                                         and r[3] == "BD" and r[5] != "OVR")
+    assert facets.mask(DocumentFilter()) is None
+    assert not facets.mask(DocumentFilter(court=["Privy Council"])).any()
+    # masks of repeated filters come from the cache and are read-only
+    again = facets.mask(DocumentFilter(jurisdiction=["BD"], exclude={"legal_status": ["OVR"]}, year_from=2000,
+                                       court=["Supreme Court", "High Court Division"]))
+    assert again is mask and not again.flags.writeable and facets.counts["hits"] == 1
+
+
+def test_facet_counts_ignore_own_clause(facets):
+    document_filter = DocumentFilter(court=["Appellate Division"], subject_primary=["CIV"])
+    counts = facets.facet_counts(document_filter)
+    assert counts["court"]["Supreme Court"] == len(expected(lambda r: r[1] == "Supreme Court" and r[4] == "CIV"))
+    assert counts["subject_primary"]["CRM"] == len(expected(lambda r: r[1] == "Appellate Division"
+                                                            and r[4] == "CRM"))
+    assert sum(counts["jurisdiction"].values()) == int(facets.mask(document_filter).sum())
+    assert list(counts["year"]) == sorted(counts["year"], key=int)
+    assert len(facets.facet_counts(limit=2)["court"]) == 2
+
+
+def test_save_load_round_trip(facets, tmp_path):
+    facets.save(tmp_path / "facets")
+    loaded = FacetIndex.load(tmp_path / "facets")
+    document_filter = DocumentFilter(year_from=1995, year_to=1999, legal_status=["GOOD"])
+    assert np.array_equal(loaded.mask(document_filter), facets.mask(document_filter))
+    assert loaded.facet_counts() == facets.facet_counts()
+
+
+def test_build_from_documents_table(postgres_database):
+    psycopg2 = pytest.importorskip("psycopg2")
+    dsn = postgres_database(["001_create_core_tables.sql", "002_create_content_tables.sql",
+                             "005_create_rag_tables.sql", "013_partition_documents.sql"])
+    conn = psycopg2.connect(dsn)
+    with conn, conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code, doc_type, title_full,
+                                   doc_year, source_url, source_domain, subject_primary, legal_status, metadata)
+            VALUES ('BD00000001', 'a.pdf', 'h', 'BD', 'CAS', 'A', 2001, 'u', 'd', 'CRM', 'ACT',
+                    '{"court": "High Court Division"}'),
+                   ('IN00000002', 'b.pdf', 'h', 'IN', 'CAS', 'B', 1999, 'u', 'd', 'CIV', NULL,
+                    '{"court": "Supreme Court"}'),
+                   ('BD00000003', 'c.pdf', 'h', 'BD', 'ACT', 'C', 1860, 'u', 'd', 'CRM', NULL, '{}')
+            RETURNING id
+        """)
+        first, second, third = (row[0] for row in cursor.fetchall())
+    conn.close()
+
+    facets = FacetIndex.from_database(dsn, batch_size=2)
+
+    assert len(facets) == 3
+    assert allowed_ids(facets.mask(DocumentFilter(court=["high court division"]))) == {first}
+    assert allowed_ids(facets.mask(DocumentFilter(jurisdiction=["BD"], subject_primary=["CRM"]))) == {first, third}
+    assert allowed_ids(facets.mask(DocumentFilter(year_to=2000, exclude={"court": ["Supreme Court"]}))) == {third}
+    assert facets.facet_counts()["court"] == {"High Court Division": 1, "Supreme Court": 1}
+
+
+def test_filter_parsing():
+    parsed = DocumentFilter.from_dict({"court": "Supreme Court", "year_from": "2001",
+                                       "exclude": {"legal_status": "OVR"}})
+    assert parsed.to_dict() == {"court": ["Supreme Court"], "year_from": 2001, "exclude": {"legal_status": ["OVR"]}}
+    for bad in ({"bench": ["x"]}, {"year_to": "recent"}, {"court": {"a": 1}}, {"exclude": {"year": ["2001"]}}):
+        with pytest.raises(ValueError):
+            DocumentFilter.from_dict(bad)
+
+
+def test_bm25_mask_is_pushed_into_postings(tmp_path):
+    index = BM25Index(tmp_path / "bm25")
+    index.add([CorpusChunk(i, i // 2, f"bail application number {i}" + " bail" * (i % 7)) for i in range(400)])
+    mask = np.zeros(300, dtype=bool)
+    mask[[5, 17, 150]] = True
+    hits = index.search_filtered("bail", 10, mask)
+    assert {hit.document_id for hit in hits} == {5, 17, 150} and len(hits) == 6
+    unfiltered = {hit.chunk_id: hit.score for hit in index.search("bail", 400)}
+    assert all(unfiltered[hit.chunk_id] == pytest.approx(hit.score) for hit in hits)
+
+
+def test_vector_mask_restricts_rows(tmp_path):
+    data = clustered_vectors(2000, 16, clusters=10)
+    index = VectorIndex(tmp_path / "vectors", dimension=16, train_size=500)
+    index.add(range(len(data)), data, [i % 100 for i in range(len(data))])
+    mask = np.zeros(100, dtype=bool)
+    mask[[3, 42]] = True
+    hits = index.search(data[0], 10, filters=VectorFilter(documents=mask))
+    assert len(hits) == 10 and {hit.document_id for hit in hits} <= {3, 42}
+
+
+def test_api_filters_search_and_counts(facets):
+    class DocumentRetriever(Retriever):
+        name = "bm25"
+
+        def search(self, query, k=10):
+            return [SearchHit(i, 1.0 / (i + 1), i) for i in range(k)]
+
+    app = RetrievalAPI(FusionEngine([DocumentRetriever()], depth=100), facets=facets)
+    body = {"query": "murder", "k": 5, "filters": {"court": ["Supreme Court"], "legal_status": ["GOOD"]}}
+    status, _, response = asyncio.run(request(app, "POST", "/search", body))
+    payload = json.loads(response)
+    allowed = expected(lambda r: r[1] == "Supreme Court" and r[5] == "GOOD")
+    assert status == 200 and payload["filters"] == body["filters"]
+    assert [hit["document_id"] for hit in payload["hits"]] == sorted(allowed)[:5]
+
+    status, _, response = asyncio.run(request(app, "GET", "/facets", query_string=b"jurisdiction=IN"))
+    counts = json.loads(response)
+    assert status == 200 and counts["documents"] == len(expected(lambda r: r[3] == "IN"))
+    assert counts["facets"]["jurisdiction"]["BD"] == 100
+
+    status, _, response = asyncio.run(request(app, "POST", "/search", {"query": "x", "filters": {"bench": 1}}))
+    assert status == 400 and "bench" in json.loads(response)["error"]
+    app.close()
@@ -0,0 +1,92 @@
+"""
+Tests for rank fusion, the concurrent FusionEngine and graph query parsing
+"""
+import time
+
+import pytest
+
+from src.fusion.engine import FusionEngine, fuse
+from src.retrievers.base import Retriever, SearchHit
+from src.retrievers.graph import query_references, section_spellings
+
+
+class FakeRetriever(Retriever):
+    def __init__(self, name, hits, delay=0.0, fail=False):
+        self.name, self.hits, self.delay, self.fail = name, hits, delay, fail
+
+    def search(self, query, k=10):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        return self.hits[:k]
+
+
+def hit(chunk_id, score, document_id=None):
+    return SearchHit(chunk_id, score, document_id)
+
+
+def test_rrf_merges_chunks_of_a_document():
+    results = {
+        "bm25": [hit(1, 9.0, 10), hit(2, 8.0, 10), hit(3, 7.0, 20)],
+        "vector": [hit(3, 0.9, 20), hit(4, 0.8, 30)],
+        "graph": [hit(None, 1.0, 20)],
+    }
+    fused = fuse(results, k=10)
+    assert [h.document_id for h in fused] == [20, 10, 30]
+    assert fused[0].chunk_id == 3 and set(fused[0].sources) == {"bm25", "vector", "graph"}
+    assert fused[0].score == pytest.approx(2 / 61 + 1 / 62)
+    # document 10 is ranked once per retriever, at its best chunk
+    assert fused[1].chunk_id == 1 and fused[1].score == pytest.approx(1 / 61)
+
+    by_chunk = fuse(results, k=10, by_document=False)
+    assert [(h.chunk_id, h.document_id) for h in by_chunk][:2] == [(3, 20), (1, 10)]
+    assert (None, 20) in [(h.chunk_id, h.document_id) for h in by_chunk]
+
+
+def test_weighted_minmax():
+    results = {"bm25": [hit(1, 10.0), hit(2, 5.0), hit(3, 0.0)], "vector": [hit(3, 0.9), hit(1, 0.1)]}
+    fused = fuse(results, method="minmax", weights={"bm25": 1.0, "vector": 3.0})
+    assert [h.chunk_id for h in fused] == [3, 1, 2]
+    assert [h.score for h in fused] == pytest.approx([3.0, 1.0, 0.5])
+    with pytest.raises(ValueError):
+        fuse(results, method="borda")
+
+
+def test_stream_is_progressive_and_slow_retrievers_miss_their_deadline():
+    engine = FusionEngine(
+        [
+            FakeRetriever("bm25", [hit(1, 5.0, 1)]),
+            FakeRetriever("vector", [hit(2, 0.9, 2)], delay=0.05),
+            FakeRetriever("graph", [hit(None, 1.0, 3)], delay=2.0),
+        ],
+        deadlines={"graph": 0.2},
+    )
+    start = time.perf_counter()
+    results = list(engine.stream("query", k=5))
+    assert time.perf_counter() - start < 1.0
+
+    assert [r.complete for r in results] == [False, False, True]
+    assert [h.document_id for h in results[0].hits] == [1]
+    final = results[-1]
+    assert {h.document_id for h in final.hits} == {1, 2}
+    assert final.reports["graph"].status == "timeout"
+    assert final.reports["vector"].status == "ok" and final.reports["vector"].latency_ms >= 50
+    assert final.reports["bm25"].contributed == 1 and final.reports["bm25"].share == pytest.approx(0.5)
+    engine.close()
+
+
+def test_failed_retriever_is_reported_not_raised():
+    engine = FusionEngine([FakeRetriever("bm25", [hit(1, 1.0)]), FakeRetriever("graph", [], fail=True)])
+    result = engine.search("query")
+    assert [h.chunk_id for h in result.hits] == [1] and result.complete
+    assert result.reports["graph"].status == "error" and "backend down" in result.reports["graph"].error
+    engine.close()
+    with pytest.raises(ValueError):
+        FusionEngine([FakeRetriever("bm25", []), FakeRetriever("bm25", [])])
+
+
+def test_graph_query_references():
+    citations, sections = query_references("bail u/s 497 CrPC, see 58 DLR (AD) 211 and Section 302(1)")
+    assert citations == ["58 dlr ad 211"]
+    assert sections == ["497", "302"]
+    assert section_spellings(["302"]) == ["Section 302", "302", "s. 302"]
@@ -0,0 +1,104 @@
+"""
+Tests for collapsing leaf hits to their covering ancestor chunks
+"""
+import json
+import asyncio
+
+import pytest
+
+from src.api.app import create_app, parse_args
+from src.retrievers.base import Retriever, SearchHit
+from src.retrievers.bm25 import BM25Index
+from src.retrievers.hierarchy import ChunkHierarchy, HierarchicalRetriever
+from src.utils.corpus import iter_document_chunks
+from tests.test_api import request
+
+# document 1: chunk 100 (document) -> sections 101, 105 -> paragraphs 102-104, 106-107;
+# paragraph 108 hangs off the document directly
+# document 2: flat chunks 200, 201
+MIGRATIONS = [
+    "001_create_core_tables.sql",
+    "002_create_content_tables.sql",
+    "005_create_rag_tables.sql",
+    "013_partition_documents.sql",
+    "017_hierarchical_chunks.sql",
+]
+
+LINKS = [(101, 100), (102, 101), (103, 101), (104, 101), (105, 100), (106, 105), (107, 105), (108, 100)]
+
+
+def hit(chunk_id, score, document_id):
+    return SearchHit(chunk_id, score, document_id, "bm25")
+
+
+def test_paths_and_flat_chunks():
+    hierarchy = ChunkHierarchy.from_pairs(reversed(LINKS))
+    assert hierarchy.path(103) == [100, 101, 103]
+    assert hierarchy.path(108) == [100, 108]
+    assert hierarchy.path(200) == [200] and hierarchy.path(100) == [100]
+
+
+def test_collapse_to_smallest_covering_ancestor():
+    hierarchy = ChunkHierarchy.from_pairs(LINKS)
+    hits = [hit(103, 9.0, 1), hit(200, 8.0, 2), hit(102, 7.0, 1), hit(106, 6.0, 1), hit(201, 5.0, 2),
+            hit(None, 4.0, 3), hit(108, 3.0, 1)]
+    collapsed = hierarchy.collapse(hits)
+    # paragraphs 103 and 102 become their section, 106 stays alone; nothing widens to the document
+    assert [(h.chunk_id, h.score) for h in collapsed] == [(101, 9.0), (200, 8.0), (106, 6.0), (201, 5.0),
+                                                          (None, 4.0), (108, 3.0)]
+    assert [h.chunk_id for h in hierarchy.collapse(hits, min_depth=0)] == [100, 200, 201, None]
+
+
+def test_collapse_chunks_through_the_api(tmp_path, postgres_database):
+    psycopg2 = pytest.importorskip("psycopg2")
+    dsn = postgres_database(MIGRATIONS)
+    conn = psycopg2.connect(dsn)
+    with conn, conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code, doc_type,
+                                   title_full, doc_year, source_url, source_domain)
+            VALUES ('BD00000001', 'a.pdf', 'h', 'BD', 'CAS', 'A vs State', 2019, 'https://a', 'a')
+            RETURNING id
+        """)
+        document_id = cursor.fetchone()[0]
+
+        def insert(index, text, level, parent=None, children=0):
+            cursor.execute("""
+                INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text, chunk_level,
+                                             parent_chunk_id, child_chunk_count)
+                VALUES (%s, 'BD', %s, %s, %s, %s, %s) RETURNING id
+            """, (document_id, index, text, level, parent, children))
+            return cursor.fetchone()[0]
+
+        root = insert(0, "JUDGMENT", "document", children=2)
+        section = insert(1, "Bail", "section", root, children=3)
+        leaves = [insert(2 + i, f"bail under s.497 ground {i}", "paragraph", section) for i in range(3)]
+        other = insert(5, "The appeal is dismissed", "section", root, children=0)
+    conn.close()
+
+    index = BM25Index(tmp_path / "bm25")
+    assert index.add(iter_document_chunks(dsn)) == len(leaves) + 1
+    app = create_app(parse_args(["--bm25", str(tmp_path / "bm25"), "--dsn", dsn, "--collapse-chunks",
+                                 "--cache-ttl", "0"]))
+    try:
+        assert app.engine.by_document is False
+        status, _, body = asyncio.run(request(app, "POST", "/search", {"query": "bail s.497 appeal", "k": 5}))
+    finally:
+        app.close()
+
+    assert status == 200
+    # The three paragraph hits become their section; the unrelated section stays itself
+    assert sorted((hit["chunk_id"], hit["document_id"]) for hit in json.loads(body)["hits"]) == \
+        [(section, document_id), (other, document_id)]
+
+
+def test_hierarchical_retriever_overfetches_leaves():
+    class Leaves(Retriever):
+        name = "bm25"
+
+        def search(self, query, k=10):
+            return [hit(c, 10.0 - i, 1) for i, c in enumerate([102, 103, 104, 106, 107, 108])][:k]
+
+    retriever = HierarchicalRetriever(Leaves(), ChunkHierarchy.from_pairs(LINKS))
+    assert retriever.name == "bm25"
+    assert [h.chunk_id for h in retriever.search("q", 2)] == [101, 105]
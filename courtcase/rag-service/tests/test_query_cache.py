@@ -0,0 +1,75 @@
+"""
+Tests for the two-level query cache
+"""
+from src.cache.query_cache import IngestScope, QueryCache, canonical_filters
+from src.embeddings.encoders import HashingEncoder
+from src.utils.corpus import CorpusChunk
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_exact_level_normalizes_query_and_filters():
+    cache = QueryCache()
+    cache.put("Bail under Section 497 CrPC", {"courts": ["HCD", "AD"], "year_from": None}, "answer")
+    hit = cache.get("bail under s. 497 crpc", {"courts": ["AD", "HCD"]})
+    assert hit.value == "answer" and hit.level == "exact"
+    assert cache.get("bail under s. 497 crpc", {"courts": ["AD"]}) is None
+    assert canonical_filters({"b": [2, 1], "a": 1}) == canonical_filters({"a": 1, "b": (1, 2), "c": []})
+
+
+def test_semantic_level_requires_same_legal_references():
+    cache = QueryCache(HashingEncoder(dimension=512), threshold=0.8)
+    cache.put("anticipatory bail under section 497 of the code of criminal procedure", None, "s497")
+    hit = cache.get("anticipatory bail under s.497 code of criminal procedure granted", None)
+    assert hit.level == "semantic" and hit.value == "s497" and 0.8 <= hit.similarity < 1.0
+    # nearly the same words, different section: never reused
+    assert cache.get("anticipatory bail under section 498 of the code of criminal procedure", None) is None
+    assert cache.stats()["semantic"] == 1 and cache.stats()["miss"] == 1
+
+
+def test_ttl_and_capacity():
+    clock = Clock()
+    cache = QueryCache(ttl=10, capacity=2, clock=clock)
+    cache.put("a", None, 1)
+    cache.put("b", None, 2)
+    clock.now = 5
+    assert cache.get("a").value == 1  # a is now most recent
+    cache.put("c", None, 3)
+    assert cache.get("b") is None and len(cache) == 2
+    clock.now = 11
+    assert cache.get("a") is None and cache.stats()["expired"] == 1
+
+
+def test_invalidation_by_court_and_statute():
+    cache = QueryCache()
+    cache.put("bail s.497 crpc", {"courts": ["HCD"]}, 1)
+    cache.put("murder s.302", {"courts": ["AD"]}, 2)
+    cache.put("land acquisition compensation", None, 3)
+    cache.put("writ under article 102", {"courts": ["AD"]}, 4)
+
+    # a new HCD judgment: HCD-filtered and unfiltered answers may change
+    assert cache.invalidate(courts=["HCD"]) == 2
+    assert cache.get("murder s.302", {"courts": ["AD"]}).value == 2
+    assert cache.invalidate(statutes=["Section 302"]) == 1
+    assert cache.invalidate(statutes=["Art. 102"]) == 1 and len(cache) == 0
+
+
+def test_ingest_scope_from_chunks():
+    chunks = [
+        CorpusChunk(1, 1, "convicted under section 302 of the Penal Code", {"court": "AD"}),
+        CorpusChunk(2, 1, "bail u/s 497 CrPC was refused", {}),
+    ]
+    scope = IngestScope()
+    assert [chunk.chunk_id for chunk in scope.observe(chunks)] == [1, 2]
+    assert scope.courts == {"AD"} and scope.statutes == {"s.302", "s.497", "crpc"}
+
+    cache = QueryCache()
+    cache.put("bail crpc", {"courts": ["HCD"]}, 1)
+    cache.put("tenancy", {"courts": ["HCD"]}, 2)
+    assert cache.invalidate_chunks(chunks) == 1 and cache.get("tenancy", {"courts": ["HCD"]}).value == 2
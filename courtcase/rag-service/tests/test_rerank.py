@@ -0,0 +1,94 @@
+"""
+Tests for the cross-encoder reranking stage (with the model-free OverlapScorer)
+"""
+import threading
+
+import numpy as np
+
+from src.rerank.cross_encoder import OverlapScorer, PairScorer, Reranker, ScoreCache, normalize_query
+
+
+class CountingScorer(PairScorer):
+    def __init__(self, scorer=None):
+        self.scorer = scorer or OverlapScorer()
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def score(self, query, texts):
+        with self.lock:
+            self.batches.append(len(texts))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return self.scorer.score(query, texts)
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+TEXTS = [
+    "land acquisition compensation",
+    "the accused was convicted under section 302 of the Penal Code",
+    "bail refused",
+    "s. 302 Penal Code murder appeal dismissed",
+    "writ petition under article 102",
+]
+
+
+def test_rerank_orders_by_pair_score():
+    reranker = Reranker(OverlapScorer(), min_batch=2)
+    result = reranker.rerank("murder appeal, Section 302 Penal Code", TEXTS, k=2)
+    assert result.order[:2] == [3, 1]
+    assert sorted(result.order) == list(range(len(TEXTS)))
+    assert result.computed == len(TEXTS) and result.cached == 0
+
+
+def test_repeated_query_is_served_from_cache():
+    scorer = CountingScorer()
+    reranker = Reranker(scorer)
+    first = reranker.rerank("s. 302 Penal Code", TEXTS, k=2)
+    # same section, different spelling: same normalized query
+    assert normalize_query("Section 302 of the Penal Code") == normalize_query("s.302 penal code")
+    second = reranker.rerank("s.302 penal code", TEXTS, k=2)
+    assert second.order == first.order and second.computed == 0 and second.cached == len(TEXTS)
+    assert sum(scorer.batches) == len(TEXTS)
+    assert reranker.stats()["cache_hits"] == len(TEXTS)
+
+
+def test_early_stop_when_top_k_is_stable():
+    # relevant candidates first (as a good first stage delivers them), then a long tail
+    texts = ["section 302 murder appeal"] * 3 + [f"unrelated tenancy matter {i}" for i in range(200)]
+    texts = [f"{text} #{i}" for i, text in enumerate(texts)]
+    scorer = CountingScorer()
+    reranker = Reranker(scorer, min_batch=4, max_batch=4, patience=2)
+    result = reranker.rerank("murder section 302", texts, k=3)
+    assert result.early_stop and result.computed < len(texts)
+    assert result.order[:3] == [0, 1, 2]
+    assert result.scores[-1] is None and len(result.order) == len(texts)
+
+
+def test_batches_adapt_and_concurrency_is_bounded():
+    scorer = CountingScorer()
+    reranker = Reranker(scorer, min_batch=2, max_batch=32, target_batch_ms=1000, patience=100, max_concurrent=2)
+    texts = [f"judgment paragraph {i} on section {i % 7}" for i in range(100)]
+
+    threads = [threading.Thread(target=reranker.rerank, args=(f"section {i}", texts, 5)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert scorer.peak <= 2
+    assert max(scorer.batches) > 2  # fast scorer: batches grow towards max_batch
+    assert max(scorer.batches) <= 32
+
+
+def test_lru_cache_evicts_least_recent():
+    cache = ScoreCache(capacity=2)
+    cache.put(("q", "a"), 1.0)
+    cache.put(("q", "b"), 2.0)
+    assert cache.get(("q", "a")) == 1.0
+    cache.put(("q", "c"), 3.0)
+    assert cache.get(("q", "b")) is None and len(cache) == 2
+    assert np.isclose(cache.get(("q", "c")), 3.0)
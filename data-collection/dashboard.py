@@ -6,11 +6,12 @@ Flask-based web dashboard to monitor scraping progress
 
 from flask import Flask, render_template, jsonify
 import json
-import sqlite3
 from pathlib import Path
 from datetime import datetime, timedelta
 import os
 
+from src.sqlite_profile import open_connection
+
 app = Flask(__name__)
 
 # Configuration
@@ -21,8 +22,11 @@ PROXY_TEST_REPORT = 'config/proxy_test_report.json'
 
 def get_db_stats():
     """Get statistics from database"""
+    conn = None
     try:
-        conn = sqlite3.connect(DATABASE_PATH)
+        # Short-lived read-only WAL reader: never blocks the scrapers writing to
+        # this file, and is closed per request (Flask serves each on a new thread)
+        conn = open_connection(DATABASE_PATH, read_only=True)
         cursor = conn.cursor()
 
         # Total cases
@@ -49,8 +53,6 @@ def get_db_stats():
         """)
         recent_cases = cursor.fetchall()
 
-        conn.close()
-
         return {
             'total_cases': total_cases,
             'pdfs_downloaded': pdfs_downloaded,
@@ -73,6 +75,9 @@ def get_db_stats():
             'added_today': 0,
             'recent_cases': []
         }
+    finally:
+        if conn is not None:
+            conn.close()
 
 
 def get_proxy_stats():
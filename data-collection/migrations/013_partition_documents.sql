@@ -0,0 +1,314 @@
+-- Migration 013: Partition documents and document_chunks by country_code
+-- Converts the two largest tables to LIST partitions (BD, IN, PK, US, UK + default)
+-- World-Class Legal RAG System - Phase 4
+--
+-- A partitioned table's primary key and unique constraints must include the
+-- partition key, so documents.id is no longer unique on its own. Every table
+-- that references documents(id) is re-pointed at document_registry(id), a
+-- narrow (id, country_code) table kept in sync by triggers. ON DELETE
+-- CASCADE / SET NULL behaviour is unchanged: deleting a document deletes its
+-- registry row, which cascades to the child tables exactly as before.
+--
+-- Unique constraints become (column, country_code). global_id and
+-- filename_universal already embed the country code, so this is equivalent.
+--
+-- Dependent views, materialized views, indexes and triggers are captured
+-- before the swap and recreated afterwards from their catalog definitions.
+--
+-- Requires PostgreSQL 15+ (ON DELETE SET NULL with a column list).
+-- Runs in a single transaction; takes an ACCESS EXCLUSIVE lock on both tables.
+
+BEGIN;
+
+-- ============================================================================
+-- STEP 1: Save and drop everything that pins the old tables
+-- ============================================================================
+
+CREATE TEMP TABLE _saved_views (
+    view_name TEXT,
+    view_kind CHAR(1),
+    view_def TEXT,
+    depth INTEGER
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE _saved_indexes (
+    table_name TEXT,
+    index_def TEXT,
+    is_unique BOOLEAN
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE _saved_triggers (
+    trigger_def TEXT
+) ON COMMIT DROP;
+
+CREATE TEMP TABLE _saved_foreign_keys (
+    table_name TEXT,
+    constraint_name TEXT,
+    constraint_def TEXT
+) ON COMMIT DROP;
+
+-- Views and materialized views (transitively) depending on either table
+WITH RECURSIVE deps AS (
+    SELECT DISTINCT v.oid, 1 AS depth
+    FROM pg_depend d
+    JOIN pg_rewrite r ON r.oid = d.objid
+    JOIN pg_class v ON v.oid = r.ev_class
+    WHERE d.refobjid IN ('documents'::regclass, 'document_chunks'::regclass)
+      AND v.relkind IN ('v', 'm')
+    UNION
+    SELECT v.oid, deps.depth + 1
+    FROM deps
+    JOIN pg_depend d ON d.refobjid = deps.oid
+    JOIN pg_rewrite r ON r.oid = d.objid
+    JOIN pg_class v ON v.oid = r.ev_class
+    WHERE v.oid <> deps.oid
+      AND v.relkind IN ('v', 'm')
+)
+INSERT INTO _saved_views
+SELECT c.relname, c.relkind, pg_get_viewdef(c.oid), MAX(deps.depth)
+FROM deps
+JOIN pg_class c ON c.oid = deps.oid
+GROUP BY c.oid, c.relname, c.relkind;
+
+-- Indexes on materialized views are dropped with them
+INSERT INTO _saved_indexes
+SELECT i.tablename, i.indexdef, FALSE
+FROM pg_indexes i
+JOIN _saved_views v ON v.view_name = i.tablename AND v.view_kind = 'm'
+WHERE i.schemaname = 'public';
+
+-- Plain indexes on the two tables (constraint-backed indexes are rebuilt below)
+INSERT INTO _saved_indexes
+SELECT c.relname, pg_get_indexdef(x.indexrelid), x.indisunique
+FROM pg_index x
+JOIN pg_class c ON c.oid = x.indrelid
+WHERE x.indrelid IN ('documents'::regclass, 'document_chunks'::regclass)
+  AND NOT EXISTS (SELECT 1 FROM pg_constraint k WHERE k.conindid = x.indexrelid);
+
+-- User triggers on the two tables
+INSERT INTO _saved_triggers
+SELECT pg_get_triggerdef(t.oid)
+FROM pg_trigger t
+WHERE t.tgrelid IN ('documents'::regclass, 'document_chunks'::regclass)
+  AND NOT t.tgisinternal;
+
+-- Foreign keys pointing at documents(id), from any table
+INSERT INTO _saved_foreign_keys
+SELECT k.conrelid::regclass::text, k.conname, pg_get_constraintdef(k.oid)
+FROM pg_constraint k
+WHERE k.contype = 'f'
+  AND k.confrelid = 'documents'::regclass;
+
+DO $$
+DECLARE
+    v RECORD;
+    fk RECORD;
+BEGIN
+    FOR v IN SELECT * FROM _saved_views ORDER BY depth DESC LOOP
+        IF v.view_kind = 'm' THEN
+            EXECUTE format('DROP MATERIALIZED VIEW IF EXISTS %I CASCADE', v.view_name);
+        ELSE
+            EXECUTE format('DROP VIEW IF EXISTS %I CASCADE', v.view_name);
+        END IF;
+    END LOOP;
+
+    FOR fk IN SELECT * FROM _saved_foreign_keys LOOP
+        EXECUTE format('ALTER TABLE %s DROP CONSTRAINT %I', fk.table_name, fk.constraint_name);
+    END LOOP;
+
+    -- Chunk self-reference is rebuilt as a composite key below
+    ALTER TABLE document_chunks DROP CONSTRAINT IF EXISTS document_chunks_parent_chunk_id_fkey;
+END $$;
+
+-- ============================================================================
+-- STEP 2: document_registry (FK anchor for documents.id)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS document_registry (
+    id INTEGER PRIMARY KEY,
+    country_code CHAR(2) NOT NULL
+);
+
+INSERT INTO document_registry (id, country_code)
+SELECT id, country_code FROM documents
+ON CONFLICT (id) DO NOTHING;
+
+COMMENT ON TABLE document_registry IS
+    'One row per document id; foreign key target for tables referencing partitioned documents';
+
+-- ============================================================================
+-- STEP 3: documents -> PARTITION BY LIST (country_code)
+-- ============================================================================
+
+ALTER TABLE documents RENAME TO documents_unpartitioned;
+
+CREATE TABLE documents (
+    LIKE documents_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        INCLUDING GENERATED INCLUDING COMMENTS
+) PARTITION BY LIST (country_code);
+
+CREATE TABLE documents_bd PARTITION OF documents FOR VALUES IN ('BD');
+CREATE TABLE documents_in PARTITION OF documents FOR VALUES IN ('IN');
+CREATE TABLE documents_pk PARTITION OF documents FOR VALUES IN ('PK');
+CREATE TABLE documents_us PARTITION OF documents FOR VALUES IN ('US');
+CREATE TABLE documents_uk PARTITION OF documents FOR VALUES IN ('UK');
+CREATE TABLE documents_default PARTITION OF documents DEFAULT;
+
+INSERT INTO documents SELECT * FROM documents_unpartitioned;
+
+-- Keep the id sequence alive when the old table is dropped
+ALTER SEQUENCE documents_id_seq OWNED BY documents.id;
+
+DROP TABLE documents_unpartitioned;
+
+ALTER TABLE documents ADD CONSTRAINT documents_pkey PRIMARY KEY (id, country_code);
+ALTER TABLE documents ADD CONSTRAINT uk_global_id UNIQUE (global_id, country_code);
+ALTER TABLE documents ADD CONSTRAINT uk_filename UNIQUE (filename_universal, country_code);
+ALTER TABLE documents ADD CONSTRAINT uk_uuid UNIQUE (uuid, country_code);
+
+-- ============================================================================
+-- STEP 4: document_chunks -> PARTITION BY LIST (country_code)
+-- ============================================================================
+
+ALTER TABLE document_chunks ADD COLUMN IF NOT EXISTS country_code CHAR(2);
+
+UPDATE document_chunks dc
+SET country_code = d.country_code
+FROM documents d
+WHERE d.id = dc.document_id
+  AND dc.country_code IS NULL;
+
+ALTER TABLE document_chunks ALTER COLUMN country_code SET NOT NULL;
+
+ALTER TABLE document_chunks RENAME TO document_chunks_unpartitioned;
+
+CREATE TABLE document_chunks (
+    LIKE document_chunks_unpartitioned INCLUDING DEFAULTS INCLUDING CONSTRAINTS
+        INCLUDING GENERATED INCLUDING COMMENTS
+) PARTITION BY LIST (country_code);
+
+CREATE TABLE document_chunks_bd PARTITION OF document_chunks FOR VALUES IN ('BD');
+CREATE TABLE document_chunks_in PARTITION OF document_chunks FOR VALUES IN ('IN');
+CREATE TABLE document_chunks_pk PARTITION OF document_chunks FOR VALUES IN ('PK');
+CREATE TABLE document_chunks_us PARTITION OF document_chunks FOR VALUES IN ('US');
+CREATE TABLE document_chunks_uk PARTITION OF document_chunks FOR VALUES IN ('UK');
+CREATE TABLE document_chunks_default PARTITION OF document_chunks DEFAULT;
+
+INSERT INTO document_chunks SELECT * FROM document_chunks_unpartitioned;
+
+ALTER SEQUENCE document_chunks_id_seq OWNED BY document_chunks.id;
+
+DROP TABLE document_chunks_unpartitioned;
+
+ALTER TABLE document_chunks ADD CONSTRAINT document_chunks_pkey PRIMARY KEY (id, country_code);
+ALTER TABLE document_chunks ADD CONSTRAINT uk_doc_chunk_index
+    UNIQUE (document_id, chunk_index, country_code);
+
+-- A parent chunk always belongs to the same document, hence the same partition
+ALTER TABLE document_chunks ADD CONSTRAINT document_chunks_parent_chunk_id_fkey
+    FOREIGN KEY (parent_chunk_id, country_code)
+    REFERENCES document_chunks (id, country_code)
+    ON DELETE SET NULL (parent_chunk_id);
+
+-- ============================================================================
+-- STEP 5: Recreate indexes, triggers and foreign keys
+-- ============================================================================
+
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    -- Table indexes first (materialized views do not exist yet)
+    FOR r IN SELECT * FROM _saved_indexes
+             WHERE table_name IN ('documents', 'document_chunks') LOOP
+        IF r.is_unique THEN
+            -- Unique indexes on a partitioned table must include the partition key
+            EXECUTE regexp_replace(r.index_def, 'USING (\w+) \(([^)]*)\)',
+                                   'USING \1 (\2, country_code)');
+        ELSE
+            EXECUTE r.index_def;
+        END IF;
+    END LOOP;
+
+    FOR r IN SELECT * FROM _saved_triggers LOOP
+        EXECUTE r.trigger_def;
+    END LOOP;
+
+    FOR r IN SELECT * FROM _saved_foreign_keys LOOP
+        EXECUTE format('ALTER TABLE %s ADD CONSTRAINT %I %s',
+                       r.table_name, r.constraint_name,
+                       replace(r.constraint_def, 'REFERENCES documents(id)',
+                               'REFERENCES document_registry(id)'));
+    END LOOP;
+END $$;
+
+-- ============================================================================
+-- STEP 6: Registry maintenance
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION register_document()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO document_registry (id, country_code)
+    VALUES (NEW.id, NEW.country_code)
+    ON CONFLICT (id) DO UPDATE SET country_code = EXCLUDED.country_code;
+
+    -- Changing country_code moves the document; move its chunks with it
+    UPDATE document_chunks
+    SET country_code = NEW.country_code
+    WHERE document_id = NEW.id
+      AND country_code <> NEW.country_code;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION unregister_document()
+RETURNS TRIGGER AS $$
+BEGIN
+    -- A cross-partition UPDATE is a DELETE + INSERT; only drop the registry
+    -- row (and cascade to child tables) when the document is really gone
+    IF NOT EXISTS (SELECT 1 FROM documents WHERE id = OLD.id) THEN
+        DELETE FROM document_registry WHERE id = OLD.id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER trigger_documents_register
+    AFTER INSERT ON documents
+    FOR EACH ROW
+    EXECUTE FUNCTION register_document();
+
+CREATE TRIGGER trigger_documents_unregister
+    AFTER DELETE ON documents
+    FOR EACH ROW
+    EXECUTE FUNCTION unregister_document();
+
+-- ============================================================================
+-- STEP 7: Recreate dependent views
+-- ============================================================================
+
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN SELECT * FROM _saved_views ORDER BY depth LOOP
+        IF r.view_kind = 'm' THEN
+            EXECUTE format('CREATE MATERIALIZED VIEW %I AS %s', r.view_name, r.view_def);
+        ELSE
+            EXECUTE format('CREATE VIEW %I AS %s', r.view_name, r.view_def);
+        END IF;
+    END LOOP;
+
+    FOR r IN SELECT * FROM _saved_indexes
+             WHERE table_name NOT IN ('documents', 'document_chunks') LOOP
+        EXECUTE r.index_def;
+    END LOOP;
+END $$;
+
+COMMIT;
+
+ANALYZE documents;
+ANALYZE document_chunks;
+ANALYZE document_registry;
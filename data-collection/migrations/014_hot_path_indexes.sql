@@ -0,0 +1,119 @@
+-- Migration 014: Covering and partial indexes for hot scraper/RAG predicates
+-- Adds: documents.pdf_downloaded, normalized source_domain, hot-path indexes
+-- World-Class Legal RAG System - Phase 4
+--
+-- Hot predicates (see PostgreSQLAdapter):
+--   pending download   source_domain = ? AND NOT pdf_downloaded
+--   pending embedding  embedding_status IN ('pending', 'failed')
+--   by source          source_domain = ? [AND doc_year ...]
+--
+-- Before this migration "pending download" was an anti-join against
+-- file_storage plus source_url LIKE '%indiankanoon.org%', which always
+-- scanned the whole documents table. pdf_downloaded is maintained by a
+-- trigger on file_storage so the predicate can live in a partial index.
+--
+-- Apply after 013 (indexes are created on the partitioned parents and
+-- cascade to every partition).
+
+BEGIN;
+
+-- ============================================================================
+-- source_domain: always the normalized host of source_url
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION normalize_source_domain(url TEXT)
+RETURNS TEXT AS $$
+    SELECT NULLIF(
+        regexp_replace(
+            lower(substring(url FROM '^[A-Za-z][A-Za-z0-9+.-]*://([^/:?#]+)')),
+            '^www\.', ''),
+        '')
+$$ LANGUAGE sql IMMUTABLE;
+
+UPDATE documents
+SET source_domain = normalize_source_domain(source_url)
+WHERE normalize_source_domain(source_url) IS NOT NULL
+  AND source_domain IS DISTINCT FROM normalize_source_domain(source_url);
+
+CREATE OR REPLACE FUNCTION set_source_domain()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.source_domain := COALESCE(normalize_source_domain(NEW.source_url), NEW.source_domain);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_documents_source_domain ON documents;
+CREATE TRIGGER trigger_documents_source_domain
+    BEFORE INSERT OR UPDATE OF source_url, source_domain ON documents
+    FOR EACH ROW
+    EXECUTE FUNCTION set_source_domain();
+
+-- ============================================================================
+-- pdf_downloaded: denormalized "has a file_storage row"
+-- ============================================================================
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS pdf_downloaded BOOLEAN NOT NULL DEFAULT FALSE;
+
+UPDATE documents d
+SET pdf_downloaded = TRUE
+WHERE NOT d.pdf_downloaded
+  AND EXISTS (SELECT 1 FROM file_storage fs WHERE fs.document_id = d.id);
+
+CREATE OR REPLACE FUNCTION sync_pdf_downloaded()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('DELETE', 'UPDATE') THEN
+        UPDATE documents d
+        SET pdf_downloaded = EXISTS (SELECT 1 FROM file_storage fs WHERE fs.document_id = d.id)
+        WHERE d.id = OLD.document_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE documents
+        SET pdf_downloaded = TRUE
+        WHERE id = NEW.document_id
+          AND NOT pdf_downloaded;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_file_storage_pdf_downloaded ON file_storage;
+CREATE TRIGGER trigger_file_storage_pdf_downloaded
+    AFTER INSERT OR DELETE OR UPDATE OF document_id ON file_storage
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_pdf_downloaded();
+
+COMMENT ON COLUMN documents.pdf_downloaded IS
+    'TRUE when a file_storage row exists (maintained by trigger_file_storage_pdf_downloaded)';
+
+-- ============================================================================
+-- Indexes
+-- ============================================================================
+
+-- Pending download: index-only scan in id order, source_url from the index
+CREATE INDEX IF NOT EXISTS idx_doc_pending_download
+    ON documents (source_domain, id) INCLUDE (source_url)
+    WHERE NOT pdf_downloaded;
+
+-- Pending embedding: same definition as 008, created here if 008 was skipped
+CREATE INDEX IF NOT EXISTS idx_doc_pending_embedding
+    ON documents (id, chunk_count)
+    WHERE embedding_status IN ('pending', 'failed');
+
+-- By source: covers per-domain counts and year breakdowns
+CREATE INDEX IF NOT EXISTS idx_doc_source_year
+    ON documents (source_domain, doc_year) INCLUDE (global_id);
+
+-- idx_doc_source (source_domain) is a prefix of idx_doc_source_year
+DROP INDEX IF EXISTS idx_doc_source;
+
+-- Chunks waiting for embeddings, in document order
+CREATE INDEX IF NOT EXISTS idx_chunk_pending_embedding
+    ON document_chunks (document_id, chunk_index) INCLUDE (id)
+    WHERE embedding_status = 'pending';
+
+COMMIT;
+
+ANALYZE documents;
+ANALYZE document_chunks;
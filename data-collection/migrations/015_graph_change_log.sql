@@ -0,0 +1,95 @@
+-- Migration 015: Change log for incremental knowledge graph sync
+-- Adds: graph_change_log, log_graph_change() and its triggers
+-- World-Class Legal RAG System - Phase 4
+--
+-- Every insert, delete or relevant update of a document, or of a row the
+-- case graph is built from (content, judges, parties, citations,
+-- sections_cited), appends (document_id, table, operation) to
+-- graph_change_log. neo4j/sync_graph.py reads the log past its high-water
+-- mark (the last log id it applied, kept on a :SyncState node in Neo4j), so
+-- edits to child rows are picked up even though they leave
+-- documents.updated_at alone.
+--
+-- The log is append-only. Prune entries the sync has long passed, e.g.
+--   DELETE FROM graph_change_log WHERE changed_at < NOW() - INTERVAL '30 days';
+--
+-- Apply after 014 (the documents trigger is created on the partitioned
+-- parent and cascades to every partition).
+
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS graph_change_log (
+    id BIGSERIAL PRIMARY KEY,
+    document_id INTEGER NOT NULL,
+    source_table VARCHAR(30) NOT NULL,
+    operation CHAR(1) NOT NULL,                -- I, U, D
+    changed_at TIMESTAMP NOT NULL DEFAULT clock_timestamp(),
+
+    CONSTRAINT chk_graph_change_operation CHECK (operation IN ('I', 'U', 'D'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_graph_change_changed_at ON graph_change_log(changed_at);
+
+-- TG_ARGV[0]: column holding the document id, TG_ARGV[1]: logical table name
+CREATE OR REPLACE FUNCTION log_graph_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    changed JSONB;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        changed := to_jsonb(OLD);
+    ELSE
+        changed := to_jsonb(NEW);
+    END IF;
+
+    IF changed ->> TG_ARGV[0] IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    INSERT INTO graph_change_log (document_id, source_table, operation)
+    VALUES ((changed ->> TG_ARGV[0])::INTEGER, TG_ARGV[1], left(TG_OP, 1));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Documents: only the columns the graph reads
+DROP TRIGGER IF EXISTS trigger_documents_graph_change ON documents;
+CREATE TRIGGER trigger_documents_graph_change
+    AFTER INSERT OR DELETE OR UPDATE OF
+        title_full, doc_type, doc_subtype, doc_year, date_judgment, country_code, source_url
+    ON documents
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('id', 'documents');
+
+DROP TRIGGER IF EXISTS trigger_content_graph_change ON content;
+CREATE TRIGGER trigger_content_graph_change
+    AFTER INSERT OR DELETE OR UPDATE OF full_text, summary
+    ON content
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('document_id', 'content');
+
+DROP TRIGGER IF EXISTS trigger_judges_graph_change ON judges;
+CREATE TRIGGER trigger_judges_graph_change
+    AFTER INSERT OR UPDATE OR DELETE ON judges
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('document_id', 'judges');
+
+DROP TRIGGER IF EXISTS trigger_parties_graph_change ON parties;
+CREATE TRIGGER trigger_parties_graph_change
+    AFTER INSERT OR UPDATE OR DELETE ON parties
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('document_id', 'parties');
+
+DROP TRIGGER IF EXISTS trigger_citations_graph_change ON citations;
+CREATE TRIGGER trigger_citations_graph_change
+    AFTER INSERT OR UPDATE OR DELETE ON citations
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('document_id', 'citations');
+
+DROP TRIGGER IF EXISTS trigger_sections_cited_graph_change ON sections_cited;
+CREATE TRIGGER trigger_sections_cited_graph_change
+    AFTER INSERT OR UPDATE OR DELETE ON sections_cited
+    FOR EACH ROW
+    EXECUTE FUNCTION log_graph_change('document_id', 'sections_cited');
+
+COMMIT;
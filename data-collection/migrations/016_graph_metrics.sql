@@ -0,0 +1,37 @@
+-- Migration 016: Citation metrics mirrored from the knowledge graph
+-- Adds: documents.authority_score, documents.graph_metrics_at, court_metrics
+-- World-Class Legal RAG System - Phase 4
+--
+-- `python neo4j/cli.py metrics --postgres $DATABASE_URL` computes citation
+-- in/out degree and a PageRank authority score for every Case node, plus
+-- per-court aggregates, stores them on the nodes and writes them here:
+--   documents.cited_by_count / cites_count   in- and out-degree
+--   documents.authority_score                PageRank (sums to 1 over all cases)
+--   court_metrics                            one row per Court node
+--
+-- These columns are derived data: the graph_change_log triggers (015) do
+-- not watch them, so refreshing them does not re-sync the cases.
+--
+-- Apply after 015.
+
+BEGIN;
+
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS authority_score DOUBLE PRECISION;
+ALTER TABLE documents ADD COLUMN IF NOT EXISTS graph_metrics_at TIMESTAMP;
+
+CREATE INDEX IF NOT EXISTS idx_doc_authority
+ON documents(authority_score DESC NULLS LAST)
+WHERE authority_score IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS court_metrics (
+    court_name VARCHAR(300) PRIMARY KEY,
+    case_count INTEGER NOT NULL DEFAULT 0,
+    citations_made INTEGER NOT NULL DEFAULT 0,
+    citations_received INTEGER NOT NULL DEFAULT 0,
+    mean_authority DOUBLE PRECISION,
+    top_case_title TEXT,
+    top_case_authority DOUBLE PRECISION,
+    computed_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+COMMIT;
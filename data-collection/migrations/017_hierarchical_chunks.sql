@@ -0,0 +1,22 @@
+-- Migration 017: Hierarchical document chunks
+-- Allows chunk_level 'document' for the root of a chunk tree
+-- World-Class Legal RAG System - Phase 4
+--
+-- `python neo4j/cli.py chunk --postgres $DATABASE_URL` writes each document
+-- as a document -> section -> paragraph tree (neo4j/utils/document_chunks.py):
+--   chunk_level      'document' (depth 0), 'section', 'paragraph' (leaves)
+--   parent_chunk_id  row id of the parent chunk, in the same partition
+--   child_chunk_count / chunk_depth as in migration 005
+-- Only leaves (child_chunk_count = 0) are embedded and indexed by the
+-- rag-service; parents are resolved through parent_chunk_id.
+--
+-- Apply after 016.
+
+BEGIN;
+
+ALTER TABLE document_chunks DROP CONSTRAINT IF EXISTS chk_chunk_level;
+ALTER TABLE document_chunks ADD CONSTRAINT chk_chunk_level CHECK (chunk_level IN (
+    'document', 'sentence', 'paragraph', 'section', 'page', 'semantic', 'hybrid', 'sliding_window'
+));
+
+COMMIT;
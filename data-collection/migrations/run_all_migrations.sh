@@ -65,6 +65,11 @@ MIGRATIONS=(
     "007_create_scraping_tables.sql"
     "008_create_indexes.sql"
     "009_seed_data.sql"
+    "013_partition_documents.sql"
+    "014_hot_path_indexes.sql"
+    "015_graph_change_log.sql"
+    "016_graph_metrics.sql"
+    "017_hierarchical_chunks.sql"
 )
 
 # Run migrations
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+SQLite Profile Benchmark
+Compares SQLite defaults (rollback journal, synchronous=FULL) against the
+production profile (WAL, synchronous=NORMAL, mmap) on a generated legal_cases
+table. Updates are timed both reconnecting per operation and on a reused
+connection under each profile, so the PRAGMA profile and connection reuse are
+reported as separate effects.
+
+Usage:
+    python scripts/benchmark_sqlite_profile.py --rows 1000000 --updates 5000
+"""
+
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.sqlite_profile import (
+    SQLiteProfile, DEFAULT_PROFILE, PRODUCTION_PROFILE, open_connection
+)
+
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS legal_cases (
+        id INTEGER PRIMARY KEY,
+        url TEXT UNIQUE,
+        title TEXT,
+        court TEXT,
+        year INTEGER,
+        pdf_downloaded INTEGER DEFAULT 0,
+        pdf_path TEXT
+    )
+"""
+
+COURTS = ['Supreme Court of India', 'Delhi High Court', 'Bombay High Court',
+          'Madras High Court', 'Calcutta High Court']
+
+
+def generate_rows(start: int, count: int):
+    for i in range(start, start + count):
+        yield (i, f"https://indiankanoon.org/doc/{i}/", f"Case {i}",
+               COURTS[i % len(COURTS)], 1950 + i % 75)
+
+
+def bench_inserts(db_path: str, profile: SQLiteProfile, rows: int, batch_size: int) -> float:
+    """Insert rows in batched transactions. Returns rows/s."""
+    conn = open_connection(db_path, profile)
+    conn.execute(SCHEMA)
+    conn.commit()
+
+    start = time.perf_counter()
+    for offset in range(1, rows + 1, batch_size):
+        count = min(batch_size, rows + 1 - offset)
+        conn.executemany(
+            "INSERT INTO legal_cases (id, url, title, court, year) VALUES (?, ?, ?, ?, ?)",
+            generate_rows(offset, count)
+        )
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    conn.close()
+    return rows / elapsed
+
+
+def bench_updates(db_path: str, profile: SQLiteProfile, rows: int, updates: int,
+                  reuse_connection: bool) -> float:
+    """Single-row UPDATE + commit, as the scraper does per document. Returns updates/s."""
+    rng = random.Random(42)
+    ids = [rng.randint(1, rows) for _ in range(updates)]
+
+    conn = open_connection(db_path, profile) if reuse_connection else None
+    start = time.perf_counter()
+    for doc_id in ids:
+        c = conn if reuse_connection else open_connection(db_path, profile)
+        c.execute(
+            "UPDATE legal_cases SET pdf_downloaded = 1, pdf_path = ? WHERE id = ?",
+            (f"data/pdfs/{doc_id}.pdf", doc_id)
+        )
+        c.commit()
+        if not reuse_connection:
+            c.close()
+    elapsed = time.perf_counter() - start
+    if conn is not None:
+        conn.close()
+    return updates / elapsed
+
+
+def run_case(label: str, work_dir: Path, profile: SQLiteProfile, args) -> dict:
+    db_path = str(work_dir / f"{label}.db")
+    print(f"\n[{label}] {profile.to_dict()}")
+    insert_rate = bench_inserts(db_path, profile, args.rows, args.batch_size)
+    print(f"  Inserts: {insert_rate:,.0f} rows/s")
+    result = {'inserts': insert_rate}
+    for reuse_connection, key, description in ((False, 'reconnect', 'reconnect per update'),
+                                               (True, 'reused', 'reused connection')):
+        result[key] = bench_updates(db_path, profile, args.rows, args.updates, reuse_connection)
+        print(f"  Updates: {result[key]:,.0f} commits/s ({description})")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark SQLite PRAGMA profiles')
+    parser.add_argument('--rows', type=int, default=1_000_000, help='Rows to insert')
+    parser.add_argument('--batch-size', type=int, default=10_000, help='Rows per insert transaction')
+    parser.add_argument('--updates', type=int, default=5_000, help='Single-row update commits')
+    parser.add_argument('--work-dir', help='Directory for benchmark databases (default: temp dir)')
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print(f"SQLITE PROFILE BENCHMARK: {args.rows:,} rows, {args.updates:,} updates")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        work_dir = Path(args.work_dir or tmp)
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        baseline = run_case('baseline', work_dir, DEFAULT_PROFILE, args)
+        tuned = run_case('production', work_dir, PRODUCTION_PROFILE, args)
+
+    print("\n" + "=" * 70)
+    print(f"Insert speedup (profile):                {tuned['inserts'] / baseline['inserts']:.1f}x")
+    print(f"Update speedup (profile, reconnect):     {tuned['reconnect'] / baseline['reconnect']:.1f}x")
+    print(f"Update speedup (profile, reused):        {tuned['reused'] / baseline['reused']:.1f}x")
+    print(f"Update speedup (connection reuse, prod): {tuned['reused'] / tuned['reconnect']:.1f}x")
+    print(f"Update speedup (combined):               {tuned['reused'] / baseline['reconnect']:.1f}x")
+    print("=" * 70)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Columnar Corpus Export
+Exports the PostgreSQL corpus to partitioned Parquet for analytics.
+The first run is a full export; later runs append only documents changed
+since the previous watermark.
+
+Usage:
+    python scripts/export_columnar.py --output data/columnar
+    python scripts/export_columnar.py --output data/columnar --full --include-text
+    python scripts/export_columnar.py --output data/columnar --stats
+"""
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+# Import after path is set
+try:
+    from sqlalchemy import create_engine
+except ImportError as e:
+    print(f"Error: Missing required package: {e}")
+    print("Install with: pip install sqlalchemy pyarrow psycopg2-binary")
+    sys.exit(1)
+
+from src.database.connection import DatabaseConfig
+from src.database.columnar import ColumnarExporter, ColumnarCorpusReader, EXPORT_TABLES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the corpus to partitioned Parquet")
+    parser.add_argument('--output', default=str(project_root / 'data' / 'columnar'),
+                        help="Export root directory")
+    parser.add_argument('--database-url', default=None,
+                        help="PostgreSQL URL (default: DATABASE_URL / config/database.yaml)")
+    parser.add_argument('--full', action='store_true',
+                        help="Discard previous runs and re-export everything")
+    parser.add_argument('--tables', nargs='+', choices=sorted(EXPORT_TABLES),
+                        help="Export only these tables")
+    parser.add_argument('--include-text', action='store_true',
+                        help="Include full_text/cleaned_text in the content table")
+    parser.add_argument('--batch-size', type=int, default=50000)
+    parser.add_argument('--stats', action='store_true',
+                        help="Print corpus statistics from the export and exit")
+    args = parser.parse_args()
+
+    if args.stats:
+        print(json.dumps(ColumnarCorpusReader(args.output).corpus_stats(), indent=2))
+        return
+
+    engine = create_engine(args.database_url or DatabaseConfig().url)
+    exporter = ColumnarExporter(
+        engine, args.output, batch_size=args.batch_size, include_text=args.include_text
+    )
+
+    try:
+        run = exporter.export(full=args.full, tables=args.tables)
+    finally:
+        engine.dispose()
+
+    print(f"✓ Run {run.run} ({run.mode}) -> {args.output}")
+    for table, rows in run.rows.items():
+        print(f"  {table:<12} {rows:>12,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,7 +18,6 @@ import time
 import json
 import yaml
 import signal
-import sqlite3
 import logging
 import requests
 from pathlib import Path
@@ -28,6 +27,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, asdict
 import threading
 
+from src.sqlite_profile import get_connection_factory
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -99,6 +100,8 @@ class SingleIPScraper:
         """Initialize scraper with configuration"""
         self.config = self._load_config(config_path)
         self.db_path = self._get_db_path()
+        # OPTIMIZATION: WAL-tuned SQLite, one reused connection per worker thread
+        self.db = get_connection_factory(self.db_path)
         self.checkpoint_manager = CheckpointManager()
         self.state = ProgressState()
         self.stats_lock = threading.Lock()
@@ -155,7 +158,7 @@ class SingleIPScraper:
         Get documents that need to be downloaded
         Returns: List of (doc_id, source_url) tuples
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self.db.connection()
         cursor = conn.cursor()
 
         # Get documents without PDFs
@@ -172,7 +175,6 @@ class SingleIPScraper:
 
         cursor.execute(query)
         results = cursor.fetchall()
-        conn.close()
 
         logger.info(f"Found {len(results)} documents to process")
         return results
@@ -269,7 +271,7 @@ class SingleIPScraper:
         try:
             # Use a lock to ensure thread-safe database access
             with self.db_batch_lock:
-                conn = sqlite3.connect(self.db_path, timeout=30)
+                conn = self.db.connection()
                 cursor = conn.cursor()
 
                 cursor.execute("""
@@ -282,7 +284,6 @@ class SingleIPScraper:
                 """, (pdf_path, size_bytes, doc_id))
 
                 conn.commit()
-                conn.close()
         except Exception as e:
             logger.error(f"Failed to mark document {doc_id} as downloaded: {e}")
 
@@ -296,7 +297,7 @@ class SingleIPScraper:
                 return  # Nothing to flush
 
             try:
-                conn = sqlite3.connect(self.db_path)
+                conn = self.db.connection()
                 cursor = conn.cursor()
 
                 # Batch update all documents in single transaction
@@ -310,7 +311,6 @@ class SingleIPScraper:
                 """, self.db_batch)
 
                 conn.commit()
-                conn.close()
 
                 logger.debug(f"✓ Flushed {len(self.db_batch)} database updates")
                 self.db_batch = []  # Clear batch
@@ -5,15 +5,20 @@ Handles storage and retrieval of scraped legal cases.
 
 from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Enum, Index, event
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import sessionmaker, load_only, defer
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Iterator, Sequence
 import json
 import logging
 import enum
 import time
 from functools import wraps
 
+try:
+    from .sqlite_profile import install_sqlalchemy_profile
+except ImportError:
+    from sqlite_profile import install_sqlalchemy_profile
+
 logger = logging.getLogger(__name__)
 
 Base = declarative_base()
@@ -222,6 +227,8 @@ class CaseDatabase:
             pool_recycle=3600,   # Recycle connections after 1 hour
             echo=False           # Set to True for SQL debugging
         )
+        # WAL, synchronous=NORMAL, mmap, busy timeout (no-op for PostgreSQL)
+        install_sqlalchemy_profile(self.engine)
         Base.metadata.create_all(self.engine)
 
         # Use scoped_session for thread-safe session management
@@ -637,6 +644,181 @@ class CaseDatabase:
 
         return urls
 
+    # ==================================================================================
+    # STREAMING METHODS (keyset pagination for large tables)
+    # ==================================================================================
+
+    def _iter_keyset(self, query, model, batch_size: int = 1000,
+                     yield_per: Optional[int] = None) -> Iterator[Any]:
+        """
+        Walk a query in primary-key order without materializing the result set.
+
+        Each page is fetched with ``WHERE id > last_id ORDER BY id LIMIT n`` so
+        the cost of a page does not grow with depth (unlike OFFSET), and rows
+        whose status changes while iterating are neither skipped nor repeated.
+
+        Args:
+            query: Base query (filters applied, no ordering or limit)
+            model: Mapped class whose ``id`` column is the keyset
+            batch_size: Rows fetched per page
+            yield_per: Stream a single server-side cursor in chunks of this
+                size instead of paging. Faster, but the session must not be
+                committed until iteration finishes.
+
+        Yields:
+            Rows of the query, ascending by id
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        if yield_per:
+            yield from query.order_by(model.id).yield_per(yield_per)
+            return
+
+        last_id = 0
+        while True:
+            page = query.filter(model.id > last_id).order_by(model.id).limit(batch_size).all()
+            if not page:
+                return
+
+            # Read the key before handing rows out: a commit by the caller
+            # expires the objects and would otherwise trigger a reload.
+            last_id = page[-1].id
+            yield from page
+
+            if len(page) < batch_size:
+                return
+
+    def _case_projection(self, columns: Optional[Sequence[str]], include_full_text: bool):
+        """Build the loader option that limits which LegalCase columns are fetched."""
+        if columns:
+            attrs = []
+            for name in columns:
+                if name not in LegalCase.__table__.columns:
+                    raise ValueError(f"Unknown LegalCase column: {name}")
+                attrs.append(getattr(LegalCase, name))
+            if include_full_text and 'full_text' not in columns:
+                attrs.append(LegalCase.full_text)
+            return load_only(*attrs)
+
+        if include_full_text:
+            return None
+        return defer(LegalCase.full_text)
+
+    def iter_cases(
+        self,
+        batch_size: int = 1000,
+        court: Optional[str] = None,
+        year: Optional[str] = None,
+        columns: Optional[Sequence[str]] = None,
+        include_full_text: bool = False,
+        yield_per: Optional[int] = None
+    ) -> Iterator[LegalCase]:
+        """
+        Stream cases with optional filters, in id order.
+
+        Unlike get_cases(), memory use is bounded by batch_size regardless of
+        how many rows match. ``full_text`` is deferred unless requested, so
+        accessing it on a yielded object issues one extra query per row.
+
+        Args:
+            batch_size: Rows fetched per page
+            court: Filter by court name
+            year: Filter by year
+            columns: LegalCase column names to load (others are deferred)
+            include_full_text: Load full_text eagerly
+            yield_per: Use ORM cursor streaming instead of keyset paging
+
+        Yields:
+            LegalCase objects
+        """
+        query = self.session.query(LegalCase)
+
+        if court:
+            query = query.filter(LegalCase.court.contains(court))
+
+        if year:
+            query = query.filter(LegalCase.case_date.contains(year))
+
+        projection = self._case_projection(columns, include_full_text)
+        if projection is not None:
+            query = query.options(projection)
+
+        return self._iter_keyset(query, LegalCase, batch_size, yield_per)
+
+    def iter_cases_without_pdfs(
+        self,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        include_full_text: bool = False,
+        yield_per: Optional[int] = None
+    ) -> Iterator[LegalCase]:
+        """
+        Stream cases that still need their PDF downloaded.
+
+        Safe to call update_pdf_status() on yielded cases while iterating.
+
+        Args:
+            batch_size: Rows fetched per page
+            columns: LegalCase column names to load (others are deferred)
+            include_full_text: Load full_text eagerly
+            yield_per: Use ORM cursor streaming instead of keyset paging
+
+        Yields:
+            LegalCase objects
+        """
+        query = self.session.query(LegalCase).filter(
+            LegalCase.pdf_link.isnot(None),
+            LegalCase.pdf_link != '',
+            LegalCase.pdf_downloaded.is_(False)
+        )
+
+        projection = self._case_projection(columns, include_full_text)
+        if projection is not None:
+            query = query.options(projection)
+
+        return self._iter_keyset(query, LegalCase, batch_size, yield_per)
+
+    def iter_pending_urls(self, batch_size: int = 1000,
+                          yield_per: Optional[int] = None) -> Iterator[URLTracker]:
+        """
+        Stream URLs pending download.
+
+        Safe to call update_download_status() on yielded records while iterating.
+
+        Args:
+            batch_size: Rows fetched per page
+            yield_per: Use ORM cursor streaming instead of keyset paging
+
+        Yields:
+            URLTracker objects
+        """
+        query = self.session.query(URLTracker).filter_by(
+            download_status=DownloadStatus.PENDING
+        )
+        return self._iter_keyset(query, URLTracker, batch_size, yield_per)
+
+    def iter_urls_to_download(self, batch_size: int = 1000) -> Iterator[Dict[str, Any]]:
+        """
+        Stream URLs ready for download in the same format as get_urls_to_download().
+
+        Args:
+            batch_size: Rows fetched per page
+
+        Yields:
+            Dictionaries with url, doc_id, metadata
+        """
+        for record in self.iter_pending_urls(batch_size=batch_size):
+            yield {
+                'id': record.id,
+                'url': record.doc_url,
+                'doc_id': record.doc_id,
+                'title': record.title,
+                'citation': record.citation,
+                'court': record.court,
+                'metadata': json.loads(record.metadata_json) if record.metadata_json else {}
+            }
+
     def _commit_with_retry(self, max_retries: int = 3) -> None:
         """
         Commit transaction with retry logic.
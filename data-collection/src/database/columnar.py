@@ -0,0 +1,560 @@
+"""
+Columnar Corpus Export
+Writes documents, content, citations, parties and judges from PostgreSQL
+into hive-partitioned Parquet files for analytics, and reads them back
+through memory-mapped Arrow datasets.
+
+Layout:
+    <root>/_manifest.json
+    <root>/documents/country_code=IN/doc_type=CAS/part-000001-0.parquet
+    <root>/citations/country_code=IN/part-000001-0.parquet
+    ...
+
+Each export run appends new files tagged with an _export_run column.
+Incremental runs export documents whose updated_at is past the last
+watermark, together with all of their child rows, so the reader can keep
+the newest snapshot per document. Deleted documents are only dropped by a
+full re-export.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+except ImportError:
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = '_manifest.json'
+RUN_COLUMN = '_export_run'
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is required for columnar export. Install with: pip install pyarrow")
+
+
+@dataclass(frozen=True)
+class ExportTable:
+    """
+    Export specification for one table.
+
+    Columns are (name, SQL expression, Arrow type name). Categorical columns
+    are dictionary-encoded in Parquet; partition columns become directories.
+    changed_at is the child table's own change timestamp, used (with
+    documents.updated_at) to select rows for an incremental export.
+    """
+    name: str
+    columns: Tuple[Tuple[str, str, str], ...]
+    key: str
+    partition_by: Tuple[str, ...] = ('country_code',)
+    categorical: Tuple[str, ...] = ()
+    text_columns: Tuple[Tuple[str, str, str], ...] = ()
+    from_clause: str = ''
+    changed_at: str = 'created_at'
+
+    def select_columns(self, include_text: bool) -> Tuple[Tuple[str, str, str], ...]:
+        return self.columns + (self.text_columns if include_text else ())
+
+
+_DOCUMENT_COLUMNS = (
+    ('id', 'd.id', 'int64'),
+    ('global_id', 'd.global_id', 'string'),
+    ('country_code', 'd.country_code', 'string'),
+    ('doc_type', 'd.doc_type', 'string'),
+    ('doc_subtype', 'd.doc_subtype', 'string'),
+    ('title_full', 'd.title_full', 'string'),
+    ('doc_year', 'd.doc_year', 'int16'),
+    ('doc_number', 'd.doc_number', 'string'),
+    ('subject_primary', 'd.subject_primary', 'string'),
+    ('legal_status', 'd.legal_status', 'string'),
+    ('date_judgment', 'd.date_judgment', 'date32'),
+    ('source_domain', 'd.source_domain', 'string'),
+    ('chunk_count', 'd.chunk_count', 'int32'),
+    ('embedding_status', 'd.embedding_status', 'string'),
+    ('cited_by_count', 'd.cited_by_count', 'int32'),
+    ('cites_count', 'd.cites_count', 'int32'),
+    ('data_quality_score', 'CAST(d.data_quality_score AS FLOAT)', 'float32'),
+    ('validation_status', 'd.validation_status', 'string'),
+    ('scraped_at', 'd.scraped_at', 'timestamp'),
+    ('updated_at', 'd.updated_at', 'timestamp'),
+)
+
+EXPORT_TABLES: Dict[str, ExportTable] = {
+    'documents': ExportTable(
+        name='documents',
+        columns=_DOCUMENT_COLUMNS,
+        key='id',
+        partition_by=('country_code', 'doc_type'),
+        categorical=('doc_subtype', 'subject_primary', 'legal_status', 'source_domain',
+                     'embedding_status', 'validation_status'),
+        from_clause='documents d',
+    ),
+    'content': ExportTable(
+        name='content',
+        columns=(
+            ('document_id', 'c.document_id', 'int64'),
+            ('country_code', 'd.country_code', 'string'),
+            ('word_count', 'c.word_count', 'int32'),
+            ('character_count', 'c.character_count', 'int32'),
+            ('paragraph_count', 'c.paragraph_count', 'int32'),
+            ('section_count', 'c.section_count', 'int32'),
+            ('language_code', 'c.language_code', 'string'),
+            ('ocr_applied', 'c.ocr_applied', 'bool'),
+            ('ocr_confidence', 'CAST(c.ocr_confidence AS FLOAT)', 'float32'),
+            ('text_quality', 'c.text_quality', 'string'),
+            ('extraction_method', 'c.extraction_method', 'string'),
+            ('updated_at', 'c.updated_at', 'timestamp'),
+        ),
+        text_columns=(
+            ('headnote', 'c.headnote', 'string'),
+            ('summary', 'c.summary', 'string'),
+            ('full_text', 'c.full_text', 'string'),
+        ),
+        key='document_id',
+        categorical=('language_code', 'text_quality', 'extraction_method'),
+        from_clause='content c JOIN documents d ON d.id = c.document_id',
+        changed_at='updated_at',
+    ),
+    'citations': ExportTable(
+        name='citations',
+        columns=(
+            ('id', 'c.id', 'int64'),
+            ('document_id', 'c.document_id', 'int64'),
+            ('country_code', 'd.country_code', 'string'),
+            ('citation_type', 'c.citation_type', 'string'),
+            ('volume', 'c.volume', 'int32'),
+            ('year', 'c.year', 'int16'),
+            ('reporter', 'c.reporter', 'string'),
+            ('court_code', 'c.court_code', 'string'),
+            ('page', 'c.page', 'int32'),
+            ('citation_encoded', 'c.citation_encoded', 'string'),
+            ('is_primary', 'c.is_primary', 'bool'),
+            ('is_verified', 'c.is_verified', 'bool'),
+            ('created_at', 'c.created_at', 'timestamp'),
+        ),
+        key='document_id',
+        categorical=('citation_type', 'reporter', 'court_code'),
+        from_clause='citations c JOIN documents d ON d.id = c.document_id',
+    ),
+    'parties': ExportTable(
+        name='parties',
+        columns=(
+            ('id', 'c.id', 'int64'),
+            ('document_id', 'c.document_id', 'int64'),
+            ('country_code', 'd.country_code', 'string'),
+            ('party_type', 'c.party_type', 'string'),
+            ('party_name', 'c.party_name', 'string'),
+            ('party_name_abbr', 'c.party_name_abbr', 'string'),
+            ('party_order', 'c.party_order', 'int16'),
+            ('party_category', 'c.party_category', 'string'),
+            ('created_at', 'c.created_at', 'timestamp'),
+        ),
+        key='document_id',
+        categorical=('party_type', 'party_category'),
+        from_clause='parties c JOIN documents d ON d.id = c.document_id',
+    ),
+    'judges': ExportTable(
+        name='judges',
+        columns=(
+            ('id', 'c.id', 'int64'),
+            ('document_id', 'c.document_id', 'int64'),
+            ('country_code', 'd.country_code', 'string'),
+            ('judge_name', 'c.judge_name', 'string'),
+            ('judge_designation', 'c.judge_designation', 'string'),
+            ('is_author', 'c.is_author', 'bool'),
+            ('is_presiding', 'c.is_presiding', 'bool'),
+            ('opinion_type', 'c.opinion_type', 'string'),
+            ('judge_order', 'c.judge_order', 'int16'),
+            ('judge_court', 'c.judge_court', 'string'),
+            ('created_at', 'c.created_at', 'timestamp'),
+        ),
+        key='document_id',
+        categorical=('judge_name', 'judge_designation', 'opinion_type', 'judge_court'),
+        from_clause='judges c JOIN documents d ON d.id = c.document_id',
+    ),
+}
+
+
+def _arrow_type(type_name: str):
+    return {
+        'int16': pa.int16(),
+        'int32': pa.int32(),
+        'int64': pa.int64(),
+        'float32': pa.float32(),
+        'bool': pa.bool_(),
+        'date32': pa.date32(),
+        'timestamp': pa.timestamp('us'),
+        'string': pa.string(),
+    }[type_name]
+
+
+def _schema(spec: ExportTable, include_text: bool):
+    fields = []
+    for name, _, type_name in spec.select_columns(include_text):
+        arrow_type = _arrow_type(type_name)
+        if name in spec.categorical:
+            arrow_type = pa.dictionary(pa.int32(), arrow_type)
+        fields.append(pa.field(name, arrow_type))
+    fields.append(pa.field(RUN_COLUMN, pa.int32()))
+    return pa.schema(fields)
+
+
+# ============================================================================
+# EXPORT
+# ============================================================================
+
+@dataclass
+class ExportRun:
+    """Summary of one export run (stored in the manifest)."""
+    run: int
+    mode: str
+    since: Optional[str]
+    watermark: Optional[str]
+    started_at: str
+    finished_at: Optional[str] = None
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+class ColumnarExporter:
+    """
+    Export PostgreSQL corpus tables to partitioned Parquet.
+
+    Example:
+        >>> exporter = ColumnarExporter(engine, 'data/columnar')
+        >>> exporter.export()              # full on first run, incremental after
+        >>> exporter.export(full=True)     # rewrite everything
+    """
+
+    def __init__(self, engine: Engine, root: str, batch_size: int = 50000,
+                 include_text: bool = False, overlap: timedelta = timedelta(minutes=5)):
+        """
+        Initialize exporter.
+
+        Args:
+            engine: SQLAlchemy engine for the PostgreSQL database
+            root: Output directory
+            batch_size: Rows fetched per server-side cursor batch
+            include_text: Also export headnote/summary/full_text from content
+            overlap: Re-export window before the last watermark, so rows from
+                     transactions that committed late are not missed
+        """
+        _require_pyarrow()
+        self.engine = engine
+        self.root = Path(root)
+        self.batch_size = batch_size
+        self.include_text = include_text
+        self.overlap = overlap
+
+    # ------------------------------------------------------------------
+    # Manifest
+    # ------------------------------------------------------------------
+
+    def load_manifest(self) -> Dict:
+        path = self.root / MANIFEST_NAME
+        if not path.exists():
+            return {'runs': []}
+        with open(path) as f:
+            return json.load(f)
+
+    def _save_manifest(self, manifest: Dict) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (MANIFEST_NAME + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp, self.root / MANIFEST_NAME)
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export(self, full: bool = False, tables: Optional[Sequence[str]] = None) -> ExportRun:
+        """
+        Run one export.
+
+        Args:
+            full: Discard existing files and export everything
+            tables: Subset of EXPORT_TABLES (default: all)
+
+        Returns:
+            ExportRun summary
+        """
+        tables = list(tables or EXPORT_TABLES)
+        unknown = set(tables) - set(EXPORT_TABLES)
+        if unknown:
+            raise ValueError(f"Unknown export tables: {sorted(unknown)}")
+
+        manifest = self.load_manifest()
+        if full or not manifest['runs']:
+            full = True
+            self._clear(tables)
+            manifest = {'runs': []}
+
+        last = manifest['runs'][-1] if manifest['runs'] else None
+        since = None
+        if not full and last and last.get('watermark'):
+            since = datetime.fromisoformat(last['watermark']) - self.overlap
+
+        run = ExportRun(
+            run=(last['run'] + 1) if last else 1,
+            mode='full' if full else 'incremental',
+            since=since.isoformat() if since else None,
+            watermark=None,
+            started_at=datetime.now().isoformat(),
+        )
+        self._remove_run_files(run.run)
+
+        with self.engine.connect() as conn:
+            # Database clock, not MAX(updated_at): most child tables only carry
+            # created_at, and their rows must not look newer than the watermark
+            run.watermark = conn.execute(text("SELECT LOCALTIMESTAMP")).scalar().isoformat()
+
+            for table in tables:
+                run.rows[table] = self._export_table(conn, EXPORT_TABLES[table], run.run, since)
+                logger.info(f"Exported {run.rows[table]:,} {table} rows (run {run.run}, {run.mode})")
+
+        run.finished_at = datetime.now().isoformat()
+        manifest['runs'].append(run.__dict__)
+        manifest['tables'] = {
+            name: {
+                'key': spec.key,
+                'partition_by': list(spec.partition_by),
+                'include_text': self.include_text if name == 'content' else False,
+            }
+            for name, spec in EXPORT_TABLES.items()
+        }
+        self._save_manifest(manifest)
+        return run
+
+    def _query(self, spec: ExportTable, since: Optional[datetime]) -> str:
+        select = ', '.join(f"{expr} AS {name}" for name, expr, _ in spec.select_columns(self.include_text))
+        query = f"SELECT {select} FROM {spec.from_clause}"
+        if since is not None:
+            if spec.name == 'documents':
+                query += " WHERE d.updated_at > :since"
+            else:
+                # Whole snapshot of every document that changed or whose child rows did
+                alias = spec.from_clause.split()[1]
+                query += (
+                    f" WHERE {alias}.document_id IN ("
+                    f"SELECT id FROM documents WHERE updated_at > :since "
+                    f"UNION SELECT document_id FROM {spec.name} WHERE {spec.changed_at} > :since)"
+                )
+        return query
+
+    def _batches(self, conn, spec: ExportTable, schema, run: int,
+                 since: Optional[datetime], counter: List[int]) -> Iterator:
+        columns = spec.select_columns(self.include_text)
+        result = conn.execution_options(stream_results=True, yield_per=self.batch_size).execute(
+            text(self._query(spec, since)), {'since': since} if since else {}
+        )
+        for rows in result.partitions(self.batch_size):
+            arrays = []
+            for i, (name, _, _) in enumerate(columns):
+                values = [row[i] for row in rows]
+                field_type = schema.field(name).type
+                if pa.types.is_dictionary(field_type):
+                    arrays.append(pa.array(values, type=field_type.value_type).dictionary_encode())
+                else:
+                    arrays.append(pa.array(values, type=field_type))
+            arrays.append(pa.array([run] * len(rows), type=pa.int32()))
+            counter[0] += len(rows)
+            yield pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+    def _export_table(self, conn, spec: ExportTable, run: int, since: Optional[datetime]) -> int:
+        schema = _schema(spec, self.include_text)
+        counter = [0]
+        reader = pa.RecordBatchReader.from_batches(
+            schema, self._batches(conn, spec, schema, run, since, counter)
+        )
+        partitioning = ds.partitioning(
+            pa.schema([schema.field(name) for name in spec.partition_by]), flavor='hive'
+        )
+        ds.write_dataset(
+            reader,
+            self.root / spec.name,
+            format='parquet',
+            partitioning=partitioning,
+            basename_template=f"part-{run:06d}-{{i}}.parquet",
+            existing_data_behavior='overwrite_or_ignore',
+            file_options=ds.ParquetFileFormat().make_write_options(compression='zstd'),
+            min_rows_per_group=min(self.batch_size, 10000),
+            max_rows_per_group=max(self.batch_size, 10000),
+        )
+        return counter[0]
+
+    def _clear(self, tables: Sequence[str]) -> None:
+        for table in tables:
+            for path in (self.root / table).rglob('*.parquet'):
+                path.unlink()
+
+    def _remove_run_files(self, run: int) -> None:
+        """Remove leftovers of a failed attempt with the same run number."""
+        for path in self.root.rglob(f"part-{run:06d}-*.parquet"):
+            path.unlink()
+
+
+# ============================================================================
+# READ
+# ============================================================================
+
+class ColumnarCorpusReader:
+    """
+    Memory-mapped reader for an exported corpus.
+
+    Only files from runs recorded in the manifest are read. With
+    latest_only=True (default) rows superseded by a later incremental run
+    are dropped, keyed per table (documents by id, child tables by
+    document_id).
+
+    Example:
+        >>> reader = ColumnarCorpusReader('data/columnar')
+        >>> reader.value_counts('documents', 'doc_year')
+        >>> reader.corpus_stats()
+    """
+
+    def __init__(self, root: str):
+        """
+        Initialize reader.
+
+        Args:
+            root: Export directory written by ColumnarExporter
+        """
+        _require_pyarrow()
+        self.root = Path(root)
+        with open(self.root / MANIFEST_NAME) as f:
+            self.manifest = json.load(f)
+        self._runs = [r['run'] for r in self.manifest['runs']]
+        self._filesystem = pafs.LocalFileSystem(use_mmap=True)
+        self._datasets: Dict[str, 'ds.Dataset'] = {}
+
+    def dataset(self, table: str) -> 'ds.Dataset':
+        """Arrow dataset over all Parquet files of a table (memory-mapped)."""
+        if table not in EXPORT_TABLES:
+            raise ValueError(f"Unknown table: {table}")
+        if table not in self._datasets:
+            self._datasets[table] = ds.dataset(
+                str(self.root / table),
+                format='parquet',
+                partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+                filesystem=self._filesystem,
+            )
+        return self._datasets[table]
+
+    def read(self, table: str, columns: Optional[List[str]] = None,
+             filter=None, latest_only: bool = True):
+        """
+        Read a table (or a projection of it).
+
+        Args:
+            table: Table name
+            columns: Columns to read (default: all)
+            filter: Optional pyarrow.compute expression, e.g. ds.field('doc_year') >= 2000
+            latest_only: Drop rows superseded by later runs
+
+        Returns:
+            pyarrow.Table
+        """
+        if not self._runs:
+            return _schema(EXPORT_TABLES[table], False).empty_table()
+
+        key = EXPORT_TABLES[table].key
+        needed = None
+        if columns is not None:
+            needed = list(dict.fromkeys(list(columns) + [key, RUN_COLUMN]))
+
+        committed = ds.field(RUN_COLUMN) <= max(self._runs)
+        expression = committed if filter is None else (committed & filter)
+        result = self.dataset(table).to_table(columns=needed, filter=expression)
+
+        if latest_only and len(self._runs) > 1:
+            result = self._latest(result, key)
+        if columns is not None:
+            result = result.select(columns)
+        return result
+
+    @staticmethod
+    def _latest(table, key: str):
+        """Keep only rows from the newest run per key."""
+        index = pa.table({
+            key: table[key],
+            RUN_COLUMN: table[RUN_COLUMN],
+            '_row': pa.array(range(table.num_rows), type=pa.int64()),
+        })
+        newest = index.group_by(key).aggregate([(RUN_COLUMN, 'max')])
+        joined = index.join(newest, key)
+        keep = joined.filter(pc.equal(joined[RUN_COLUMN], joined[f"{RUN_COLUMN}_max"]))
+        rows = keep['_row'].combine_chunks()
+        return table.take(pc.take(rows, pc.sort_indices(rows)))
+
+    def value_counts(self, table: str, column: str, filter=None) -> Dict:
+        """
+        Count rows per distinct value of a column.
+
+        Returns:
+            Dict of value -> count, most frequent first
+        """
+        data = self.read(table, columns=[column], filter=filter)
+        counts = pc.value_counts(data[column].combine_chunks()).to_pylist()
+        counts.sort(key=lambda item: item['counts'], reverse=True)
+        return {item['values']: item['counts'] for item in counts}
+
+    def corpus_stats(self) -> Dict:
+        """
+        Corpus-wide statistics in the dataset_stats.json layout.
+
+        Returns:
+            Dict with totals and distributions
+        """
+        documents = self.read('documents', columns=['id', 'doc_subtype', 'doc_year'])
+        stats = {
+            'total_documents': documents.num_rows,
+            'court_distribution': _counts(documents['doc_subtype'], 'Unknown Court'),
+            'year_distribution': {
+                str(year): count for year, count in
+                sorted(_counts(documents['doc_year']).items(), key=lambda item: item[0] or 0)
+            },
+            'country_distribution': self.value_counts('documents', 'country_code'),
+            'doc_type_distribution': self.value_counts('documents', 'doc_type'),
+        }
+
+        content = self.read('content', columns=['character_count', 'word_count'])
+        lengths = content['character_count']
+        if content.num_rows and lengths.null_count < content.num_rows:
+            min_max = pc.min_max(lengths).as_py()
+            stats['content_stats'] = {
+                'average_length': int(pc.mean(lengths).as_py()),
+                'min_length': min_max['min'],
+                'max_length': min_max['max'],
+                'total_chars': pc.sum(lengths).as_py(),
+                'total_words': pc.sum(content['word_count']).as_py() or 0,
+            }
+        else:
+            stats['content_stats'] = {}
+
+        stats['citation_reporters'] = self.value_counts('citations', 'reporter')
+        stats['total_parties'] = self.read('parties', columns=['id']).num_rows
+        stats['total_judges'] = self.read('judges', columns=['id']).num_rows
+        return stats
+
+
+def _counts(column, null_label: Optional[str] = None) -> Dict:
+    counts = pc.value_counts(column.combine_chunks()).to_pylist()
+    counts.sort(key=lambda item: item['counts'], reverse=True)
+    return {
+        (item['values'] if item['values'] is not None else null_label): item['counts']
+        for item in counts
+    }
@@ -8,9 +8,9 @@ from typing import List, Optional
 import uuid
 
 from sqlalchemy import (
-    Boolean, Column, Integer, String, Text, Date, DateTime, Numeric,
+    Boolean, Column, Integer, String, Text, Date, DateTime, Numeric, Float,
     ForeignKey, CheckConstraint, UniqueConstraint, Index, CHAR, BigInteger,
-    Enum as SQLEnum, DECIMAL
+    Enum as SQLEnum, DECIMAL, text
 )
 from sqlalchemy.dialects.postgresql import JSONB, UUID, TSVECTOR, ARRAY
 from sqlalchemy.orm import DeclarativeBase, relationship, Mapped, mapped_column
@@ -97,6 +97,10 @@ class StorageTier(str, enum.Enum):
 class Document(Base):
     """
     Main document model with Phase 1 naming integration.
+
+    In PostgreSQL the table is LIST-partitioned by country_code
+    (migrations/013_partition_documents.sql); foreign keys to documents.id
+    are enforced through document_registry.
     """
     __tablename__ = "documents"
 
@@ -141,6 +145,9 @@ class Document(Base):
     source_id: Mapped[Optional[str]] = mapped_column(String(100))
     source_database: Mapped[Optional[str]] = mapped_column(String(100))
 
+    # Download Status (maintained by a trigger on file_storage)
+    pdf_downloaded: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
     # Relationships
     parent_doc_id: Mapped[Optional[int]] = mapped_column(ForeignKey('documents.id', ondelete='SET NULL'))
     supersedes_doc_id: Mapped[Optional[int]] = mapped_column(ForeignKey('documents.id', ondelete='SET NULL'))
@@ -155,6 +162,8 @@ class Document(Base):
     # Statistics
     cited_by_count: Mapped[int] = mapped_column(Integer, default=0)
     cites_count: Mapped[int] = mapped_column(Integer, default=0)
+    authority_score: Mapped[Optional[float]] = mapped_column(Float)  # Graph PageRank (migration 016)
+    graph_metrics_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
 
     # Data Quality
     data_quality_score: Mapped[Optional[float]] = mapped_column(DECIMAL(3, 2))
@@ -188,6 +197,11 @@ class Document(Base):
         CheckConstraint('doc_year >= 1800 AND doc_year <= 2100', name='chk_doc_year'),
         Index('idx_doc_country_type', 'country_code', 'doc_type'),
         Index('idx_doc_country_type_year', 'country_code', 'doc_type', 'doc_year'),
+        Index('idx_doc_pending_download', 'source_domain', 'id',
+              postgresql_include=['source_url'],
+              postgresql_where=text('NOT pdf_downloaded')),
+        Index('idx_doc_source_year', 'source_domain', 'doc_year',
+              postgresql_include=['global_id']),
     )
 
     def __repr__(self):
@@ -392,6 +406,7 @@ class DocumentChunk(Base):
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     document_id: Mapped[int] = mapped_column(ForeignKey('documents.id', ondelete='CASCADE'), nullable=False)
+    country_code: Mapped[str] = mapped_column(CHAR(2), nullable=False)  # Partition key, copied from document
     chunk_index: Mapped[int] = mapped_column(Integer, nullable=False)
     chunk_id: Mapped[Optional[str]] = mapped_column(String(50))
     chunk_text: Mapped[str] = mapped_column(Text, nullable=False)
@@ -433,9 +448,26 @@ class DocumentChunk(Base):
         UniqueConstraint('document_id', 'chunk_index', name='uk_doc_chunk_index'),
         Index('idx_chunk_document', 'document_id'),
         Index('idx_chunk_embedding_status', 'embedding_status'),
+        Index('idx_chunk_pending_embedding', 'document_id', 'chunk_index',
+              postgresql_include=['id'],
+              postgresql_where=text("embedding_status = 'pending'")),
     )
 
 
+class CourtMetrics(Base):
+    """Per-court citation aggregates mirrored from the knowledge graph."""
+    __tablename__ = "court_metrics"
+
+    court_name: Mapped[str] = mapped_column(String(300), primary_key=True)
+    case_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    citations_made: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    citations_received: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    mean_authority: Mapped[Optional[float]] = mapped_column(Float)
+    top_case_title: Mapped[Optional[str]] = mapped_column(Text)
+    top_case_authority: Mapped[Optional[float]] = mapped_column(Float)
+    computed_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+
+
 # ============================================================================
 # Additional models would go here (LegalReference, SectionCited, etc.)
 # Truncated for brevity - the pattern is the same
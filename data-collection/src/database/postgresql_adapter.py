@@ -12,6 +12,35 @@ import psycopg2
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 
+
+# Hot-path queries. Each one is served by a partial/covering index from
+# migrations/014_hot_path_indexes.sql; tests/test_query_plans.py checks the plans.
+PENDING_DOWNLOAD_QUERY = """
+    SELECT d.id, d.source_url
+    FROM documents d
+    WHERE d.source_domain = %(source_domain)s
+    AND NOT d.pdf_downloaded
+    AND d.source_url NOT LIKE '%%/docfragment/%%'
+    ORDER BY d.id
+    LIMIT %(limit)s
+"""
+
+PENDING_EMBEDDING_QUERY = """
+    SELECT d.id, d.chunk_count
+    FROM documents d
+    WHERE d.embedding_status IN ('pending', 'failed')
+    ORDER BY d.id
+    LIMIT %(limit)s
+"""
+
+PENDING_COUNT_QUERY = """
+    SELECT COUNT(*)
+    FROM documents d
+    WHERE NOT d.pdf_downloaded
+    AND d.source_url NOT LIKE '%/docfragment/%'
+"""
+
+
 class PostgreSQLAdapter:
     """Database adapter for PostgreSQL operations"""
 
@@ -43,34 +72,46 @@ class PostgreSQLAdapter:
         finally:
             conn.close()
 
-    def get_documents_to_process(self, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+    def get_documents_to_process(self, limit: Optional[int] = None,
+                                 source_domain: str = 'indiankanoon.org') -> List[Tuple[int, str]]:
         """
         Get documents that need to be downloaded
 
+        Uses documents.pdf_downloaded and the normalized source_domain
+        (idx_doc_pending_download) instead of an anti-join on file_storage
+        and a LIKE on source_url.
+
+        Args:
+            limit: Maximum number of documents (None = all)
+            source_domain: Source host without "www."
+
         Returns:
             List of (doc_id, source_url) tuples
         """
         with self.get_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(PENDING_DOWNLOAD_QUERY, {
+                'source_domain': source_domain,
+                'limit': limit,  # LIMIT NULL = no limit
+            })
+            results = cursor.fetchall()
 
-            # Find documents without file storage records
-            query = """
-                SELECT d.id, d.source_url
-                FROM documents d
-                LEFT JOIN file_storage fs ON d.id = fs.document_id
-                WHERE fs.id IS NULL
-                AND d.source_url IS NOT NULL
-                AND d.source_url LIKE '%indiankanoon.org%'
-                AND d.source_url NOT LIKE '%/docfragment/%'
-            """
+            return results
 
-            if limit:
-                query += f" LIMIT {limit}"
+    def get_documents_pending_embedding(self, limit: int = 100) -> List[Tuple[int, int]]:
+        """
+        Get documents waiting for (or retrying) embedding
 
-            cursor.execute(query)
-            results = cursor.fetchall()
+        Args:
+            limit: Maximum number of documents to return
 
-            return results
+        Returns:
+            List of (doc_id, chunk_count) tuples in id order
+        """
+        with self.get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(PENDING_EMBEDDING_QUERY, {'limit': limit})
+            return cursor.fetchall()
 
     def mark_document_downloaded(self, doc_id: int, pdf_path: str, pdf_size: int) -> bool:
         """
@@ -154,13 +195,7 @@ class PostgreSQLAdapter:
             downloaded = cursor.fetchone()[0]
 
             # Pending (exclude docfragments)
-            cursor.execute("""
-                SELECT COUNT(*)
-                FROM documents d
-                LEFT JOIN file_storage fs ON d.id = fs.document_id
-                WHERE fs.id IS NULL
-                AND d.source_url NOT LIKE '%/docfragment/%'
-            """)
+            cursor.execute(PENDING_COUNT_QUERY)
             pending = cursor.fetchone()[0]
 
             return {
@@ -200,8 +235,9 @@ class PostgreSQLAdapter:
             cursor.execute("""
                 SELECT MAX(CAST(SUBSTRING(global_id FROM 3) AS INTEGER))
                 FROM documents
-                WHERE global_id LIKE %s
-            """, (f"{country_code}%",))
+                WHERE country_code = %s
+                AND global_id LIKE %s
+            """, (country_code, f"{country_code}%"))
             result = cursor.fetchone()[0]
             next_num = (result or 0) + 1
             return f"{country_code}{next_num:08d}"
@@ -257,7 +293,7 @@ class PostgreSQLAdapter:
                     'pending', 'bangladesh_scraper', '1.0',
                     %s, %s, %s
                 )
-                ON CONFLICT (global_id) DO UPDATE SET
+                ON CONFLICT (global_id, country_code) DO UPDATE SET
                     updated_at = EXCLUDED.updated_at
                 RETURNING id
             """, (
@@ -10,6 +10,7 @@ from ..base_extractor import SimpleExtractor
 from ..cache_manager import get_pattern_cache
 from ..schemas import CitationSchema, CitationExtractionResult, ExtractionStatus
 from ..logging_config import get_logger
+from ...naming.code_resolver import get_code_resolver
 
 logger = get_logger(__name__)
 
@@ -36,6 +37,7 @@ class CitationExtractor(SimpleExtractor):
         self.india_patterns = self.patterns.get('india', {})
         self.pakistan_patterns = self.patterns.get('pakistan', {})
         self.court_codes = self.patterns.get('court_codes', {})
+        self.code_resolver = get_code_resolver()
 
     def _extract_impl(self, text: str, **kwargs) -> Dict[str, Any]:
         """
@@ -333,19 +335,7 @@ class CitationExtractor(SimpleExtractor):
 
     def _get_court_code(self, court: str) -> str:
         """Get court code for encoding"""
-        # First letter for simple codes
-        if len(court) <= 3:
-            return court[0].upper()
-
-        # Special handling
-        court_map = {
-            'HCD': 'H',
-            'AD': 'A',
-            'SC': 'S',
-            'FSC': 'F',
-        }
-
-        return court_map.get(court, court[0].upper())
+        return self.code_resolver.citation_court_letter(court)
 
     def _validate_year(self, year: int) -> bool:
         """Validate year is in reasonable range"""
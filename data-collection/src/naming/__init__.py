@@ -9,6 +9,7 @@ Components:
 - PartyAbbreviator: Abbreviate party names
 - DocnumGenerator: Generate document numbers
 - HashGenerator: Generate content hashes
+- CodeResolver: Cached court/law code lookup
 """
 
 # Legacy imports (for backward compatibility)
@@ -31,6 +32,7 @@ from .enhanced_namer import (
     generate_filename, validate_filename, generate_global_id
 )
 from .filename_parser import FilenameParser, parse_filename, extract_metadata
+from .code_resolver import CodeResolver, get_code_resolver
 
 __all__ = [
     # Legacy
@@ -47,6 +49,7 @@ __all__ = [
     'PartyAbbreviator',
     'DocnumGenerator',
     'HashGenerator',
+    'CodeResolver',
 
     # Convenience functions
     'generate_filename',
@@ -54,6 +57,7 @@ __all__ = [
     'generate_global_id',
     'parse_filename',
     'extract_metadata',
+    'get_code_resolver',
 
     # Constants
     'COUNTRY_CODES',
@@ -0,0 +1,352 @@
+"""
+Court and Law Code Resolution
+Compiled, cached lookup of standard court and law codes from free-text names.
+
+Codes default to the legacy UniversalNamer keyword rules, compiled once into
+ordered tables, so filenames and IDs match those already generated. The
+registry aliases from COURT_CODES and config/law_codes.json (an exact match
+on the normalized name, then a token-index fallback that picks the most
+specific alias whose tokens all occur in the name) yield different codes for
+many names (Limitation Act LIM -> LIMI, Lahore High Court HC -> LHC) and are
+opt-in via registry_aliases=True, to be switched on only together with a
+migration of existing names. Results are memoized in a bounded LRU so naming
+a large batch costs a dict lookup per repeated court or act.
+"""
+
+import re
+import json
+import threading
+from pathlib import Path
+from functools import lru_cache
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    from .constants import COURT_CODES
+except ImportError:
+    from constants import COURT_CODES
+
+
+DEFAULT_LAW_CODES_PATH = Path(__file__).resolve().parents[2] / 'config' / 'law_codes.json'
+
+# Words that never distinguish one court or act from another
+STOPWORDS = frozenset({'the', 'of', 'and', 'or', 'for', 'in', 'at'})
+
+# Words dropped when a law code is generated from initials
+INITIALS_STOPWORDS = frozenset({'THE', 'OF', 'AND', 'OR', 'ACT', 'CODE'})
+
+# Legacy court rules, first match wins. Each rule is a list of term groups;
+# every group must occur in the lowercased name, where a group occurs if any
+# of its substrings does.
+LEGACY_COURT_RULES: List[Tuple[str, Sequence[Sequence[str]]]] = [
+    ('SC', [['supreme']]),
+    ('DHC', [['high court', 'high-court'], ['delhi']]),
+    ('BHC', [['high court', 'high-court'], ['bombay', 'mumbai']]),
+    ('CHC', [['high court', 'high-court'], ['calcutta', 'kolkata']]),
+    ('MHC', [['high court', 'high-court'], ['madras', 'chennai']]),
+    ('KHC', [['high court', 'high-court'], ['karnataka', 'bangalore']]),
+    ('AHC', [['high court', 'high-court'], ['allahabad']]),
+    ('GHC', [['high court', 'high-court'], ['gujarat', 'ahmedabad']]),
+    ('HC', [['high court', 'high-court']]),
+    ('DISTRICT', [['district']]),
+    ('ITAT', [['tribunal'], ['income tax', 'itat']]),
+    ('NCLT', [['tribunal'], ['company', 'nclt']]),
+    ('AFT', [['tribunal'], ['armed forces', 'aft']]),
+    ('TRIBUNAL', [['tribunal']]),
+]
+
+# Legacy country rules, checked after LEGACY_COURT_RULES
+LEGACY_COUNTRY_COURT_RULES: Dict[str, List[Tuple[str, Sequence[Sequence[str]]]]] = {
+    'BD': [
+        ('AD', [['appellate division']]),
+        ('HCD', [['high court division']]),
+    ],
+}
+
+# COURT_CODES entries already expressed by the legacy rules above
+# (or jurisdiction levels rather than courts)
+GENERIC_COURT_CODES = frozenset({'SC', 'HC', 'DIS', 'TRI', 'CTR', 'STA', 'FED', 'PRO', 'DIV'})
+
+# Legacy act-name table: the first key contained in the uppercased name wins
+LEGACY_LAW_CODES: Dict[str, str] = {
+    'INDIAN PENAL CODE': 'IPC',
+    'PENAL CODE': 'PEN',
+    'INCOME TAX ACT': 'ITA',
+    'COMPANIES ACT': 'CA',
+    'EVIDENCE ACT': 'EVA',
+    'CIVIL PROCEDURE CODE': 'CPC',
+    'CRIMINAL PROCEDURE CODE': 'CRPC',
+    'CONSTITUTION': 'CONST',
+    'CONTRACT ACT': 'CA',
+    'NEGOTIABLE INSTRUMENTS ACT': 'NIA',
+    'TRANSFER OF PROPERTY ACT': 'TPA',
+    'ARBITRATION': 'ARB',
+    'LIMITATION': 'LIM',
+    'SPECIFIC RELIEF': 'SRA',
+    'GOODS AND SERVICES TAX': 'GST',
+    'CUSTOMS': 'CUST',
+    'FOREIGN EXCHANGE': 'FEMA',
+}
+
+# Single-letter court markers used in encoded citations
+CITATION_COURT_LETTERS: Dict[str, str] = {
+    'HCD': 'H',
+    'AD': 'A',
+    'SC': 'S',
+    'FSC': 'F',
+}
+
+# law_codes.json section -> country code
+LAW_CODE_COUNTRIES: Dict[str, str] = {
+    'INDIA': 'IN',
+    'BANGLADESH': 'BD',
+    'PAKISTAN': 'PK',
+}
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a court or act name for lookup.
+
+    Lowercases, maps '&' to 'and', replaces punctuation with spaces and
+    collapses whitespace ('High-Court, Delhi' -> 'high court delhi').
+    """
+    if not name:
+        return ''
+    return _NON_ALNUM.sub(' ', name.lower().replace('&', ' and ')).strip()
+
+
+def _tokens(normalized: str) -> Tuple[str, ...]:
+    """Significant tokens of a normalized name (stopwords removed)."""
+    return tuple(t for t in normalized.split() if t not in STOPWORDS)
+
+
+def _legacy_match(text: str, rules: Sequence[Tuple[str, Sequence[Sequence[str]]]]) -> Optional[str]:
+    """First rule whose every group has a substring in text."""
+    for code, groups in rules:
+        if all(any(term in text for term in group) for group in groups):
+            return code
+    return None
+
+
+@dataclass(frozen=True)
+class _Rule:
+    """One alias rule: all groups must match; a group matches if any alternative does."""
+    code: str
+    groups: Tuple[Tuple[frozenset, ...], ...]
+    specificity: int
+    order: int
+
+    def matches(self, tokens: frozenset) -> bool:
+        return all(any(alt <= tokens for alt in group) for group in self.groups)
+
+
+class _RuleSet:
+    """Exact-match table plus a token index over rules."""
+
+    def __init__(self):
+        self.exact: Dict[str, str] = {}
+        self.rules: List[_Rule] = []
+        self.index: Dict[str, List[_Rule]] = {}
+
+    def add_exact(self, name: str, code: str) -> None:
+        key = ' '.join(_tokens(normalize_name(name)))
+        if key:
+            self.exact.setdefault(key, code)
+
+    def add_rule(self, code: str, groups: Sequence[Sequence[str]], tier: int = 0) -> None:
+        compiled = tuple(
+            tuple(frozenset(_tokens(normalize_name(phrase))) for phrase in group)
+            for group in groups
+        )
+        compiled = tuple(tuple(alt for alt in group if alt) for group in compiled)
+        if not compiled or not all(compiled):
+            return
+        # Specificity: fewest tokens this rule can match on
+        specificity = sum(min(len(alt) for alt in group) for group in compiled)
+        rule = _Rule(code, compiled, specificity, order=tier * 100000 + len(self.rules))
+        self.rules.append(rule)
+        # Every match satisfies the first group, so index on its tokens
+        for alt in compiled[0]:
+            for token in alt:
+                self.index.setdefault(token, []).append(rule)
+
+    def lookup(self, normalized: str) -> Optional[str]:
+        tokens = _tokens(normalized)
+        if not tokens:
+            return None
+
+        exact = self.exact.get(' '.join(tokens))
+        if exact is not None:
+            return exact
+
+        token_set = frozenset(tokens)
+        best: Optional[_Rule] = None
+        seen = set()
+        for token in token_set:
+            for rule in self.index.get(token, ()):
+                if id(rule) in seen:
+                    continue
+                seen.add(id(rule))
+                if not rule.matches(token_set):
+                    continue
+                if best is None or (rule.specificity, -rule.order) > (best.specificity, -best.order):
+                    best = rule
+        return best.code if best else None
+
+
+class CodeResolver:
+    """
+    Resolve court and act names to standard codes.
+
+    Shared by UniversalNamer, CitationExtractor and the graph loaders; use
+    get_code_resolver() for the process-wide instance.
+    """
+
+    def __init__(self, law_codes_path: Optional[str] = None, cache_size: int = 4096,
+                 registry_aliases: bool = False):
+        """
+        Build alias tables.
+
+        Args:
+            law_codes_path: Path to law_codes.json (defaults to config/law_codes.json)
+            cache_size: Maximum memoized lookups per resolver method
+            registry_aliases: Prefer COURT_CODES / law_codes.json aliases over the
+                legacy rules. Changes existing codes; enable only with a rename migration.
+        """
+        self.registry_aliases = registry_aliases
+        self._courts: Dict[str, _RuleSet] = {}
+        self._laws: Dict[str, _RuleSet] = {}
+
+        if registry_aliases:
+            self._build_courts()
+            self._build_laws(self._load_json(law_codes_path or DEFAULT_LAW_CODES_PATH))
+
+        self.court_code = lru_cache(maxsize=cache_size)(self._court_code)
+        self.law_code = lru_cache(maxsize=cache_size)(self._law_code)
+        self.citation_court_letter = lru_cache(maxsize=cache_size)(self._citation_court_letter)
+
+    @staticmethod
+    def _load_json(path) -> dict:
+        """Load JSON file, return empty dict if not found"""
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _rule_set(self, tables: Dict[str, _RuleSet], country: str) -> _RuleSet:
+        if country not in tables:
+            tables[country] = _RuleSet()
+        return tables[country]
+
+    def _build_courts(self) -> None:
+        self._rule_set(self._courts, '')
+        for country, courts in COURT_CODES.items():
+            rules = self._rule_set(self._courts, country)
+            for code, groups in LEGACY_COUNTRY_COURT_RULES.get(country, []):
+                rules.add_rule(code, groups)
+            for code, name in courts.items():
+                rules.add_exact(code, code)
+                if code not in GENERIC_COURT_CODES:
+                    rules.add_exact(name, code)
+                    rules.add_rule(code, [[name]], tier=1)
+
+    def _build_laws(self, law_codes: dict) -> None:
+        generic = self._rule_set(self._laws, '')
+        for section, country in LAW_CODE_COUNTRIES.items():
+            rules = self._rule_set(self._laws, country)
+            for key, entry in law_codes.get(section, {}).items():
+                name = entry.get('full_name') if isinstance(entry, dict) else None
+                if not name:
+                    continue
+                code = key.rsplit('_', 1)[0] if re.search(r'_\d{4}$', key) else key
+                rules.add_exact(name, code)
+                rules.add_rule(code, [[name]], tier=1)
+                # Unqualified names fall back to any country's alias
+                generic.add_rule(code, [[name]], tier=1)
+
+    def _lookup(self, tables: Dict[str, _RuleSet], name: str, country: str) -> Optional[str]:
+        """Registry alias for name, or None (always None unless registry_aliases)."""
+        if not tables:
+            return None
+        normalized = normalize_name(name)
+        country = (country or '').upper()
+        if country and country in tables:
+            code = tables[country].lookup(normalized)
+            if code is not None:
+                return code
+        return tables[''].lookup(normalized)
+
+    def _court_code(self, court_name: str, country: str = '') -> str:
+        """Uncached court_code()."""
+        code = self._lookup(self._courts, court_name, country)
+        if code is not None:
+            return code
+
+        text = (court_name or '').lower().strip()
+        code = _legacy_match(text, LEGACY_COURT_RULES)
+        if code is None:
+            code = _legacy_match(text, LEGACY_COUNTRY_COURT_RULES.get((country or '').upper(), []))
+        return code or 'MISC'
+
+    def _law_code(self, act_name: str, year: Optional[int] = None, country: str = '') -> str:
+        """Uncached law_code()."""
+        code = self._lookup(self._laws, act_name, country)
+
+        if code is None:
+            text = (act_name or '').upper().strip()
+            code = next((code for key, code in LEGACY_LAW_CODES.items() if key in text), None)
+
+        if code is None:
+            # Generate code from initials of the significant words
+            words = (act_name or '').upper().replace(',', '').split()
+            filtered = [w for w in words if w not in INITIALS_STOPWORDS]
+            code = ''.join(w[0] for w in filtered[:4]) if filtered else 'ACT'
+
+        if year:
+            return f'{code}_{year}'
+        return code
+
+    def _citation_court_letter(self, court: str) -> str:
+        """Uncached citation_court_letter()."""
+        if not court:
+            return ''
+        if len(court) <= 3:
+            return court[0].upper()
+        return CITATION_COURT_LETTERS.get(court, court[0].upper())
+
+    def cache_info(self) -> Dict[str, Dict[str, int]]:
+        """LRU statistics per lookup method."""
+        return {
+            name: getattr(self, name).cache_info()._asdict()
+            for name in ('court_code', 'law_code', 'citation_court_letter')
+        }
+
+    def clear_cache(self) -> None:
+        """Drop memoized lookups."""
+        self.court_code.cache_clear()
+        self.law_code.cache_clear()
+        self.citation_court_letter.cache_clear()
+
+
+# Global resolver instance
+_code_resolver: Optional[CodeResolver] = None
+_code_resolver_lock = threading.Lock()
+
+
+def get_code_resolver() -> CodeResolver:
+    """
+    Get global code resolver instance.
+
+    Returns:
+        Global CodeResolver instance
+    """
+    global _code_resolver
+    if _code_resolver is None:
+        with _code_resolver_lock:
+            if _code_resolver is None:
+                _code_resolver = CodeResolver()
+    return _code_resolver
@@ -4,11 +4,14 @@ Generates unique identifiers across the entire system
 """
 
 import uuid
-import sqlite3
 from typing import Optional, Tuple
-from pathlib import Path
 import threading
 
+try:
+    from ..sqlite_profile import get_connection_factory
+except ImportError:
+    from sqlite_profile import get_connection_factory
+
 
 class IDGenerator:
     """
@@ -34,6 +37,7 @@ class IDGenerator:
             db_path = 'data/universal_legal.db'
 
         self.db_path = db_path
+        self._db = get_connection_factory(db_path)
         self._ensure_database()
 
     @classmethod
@@ -47,9 +51,7 @@ class IDGenerator:
 
     def _ensure_database(self):
         """Ensure database and sequence_tracker table exist"""
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
-
-        conn = sqlite3.connect(self.db_path)
+        conn = self._db.connection()
         cursor = conn.cursor()
 
         # Create sequence_tracker if it doesn't exist
@@ -74,7 +76,6 @@ class IDGenerator:
         """)
 
         conn.commit()
-        conn.close()
 
     def generate_global_id(self) -> Tuple[int, str]:
         """
@@ -85,7 +86,7 @@ class IDGenerator:
             e.g., (1, 'ULEGAL-0000000001')
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._db.connection()
             cursor = conn.cursor()
 
             # Get and increment global sequence
@@ -103,7 +104,6 @@ class IDGenerator:
 
             result = cursor.fetchone()
             conn.commit()
-            conn.close()
 
             if result:
                 seq_id = result[0]
@@ -140,7 +140,7 @@ class IDGenerator:
             Next sequence number (1-based)
         """
         with self._lock:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._db.connection()
             cursor = conn.cursor()
 
             # Try to insert or update
@@ -166,7 +166,6 @@ class IDGenerator:
 
             result = cursor.fetchone()
             conn.commit()
-            conn.close()
 
             if result:
                 return result[0]
@@ -190,7 +189,7 @@ class IDGenerator:
         Returns:
             Current sequence number (0 if not initialized)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._db.connection()
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -202,7 +201,6 @@ class IDGenerator:
         """, (country_code, doc_category, year))
 
         result = cursor.fetchone()
-        conn.close()
 
         return result[0] if result else 0
 
@@ -222,7 +220,7 @@ class IDGenerator:
             doc_category: Required for YEARLY
             year: Required for YEARLY
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._db.connection()
         cursor = conn.cursor()
 
         if sequence_type == 'GLOBAL':
@@ -242,7 +240,6 @@ class IDGenerator:
             """, (country_code, doc_category, year))
 
         conn.commit()
-        conn.close()
 
     def get_stats(self) -> dict:
         """
@@ -251,7 +248,7 @@ class IDGenerator:
         Returns:
             Dictionary with sequence statistics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._db.connection()
         cursor = conn.cursor()
 
         # Global sequence
@@ -274,8 +271,6 @@ class IDGenerator:
         """)
         yearly_seqs = cursor.fetchall()
 
-        conn.close()
-
         return {
             'global_sequence': global_seq[0] if global_seq else 0,
             'yearly_sequences': [
@@ -0,0 +1,115 @@
+"""
+Tests for CodeResolver (court and law code lookup)
+"""
+
+import pytest
+
+from src.naming.code_resolver import CodeResolver, get_code_resolver, normalize_name
+from src.naming.universal_namer import UniversalNamer
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return CodeResolver(cache_size=64)
+
+
+@pytest.fixture(scope='module')
+def registry():
+    return CodeResolver(cache_size=64, registry_aliases=True)
+
+
+class TestCourtCodes:
+    """Tests for court_code()."""
+
+    @pytest.mark.parametrize('name,country,expected', [
+        ('Supreme Court of India', '', 'SC'),
+        ('Delhi High Court', '', 'DHC'),
+        ('High-Court of Judicature at Bombay', '', 'BHC'),
+        ('Income Tax Appellate Tribunal', '', 'ITAT'),
+        ('Armed Forces Tribunal', '', 'AFT'),
+        ('District Court', 'IN', 'DISTRICT'),
+        ('Patna High Court', '', 'HC'),
+        ('Some Court', '', 'MISC'),
+    ])
+    def test_legacy_codes(self, resolver, name, country, expected):
+        assert resolver.court_code(name, country) == expected
+
+    @pytest.mark.parametrize('name,country,expected', [
+        # Codes already used in filenames and IDs; changing them needs a migration
+        ('Lahore High Court', 'PK', 'HC'),
+        ('Sindh High Court', 'PK', 'HC'),
+        ('Peshawar High Court', 'PK', 'HC'),
+        ('Punjab and Haryana High Court', 'IN', 'HC'),
+        ('High Court Division', 'BD', 'HC'),
+        ('Supreme Court of Bangladesh, Appellate Division', 'BD', 'SC'),
+        ('Appellate Division', 'BD', 'AD'),
+        ('Appellate Division', '', 'MISC'),
+        ('National Company Law Appellate Tribunal', 'IN', 'NCLT'),
+    ])
+    def test_legacy_country_codes_are_pinned(self, resolver, name, country, expected):
+        assert resolver.court_code(name, country) == expected
+
+    def test_lookups_are_memoized(self):
+        resolver = CodeResolver(cache_size=8)
+        for _ in range(5):
+            resolver.court_code('Delhi High Court')
+        info = resolver.cache_info()['court_code']
+        assert info['misses'] == 1
+        assert info['hits'] == 4
+
+
+class TestLawCodes:
+    """Tests for law_code()."""
+
+    @pytest.mark.parametrize('name,year,country,expected', [
+        ('Indian Penal Code', 1860, '', 'IPC_1860'),
+        ('Income Tax Act', 1961, '', 'ITA_1961'),
+        ('Companies Act', 2013, '', 'CA_2013'),
+        ('Code of Criminal Procedure', 1973, '', 'CP_1973'),
+        ('Custom Duty and Tax Act', 2020, '', 'CDT_2020'),
+        ('', None, '', 'ACT'),
+        ('', 1950, '', 'ACT_1950'),
+        # Codes already used in filenames and IDs; changing them needs a migration
+        ('Limitation Act', 1963, 'IN', 'LIM_1963'),
+        ('Indian Contract Act', 1872, 'IN', 'CA_1872'),
+        ('Contract Act', None, 'BD', 'CA'),
+        ('Customs Act', 1962, 'IN', 'CUST_1962'),
+        ('Arbitration and Conciliation Act', 1996, 'IN', 'ARB_1996'),
+        ('The Indian Evidence Act', 1872, '', 'EVA_1872'),
+        ('Central Goods and Services Tax Act', 2017, 'IN', 'GST_2017'),
+    ])
+    def test_law_codes(self, resolver, name, year, country, expected):
+        assert resolver.law_code(name, year, country) == expected
+
+
+class TestRegistryAliases:
+    """Opt-in registry aliases (the codes a rename migration would switch to)."""
+
+    def test_registry_codes(self, registry):
+        assert registry.court_code('Lahore High Court', 'PK') == 'LHC'
+        assert registry.court_code('High Court Division', 'BD') == 'HCD'
+        assert registry.court_code('Patna High Court') == 'HC'
+        assert registry.law_code('The Indian Evidence Act', 1872) == 'IEA_1872'
+        assert registry.law_code('Indian Penal Code', 1860) == 'IPC_1860'
+
+    def test_default_resolver_is_legacy(self):
+        assert not get_code_resolver().registry_aliases
+
+
+class TestIntegration:
+    """Namer and citation encoding share the global resolver."""
+
+    def test_namer_uses_shared_resolver(self):
+        namer = UniversalNamer()
+        assert namer.code_resolver is get_code_resolver()
+        assert namer.get_court_code('Bombay High Court') == 'BHC'
+        assert namer.get_law_code('Penal Code', 1860, 'BD') == 'PEN_1860'
+
+    @pytest.mark.parametrize('court,letter', [
+        ('HCD', 'H'), ('AD', 'A'), ('Kant', 'K'), ('P&H', 'P'),
+    ])
+    def test_citation_court_letter(self, court, letter):
+        assert get_code_resolver().citation_court_letter(court) == letter
+
+    def test_normalize_name(self):
+        assert normalize_name('  High-Court, Punjab & Haryana ') == 'high court punjab and haryana'
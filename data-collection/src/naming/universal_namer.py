@@ -8,6 +8,11 @@ from typing import Dict, Any, Optional
 from pathlib import Path
 import json
 
+try:
+    from .code_resolver import get_code_resolver
+except ImportError:
+    from code_resolver import get_code_resolver
+
 
 class UniversalNamer:
     """
@@ -37,6 +42,9 @@ class UniversalNamer:
         self.taxonomy = self._load_json(taxonomy_path)
         self.country_codes = self._load_json(country_codes_path)
 
+        # Shared, memoized court/law code lookup
+        self.code_resolver = get_code_resolver()
+
     def _load_json(self, filepath: str) -> dict:
         """Load JSON file, return empty dict if not found"""
         try:
@@ -608,63 +616,16 @@ class UniversalNamer:
             >>> namer.get_court_code('Bombay High Court')
             'BHC'
         """
-        court_name = court_name.lower().strip()
-
-        # Supreme Court variations
-        if 'supreme' in court_name:
-            return 'SC'
-
-        # High Court variations
-        if 'high court' in court_name or 'high-court' in court_name:
-            # Try to extract state/location name
-            if 'delhi' in court_name:
-                return 'DHC'
-            elif 'bombay' in court_name or 'mumbai' in court_name:
-                return 'BHC'
-            elif 'calcutta' in court_name or 'kolkata' in court_name:
-                return 'CHC'
-            elif 'madras' in court_name or 'chennai' in court_name:
-                return 'MHC'
-            elif 'karnataka' in court_name or 'bangalore' in court_name:
-                return 'KHC'
-            elif 'allahabad' in court_name:
-                return 'AHC'
-            elif 'gujarat' in court_name or 'ahmedabad' in court_name:
-                return 'GHC'
-            else:
-                return 'HC'
-
-        # District Court
-        if 'district' in court_name:
-            return 'DISTRICT'
-
-        # Tribunal
-        if 'tribunal' in court_name:
-            if 'income tax' in court_name or 'itat' in court_name:
-                return 'ITAT'
-            elif 'company' in court_name or 'nclt' in court_name:
-                return 'NCLT'
-            elif 'armed forces' in court_name or 'aft' in court_name:
-                return 'AFT'
-            else:
-                return 'TRIBUNAL'
+        return self.code_resolver.court_code(court_name, country)
 
-        # Bangladesh specific
-        if country.upper() == 'BD':
-            if 'appellate division' in court_name:
-                return 'AD'
-            elif 'high court division' in court_name:
-                return 'HCD'
-
-        return 'MISC'
-
-    def get_law_code(self, act_name: str, year: Optional[int] = None) -> str:
+    def get_law_code(self, act_name: str, year: Optional[int] = None, country: str = '') -> str:
         """
         Generate standard law reference code from act name.
 
         Args:
             act_name: Full act name
             year: Year of enactment (optional)
+            country: Country code (optional, for country-specific codes)
 
         Returns:
             Law code (e.g., 'IPC_1860', 'ITA_1961')
@@ -677,53 +638,7 @@ class UniversalNamer:
             >>> namer.get_law_code('Companies Act', 2013)
             'CA_2013'
         """
-        act_name = act_name.upper().strip()
-
-        # Common law codes (predefined)
-        law_codes = {
-            'INDIAN PENAL CODE': 'IPC',
-            'PENAL CODE': 'PEN',
-            'INCOME TAX ACT': 'ITA',
-            'COMPANIES ACT': 'CA',
-            'EVIDENCE ACT': 'EVA',
-            'CIVIL PROCEDURE CODE': 'CPC',
-            'CRIMINAL PROCEDURE CODE': 'CRPC',
-            'CONSTITUTION': 'CONST',
-            'CONTRACT ACT': 'CA',
-            'NEGOTIABLE INSTRUMENTS ACT': 'NIA',
-            'TRANSFER OF PROPERTY ACT': 'TPA',
-            'ARBITRATION': 'ARB',
-            'LIMITATION': 'LIM',
-            'SPECIFIC RELIEF': 'SRA',
-            'GOODS AND SERVICES TAX': 'GST',
-            'CUSTOMS': 'CUST',
-            'FOREIGN EXCHANGE': 'FEMA'
-        }
-
-        # Check for known acts
-        for key, code in law_codes.items():
-            if key in act_name:
-                if year:
-                    return f'{code}_{year}'
-                return code
-
-        # Generate code from initials
-        # Remove common words
-        words = act_name.replace(',', '').split()
-        filtered_words = [w for w in words if w not in ['THE', 'OF', 'AND', 'OR', 'ACT', 'CODE']]
-
-        if filtered_words:
-            # Take first letter of each significant word
-            code = ''.join([w[0] for w in filtered_words[:4]])  # Max 4 letters
-
-            if year:
-                return f'{code}_{year}'
-            return code
-
-        if year:
-            return f'ACT_{year}'
-        return 'ACT'
-
+        return self.code_resolver.law_code(act_name, year, country)
 
 if __name__ == "__main__":
     # Test universal namer
@@ -30,6 +30,11 @@ except ImportError:
         UniversalNamer = None
         SubjectClassifier = None
 
+try:
+    from .sqlite_profile import open_connection
+except ImportError:
+    from sqlite_profile import open_connection
+
 
 class UnifiedDatabase:
     """Database manager for unified multi-country legal documents"""
@@ -47,9 +52,9 @@ class UnifiedDatabase:
 
         self.db_path = db_path
         self.use_universal = use_universal
-        self.conn = sqlite3.connect(db_path)
-        self.conn.row_factory = sqlite3.Row  # Return rows as dictionaries
+        self.conn = open_connection(db_path, row_factory=sqlite3.Row)  # Rows as dictionaries
         self.logger = logging.getLogger(__name__)
+        self._column_cache: Dict[str, List[str]] = {}
 
         # Initialize universal system components
         if use_universal and IDGenerator:
@@ -259,6 +264,71 @@ class UnifiedDatabase:
 
         return [dict(row) for row in cursor.fetchall()]
 
+    # Columns holding full document bodies; skipped by iter_documents() by default
+    HEAVY_COLUMNS = ('html_content', 'plain_text')
+
+    def _table_columns(self, table: str) -> List[str]:
+        """Get column names of a table (cached per instance)"""
+        if table not in self._column_cache:
+            cursor = self.conn.execute(f"PRAGMA table_info({table})")
+            self._column_cache[table] = [row['name'] for row in cursor.fetchall()]
+        return self._column_cache[table]
+
+    def iter_documents(self, country: str = None, batch_size: int = 1000,
+                       columns: List[str] = None, include_content: bool = False):
+        """
+        Stream documents in id order using keyset pagination.
+
+        Each page is a ``WHERE id > ? ORDER BY id LIMIT ?`` query, so deep
+        iteration costs the same per row as the first page and memory stays
+        bounded by batch_size.
+
+        Args:
+            country: Filter by country (None for all)
+            batch_size: Rows fetched per page
+            columns: Columns to select (default: all except html_content/plain_text)
+            include_content: Also select html_content and plain_text
+
+        Yields:
+            Document dictionaries
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+
+        available = self._table_columns('legal_documents')
+
+        if columns:
+            unknown = [c for c in columns if c not in available]
+            if unknown:
+                raise ValueError(f"Unknown legal_documents columns: {unknown}")
+            selected = list(columns)
+        else:
+            selected = [c for c in available if c not in self.HEAVY_COLUMNS]
+
+        if include_content:
+            selected += [c for c in self.HEAVY_COLUMNS if c not in selected]
+        if 'id' not in selected:
+            selected.insert(0, 'id')
+
+        sql = f"SELECT {', '.join(selected)} FROM legal_documents WHERE id > ?"
+        if country:
+            sql += " AND country = ?"
+        sql += " ORDER BY id LIMIT ?"
+
+        last_id = 0
+        while True:
+            params = (last_id, country, batch_size) if country else (last_id, batch_size)
+            rows = self.conn.execute(sql, params).fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1]['id']
+            for row in rows:
+                yield dict(row)
+
+            if len(rows) < batch_size:
+                return
+
     def search_documents(self, query: str, country: str = None) -> List[Dict]:
         """
         Search documents by title or text.
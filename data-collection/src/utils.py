@@ -8,6 +8,7 @@ import hashlib
 from typing import Optional, Dict, Any, Union
 from datetime import datetime
 from pathlib import Path
+from functools import lru_cache
 import unicodedata
 
 
@@ -332,9 +333,26 @@ def extract_numbers_from_string(text: str) -> list:
     return [int(num) for num in re.findall(r'\d+', text)]
 
 
+# Casing fixes applied after title-casing a court name
+COURT_NAME_CASE_FIXES = {
+    'Sc ': 'SC ',
+    'Hc ': 'HC ',
+    ' Of ': ' of ',
+    ' And ': ' and ',
+    ' The ': ' the ',
+    ' For ': ' for ',
+    ' In ': ' in ',
+    ' At ': ' at '
+}
+
+
+@lru_cache(maxsize=4096)
 def normalize_court_name(court_name: str) -> str:
     """
-    Normalize court name to standard format.
+    Normalize court name to standard display format.
+
+    Court names repeat across a corpus, so results are memoized. For the
+    standard court code use naming.code_resolver.get_code_resolver().court_code().
 
     Args:
         court_name: Court name in any format
@@ -355,18 +373,7 @@ def normalize_court_name(court_name: str) -> str:
     court_name = court_name.strip().title()
 
     # Fix common abbreviations
-    replacements = {
-        'Sc ': 'SC ',
-        'Hc ': 'HC ',
-        ' Of ': ' of ',
-        ' And ': ' and ',
-        ' The ': ' the ',
-        ' For ': ' for ',
-        ' In ': ' in ',
-        ' At ': ' at '
-    }
-
-    for old, new in replacements.items():
+    for old, new in COURT_NAME_CASE_FIXES.items():
         court_name = court_name.replace(old, new)
 
     return court_name
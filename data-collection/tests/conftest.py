@@ -0,0 +1,5 @@
+"""
+Shared fixtures for the data-collection tests (defined in tests/fixtures.py)
+"""
+
+pytest_plugins = ['tests.fixtures']
@@ -4,7 +4,9 @@ Provides reusable test data, mock objects, and utilities for testing.
 """
 
 import json
+import os
 from datetime import datetime
+from pathlib import Path
 from typing import Dict, List
 from unittest.mock import Mock, MagicMock
 import pytest
@@ -430,6 +432,102 @@ def temp_dir(tmp_path):
     return str(tmp_path)
 
 
+@pytest.fixture(scope='module')
+def postgres_server_url(tmp_path_factory):
+    """
+    Superuser URL for a PostgreSQL server.
+
+    Uses TEST_POSTGRES_URL when set, otherwise starts a local server with
+    pgserver; skips when neither is available.
+    """
+    url = os.environ.get('TEST_POSTGRES_URL')
+    if url:
+        yield url
+        return
+    try:
+        import pgserver
+    except ImportError:
+        pytest.skip("Set TEST_POSTGRES_URL or install pgserver for PostgreSQL tests")
+
+    server = pgserver.get_server(tmp_path_factory.mktemp('pgdata'), cleanup_mode='stop')
+    yield server.get_uri()
+    server.cleanup()
+
+
+# =============================================================================
+# PostgreSQL Scratch Databases
+# =============================================================================
+
+MIGRATIONS_DIR = Path(__file__).parent.parent / 'migrations'
+
+
+# Operator classes of optional extensions, used by single-line CREATE INDEX statements
+EXTENSION_OPCLASSES = {'pg_trgm': ('gin_trgm_ops', 'gist_trgm_ops')}
+
+
+def _apply_migration(cursor, path: Path, available_extensions: set):
+    """Run a migration file, skipping CREATE EXTENSION (and indexes using it) for extensions the server lacks."""
+    missing_opclasses = [
+        opclass for name, opclasses in EXTENSION_OPCLASSES.items()
+        if name not in available_extensions for opclass in opclasses
+    ]
+    lines = []
+    for line in path.read_text().splitlines():
+        if line.strip().upper().startswith('CREATE EXTENSION'):
+            name = line.split('"')[1] if '"' in line else line.split()[-1].rstrip(';')
+            if name not in available_extensions:
+                continue
+        if any(opclass in line for opclass in missing_opclasses):
+            continue
+        lines.append(line)
+    cursor.execute('\n'.join(lines))
+
+
+def create_migrated_database(server_url: str, db_name: str, migrations: List[str]) -> str:
+    """
+    (Re)create a scratch database and apply SQL migrations to it.
+
+    Args:
+        server_url: Superuser URL (see postgres_server_url)
+        db_name: Scratch database name
+        migrations: Migration file names under migrations/
+
+    Returns:
+        DSN of the new database
+    """
+    import psycopg2
+    from psycopg2.extensions import make_dsn
+
+    admin = psycopg2.connect(server_url)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {db_name}")
+        cur.execute(f"CREATE DATABASE {db_name}")
+    admin.close()
+
+    dsn = make_dsn(server_url, dbname=db_name)
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        cur.execute("SELECT name FROM pg_available_extensions")
+        available = {row[0] for row in cur.fetchall()}
+        for migration in migrations:
+            _apply_migration(cur, MIGRATIONS_DIR / migration, available)
+    conn.close()
+    return dsn
+
+
+def drop_database(server_url: str, db_name: str):
+    """Drop a scratch database created by create_migrated_database."""
+    import psycopg2
+
+    admin = psycopg2.connect(server_url)
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {db_name} WITH (FORCE)")
+    admin.close()
+
+
 # =============================================================================
 # Test Data Generators
 # =============================================================================
@@ -0,0 +1,178 @@
+"""
+Tests for keyset-paginated streaming (CaseDatabase.iter_* and UnifiedDatabase.iter_documents)
+"""
+
+import importlib.util
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from src.unified_database import UnifiedDatabase
+
+SRC_DIR = Path(__file__).parent.parent / 'src'
+UNIFIED_SCHEMA = Path(__file__).parent.parent / 'migrations' / 'create_unified_schema.sql'
+
+
+def _load_case_database():
+    """src/database.py, which the src/database/ package shadows on import."""
+    spec = importlib.util.spec_from_file_location('src._case_database', SRC_DIR / 'database.py')
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+CaseDatabase = _load_case_database().CaseDatabase
+
+
+@pytest.fixture
+def db(tmp_path):
+    """CaseDatabase on a temporary SQLite file."""
+    database = CaseDatabase(f"sqlite:///{tmp_path / 'cases.db'}")
+    yield database
+    database.close()
+
+
+@pytest.fixture
+def unified_db(tmp_path):
+    """UnifiedDatabase on a temporary file with the unified schema (no legal_cases import)."""
+    db_path = str(tmp_path / 'unified.db')
+    schema = UNIFIED_SCHEMA.read_text().split('-- MIGRATION:')[0]
+    conn = sqlite3.connect(db_path)
+    conn.executescript(schema)
+    conn.close()
+    database = UnifiedDatabase(db_path)
+    yield database
+    database.close()
+
+
+class TestKeysetStreaming:
+    """Test generator-based keyset iteration."""
+
+    def _save_cases(self, db, count, **overrides):
+        for i in range(count):
+            case = {
+                'url': f'https://test.com/stream/{i}',
+                'title': f'Case {i}',
+                'court': 'Supreme Court',
+                'full_text': 'x' * 100,
+            }
+            case.update(overrides)
+            db.save_case(case)
+
+    def test_iter_cases_walks_all_rows_across_pages(self, db):
+        """Test that iteration crosses page boundaries without gaps."""
+        self._save_cases(db, 25)
+
+        ids = [c.id for c in db.iter_cases(batch_size=7)]
+
+        assert len(ids) == 25
+        assert ids == sorted(ids)
+        assert len(set(ids)) == 25
+
+    def test_iter_cases_defers_full_text(self, db):
+        """Test that full_text is not loaded unless requested."""
+        self._save_cases(db, 3)
+
+        case = next(db.iter_cases(batch_size=2))
+
+        assert 'full_text' not in case.__dict__
+
+        case = next(db.iter_cases(batch_size=2, include_full_text=True))
+        assert 'full_text' in case.__dict__
+
+    def test_iter_cases_column_projection(self, db):
+        """Test that only requested columns are loaded."""
+        self._save_cases(db, 3)
+
+        case = next(db.iter_cases(columns=['title']))
+
+        assert 'title' in case.__dict__
+        assert 'court' not in case.__dict__
+
+    def test_iter_cases_rejects_unknown_column(self, db):
+        """Test projection validation."""
+        with pytest.raises(ValueError):
+            next(db.iter_cases(columns=['no_such_column']))
+
+    def test_iter_cases_with_yield_per(self, db):
+        """Test ORM cursor streaming mode."""
+        self._save_cases(db, 10)
+
+        assert len(list(db.iter_cases(yield_per=3))) == 10
+
+    def test_iter_cases_without_pdfs_tolerates_updates(self, db):
+        """Test that marking rows done mid-iteration neither skips nor repeats rows."""
+        self._save_cases(db, 12, pdf_link='https://test.com/doc.pdf')
+
+        seen = []
+        for case in db.iter_cases_without_pdfs(batch_size=5):
+            seen.append(case.id)
+            db.update_pdf_status(case.id, f'/tmp/{case.id}.pdf')
+
+        assert len(seen) == 12
+        assert len(set(seen)) == 12
+        assert list(db.iter_cases_without_pdfs()) == []
+
+    def test_iter_urls_to_download(self, db):
+        """Test streaming URLs in get_urls_to_download() format."""
+        for i in range(8):
+            db.save_url({'url': f'https://test.com/url/{i}', 'doc_id': str(i)})
+
+        urls = list(db.iter_urls_to_download(batch_size=3))
+
+        assert len(urls) == 8
+        assert all('url' in u and 'doc_id' in u for u in urls)
+
+
+class TestUnifiedIterDocuments:
+    """Test UnifiedDatabase.iter_documents()."""
+
+    def _save_documents(self, db, count):
+        for i in range(count):
+            db.save_legal_document({
+                'country': 'BD' if i % 2 else 'IN',
+                'title': f'Document {i}',
+                'source_url': f'https://test.com/doc/{i}',
+                'source_site': 'test.com',
+                'plain_text': 'text ' * 50,
+                'html_content': '<p>text</p>',
+            })
+
+    def test_walks_all_rows_across_pages(self, unified_db):
+        """Test that iteration crosses page boundaries in id order."""
+        self._save_documents(unified_db, 11)
+
+        ids = [doc['id'] for doc in unified_db.iter_documents(batch_size=4)]
+
+        assert len(ids) == 11
+        assert ids == sorted(set(ids))
+
+    def test_country_filter(self, unified_db):
+        """Test that only the requested country is streamed."""
+        self._save_documents(unified_db, 9)
+
+        docs = list(unified_db.iter_documents(country='BD', batch_size=2))
+
+        assert len(docs) == 4
+        assert {doc['country'] for doc in docs} == {'BD'}
+
+    def test_skips_heavy_columns_by_default(self, unified_db):
+        """Test that html_content/plain_text are only selected on request."""
+        self._save_documents(unified_db, 2)
+
+        doc = next(unified_db.iter_documents())
+        assert 'plain_text' not in doc and 'html_content' not in doc
+
+        doc = next(unified_db.iter_documents(include_content=True))
+        assert doc['plain_text'].startswith('text')
+
+    def test_column_projection(self, unified_db):
+        """Test projection always includes the keyset column and rejects unknown columns."""
+        self._save_documents(unified_db, 2)
+
+        assert set(next(unified_db.iter_documents(columns=['title']))) == {'id', 'title'}
+        with pytest.raises(ValueError):
+            next(unified_db.iter_documents(columns=['no_such_column']))
+        with pytest.raises(ValueError):
+            next(unified_db.iter_documents(batch_size=0))
@@ -0,0 +1,345 @@
+"""
+Query Plan Regression Tests for the PostgreSQL Schema
+Applies the core, RAG, partitioning and hot-path index migrations to a
+scratch database, loads a skewed data set and checks that the hot queries
+keep using their partial/covering indexes and partition pruning.
+
+Needs a PostgreSQL server: set TEST_POSTGRES_URL (a superuser URL; a scratch
+database is created and dropped) or install pgserver for a local one.
+"""
+
+import os
+
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+from psycopg2.extensions import parse_dsn
+
+from src.database.postgresql_adapter import (
+    PostgreSQLAdapter, PENDING_DOWNLOAD_QUERY, PENDING_EMBEDDING_QUERY
+)
+from tests.fixtures import create_migrated_database, drop_database
+
+
+pytestmark = [pytest.mark.database, pytest.mark.integration]
+
+MIGRATIONS = [
+    '001_create_core_tables.sql',
+    '005_create_rag_tables.sql',
+    '013_partition_documents.sql',
+    '014_hot_path_indexes.sql',
+]
+
+# Skewed like production: mostly IN, nearly everything downloaded/embedded
+DOC_COUNT = 30000
+PENDING_DOWNLOAD_EVERY = 100     # 1% without file_storage
+PENDING_EMBEDDING_EVERY = 50     # 2% pending embedding
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+@pytest.fixture(scope='module')
+def pg_dsn(postgres_server_url):
+    """Scratch database with migrations applied and test data loaded."""
+    db_name = f"query_plans_{os.getpid()}"
+    dsn = create_migrated_database(postgres_server_url, db_name, MIGRATIONS)
+
+    conn = psycopg2.connect(dsn)
+    conn.autocommit = True
+    with conn.cursor() as cur:
+        _load_data(cur)
+        cur.execute("VACUUM ANALYZE")
+    conn.close()
+
+    yield dsn
+
+    drop_database(postgres_server_url, db_name)
+
+
+def _load_data(cur):
+    cur.execute("""
+        INSERT INTO documents (
+            global_id, filename_universal, content_hash, country_code, doc_type,
+            title_full, doc_year, source_url, source_domain, embedding_status
+        )
+        SELECT
+            c.code || lpad(g::text, 8, '0'),
+            c.code || '_' || g || '.pdf',
+            substr(md5(g::text), 1, 16),
+            c.code,
+            'CAS',
+            'Case ' || g,
+            1950 + g %% 75,
+            CASE
+                WHEN c.code = 'BD' THEN 'http://bdlaws.minlaw.gov.bd/act-' || g || '.html'
+                WHEN g %% 50 = 1 THEN 'https://main.sci.gov.in/judgment/' || g
+                WHEN g %% 7 = 0 THEN 'https://indiankanoon.org/docfragment/' || g || '/'
+                ELSE 'https://www.indiankanoon.org/doc/' || g || '/'
+            END,
+            'unknown',
+            CASE WHEN g %% %(embed)s = 0 THEN 'pending' ELSE 'completed' END
+        FROM generate_series(1, %(n)s) g
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN g %% 10 < 7 THEN 'IN' WHEN g %% 10 < 9 THEN 'BD' ELSE 'PK' END AS code
+        ) c
+    """, {'n': DOC_COUNT, 'embed': PENDING_EMBEDDING_EVERY})
+
+    cur.execute("""
+        INSERT INTO file_storage (document_id, storage_tier, pdf_filename, pdf_hash_sha256, pdf_size_bytes)
+        SELECT id, 'cache', filename_universal, md5(id::text) || md5(id::text), 1024
+        FROM documents
+        WHERE id %% %(every)s <> 0
+    """, {'every': PENDING_DOWNLOAD_EVERY})
+
+    cur.execute("""
+        INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text, embedding_status)
+        SELECT id, country_code, 0, title_full,
+               CASE WHEN id %% %(embed)s = 0 THEN 'pending' ELSE 'completed' END
+        FROM documents
+    """, {'embed': PENDING_EMBEDDING_EVERY})
+
+
+@pytest.fixture
+def pg_conn(pg_dsn):
+    conn = psycopg2.connect(pg_dsn)
+    yield conn
+    conn.rollback()
+    conn.close()
+
+
+# =============================================================================
+# Plan helpers
+# =============================================================================
+
+def explain(conn, sql: str, params=None) -> dict:
+    with conn.cursor() as cur:
+        cur.execute("EXPLAIN (FORMAT JSON) " + sql, params)
+        return cur.fetchone()[0][0]['Plan']
+
+
+def plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get('Plans', []):
+        yield from plan_nodes(child)
+
+
+def parent_index_names(conn) -> dict:
+    """Map partition-level index names to the partitioned index they belong to."""
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT c.relname, p.relname
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            JOIN pg_class p ON p.oid = i.inhparent
+            WHERE c.relkind = 'i'
+        """)
+        return dict(cur.fetchall())
+
+
+def scans_of(plan: dict, table_prefix: str) -> list:
+    return [
+        node for node in plan_nodes(plan)
+        if node.get('Relation Name', '').startswith(table_prefix)
+    ]
+
+
+def populated_tables(conn) -> set:
+    with conn.cursor() as cur:
+        cur.execute("SELECT relname FROM pg_class WHERE relkind = 'r' AND relpages > 0")
+        return {row[0] for row in cur.fetchall()}
+
+
+def assert_uses_index(conn, plan: dict, table_prefix: str, index_name: str):
+    # Empty partitions are always seq-scanned; only the ones with data matter
+    populated = populated_tables(conn)
+    scans = [node for node in scans_of(plan, table_prefix) if node['Relation Name'] in populated]
+    assert scans, f"no scan of {table_prefix}* in plan"
+    parents = parent_index_names(conn)
+    for node in scans:
+        assert node['Node Type'] in ('Index Scan', 'Index Only Scan'), (
+            f"{node['Node Type']} on {node['Relation Name']}"
+        )
+        assert parents.get(node['Index Name'], node['Index Name']) == index_name
+
+
+# =============================================================================
+# Hot query plans
+# =============================================================================
+
+class TestHotQueryPlans:
+    """The hot predicates are served by partial/covering indexes"""
+
+    def test_pending_download_uses_partial_index(self, pg_conn):
+        plan = explain(pg_conn, PENDING_DOWNLOAD_QUERY,
+                       {'source_domain': 'indiankanoon.org', 'limit': 100})
+
+        assert_uses_index(pg_conn, plan, 'documents', 'idx_doc_pending_download')
+        assert not scans_of(plan, 'file_storage')
+
+    def test_pending_download_is_index_only(self, pg_conn):
+        plan = explain(pg_conn, PENDING_DOWNLOAD_QUERY,
+                       {'source_domain': 'indiankanoon.org', 'limit': 100})
+
+        populated = populated_tables(pg_conn)
+        node_types = {node['Node Type'] for node in scans_of(plan, 'documents')
+                      if node['Relation Name'] in populated}
+        assert node_types == {'Index Only Scan'}
+
+    def test_pending_embedding_uses_partial_index(self, pg_conn):
+        plan = explain(pg_conn, PENDING_EMBEDDING_QUERY, {'limit': 100})
+
+        assert_uses_index(pg_conn, plan, 'documents', 'idx_doc_pending_embedding')
+
+    def test_pending_chunks_use_partial_index(self, pg_conn):
+        plan = explain(pg_conn, """
+            SELECT id, document_id, chunk_index
+            FROM document_chunks
+            WHERE embedding_status = 'pending'
+            ORDER BY document_id, chunk_index
+            LIMIT 100
+        """)
+
+        assert_uses_index(pg_conn, plan, 'document_chunks', 'idx_chunk_pending_embedding')
+
+    def test_source_domain_breakdown_is_index_only(self, pg_conn):
+        plan = explain(pg_conn, """
+            SELECT doc_year, COUNT(*)
+            FROM documents
+            WHERE source_domain = %s
+            GROUP BY doc_year
+        """, ('main.sci.gov.in',))
+
+        assert_uses_index(pg_conn, plan, 'documents', 'idx_doc_source_year')
+        populated = populated_tables(pg_conn)
+        assert {node['Node Type'] for node in scans_of(plan, 'documents')
+                if node['Relation Name'] in populated} == {'Index Only Scan'}
+
+    def test_country_filter_prunes_partitions(self, pg_conn):
+        plan = explain(pg_conn, """
+            SELECT id, global_id FROM documents
+            WHERE country_code = 'BD' AND doc_year = 2000
+        """)
+
+        assert {node['Relation Name'] for node in scans_of(plan, 'documents')} == {'documents_bd'}
+
+    def test_chunk_lookup_by_document_prunes_with_country(self, pg_conn):
+        plan = explain(pg_conn, """
+            SELECT chunk_text FROM document_chunks
+            WHERE document_id = 1 AND country_code = 'IN'
+        """)
+
+        assert {node['Relation Name'] for node in scans_of(plan, 'document_chunks')} == {
+            'document_chunks_in'
+        }
+
+
+# =============================================================================
+# Schema behaviour after partitioning
+# =============================================================================
+
+class TestPartitionedSchema:
+    """Triggers and foreign keys keep the old semantics"""
+
+    def _new_document(self, cur, country='IN', url='https://www.IndianKanoon.org/doc/999999/'):
+        cur.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code,
+                                   doc_type, title_full, doc_year, source_url, source_domain)
+            VALUES (%s, %s, 'h', %s, 'CAS', 'Test', 2020, %s, 'unknown')
+            RETURNING id, source_domain, pdf_downloaded
+        """, (f"{country}99999999", f"{country}_test.pdf", country, url))
+        return cur.fetchone()
+
+    def test_source_domain_normalized(self, pg_conn):
+        with pg_conn.cursor() as cur:
+            _, source_domain, _ = self._new_document(cur)
+        assert source_domain == 'indiankanoon.org'
+
+    def test_pdf_downloaded_follows_file_storage(self, pg_conn):
+        with pg_conn.cursor() as cur:
+            doc_id, _, downloaded = self._new_document(cur)
+            assert downloaded is False
+
+            cur.execute("""
+                INSERT INTO file_storage (document_id, storage_tier, pdf_filename,
+                                          pdf_hash_sha256, pdf_size_bytes)
+                VALUES (%s, 'cache', 'f.pdf', repeat('a', 64), 1)
+            """, (doc_id,))
+            cur.execute("SELECT pdf_downloaded FROM documents WHERE id = %s", (doc_id,))
+            assert cur.fetchone()[0] is True
+
+            cur.execute("DELETE FROM file_storage WHERE document_id = %s", (doc_id,))
+            cur.execute("SELECT pdf_downloaded FROM documents WHERE id = %s", (doc_id,))
+            assert cur.fetchone()[0] is False
+
+    def test_delete_cascades_through_registry(self, pg_conn):
+        with pg_conn.cursor() as cur:
+            doc_id, _, _ = self._new_document(cur)
+            cur.execute("""
+                INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text)
+                VALUES (%s, 'IN', 0, 'text')
+            """, (doc_id,))
+
+            cur.execute("DELETE FROM documents WHERE id = %s", (doc_id,))
+            cur.execute("SELECT COUNT(*) FROM document_chunks WHERE document_id = %s", (doc_id,))
+            assert cur.fetchone()[0] == 0
+            cur.execute("SELECT COUNT(*) FROM document_registry WHERE id = %s", (doc_id,))
+            assert cur.fetchone()[0] == 0
+
+    def test_country_change_moves_document_and_chunks(self, pg_conn):
+        with pg_conn.cursor() as cur:
+            doc_id, _, _ = self._new_document(cur)
+            cur.execute("""
+                INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text)
+                VALUES (%s, 'IN', 0, 'text')
+            """, (doc_id,))
+
+            cur.execute("UPDATE documents SET country_code = 'PK' WHERE id = %s", (doc_id,))
+            cur.execute("SELECT tableoid::regclass::text FROM document_chunks WHERE document_id = %s",
+                        (doc_id,))
+            assert cur.fetchone()[0] == 'document_chunks_pk'
+            cur.execute("SELECT country_code FROM document_registry WHERE id = %s", (doc_id,))
+            assert cur.fetchone()[0] == 'PK'
+
+    def test_child_rows_require_existing_document(self, pg_conn):
+        with pg_conn.cursor() as cur:
+            with pytest.raises(psycopg2.errors.ForeignKeyViolation):
+                cur.execute("""
+                    INSERT INTO document_chunks (document_id, country_code, chunk_index, chunk_text)
+                    VALUES (-1, 'IN', 0, 'orphan')
+                """)
+
+
+# =============================================================================
+# Adapter against the partitioned schema
+# =============================================================================
+
+class TestAdapterQueries:
+    """PostgreSQLAdapter hot-path methods return the expected rows"""
+
+    @pytest.fixture
+    def adapter(self, pg_dsn):
+        params = parse_dsn(pg_dsn)
+        return PostgreSQLAdapter({
+            'host': params.get('host'),
+            'port': params.get('port', 5432),
+            'database': params['dbname'],
+            'user': params.get('user'),
+            'password': params.get('password', ''),
+        })
+
+    def test_get_documents_to_process(self, adapter):
+        rows = adapter.get_documents_to_process(limit=20)
+
+        assert 0 < len(rows) <= 20
+        assert [doc_id for doc_id, _ in rows] == sorted(doc_id for doc_id, _ in rows)
+        for doc_id, url in rows:
+            assert doc_id % PENDING_DOWNLOAD_EVERY == 0
+            assert 'indiankanoon.org/doc/' in url
+
+    def test_get_documents_pending_embedding(self, adapter):
+        rows = adapter.get_documents_pending_embedding(limit=10)
+
+        assert len(rows) == 10
+        assert all(doc_id % PENDING_EMBEDDING_EVERY == 0 for doc_id, _ in rows)
@@ -0,0 +1,60 @@
+"""
+Tests for the shared SQLite performance profile
+"""
+
+import sqlite3
+import threading
+
+import pytest
+
+from src.sqlite_profile import (
+    SQLiteConnectionFactory, DEFAULT_PROFILE, open_connection, get_connection_factory
+)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "profile.db")
+
+
+class TestSQLiteProfile:
+    """Test PRAGMA application and connection reuse"""
+
+    def test_production_profile_enables_wal(self, db_path):
+        conn = open_connection(db_path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 30000
+        conn.close()
+
+    def test_default_profile_keeps_rollback_journal(self, db_path):
+        conn = open_connection(db_path, DEFAULT_PROFILE)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+        conn.close()
+
+    def test_read_only_connection_rejects_writes(self, db_path):
+        factory = SQLiteConnectionFactory(db_path)
+        rw = factory.connection()
+        rw.execute("CREATE TABLE t (x INTEGER)")
+        rw.commit()
+
+        ro = factory.read_only_connection()
+        assert ro.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+        with pytest.raises(sqlite3.OperationalError):
+            ro.execute("INSERT INTO t VALUES (1)")
+        factory.close_all()
+
+    def test_connection_reused_per_thread(self, db_path):
+        factory = SQLiteConnectionFactory(db_path)
+        main_conn = factory.connection()
+        assert factory.connection() is main_conn
+
+        other = []
+        t = threading.Thread(target=lambda: other.append(factory.connection()))
+        t.start()
+        t.join()
+        assert other[0] is not main_conn
+        factory.close_all()
+
+    def test_factory_registry_keyed_by_path(self, db_path):
+        assert get_connection_factory(db_path) is get_connection_factory(db_path)
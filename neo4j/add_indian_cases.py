@@ -8,6 +8,9 @@ from dotenv import load_dotenv
 import os
 import json
 
+from utils.graph_loader import GraphBatchLoader, UnwindStatement
+from utils.graph_metrics import GraphMetricsReader, format_counts
+
 load_dotenv()
 
 NEO4J_URL = os.getenv("NEO4J_URL")
@@ -16,10 +19,73 @@ NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD")
 NEO4J_DATABASE = os.getenv("NEO4J_DATABASE")
 
 
+CASE_STATEMENTS = [
+    UnwindStatement("cases", """
+        MERGE (c:Case {id: row.case_id})
+        SET c.name = row.title,
+            c.citation = row.citation,
+            c.date = row.date,
+            c.year = row.year,
+            c.case_type = row.case_type,
+            c.source = 'IndianKanoon',
+            c.country = 'India',
+            c.snippet = row.snippet
+        WITH c
+        MATCH (country:Country {name: 'India'})
+        MERGE (c)-[:FROM_COUNTRY]->(country)
+    """),
+    UnwindStatement("courts", """
+        MERGE (court:Court {id: row.court_id})
+        SET court.name = row.court_name,
+            court.country = 'India'
+        WITH court, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:BEFORE_COURT]->(court)
+    """),
+    UnwindStatement("judges", """
+        MERGE (j:Judge {id: row.judge_id})
+        SET j.name = row.judge_name
+        WITH j, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:DECIDED_BY]->(j)
+    """),
+    UnwindStatement("petitioners", """
+        MERGE (p:Party {id: row.party_id})
+        SET p.name = row.party_name,
+            p.role = 'Petitioner'
+        WITH p, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:PETITIONER]->(p)
+    """),
+    UnwindStatement("respondents", """
+        MERGE (p:Party {id: row.party_id})
+        SET p.name = row.party_name,
+            p.role = 'Respondent'
+        WITH p, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:RESPONDENT]->(p)
+    """),
+    UnwindStatement("sections", """
+        MATCH (c:Case {id: row.case_id})
+        MATCH (s:Section {section_id: row.section_id})
+        MERGE (c)-[:APPLIES_SECTION]->(s)
+    """),
+    UnwindStatement("topics", """
+        MERGE (t:Topic {name: row.topic})
+        WITH t, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:BELONGS_TO_TOPIC]->(t)
+    """),
+]
+
+
 class IndianCaseExtractor:
-    def __init__(self):
+    def __init__(self, batch_size=100):
         self.db_path = "/workspaces/lool-/data-collection/data/indiankanoon.db"
         self.neo4j_driver = GraphDatabase.driver(NEO4J_URL, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        self.loader = GraphBatchLoader(
+            self.neo4j_driver, database=NEO4J_DATABASE, batch_size=batch_size, skip_failed=True
+        )
 
     def extract_cases_from_db(self, limit=30):
         """Extract top cases with substantial full text"""
@@ -52,7 +118,8 @@ class IndianCaseExtractor:
         print(f"\n✓ Extracted {len(cases)} cases from database")
         return cases
 
-    def parse_case_text(self, full_text, title):
+    @staticmethod
+    def parse_case_text(full_text, title):
         """Extract structured information from case full text"""
         parsed = {
             'court_name': None,
@@ -102,202 +169,105 @@ class IndianCaseExtractor:
     def load_cases_to_neo4j(self, cases):
         """Load Indian cases into Neo4j"""
         with self.neo4j_driver.session(database=NEO4J_DATABASE) as session:
-
             # Create India Country node
             session.run("""
                 MERGE (c:Country {name: 'India'})
             """)
 
-            loaded_count = 0
-            for i, case in enumerate(cases):
-                try:
-                    # Create case node
-                    case_id = f"indian_case_{case['id']}"
-
-                    # Extract date from title if not in case_date
-                    date_match = re.search(r'on\s+(\d+\s+\w+,?\s+\d{4})', case['title'])
-                    case_date = date_match.group(1) if date_match else case.get('case_date', 'Unknown')
-
-                    # Extract year
-                    year_match = re.search(r'\b(19|20)\d{2}\b', case_date if case_date else case['title'])
-                    year = int(year_match.group(0)) if year_match else None
-
-                    session.run("""
-                        MERGE (c:Case {id: $case_id})
-                        SET c.name = $title,
-                            c.citation = $citation,
-                            c.date = $date,
-                            c.year = $year,
-                            c.case_type = $case_type,
-                            c.source = 'IndianKanoon',
-                            c.country = 'India',
-                            c.snippet = $snippet
-                    """, case_id=case_id,
-                         title=case['title'][:200],
-                         citation=case.get('citation', f"IK-{case['id']}"),
-                         date=case_date,
-                         year=year,
-                         case_type=case.get('case_type', 'Unknown'),
-                         snippet=case.get('snippet', '')[:500])
-
-                    # Link to India
-                    session.run("""
-                        MATCH (c:Case {id: $case_id})
-                        MATCH (country:Country {name: 'India'})
-                        MERGE (c)-[:FROM_COUNTRY]->(country)
-                    """, case_id=case_id)
-
-                    # Create Court node if available
-                    if case.get('court_name'):
-                        court_id = case['court_name'].replace(' ', '_').lower()
-                        session.run("""
-                            MERGE (court:Court {id: $court_id})
-                            SET court.name = $court_name,
-                                court.country = 'India'
-                            WITH court
-                            MATCH (c:Case {id: $case_id})
-                            MERGE (c)-[:BEFORE_COURT]->(court)
-                        """, court_id=court_id,
-                             court_name=case['court_name'],
-                             case_id=case_id)
-
-                    # Create Judge nodes
-                    for judge_name in case.get('judges', [])[:3]:
-                        if judge_name and len(judge_name) > 2:
-                            judge_id = judge_name.replace(' ', '_').replace('.', '').lower()
-                            session.run("""
-                                MERGE (j:Judge {id: $judge_id})
-                                SET j.name = $judge_name
-                                WITH j
-                                MATCH (c:Case {id: $case_id})
-                                MERGE (c)-[:DECIDED_BY]->(j)
-                            """, judge_id=judge_id,
-                                 judge_name=judge_name,
-                                 case_id=case_id)
-
-                    # Create Party nodes
-                    for petitioner in case.get('parties', {}).get('petitioner', [])[:2]:
-                        if petitioner and len(petitioner) > 2:
-                            party_id = petitioner[:50].replace(' ', '_').lower()
-                            session.run("""
-                                MERGE (p:Party {id: $party_id})
-                                SET p.name = $party_name,
-                                    p.role = 'Petitioner'
-                                WITH p
-                                MATCH (c:Case {id: $case_id})
-                                MERGE (c)-[:PETITIONER]->(p)
-                            """, party_id=party_id,
-                                 party_name=petitioner[:100],
-                                 case_id=case_id)
-
-                    for respondent in case.get('parties', {}).get('respondent', [])[:2]:
-                        if respondent and len(respondent) > 2:
-                            party_id = respondent[:50].replace(' ', '_').lower()
-                            session.run("""
-                                MERGE (p:Party {id: $party_id})
-                                SET p.name = $party_name,
-                                    p.role = 'Respondent'
-                                WITH p
-                                MATCH (c:Case {id: $case_id})
-                                MERGE (c)-[:RESPONDENT]->(p)
-                            """, party_id=party_id,
-                                 party_name=respondent[:100],
-                                 case_id=case_id)
-
-                    # Link to CPC Sections if they exist in graph
-                    for section_id in case.get('sections_cited', [])[:10]:
-                        # Try to find existing section in graph
-                        result = session.run("""
-                            MATCH (s:Section)
-                            WHERE s.section_id = $section_id
-                            RETURN s.section_id as id
-                            LIMIT 1
-                        """, section_id=section_id)
-
-                        if result.single():
-                            session.run("""
-                                MATCH (c:Case {id: $case_id})
-                                MATCH (s:Section {section_id: $section_id})
-                                MERGE (c)-[:APPLIES_SECTION]->(s)
-                            """, case_id=case_id, section_id=section_id)
-
-                    # Create Topic node for case type
-                    if case.get('case_type'):
-                        session.run("""
-                            MERGE (t:Topic {name: $topic})
-                            WITH t
-                            MATCH (c:Case {id: $case_id})
-                            MERGE (c)-[:BELONGS_TO_TOPIC]->(t)
-                        """, topic=case['case_type'], case_id=case_id)
-
-                    loaded_count += 1
-                    if (i + 1) % 5 == 0:
-                        print(f"  Loaded {i + 1}/{len(cases)} cases...")
-
-                except Exception as e:
-                    print(f"  Error loading case {case['id']}: {str(e)}")
-                    continue
-
-            print(f"\n✓ Successfully loaded {loaded_count}/{len(cases)} Indian cases")
-            return loaded_count
+        progress = {'done': 0, 'errors': 0}
+
+        def report(count):
+            progress['done'] += count
+            print(f"  Loaded {progress['done']}/{len(cases)} cases...")
+
+        def case_rows(case):
+            try:
+                return self._case_rows(case)
+            except Exception as e:
+                print(f"  Error loading case {case['id']}: {str(e)}")
+                progress['errors'] += 1
+                return {}
+
+        # Failed batches are retried case by case so one bad case is skipped, not the batch
+        stats = self.loader.load(cases, case_rows, CASE_STATEMENTS, progress=report)
+
+        loaded_count = stats.loaded_records - progress['errors']
+        print(f"\n✓ Successfully loaded {loaded_count}/{len(cases)} Indian cases")
+        return loaded_count
+
+    def _case_rows(self, case):
+        """Split one case into UNWIND rows per statement"""
+        case_id = f"indian_case_{case['id']}"
+
+        # Extract date from title if not in case_date
+        date_match = re.search(r'on\s+(\d+\s+\w+,?\s+\d{4})', case['title'])
+        case_date = date_match.group(1) if date_match else case.get('case_date', 'Unknown')
+
+        # Extract year
+        year_match = re.search(r'\b(19|20)\d{2}\b', case_date if case_date else case['title'])
+        year = int(year_match.group(0)) if year_match else None
+
+        rows = {statement.name: [] for statement in CASE_STATEMENTS}
+        rows['cases'].append({
+            'case_id': case_id,
+            'title': case['title'][:200],
+            'citation': case.get('citation', f"IK-{case['id']}"),
+            'date': case_date,
+            'year': year,
+            'case_type': case.get('case_type', 'Unknown'),
+            'snippet': case.get('snippet', '')[:500],
+        })
+
+        # Court node if available
+        if case.get('court_name'):
+            rows['courts'].append({
+                'court_id': case['court_name'].replace(' ', '_').lower(),
+                'court_name': case['court_name'],
+                'case_id': case_id,
+            })
+
+        # Judge nodes
+        for judge_name in case.get('judges', [])[:3]:
+            if judge_name and len(judge_name) > 2:
+                rows['judges'].append({
+                    'judge_id': judge_name.replace(' ', '_').replace('.', '').lower(),
+                    'judge_name': judge_name,
+                    'case_id': case_id,
+                })
+
+        # Party nodes
+        for role, key in (('petitioners', 'petitioner'), ('respondents', 'respondent')):
+            for party in case.get('parties', {}).get(key, [])[:2]:
+                if party and len(party) > 2:
+                    rows[role].append({
+                        'party_id': party[:50].replace(' ', '_').lower(),
+                        'party_name': party[:100],
+                        'case_id': case_id,
+                    })
+
+        # CPC Sections (linked only if they already exist in the graph)
+        for section_id in case.get('sections_cited', [])[:10]:
+            rows['sections'].append({'section_id': section_id, 'case_id': case_id})
+
+        # Topic node for case type
+        if case.get('case_type'):
+            rows['topics'].append({'topic': case['case_type'], 'case_id': case_id})
+
+        return rows
 
     def get_statistics(self):
         """Get updated graph statistics"""
+        counts = GraphMetricsReader(self.neo4j_driver, NEO4J_DATABASE).counts()
         with self.neo4j_driver.session(database=NEO4J_DATABASE) as session:
-            result = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] as label, count(*) as count
-                ORDER BY count DESC
-            """)
-
-            print("\n" + "="*60)
-            print("UPDATED KNOWLEDGE GRAPH STATISTICS")
-            print("="*60)
-
-            total_nodes = 0
-            for record in result:
-                label = record['label']
-                count = record['count']
-                if label:
-                    print(f"  {label:20} {count:4} nodes")
-                    total_nodes += count
-
-            # Count Indian cases specifically
             indian_cases = session.run("""
                 MATCH (c:Case {source: 'IndianKanoon'})
                 RETURN count(c) as count
             """).single()['count']
+        bangladesh_cases = counts.labels.get('Case', 0) - indian_cases
 
-            bangladesh_cases = session.run("""
-                MATCH (c:Case)
-                WHERE c.source IS NULL OR c.source <> 'IndianKanoon'
-                RETURN count(c) as count
-            """).single()['count']
-
-            print(f"\n  {'Indian Cases':20} {indian_cases:4}")
-            print(f"  {'Bangladesh Cases':20} {bangladesh_cases:4}")
-
-            rel_result = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) as rel_type, count(*) as count
-                ORDER BY count DESC
-                LIMIT 15
-            """)
-
-            print("\nTop Relationships:")
-            total_rels = 0
-            for record in rel_result:
-                rel_type = record['rel_type']
-                count = record['count']
-                print(f"  {rel_type:25} {count:4} relationships")
-                total_rels += count
-
-            total_rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as total")
-            total_rels = total_rel_result.single()['total']
-
-            print(f"\n{'TOTAL':20} {total_nodes:4} nodes")
-            print(f"{'TOTAL':20} {total_rels:4} relationships")
-            print("="*60 + "\n")
+        print(format_counts(counts, "UPDATED KNOWLEDGE GRAPH STATISTICS"))
+        print(f"  {'Indian Cases':20} {indian_cases:4}")
+        print(f"  {'Bangladesh Cases':20} {bangladesh_cases:4}\n")
 
     def close(self):
         self.neo4j_driver.close()
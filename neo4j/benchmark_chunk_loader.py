@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Chunk Loading Benchmark
+Compares the old per-chunk writes (one MERGE plus one MATCH+MERGE link per
+chunk) against ChunkWriter's UNWIND batches, with embeddings set as a float
+list property or through db.create.setNodeVectorProperty.
+
+Run it against a scratch Neo4j, e.g. a local container:
+    docker run -d --name neo4j-bench -p 7687:7687 -e NEO4J_AUTH=neo4j/benchmark neo4j:5
+    python benchmark_chunk_loader.py --url bolt://localhost:7687 --password benchmark
+
+Benchmark nodes (Case ids and Chunk ids prefixed with "bench-") are deleted
+before and after each run.
+"""
+import os
+import time
+import random
+import argparse
+
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+from utils.chunk_loader import ChunkWriter
+from utils.embeddings_generator import TextChunk
+
+PREFIX = "bench-"
+
+
+def make_chunks(cases: int, chunks_per_case: int, dimension: int, seed: int = 42):
+    rng = random.Random(seed)
+    chunks = []
+    for case in range(cases):
+        for index in range(chunks_per_case):
+            chunks.append(TextChunk(
+                chunk_id=f"{PREFIX}{case}-{index}",
+                text=f"Chunk {index} of case {case}. " * 40,
+                chunk_index=index,
+                source_id=f"{PREFIX}{case}",
+                source_type="case",
+                metadata={"start_pos": index * 2000, "end_pos": (index + 1) * 2000,
+                          "tokens": 500, "start_page": index // 3 + 1, "end_page": index // 3 + 1},
+                embedding=[rng.uniform(-1, 1) for _ in range(dimension)]
+            ))
+    return chunks
+
+
+def reset(session, cases: int):
+    session.run(
+        "MATCH (n) WHERE n.case_id STARTS WITH $prefix OR n.chunk_id STARTS WITH $prefix "
+        "DETACH DELETE n", prefix=PREFIX
+    ).consume()
+    session.run(
+        "UNWIND range(0, $cases - 1) AS i CREATE (:Case {case_id: $prefix + toString(i)})",
+        cases=cases, prefix=PREFIX
+    ).consume()
+
+
+def load_per_chunk(driver, database, chunks):
+    """The previous Neo4jEmbeddingsLoader.load_chunks: two auto-commit queries per chunk"""
+    with driver.session(database=database) as session:
+        for chunk in chunks:
+            session.run("""
+                MERGE (ch:Chunk {chunk_id: $chunk_id})
+                SET ch.text = $text,
+                    ch.chunk_index = $chunk_index,
+                    ch.source_type = $source_type,
+                    ch.embedding = $embedding,
+                    ch.metadata = $metadata
+            """, chunk_id=chunk.chunk_id, text=chunk.text, chunk_index=chunk.chunk_index,
+                source_type=chunk.source_type, embedding=chunk.embedding,
+                metadata=str(chunk.metadata)).consume()
+            session.run("""
+                MATCH (c:Case {case_id: $source_id})
+                MATCH (ch:Chunk {chunk_id: $chunk_id})
+                MERGE (c)-[:HAS_CHUNK]->(ch)
+            """, source_id=chunk.source_id, chunk_id=chunk.chunk_id).consume()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Chunk node loading")
+    parser.add_argument("--url", default=os.getenv("NEO4J_URL", "bolt://localhost:7687"))
+    parser.add_argument("--username", default=os.getenv("NEO4J_USERNAME", "neo4j"))
+    parser.add_argument("--password", default=os.getenv("NEO4J_PASSWORD"))
+    parser.add_argument("--database", default=os.getenv("NEO4J_DATABASE", "neo4j"))
+    parser.add_argument("--cases", type=int, default=200)
+    parser.add_argument("--chunks-per-case", type=int, default=25)
+    parser.add_argument("--dimension", type=int, default=1536)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--skip-per-chunk", action="store_true", help="Skip the slow per-chunk baseline")
+    args = parser.parse_args()
+
+    load_dotenv()
+    chunks = make_chunks(args.cases, args.chunks_per_case, args.dimension)
+    driver = GraphDatabase.driver(args.url, auth=(args.username, args.password))
+
+    runs = [
+        ("UNWIND batches", lambda: ChunkWriter(driver, args.database, args.dimension, args.batch_size).write(chunks)),
+        ("UNWIND + setNodeVectorProperty", lambda: ChunkWriter(
+            driver, args.database, args.dimension, args.batch_size, vector_procedure=True).write(chunks)),
+    ]
+    if not args.skip_per_chunk:
+        runs.insert(0, ("per-chunk queries", lambda: load_per_chunk(driver, args.database, chunks)))
+
+    print(f"{len(chunks)} chunks, {args.dimension} dims, batch size {args.batch_size}\n")
+    print(f"{'Loader':<34} {'Seconds':>9} {'Chunks/s':>10}")
+    print("-" * 55)
+    try:
+        with driver.session(database=args.database) as session:
+            session.run("CREATE INDEX case_id_bench IF NOT EXISTS FOR (c:Case) ON (c.case_id)").consume()
+            session.run("CREATE INDEX chunk_id_bench IF NOT EXISTS FOR (ch:Chunk) ON (ch.chunk_id)").consume()
+
+        for name, run in runs:
+            with driver.session(database=args.database) as session:
+                reset(session, args.cases)
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+
+            with driver.session(database=args.database) as session:
+                linked = session.run(
+                    "MATCH (:Case)-[:HAS_CHUNK]->(ch:Chunk) WHERE ch.chunk_id STARTS WITH $prefix "
+                    "RETURN count(ch) AS n", prefix=PREFIX
+                ).single()["n"]
+            assert linked == len(chunks), f"{name}: {linked}/{len(chunks)} chunks linked"
+            print(f"{name:<34} {elapsed:>9.2f} {len(chunks) / elapsed:>10,.0f}")
+    finally:
+        with driver.session(database=args.database) as session:
+            reset(session, 0)
+            session.run("DROP INDEX case_id_bench IF EXISTS").consume()
+            session.run("DROP INDEX chunk_id_bench IF EXISTS").consume()
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
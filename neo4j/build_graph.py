@@ -14,6 +14,7 @@ from utils.error_handling import (
     Neo4jTransactionContext,
     validate_json_structure
 )
+from utils.graph_loader import GraphBatchLoader, UnwindStatement
 
 # Set up logging
 logging.basicConfig(
@@ -41,9 +42,99 @@ if not all([NEO4J_URL, NEO4J_USERNAME, NEO4J_PASSWORD]):
     )
 
 
+STATUTES = UnwindStatement("statutes", """
+    MERGE (s:Statute {id: row.id})
+    SET s.name = row.name,
+        s.country = row.country,
+        s.short_name = coalesce(row.short_name, s.short_name)
+""")
+
+COURTS = UnwindStatement("courts", """
+    MERGE (c:Court {id: row.id})
+    SET c.name = row.name,
+        c.type = row.type
+""")
+
+PRINCIPLES = UnwindStatement("principles", """
+    MERGE (p:Principle {id: row.id})
+    SET p.name = row.name,
+        p.description = row.description,
+        p.category = row.category
+""")
+
+SECTION_STATEMENTS = [
+    UnwindStatement("sections", """
+        MERGE (sec:Section {id: row.id})
+        SET sec.section_id = row.section_id,
+            sec.title = row.title,
+            sec.description = row.description
+    """),
+    UnwindStatement("section_statutes", """
+        MATCH (sec:Section {id: row.section_id})
+        MATCH (stat:Statute {id: row.statute_id})
+        MERGE (sec)-[:PART_OF]->(stat)
+    """),
+]
+
+CASE_STATEMENTS = [
+    UnwindStatement("cases", """
+        MERGE (c:Case {id: row.id})
+        SET c.name = row.name,
+            c.citation = row.citation,
+            c.year = row.year,
+            c.date = row.date,
+            c.topic = row.topic,
+            c.abstract = row.abstract,
+            c.issue = row.issue,
+            c.holding = row.holding,
+            c.significance = row.significance
+    """),
+    UnwindStatement("case_topics", """
+        MERGE (t:Topic {name: row.topic})
+        WITH t, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:BELONGS_TO_TOPIC]->(t)
+    """),
+    UnwindStatement("case_courts", """
+        MATCH (c:Case {id: row.case_id})
+        MATCH (court:Court {name: row.court_name})
+        MERGE (c)-[:BEFORE_COURT]->(court)
+    """),
+    UnwindStatement("judges", """
+        MERGE (j:Judge {name: row.judge_name})
+        WITH j, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:DECIDED_BY]->(j)
+    """),
+    UnwindStatement("petitioners", """
+        MERGE (p:Party {name: row.party_name})
+        WITH p, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:PETITIONER]->(p)
+    """),
+    UnwindStatement("respondents", """
+        MERGE (p:Party {name: row.party_name})
+        WITH p, row
+        MATCH (c:Case {id: row.case_id})
+        MERGE (c)-[:RESPONDENT]->(p)
+    """),
+    UnwindStatement("case_sections", """
+        MATCH (c:Case {id: row.case_id})
+        MATCH (s:Section {id: row.section_id})
+        MERGE (c)-[:APPLIES_SECTION]->(s)
+    """),
+    UnwindStatement("case_principles", """
+        MATCH (c:Case {id: row.case_id})
+        MATCH (p:Principle {id: row.principle_id})
+        MERGE (c)-[:ESTABLISHES]->(p)
+    """),
+]
+
+
 class CPCGraphBuilder:
-    def __init__(self):
+    def __init__(self, batch_size: int = 500):
         self.driver = GraphDatabase.driver(NEO4J_URL, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        self.loader = GraphBatchLoader(self.driver, database=NEO4J_DATABASE, batch_size=batch_size)
         self.data = self.load_data()
 
     def load_data(self):
@@ -130,162 +221,76 @@ class CPCGraphBuilder:
 
     def create_statutes(self):
         """Create Statute nodes"""
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for statute in self.data['statutes']:
-                params = {
-                    'id': statute['id'],
-                    'name': statute['name'],
-                    'country': statute['country']
-                }
-                if 'short_name' in statute:
-                    params['short_name'] = statute['short_name']
-
-                query = """
-                    MERGE (s:Statute {id: $id})
-                    SET s.name = $name,
-                        s.country = $country
-                """
-                if 'short_name' in statute:
-                    query += ", s.short_name = $short_name"
-
-                session.run(query, params)
-            print(f"✓ Created {len(self.data['statutes'])} Statute nodes")
+        stats = self.loader.load_rows(STATUTES, self.data['statutes'])
+        print(f"✓ Created {stats.loaded_records} Statute nodes")
 
     def create_sections(self):
         """Create Section nodes and link to Statutes"""
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for section in self.data['sections']:
-                session.run("""
-                    MERGE (sec:Section {id: $id})
-                    SET sec.section_id = $section_id,
-                        sec.title = $title,
-                        sec.description = $description
-                """, section)
-
-                # Link to Statute
-                if section['statute'] == "Code of Civil Procedure, 1908":
-                    statute_id = "cpc_1908"
-                elif section['statute'] == "Partition Act, 1893":
-                    statute_id = "partition_act_1893"
-                else:
-                    statute_id = "cpc_1908"
-
-                session.run("""
-                    MATCH (sec:Section {id: $section_id})
-                    MATCH (stat:Statute {id: $statute_id})
-                    MERGE (sec)-[:PART_OF]->(stat)
-                """, section_id=section['id'], statute_id=statute_id)
-
-            print(f"✓ Created {len(self.data['sections'])} Section nodes")
+        stats = self.loader.load(self.data['sections'], self._section_rows, SECTION_STATEMENTS)
+        print(f"✓ Created {stats.loaded_records} Section nodes")
+
+    def _section_rows(self, section):
+        # Link to Statute
+        if section['statute'] == "Code of Civil Procedure, 1908":
+            statute_id = "cpc_1908"
+        elif section['statute'] == "Partition Act, 1893":
+            statute_id = "partition_act_1893"
+        else:
+            statute_id = "cpc_1908"
+
+        return {
+            'sections': [section],
+            'section_statutes': [{'section_id': section['id'], 'statute_id': statute_id}],
+        }
 
     def create_courts(self):
         """Create Court nodes"""
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for court in self.data['courts']:
-                session.run("""
-                    MERGE (c:Court {id: $id})
-                    SET c.name = $name,
-                        c.type = $type
-                """, court)
-            print(f"✓ Created {len(self.data['courts'])} Court nodes")
+        stats = self.loader.load_rows(COURTS, self.data['courts'])
+        print(f"✓ Created {stats.loaded_records} Court nodes")
 
     def create_principles(self):
         """Create Principle nodes"""
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for principle in self.data['principles']:
-                session.run("""
-                    MERGE (p:Principle {id: $id})
-                    SET p.name = $name,
-                        p.description = $description,
-                        p.category = $category
-                """, principle)
-            print(f"✓ Created {len(self.data['principles'])} Principle nodes")
+        stats = self.loader.load_rows(PRINCIPLES, self.data['principles'])
+        print(f"✓ Created {stats.loaded_records} Principle nodes")
 
     def create_cases(self):
         """Create Case nodes and all related entities"""
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for case in self.data['cases']:
-                # Create Case node
-                session.run("""
-                    MERGE (c:Case {id: $id})
-                    SET c.name = $name,
-                        c.citation = $citation,
-                        c.year = $year,
-                        c.date = $date,
-                        c.topic = $topic,
-                        c.abstract = $abstract,
-                        c.issue = $issue,
-                        c.holding = $holding,
-                        c.significance = $significance
-                """, case)
-
-                # Create Topic node and link
-                session.run("""
-                    MERGE (t:Topic {name: $topic})
-                    WITH t
-                    MATCH (c:Case {id: $case_id})
-                    MERGE (c)-[:BELONGS_TO_TOPIC]->(t)
-                """, topic=case['topic'], case_id=case['id'])
-
-                # Link to Court
-                session.run("""
-                    MATCH (c:Case {id: $case_id})
-                    MATCH (court:Court {name: $court_name})
-                    MERGE (c)-[:BEFORE_COURT]->(court)
-                """, case_id=case['id'], court_name=case['court'])
-
-                # Create Judge nodes and link
-                for judge_name in case['judges']:
-                    session.run("""
-                        MERGE (j:Judge {name: $judge_name})
-                        WITH j
-                        MATCH (c:Case {id: $case_id})
-                        MERGE (c)-[:DECIDED_BY]->(j)
-                    """, judge_name=judge_name, case_id=case['id'])
-
-                # Create Party nodes (Petitioners)
-                for party_name in case['petitioner']:
-                    session.run("""
-                        MERGE (p:Party {name: $party_name})
-                        WITH p
-                        MATCH (c:Case {id: $case_id})
-                        MERGE (c)-[:PETITIONER]->(p)
-                    """, party_name=party_name, case_id=case['id'])
-
-                # Create Party nodes (Respondents)
-                for party_name in case['respondent']:
-                    session.run("""
-                        MERGE (p:Party {name: $party_name})
-                        WITH p
-                        MATCH (c:Case {id: $case_id})
-                        MERGE (c)-[:RESPONDENT]->(p)
-                    """, party_name=party_name, case_id=case['id'])
-
-                # Link to Sections
-                for section_ref in case['sections']:
-                    # Find matching section
-                    for section in self.data['sections']:
-                        if section['section_id'] == section_ref:
-                            session.run("""
-                                MATCH (c:Case {id: $case_id})
-                                MATCH (s:Section {id: $section_id})
-                                MERGE (c)-[:APPLIES_SECTION]->(s)
-                            """, case_id=case['id'], section_id=section['id'])
-                            break
-
-                # Link to Principles
-                for principle_name in case['principles']:
-                    # Find matching principle
-                    for principle in self.data['principles']:
-                        if principle_name.lower() in principle['name'].lower() or principle['name'].lower() in principle_name.lower():
-                            session.run("""
-                                MATCH (c:Case {id: $case_id})
-                                MATCH (p:Principle {id: $principle_id})
-                                MERGE (c)-[:ESTABLISHES]->(p)
-                            """, case_id=case['id'], principle_id=principle['id'])
-                            break
-
-            print(f"✓ Created {len(self.data['cases'])} Case nodes with all relationships")
+        # Index sections once instead of scanning the list for every reference
+        self._sections_by_ref = {}
+        for section in self.data['sections']:
+            self._sections_by_ref.setdefault(section['section_id'], section['id'])
+
+        stats = self.loader.load(self.data['cases'], self._case_rows, CASE_STATEMENTS)
+        print(f"✓ Created {stats.loaded_records} Case nodes with all relationships")
+
+    def _case_rows(self, case):
+        case_id = case['id']
+        rows = {
+            'cases': [case],
+            'case_topics': [{'topic': case['topic'], 'case_id': case_id}],
+            'case_courts': [{'court_name': case['court'], 'case_id': case_id}],
+            'judges': [{'judge_name': name, 'case_id': case_id} for name in case['judges']],
+            'petitioners': [{'party_name': name, 'case_id': case_id} for name in case['petitioner']],
+            'respondents': [{'party_name': name, 'case_id': case_id} for name in case['respondent']],
+            'case_sections': [],
+            'case_principles': [],
+        }
+
+        # Link to Sections
+        for section_ref in case['sections']:
+            section_id = self._sections_by_ref.get(section_ref)
+            if section_id is not None:
+                rows['case_sections'].append({'case_id': case_id, 'section_id': section_id})
+
+        # Link to Principles
+        for principle_name in case['principles']:
+            # Find matching principle
+            for principle in self.data['principles']:
+                if principle_name.lower() in principle['name'].lower() or principle['name'].lower() in principle_name.lower():
+                    rows['case_principles'].append({'case_id': case_id, 'principle_id': principle['id']})
+                    break
+
+        return rows
 
     def create_precedent_relationships(self):
         """Create citation/precedent relationships between cases"""
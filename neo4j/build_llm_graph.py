@@ -9,20 +9,24 @@ import sqlite3
 import os
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-from datetime import datetime
 from neo4j import GraphDatabase
 from dotenv import load_dotenv
 import logging
 from tqdm import tqdm
 
 from llm_extractor import LLMExtractor
+from utils.extraction_executor import ResponseCache
 from utils.error_handling import neo4j_retry, Neo4jTransactionContext
+from utils.graph_loader import GraphBatchLoader, DEFAULT_BATCH_SIZE
+from utils.case_rows import CASE_STATEMENTS, case_rows, prepare_case_properties, generate_id
+from utils.graph_metrics import GraphMetricsReader, format_counts
 from utils.monitoring import init_monitoring, global_monitor
 from utils.embeddings_generator import (
     EmbeddingsGenerator,
     Neo4jEmbeddingsLoader,
     create_chunks_with_embeddings
 )
+from utils.embedding_pipeline import EmbeddingPipeline, EmbeddingCache, CASE_TARGET
 
 # Initialize logging
 init_monitoring(log_level="INFO", log_file="logs/llm_graph_build.log")
@@ -54,16 +58,25 @@ class LLMGraphBuilder:
     - Cross-jurisdictional linking
     """
 
-    def __init__(self, llm_model: str = "gpt-4-turbo", enable_embeddings: bool = True):
+    def __init__(self, llm_model: str = "gpt-4-turbo", enable_embeddings: bool = True,
+                 batch_size: int = DEFAULT_BATCH_SIZE, llm_cache: bool = True, replay: bool = False,
+                 llm_concurrency: Optional[int] = None):
         """
         Initialize graph builder
 
         Args:
-            llm_model: LLM model for extraction ('gpt-4', 'gpt-4-turbo', 'gemini-2.5-pro')
+            llm_model: LLM model for extraction ('gpt-4', 'gpt-4-turbo', 'gemini-2.5-pro', 'fake')
             enable_embeddings: Whether to generate embeddings for RAG
+            batch_size: Cases per Neo4j write transaction
+            llm_cache: Cache LLM responses on disk (LLM_CACHE_PATH)
+            replay: Rebuild from cached LLM responses only, without API calls
+            llm_concurrency: LLM requests in flight (default: the provider's)
         """
         self.driver = GraphDatabase.driver(NEO4J_URL, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
-        self.extractor = LLMExtractor(model=llm_model)
+        self.loader = GraphBatchLoader(self.driver, database=NEO4J_DATABASE, batch_size=batch_size)
+        self.llm_cache = ResponseCache() if (llm_cache or replay) else None
+        self.extractor = LLMExtractor(model=llm_model, cache=self.llm_cache,
+                                      max_concurrency=llm_concurrency, replay=replay)
         self.schema = self._load_schema()
         self.enable_embeddings = enable_embeddings
 
@@ -71,7 +84,12 @@ class LLMGraphBuilder:
         if enable_embeddings:
             try:
                 self.embeddings_gen = EmbeddingsGenerator()
-                self.embeddings_loader = Neo4jEmbeddingsLoader(self.driver)
+                self.embeddings_loader = Neo4jEmbeddingsLoader(
+                    self.driver, dimension=self.embeddings_gen.dimension, database=NEO4J_DATABASE
+                )
+                self.embedding_pipeline = EmbeddingPipeline(
+                    self.driver, self.embeddings_gen, EmbeddingCache(), database=NEO4J_DATABASE
+                )
                 logger.info("✓ Embeddings generator initialized")
             except Exception as e:
                 logger.warning(f"Embeddings disabled: {str(e)}")
@@ -183,14 +201,8 @@ class LLMGraphBuilder:
         rows = cursor.fetchall()
         logger.info(f"Found {len(rows)} cases in database")
 
-        enhanced_cases = []
-
-        for row in tqdm(rows, desc="Enhancing DB cases with LLM"):
-            case_record = dict(row)
-
-            with global_monitor.track("db_case_llm_enhancement"):
-                enhanced = self.extractor.extract_from_database_case(case_record)
-                enhanced_cases.append(enhanced)
+        with global_monitor.track("db_case_llm_enhancement"):
+            enhanced_cases = self.extractor.extract_from_database_cases([dict(row) for row in rows])
 
         conn.close()
 
@@ -201,149 +213,18 @@ class LLMGraphBuilder:
         """Load cases into Neo4j following schema v3.0"""
         logger.info(f"Loading {len(cases)} cases to Neo4j (source: {source_type})...")
 
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            for case in tqdm(cases, desc="Loading cases"):
-                with Neo4jTransactionContext(session, "load_case") as tx:
-                    # Create Case node
-                    case_props = self._prepare_case_properties(case)
+        with tqdm(total=len(cases), desc="Loading cases") as progress:
+            stats = self.loader.load(cases, self._case_rows, CASE_STATEMENTS, progress=progress.update)
 
-                    tx.run("""
-                        MERGE (c:Case {case_id: $case_id})
-                        SET c += $properties
-                    """, case_id=case_props["case_id"], properties=case_props)
-
-                    # Create Judges
-                    for judge in case.get("judges", case.get("llm_judges", [])):
-                        if isinstance(judge, dict):
-                            judge_name = judge.get("name")
-                        else:
-                            judge_name = str(judge)
-
-                        if judge_name:
-                            judge_id = self._generate_id(judge_name)
-                            tx.run("""
-                                MERGE (j:Judge {judge_id: $judge_id})
-                                SET j.name = $name,
-                                    j.title = $title
-                                WITH j
-                                MATCH (c:Case {case_id: $case_id})
-                                MERGE (c)-[:DECIDED_BY]->(j)
-                            """, judge_id=judge_id, name=judge_name,
-                                 title=judge.get("title", "Justice") if isinstance(judge, dict) else "Justice",
-                                 case_id=case_props["case_id"])
-
-                    # Create Court
-                    court_name = case.get("court")
-                    if court_name:
-                        court_id = self._generate_id(court_name)
-                        tx.run("""
-                            MERGE (court:Court {court_id: $court_id})
-                            SET court.name = $name
-                            WITH court
-                            MATCH (c:Case {case_id: $case_id})
-                            MERGE (c)-[:BEFORE_COURT]->(court)
-                        """, court_id=court_id, name=court_name, case_id=case_props["case_id"])
-
-                    # Create Parties
-                    parties = case.get("parties", {})
-                    for petitioner in parties.get("petitioners", []):
-                        party_id = self._generate_id(petitioner)
-                        tx.run("""
-                            MERGE (p:Party {party_id: $party_id})
-                            SET p.name = $name, p.role = 'Petitioner'
-                            WITH p
-                            MATCH (c:Case {case_id: $case_id})
-                            MERGE (c)-[:PETITIONER]->(p)
-                        """, party_id=party_id, name=petitioner, case_id=case_props["case_id"])
-
-                    for respondent in parties.get("respondents", []):
-                        party_id = self._generate_id(respondent)
-                        tx.run("""
-                            MERGE (p:Party {party_id: $party_id})
-                            SET p.name = $name, p.role = 'Respondent'
-                            WITH p
-                            MATCH (c:Case {case_id: $case_id})
-                            MERGE (c)-[:RESPONDENT]->(p)
-                        """, party_id=party_id, name=respondent, case_id=case_props["case_id"])
-
-                    # Create Sections
-                    for section in case.get("sections", case.get("llm_sections", [])):
-                        if isinstance(section, dict):
-                            section_id_str = section.get("section_id")
-                            statute = section.get("statute", "Unknown")
-                            description = section.get("description", "")
-                        else:
-                            section_id_str = str(section)
-                            statute = "Unknown"
-                            description = ""
-
-                        if section_id_str:
-                            section_id = self._generate_id(section_id_str)
-                            tx.run("""
-                                MERGE (s:Section {section_id: $section_id})
-                                SET s.section_number = $section_number,
-                                    s.statute = $statute,
-                                    s.description = $description
-                                WITH s
-                                MATCH (c:Case {case_id: $case_id})
-                                MERGE (c)-[:APPLIES_SECTION]->(s)
-                            """, section_id=section_id, section_number=section_id_str,
-                                 statute=statute, description=description, case_id=case_props["case_id"])
-
-                    # Create Principles
-                    for principle in case.get("principles", case.get("llm_principles", [])):
-                        if isinstance(principle, dict):
-                            principle_name = principle.get("name")
-                            description = principle.get("description", "")
-                            category = principle.get("category", "Legal Principle")
-                        else:
-                            principle_name = str(principle)
-                            description = ""
-                            category = "Legal Principle"
-
-                        if principle_name:
-                            principle_id = self._generate_id(principle_name)
-                            tx.run("""
-                                MERGE (p:Principle {principle_id: $principle_id})
-                                SET p.name = $name,
-                                    p.description = $description,
-                                    p.category = $category
-                                WITH p
-                                MATCH (c:Case {case_id: $case_id})
-                                MERGE (c)-[:ESTABLISHES]->(p)
-                            """, principle_id=principle_id, name=principle_name,
-                                 description=description, category=category, case_id=case_props["case_id"])
-
-        logger.info(f"✓ Loaded {len(cases)} cases to Neo4j")
+        logger.info(f"✓ Loaded {len(cases)} cases to Neo4j ({stats.batches} batches)")
+
+    def _case_rows(self, case: Dict) -> Dict[str, List[Dict]]:
+        """Split one case into UNWIND rows per statement"""
+        return case_rows(case)
 
     def _prepare_case_properties(self, case: Dict) -> Dict:
         """Prepare case properties following schema v3.0"""
-        case_id = case.get("case_id", self._generate_id(case.get("title", case.get("citation", "unknown"))))
-
-        return {
-            "case_id": case_id,
-            "citation": case.get("citation", ""),
-            "title": case.get("title", case.get("name", "")),
-            "date": case.get("date", case.get("case_date", "")),
-            "year": case.get("year"),
-            "jurisdiction": case.get("jurisdiction", "Bangladesh"),
-            "case_type": case.get("case_type", "Unknown"),
-            "full_text": case.get("full_text", "")[:10000],  # Limit to 10k chars
-            "summary": case.get("summary", case.get("llm_summary", case.get("snippet", ""))),
-            "holding": case.get("holding", case.get("llm_holding", "")),
-            "facts": case.get("facts", case.get("llm_facts", "")),
-            "reasoning": case.get("reasoning", case.get("llm_reasoning", "")),
-            "outcome": case.get("outcome", ""),
-            "trust_score": case.get("trust_score", case.get("confidence_score", 0.75)),
-            "authority_level": case.get("authority_level", case.get("court_type", "Unknown")),
-            "source": case.get("source", ""),
-            "extracted_at": case.get("extracted_at", datetime.now().isoformat()),
-            "extracted_by": case.get("extracted_by", "llm_extractor"),
-            "confidence_score": case.get("confidence_score", 0.75),
-            "version": 1,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
-        }
+        return prepare_case_properties(case)
 
     def _load_statute_to_neo4j(self, statute_data: Dict):
         """Load statute and sections to Neo4j"""
@@ -428,8 +309,7 @@ class LLMGraphBuilder:
 
     def _generate_id(self, text: str) -> str:
         """Generate ID from text"""
-        import hashlib
-        return hashlib.md5(text.encode()).hexdigest()[:16]
+        return generate_id(text)
 
     def create_vector_indexes(self):
         """Create vector indexes for RAG"""
@@ -450,43 +330,18 @@ class LLMGraphBuilder:
 
         logger.info("Generating embeddings for cases...")
 
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            # Get all cases
-            result = session.run("""
-                MATCH (c:Case)
-                WHERE c.embedding IS NULL
-                RETURN c.case_id as case_id,
-                       c.title as title,
-                       c.summary as summary,
-                       c.facts as facts,
-                       c.holding as holding,
-                       c.reasoning as reasoning,
-                       c.full_text as full_text
-                LIMIT 1000
-            """)
-
-            cases = []
-            for record in result:
-                cases.append(dict(record))
+        with global_monitor.track("case_embeddings"):
+            with tqdm(desc="Generating case embeddings") as progress:
+                stats = self.embedding_pipeline.run(CASE_TARGET, progress=progress.update)
 
-            if not cases:
-                logger.info("No cases found without embeddings")
-                return
-
-            logger.info(f"Found {len(cases)} cases to embed")
-
-            # Generate embeddings
-            for case in tqdm(cases, desc="Generating case embeddings"):
-                with global_monitor.track("case_embedding"):
-                    embedding = self.embeddings_gen.generate_case_embedding(case)
-
-                    # Update in Neo4j
-                    self.embeddings_loader.update_case_embeddings(
-                        case['case_id'],
-                        embedding
-                    )
+        if not stats.nodes:
+            logger.info("No cases found without embeddings")
+            return
 
-            logger.info(f"✓ Generated embeddings for {len(cases)} cases")
+        logger.info(
+            f"✓ Generated embeddings for {stats.embedded} cases "
+            f"({stats.cache_hits} from cache, {len(stats.failed_ids)} failed)"
+        )
 
     def generate_chunks(self):
         """Generate text chunks for all cases"""
@@ -527,7 +382,8 @@ class LLMGraphBuilder:
                     chunks = create_chunks_with_embeddings(
                         text=full_text,
                         source_id=case_id,
-                        source_type="case"
+                        source_type="case",
+                        generator=self.embeddings_gen
                     )
 
                     all_chunks.extend(chunks)
@@ -542,43 +398,8 @@ class LLMGraphBuilder:
         """Get graph statistics"""
         logger.info("Fetching graph statistics...")
 
-        with self.driver.session(database=NEO4J_DATABASE) as session:
-            result = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] as label, count(*) as count
-                ORDER BY count DESC
-            """)
-
-            print("\n" + "="*60)
-            print("LLM-POWERED KNOWLEDGE GRAPH STATISTICS")
-            print("="*60)
-
-            total_nodes = 0
-            for record in result:
-                label = record['label']
-                count = record['count']
-                if label:
-                    print(f"  {label:20} {count:4} nodes")
-                    total_nodes += count
-
-            rel_result = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) as rel_type, count(*) as count
-                ORDER BY count DESC
-                LIMIT 15
-            """)
-
-            print("\nTop Relationships:")
-            total_rels = 0
-            for record in rel_result:
-                print(f"  {record['rel_type']:25} {record['count']:4} relationships")
-                total_rels += record['count']
-
-            total_rel = session.run("MATCH ()-[r]->() RETURN count(r) as total").single()['total']
-
-            print(f"\n{'TOTAL':20} {total_nodes:4} nodes")
-            print(f"{'TOTAL':20} {total_rel:4} relationships")
-            print("="*60 + "\n")
+        counts = GraphMetricsReader(self.driver, NEO4J_DATABASE).counts()
+        print(format_counts(counts, "LLM-POWERED KNOWLEDGE GRAPH STATISTICS"))
 
         # Export metrics
         global_monitor.export_metrics("logs/llm_graph_metrics.json")
@@ -586,6 +407,9 @@ class LLMGraphBuilder:
 
     def close(self):
         """Close connections"""
+        logger.info(f"LLM extraction: {self.extractor.stats.summary()}")
+        if self.llm_cache is not None:
+            self.llm_cache.close()
         self.driver.close()
 
 
@@ -604,6 +428,10 @@ def main():
     parser.add_argument("--skip-db", action="store_true", help="Skip database processing")
     parser.add_argument("--no-embeddings", action="store_true", help="Disable embeddings generation")
     parser.add_argument("--skip-chunks", action="store_true", help="Skip chunk generation")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Cases per Neo4j transaction")
+    parser.add_argument("--llm-concurrency", type=int, help="LLM requests in flight")
+    parser.add_argument("--no-llm-cache", action="store_true", help="Do not cache LLM responses")
+    parser.add_argument("--replay", action="store_true", help="Use cached LLM responses only (no API calls)")
 
     args = parser.parse_args()
 
@@ -611,7 +439,9 @@ def main():
     logger.info("LLM-POWERED KNOWLEDGE GRAPH BUILDER")
     logger.info("="*60)
 
-    builder = LLMGraphBuilder(llm_model=args.model, enable_embeddings=not args.no_embeddings)
+    builder = LLMGraphBuilder(llm_model=args.model, enable_embeddings=not args.no_embeddings,
+                              batch_size=args.batch_size, llm_cache=not args.no_llm_cache,
+                              replay=args.replay, llm_concurrency=args.llm_concurrency)
 
     try:
         # Create schema constraints
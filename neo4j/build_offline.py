@@ -0,0 +1,260 @@
+"""
+Build the Knowledge Graph Offline with neo4j-admin
+
+Streams cases from the SQLite (Indian Kanoon) and PostgreSQL case databases,
+merges any saved LLM extraction output, and writes neo4j-admin import CSVs
+instead of sending MERGE statements over Bolt. Use for first loads and full
+rebuilds; incremental updates still go through build_llm_graph.py.
+
+Usage:
+    python build_offline.py --sqlite ../data-collection/data/indiankanoon.db --output import/
+    sh import/import.sh    # with the database stopped
+"""
+import json
+import sqlite3
+import logging
+import argparse
+from typing import Dict, Iterator, Optional
+
+from add_indian_cases import IndianCaseExtractor
+from utils.case_rows import generate_id
+from utils.bulk_import import BulkImportWriter, SchemaCatalog, DEFAULT_SCHEMA_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FETCH_SIZE = 1000
+
+COUNTRY_NAMES = {"BD": "Bangladesh", "IN": "India", "PK": "Pakistan", "US": "United States", "UK": "United Kingdom"}
+
+COURT_NAMES = {
+    "SC": "Supreme Court",
+    "AD": "Appellate Division",
+    "HCD": "High Court Division",
+    "HC": "High Court",
+    "FSC": "Federal Shariat Court",
+}
+
+POSTGRES_CASES_SELECT = """
+    SELECT d.id, d.global_id, d.country_code, d.doc_subtype,
+           d.title_full AS title, d.doc_year AS year, d.date_judgment AS case_date,
+           d.source_url, c.full_text, c.summary,
+           (SELECT COALESCE(ci.citation_display, ci.citation_full, ci.citation_encoded)
+              FROM citations ci
+             WHERE ci.document_id = d.id AND ci.citation_type = 'primary'
+             LIMIT 1) AS citation,
+           ARRAY(SELECT j.judge_name FROM judges j
+                  WHERE j.document_id = d.id ORDER BY j.judge_order) AS judges,
+           ARRAY(SELECT p.party_name FROM parties p
+                  WHERE p.document_id = d.id AND p.party_type IN ('petitioner', 'appellant')
+                  ORDER BY p.party_order) AS petitioners,
+           ARRAY(SELECT p.party_name FROM parties p
+                  WHERE p.document_id = d.id AND p.party_type = 'respondent'
+                  ORDER BY p.party_order) AS respondents,
+           (SELECT json_agg(json_build_object(
+                       'section_id', 'Section ' || s.section_number, 'statute', s.act_name))
+              FROM sections_cited s
+             WHERE s.document_id = d.id AND s.section_number IS NOT NULL) AS sections
+    FROM documents d
+    LEFT JOIN content c ON c.document_id = d.id
+"""
+
+POSTGRES_CASES_QUERY = POSTGRES_CASES_SELECT + """
+    WHERE d.doc_type = 'CAS'
+    ORDER BY d.id
+"""
+
+
+def case_key(case: Dict) -> str:
+    """Case ID the graph will use (see prepare_case_properties)"""
+    return case.get("case_id") or generate_id(case.get("title", case.get("citation", "unknown")))
+
+
+def sqlite_case_id(row_id: int) -> str:
+    """Case ID of a legal_cases row (kept when the title is edited)"""
+    return f"indian_case_{row_id}"
+
+
+def postgres_case_id(document_id: int) -> str:
+    """Case ID of a documents row (kept when the title is edited)"""
+    return f"document_{document_id}"
+
+
+def load_extractions(path: str) -> Dict[str, Dict]:
+    """
+    Load saved extraction output (one enhanced case dict per JSON line)
+
+    Returns:
+        Extractions keyed by case ID
+    """
+    extractions = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                case = json.loads(line)
+                extractions[case_key(case)] = case
+    logger.info(f"Loaded {len(extractions)} saved extractions from {path}")
+    return extractions
+
+
+def sqlite_case(record: Dict) -> Dict:
+    """Map a legal_cases row to the extraction output shape"""
+    case = dict(record)
+    case["case_id"] = sqlite_case_id(case["id"])
+    case.setdefault("jurisdiction", "India")
+    case.setdefault("source", "IndianKanoon")
+
+    parsed = IndianCaseExtractor.parse_case_text(case.get("full_text") or "", case.get("title") or "")
+    case["judges"] = parsed["judges"]
+    case["parties"] = {
+        "petitioners": parsed["parties"]["petitioner"],
+        "respondents": parsed["parties"]["respondent"],
+    }
+    case["sections"] = parsed["sections_cited"]
+    case["court"] = case.get("court") or case.get("court_name") or parsed["court_name"]
+    if parsed["case_type"]:
+        case["case_type"] = parsed["case_type"]
+    return case
+
+
+def iter_sqlite_cases(db_path: str, limit: Optional[int] = None,
+                      fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict]:
+    """Stream legal_cases rows by primary-key keyset"""
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    last_id = 0
+    count = 0
+    try:
+        while limit is None or count < limit:
+            size = fetch_size if limit is None else min(fetch_size, limit - count)
+            rows = conn.execute(
+                "SELECT * FROM legal_cases WHERE id > ? AND full_text IS NOT NULL ORDER BY id LIMIT ?",
+                (last_id, size)
+            ).fetchall()
+            if not rows:
+                break
+            for row in rows:
+                yield sqlite_case(dict(row))
+            last_id = rows[-1]["id"]
+            count += len(rows)
+    finally:
+        conn.close()
+
+
+def postgres_case(record: Dict) -> Dict:
+    """Map a documents row (with its judges, parties and sections) to the extraction output shape"""
+    country = (record.get("country_code") or "").strip()
+    jurisdiction = COUNTRY_NAMES.get(country, country)
+    subtype = record.get("doc_subtype") or ""
+    court = COURT_NAMES.get(subtype, subtype)
+    if court and jurisdiction:
+        court = f"{court} of {jurisdiction}" if subtype == "SC" else f"{court}, {jurisdiction}"
+
+    case_date = record.get("case_date")
+    return {
+        "case_id": postgres_case_id(record["id"]),
+        "title": record.get("title") or "",
+        "citation": record.get("citation") or "",
+        "year": record.get("year"),
+        "case_date": case_date.isoformat() if case_date else "",
+        "full_text": record.get("full_text") or "",
+        "summary": record.get("summary") or "",
+        "jurisdiction": jurisdiction,
+        "source": record.get("source_url") or "",
+        "court": court,
+        "judges": list(record.get("judges") or []),
+        "parties": {
+            "petitioners": list(record.get("petitioners") or []),
+            "respondents": list(record.get("respondents") or []),
+        },
+        "sections": record.get("sections") or [],
+    }
+
+
+def iter_postgres_cases(dsn: str, limit: Optional[int] = None,
+                        fetch_size: int = DEFAULT_FETCH_SIZE) -> Iterator[Dict]:
+    """Stream case documents through a server-side cursor"""
+    try:
+        import psycopg2
+        import psycopg2.extras
+    except ImportError:
+        raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+    query = POSTGRES_CASES_QUERY + (f" LIMIT {int(limit)}" if limit else "")
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn.cursor("offline_cases", cursor_factory=psycopg2.extras.RealDictCursor) as cursor:
+            cursor.itersize = fetch_size
+            cursor.execute(query)
+            for record in cursor:
+                yield postgres_case(record)
+    finally:
+        conn.close()
+
+
+def with_extractions(cases: Iterator[Dict], extractions: Dict[str, Dict]) -> Iterator[Dict]:
+    """Overlay saved extraction output on source cases (extraction wins, the source case ID stays)"""
+    for case in cases:
+        extraction = extractions.get(case["case_id"])
+        if not extraction and case.get("title"):
+            # Saved LLM output has no row id and is keyed by title
+            extraction = extractions.get(generate_id(case["title"]))
+        if extraction:
+            # LLM entities replace the regex/database ones
+            case_id = case["case_id"]
+            case = {k: v for k, v in case.items() if k not in ("judges", "sections", "principles")}
+            case.update(extraction)
+            case["case_id"] = case_id
+        yield case
+
+
+def build_offline(
+    output_dir: str,
+    sqlite_path: Optional[str] = None,
+    postgres_dsn: Optional[str] = None,
+    extractions_path: Optional[str] = None,
+    schema_dir: Optional[str] = None,
+    limit: Optional[int] = None,
+    database: str = "neo4j"
+):
+    """
+    Write import CSVs for every case in the given sources
+
+    Returns:
+        ImportReport
+    """
+    extractions = load_extractions(extractions_path) if extractions_path else {}
+
+    with BulkImportWriter(output_dir, SchemaCatalog(schema_dir or DEFAULT_SCHEMA_DIR), database=database) as writer:
+        if sqlite_path:
+            logger.info(f"Streaming cases from SQLite: {sqlite_path}")
+            writer.write_cases(with_extractions(iter_sqlite_cases(sqlite_path, limit), extractions))
+        if postgres_dsn:
+            logger.info("Streaming cases from PostgreSQL")
+            writer.write_cases(with_extractions(iter_postgres_cases(postgres_dsn, limit), extractions))
+
+    return writer.report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write neo4j-admin import files for the case graph")
+    parser.add_argument("--sqlite", help="Indian Kanoon SQLite database")
+    parser.add_argument("--postgres", help="PostgreSQL DSN of the case corpus")
+    parser.add_argument("--extractions", help="Saved extraction output (JSON lines)")
+    parser.add_argument("--output", default="import", help="Output directory")
+    parser.add_argument("--schema-dir", help="Schema directory (default: legal-knowledge-graph/schema)")
+    parser.add_argument("--limit", type=int, help="Max cases per source")
+    parser.add_argument("--database", default="neo4j", help="Target database name")
+    args = parser.parse_args()
+
+    if not (args.sqlite or args.postgres):
+        parser.error("give --sqlite and/or --postgres")
+
+    logging.basicConfig(level=logging.INFO)
+    report = build_offline(args.output, args.sqlite, args.postgres, args.extractions,
+                           args.schema_dir, args.limit, args.database)
+    print(json.dumps(report.__dict__, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -6,6 +6,9 @@ Usage:
     python cli.py extract-pdf --input cpc2.pdf --output cpc_data_auto.json
     python cli.py build-graph --data cpc_data.json
     python cli.py add-indian-cases --limit 30
+    python cli.py build-offline --sqlite ../data-collection/data/indiankanoon.db --output import
+    python cli.py embed --label Case --workers 4
+    python cli.py chunk --postgres "$DATABASE_URL"
     python cli.py visualize
     python cli.py stats
     python cli.py run-tests
@@ -22,6 +25,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# visualize: best-connected nodes written to the static files
+STATIC_MAX_NODES = 2000
+
 
 def command_extract_pdf(args):
     """Extract cases from PDF"""
@@ -84,14 +90,19 @@ def command_add_indian_cases(args):
 
 
 def command_visualize(args):
-    """Generate visualizations"""
+    """Generate visualizations (or serve the interactive explorer)"""
+    if args.serve:
+        from visualization_server import serve, DEFAULT_MAX_NODES
+        serve(host=args.host, port=args.port, max_nodes=args.max_nodes or DEFAULT_MAX_NODES, warm=args.warm)
+        return 0
+
     from visualize_graph import CPCGraphVisualizer
 
     logger.info("Generating graph visualizations...")
 
     try:
         visualizer = CPCGraphVisualizer()
-        visualizer.visualize()
+        visualizer.visualize(max_nodes=args.max_nodes or STATIC_MAX_NODES)
         logger.info("✓ Visualizations generated")
         return 0
     except Exception as e:
@@ -122,50 +133,21 @@ def command_stats(args):
     logger.info("Fetching graph statistics...")
 
     try:
+        from utils.graph_metrics import GraphMetricsReader, format_counts
+
         driver = GraphDatabase.driver(NEO4J_URL, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
+        reader = GraphMetricsReader(driver, NEO4J_DATABASE)
+
+        # Count-store lookups, not full scans
+        print(format_counts(reader.counts()))
 
-        with driver.session(database=NEO4J_DATABASE) as session:
-            # Node counts by label
-            result = session.run("""
-                MATCH (n)
-                RETURN labels(n)[0] as label, count(*) as count
-                ORDER BY count DESC
-            """)
-
-            print("\n" + "="*60)
-            print("KNOWLEDGE GRAPH STATISTICS")
-            print("="*60)
-
-            total_nodes = 0
-            for record in result:
-                label = record['label']
-                count = record['count']
-                if label:
-                    print(f"  {label:20} {count:4} nodes")
-                    total_nodes += count
-
-            # Relationship counts
-            result = session.run("""
-                MATCH ()-[r]->()
-                RETURN type(r) as rel_type, count(*) as count
-                ORDER BY count DESC
-                LIMIT 15
-            """)
-
-            print("\nTop Relationships:")
-            total_rels = 0
-            for record in result:
-                rel_type = record['rel_type']
-                count = record['count']
-                print(f"  {rel_type:25} {count:4} relationships")
-                total_rels += count
-
-            total_rel_result = session.run("MATCH ()-[r]->() RETURN count(r) as total")
-            total_rels = total_rel_result.single()['total']
-
-            print(f"\n{'TOTAL':20} {total_nodes:4} nodes")
-            print(f"{'TOTAL':20} {total_rels:4} relationships")
-            print("="*60 + "\n")
+        top_cases = reader.top_cases(args.top)
+        if top_cases:
+            print("Most authoritative cases (from the last `metrics` run):")
+            for case in top_cases:
+                print(f"  {case['rank']:4}. {(case['title'] or case['case_id'] or '')[:60]:60} "
+                      f"cited by {case['cited_by_count']}")
+            print()
 
         driver.close()
         return 0
@@ -238,7 +220,13 @@ def command_build_llm_graph(args):
     logger.info(f"Building LLM-powered knowledge graph with {args.model}...")
 
     enable_embeddings = not getattr(args, 'no_embeddings', False)
-    builder = LLMGraphBuilder(llm_model=args.model, enable_embeddings=enable_embeddings)
+    builder = LLMGraphBuilder(
+        llm_model=args.model,
+        enable_embeddings=enable_embeddings,
+        llm_cache=not args.no_llm_cache,
+        replay=args.replay,
+        llm_concurrency=args.llm_concurrency
+    )
 
     try:
         # Create schema constraints
@@ -294,6 +282,176 @@ def command_build_llm_graph(args):
         builder.close()
 
 
+def command_build_offline(args):
+    """Write neo4j-admin import files instead of loading over Bolt"""
+    from build_offline import build_offline
+
+    if not (args.sqlite or args.postgres):
+        logger.error("✗ Give --sqlite and/or --postgres")
+        return 1
+
+    logger.info(f"Writing offline import files to {args.output}...")
+
+    try:
+        report = build_offline(
+            args.output,
+            sqlite_path=args.sqlite,
+            postgres_dsn=args.postgres,
+            extractions_path=args.extractions,
+            schema_dir=args.schema_dir,
+            limit=args.limit,
+            database=args.database
+        )
+        logger.info(
+            f"✓ {report.cases} cases -> {sum(report.nodes.values())} nodes, "
+            f"{sum(report.relationships.values())} relationships"
+        )
+        logger.info(f"  Import with the database stopped: sh {Path(args.output) / 'import.sh'}")
+        return 0
+    except Exception as e:
+        logger.error(f"✗ Offline build failed: {str(e)}")
+        return 1
+
+
+def command_embed(args):
+    """Embed un-embedded nodes (or benchmark the pipeline offline)"""
+    import time
+    from utils.embedding_pipeline import (
+        EmbeddingPipeline, EmbeddingCache, EmbeddingStats, RateLimiter, StubEmbeddingClient,
+        CASE_TARGET, SECTION_TARGET
+    )
+
+    cache = None if args.no_cache else EmbeddingCache(args.cache) if args.cache else EmbeddingCache()
+    limiter = RateLimiter(args.rpm, args.tpm)
+
+    if args.benchmark:
+        # Offline: synthetic texts through the stub client, no Neo4j
+        client = StubEmbeddingClient(latency=args.stub_latency)
+        pipeline = EmbeddingPipeline(None, client, cache, batch_size=args.batch_size,
+                                     max_workers=args.workers, rate_limiter=limiter)
+        distinct = max(1, args.benchmark * 9 // 10)    # ~10% repeated texts
+        texts = [f"Case {i % distinct} holding on section {i % distinct % 97}"
+                 for i in range(args.benchmark)]
+        stats = EmbeddingStats(nodes=len(texts))
+        started = time.time()
+        pipeline.embed_texts(texts, stats)
+        stats.seconds = time.time() - started
+        print(f"{stats.nodes} texts in {stats.seconds:.2f}s ({stats.nodes_per_second:,.0f}/s): "
+              f"{stats.requests} requests, {stats.cache_hits} cached, {stats.duplicates} duplicates")
+        if cache is not None:
+            cache.close()
+        return 0
+
+    from neo4j import GraphDatabase
+    from dotenv import load_dotenv
+    import os
+
+    load_dotenv()
+    driver = GraphDatabase.driver(os.getenv("NEO4J_URL"),
+                                  auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD")))
+    try:
+        if args.stub:
+            client = StubEmbeddingClient(latency=args.stub_latency)
+        else:
+            from utils.embeddings_generator import EmbeddingsGenerator
+            from utils.embedding_backends import create_backend
+            client = EmbeddingsGenerator(backend=create_backend(args.backend))
+
+        pipeline = EmbeddingPipeline(driver, client, cache, database=os.getenv("NEO4J_DATABASE", "neo4j"),
+                                     batch_size=args.batch_size, max_workers=args.workers,
+                                     rate_limiter=limiter)
+        target = CASE_TARGET if args.label == 'Case' else SECTION_TARGET
+        stats = pipeline.run(target, limit=args.limit)
+        logger.info(f"✓ Embedded {stats.embedded}/{stats.nodes} {args.label} nodes "
+                    f"({stats.nodes_per_second:.1f}/s, {stats.cache_hits} cached)")
+        return 0 if not stats.failed_ids else 1
+    except Exception as e:
+        logger.error(f"✗ Embedding failed: {str(e)}")
+        return 1
+    finally:
+        driver.close()
+        if cache is not None:
+            cache.close()
+
+
+def command_sync(args):
+    """Push new and changed cases to the graph (incremental)"""
+    from neo4j import GraphDatabase
+    from dotenv import load_dotenv
+    import os
+    from sync_graph import GraphSync, SQLiteChangeSource, PostgresChangeSource
+
+    if not (args.sqlite or args.postgres):
+        logger.error("✗ Give --sqlite and/or --postgres")
+        return 1
+
+    load_dotenv()
+    sources = []
+    if args.sqlite:
+        sources.append(SQLiteChangeSource(args.sqlite))
+    if args.postgres:
+        sources.append(PostgresChangeSource(args.postgres, settle_seconds=args.settle))
+
+    driver = GraphDatabase.driver(os.getenv("NEO4J_URL"),
+                                  auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD")))
+    try:
+        sync = GraphSync(driver, os.getenv("NEO4J_DATABASE", "neo4j"),
+                         batch_size=args.batch_size, page_size=args.page_size)
+        if args.interval:
+            sync.run(sources, args.interval)
+        else:
+            for source in sources:
+                result = sync.sync(source)
+                logger.info(f"✓ {result.source}: {result.cases} cases synced, {result.deleted} deleted "
+                            f"(watermark {result.watermark})")
+        return 0
+    except Exception as e:
+        logger.error(f"✗ Sync failed: {str(e)}")
+        return 1
+    finally:
+        for source in sources:
+            source.close()
+        driver.close()
+
+
+def command_metrics(args):
+    """Precompute counts, citation degree, authority and court aggregates"""
+    from neo4j import GraphDatabase
+    from dotenv import load_dotenv
+    import os
+    from utils.graph_metrics import GraphMetrics, mirror_to_postgres
+
+    load_dotenv()
+    driver = GraphDatabase.driver(os.getenv("NEO4J_URL"),
+                                  auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD")))
+    try:
+        result = GraphMetrics(driver, os.getenv("NEO4J_DATABASE", "neo4j"), batch_size=args.batch_size).compute()
+        logger.info(f"✓ Metrics stored for {len(result.cases)} cases and {len(result.courts)} courts")
+        if args.postgres:
+            updated = mirror_to_postgres(args.postgres, result)
+            logger.info(f"✓ Mirrored to PostgreSQL ({updated} documents)")
+        return 0
+    except Exception as e:
+        logger.error(f"✗ Metrics failed: {str(e)}")
+        return 1
+    finally:
+        driver.close()
+
+
+def command_chunk(args):
+    """Write hierarchical chunks for documents that have none yet"""
+    from utils.document_chunks import chunk_documents
+
+    try:
+        documents, chunks = chunk_documents(args.postgres, limit=args.limit, max_tokens=args.max_tokens,
+                                            context_chars=args.context_chars)
+        logger.info(f"✓ Wrote {chunks} chunks for {documents} documents")
+        return 0
+    except Exception as e:
+        logger.error(f"✗ Chunking failed: {str(e)}")
+        return 1
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -310,9 +468,24 @@ Examples:
   # Add Indian cases
   python cli.py add-indian-cases --limit 50
 
+  # Full rebuild via neo4j-admin import
+  python cli.py build-offline --sqlite ../data-collection/data/indiankanoon.db --output import
+
+  # Keep the graph in sync with the case databases
+  python cli.py sync --postgres "$DATABASE_URL" --interval 300
+
   # Generate visualizations
   python cli.py visualize
 
+  # Explore the full graph interactively (http://127.0.0.1:5050)
+  python cli.py visualize --serve --warm 20
+
+  # Precompute citation metrics (and mirror them to PostgreSQL)
+  python cli.py metrics --postgres "$DATABASE_URL"
+
+  # Chunk new documents as document -> section -> paragraph trees
+  python cli.py chunk --postgres "$DATABASE_URL" --limit 1000
+
   # Show statistics
   python cli.py stats
 
@@ -344,10 +517,18 @@ Examples:
 
     # Visualize command
     viz_parser = subparsers.add_parser('visualize', help='Generate graph visualizations')
+    viz_parser.add_argument('--max-nodes', type=int,
+                            help=f'Best-connected nodes in the static files (default {STATIC_MAX_NODES}), '
+                                 'or nodes per explorer response with --serve')
+    viz_parser.add_argument('--serve', action='store_true', help='Serve the interactive explorer instead')
+    viz_parser.add_argument('--host', default='127.0.0.1', help='Explorer host')
+    viz_parser.add_argument('--port', type=int, default=5050, help='Explorer port')
+    viz_parser.add_argument('--warm', type=int, default=0, metavar='N', help='Precompute the top N case neighbourhoods')
     viz_parser.set_defaults(func=command_visualize)
 
     # Stats command
     stats_parser = subparsers.add_parser('stats', help='Show graph statistics')
+    stats_parser.add_argument('--top', type=int, default=10, help='Most authoritative cases to list')
     stats_parser.set_defaults(func=command_stats)
 
     # Run tests command
@@ -367,7 +548,7 @@ Examples:
 
     # Build LLM graph command (NEW!)
     llm_parser = subparsers.add_parser('build-llm-graph', help='Build knowledge graph using LLM extraction with RAG')
-    llm_parser.add_argument('--model', default='gpt-4-turbo', help='LLM model (gpt-4, gpt-4-turbo, gemini-2.5-pro)')
+    llm_parser.add_argument('--model', default='gpt-4-turbo', help='LLM model (gpt-4, gpt-4-turbo, gemini-2.5-pro, fake)')
     llm_parser.add_argument('--pdfs', nargs='+', default=['cpc2.pdf'], help='PDF files to process')
     llm_parser.add_argument('--text-files', nargs='+', default=['cpc.txt', 'act.txt'], help='Text files to process')
     llm_parser.add_argument('--db-path', default='../data-collection/data/indiankanoon.db', help='SQLite database path')
@@ -377,8 +558,65 @@ Examples:
     llm_parser.add_argument('--skip-db', action='store_true', help='Skip database processing')
     llm_parser.add_argument('--no-embeddings', action='store_true', help='Disable embeddings generation')
     llm_parser.add_argument('--skip-chunks', action='store_true', help='Skip chunk generation for RAG')
+    llm_parser.add_argument('--llm-concurrency', type=int, help='LLM requests in flight (default: per provider)')
+    llm_parser.add_argument('--no-llm-cache', action='store_true', help='Do not cache LLM responses')
+    llm_parser.add_argument('--replay', action='store_true', help='Use cached LLM responses only (no API calls)')
     llm_parser.set_defaults(func=command_build_llm_graph)
 
+    # Offline build command
+    offline_parser = subparsers.add_parser('build-offline', help='Write neo4j-admin import CSVs for a full rebuild')
+    offline_parser.add_argument('--sqlite', help='Indian Kanoon SQLite database path')
+    offline_parser.add_argument('--postgres', help='PostgreSQL DSN of the case corpus')
+    offline_parser.add_argument('--extractions', help='Saved LLM extraction output (JSON lines)')
+    offline_parser.add_argument('--output', '-o', default='import', help='Output directory (default: import)')
+    offline_parser.add_argument('--schema-dir', help='Schema directory (default: legal-knowledge-graph/schema)')
+    offline_parser.add_argument('--limit', type=int, help='Max cases per source')
+    offline_parser.add_argument('--database', default='neo4j', help='Target database name')
+    offline_parser.set_defaults(func=command_build_offline)
+
+    # Embed command
+    embed_parser = subparsers.add_parser('embed', help='Embed nodes without embeddings (batched, concurrent, cached)')
+    embed_parser.add_argument('--label', choices=['Case', 'Section'], default='Case', help='Node label to embed')
+    embed_parser.add_argument('--limit', type=int, help='Max nodes to embed')
+    embed_parser.add_argument('--batch-size', type=int, default=100, help='Texts per embedding request')
+    embed_parser.add_argument('--workers', type=int, default=4, help='Concurrent embedding requests')
+    embed_parser.add_argument('--rpm', type=int, help='Max requests per minute')
+    embed_parser.add_argument('--tpm', type=int, help='Max input tokens per minute')
+    embed_parser.add_argument('--cache', help='Embedding cache file (default: cache/embeddings.db)')
+    embed_parser.add_argument('--no-cache', action='store_true', help='Disable the embedding cache')
+    embed_parser.add_argument('--backend', choices=['openai', 'local'],
+                              help='Embedding backend (default: EMBEDDING_BACKEND or openai)')
+    embed_parser.add_argument('--stub', action='store_true', help='Use the deterministic stub model (no network, no model files)')
+    embed_parser.add_argument('--stub-latency', type=float, default=0.0, help='Simulated seconds per stub request')
+    embed_parser.add_argument('--benchmark', type=int, metavar='N', help='Embed N synthetic texts offline and report throughput')
+    embed_parser.set_defaults(func=command_embed)
+
+    # Incremental sync command
+    sync_parser = subparsers.add_parser('sync', help='Push new and changed cases to the graph')
+    sync_parser.add_argument('--sqlite', help='Indian Kanoon SQLite database path')
+    sync_parser.add_argument('--postgres', help='PostgreSQL DSN of the case corpus (needs migration 015)')
+    sync_parser.add_argument('--interval', type=float, help='Keep syncing every N seconds')
+    sync_parser.add_argument('--batch-size', type=int, default=500, help='Cases per Neo4j transaction')
+    sync_parser.add_argument('--page-size', type=int, default=1000, help='Changes read per round')
+    sync_parser.add_argument('--settle', type=float, default=60,
+                             help='Seconds to wait on a change log gap before skipping it')
+    sync_parser.set_defaults(func=command_sync)
+
+    # Precomputed metrics command
+    metrics_parser = subparsers.add_parser('metrics', help='Precompute counts, citation degree, authority and court aggregates')
+    metrics_parser.add_argument('--postgres', help='Also write them to this PostgreSQL DSN (needs migration 016)')
+    metrics_parser.add_argument('--batch-size', type=int, default=500, help='Nodes per Neo4j transaction')
+    metrics_parser.set_defaults(func=command_metrics)
+
+    # Hierarchical chunking command
+    chunk_parser = subparsers.add_parser('chunk', help='Write hierarchical chunks to document_chunks')
+    chunk_parser.add_argument('--postgres', required=True, help='PostgreSQL DSN (needs migration 017)')
+    chunk_parser.add_argument('--limit', type=int, default=1000, help='Documents per run')
+    chunk_parser.add_argument('--max-tokens', type=int, default=512, help='Token budget per paragraph chunk')
+    chunk_parser.add_argument('--context-chars', type=int, default=200,
+                              help='Neighbouring characters stored with each paragraph')
+    chunk_parser.set_defaults(func=command_chunk)
+
     args = parser.parse_args()
 
     if not args.command:
@@ -4,16 +4,17 @@ LLM-Powered Entity Extraction for Legal Knowledge Graph
 Uses GPT-4 or Gemini to intelligently extract legal entities and relationships
 from PDFs, text files, and databases.
 """
-import os
 import json
-import re
-import requests
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 from pathlib import Path
 import logging
 from dotenv import load_dotenv
 
+from utils.chunker import iter_chunks, join_pages
+from utils.llm_providers import Completion, LLMProvider, create_provider
+from utils.extraction_executor import ExtractionExecutor, ExtractionStats, ExtractionTask, ResponseCache
+
 # Load environment
 load_dotenv()
 
@@ -21,20 +22,15 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Try to import LLM clients
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    logger.warning("OpenAI not available. Install with: pip install openai")
+# Bump when an extraction prompt changes; cached responses are keyed by it
+PROMPT_TEMPLATE_VERSION = "1"
+
 
-try:
-    import google.generativeai as genai
-    GENAI_AVAILABLE = True
-except ImportError:
-    GENAI_AVAILABLE = False
-    logger.warning("Google GenAI not available. Install with: pip install google-generativeai")
+def _is_json_object(text: str) -> bool:
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
 
 
 class LLMExtractor:
@@ -45,57 +41,44 @@ class LLMExtractor:
     - Intelligent entity recognition
     - Relationship extraction
     - Structured JSON output
-    - Batch processing
+    - Concurrent batch processing with a persistent response cache
+    - Token and cost accounting (see self.stats)
     - Error handling
     """
 
-    def __init__(self, model: str = "gpt-4", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: str = "gpt-4",
+        api_key: Optional[str] = None,
+        provider: Optional[LLMProvider] = None,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        replay: bool = False
+    ):
         """
         Initialize LLM extractor
 
         Args:
-            model: Model name ('gpt-4', 'gpt-4-turbo', 'gemini-2.5-pro')
+            model: Model name ('gpt-4', 'gpt-4-turbo', 'gemini-2.5-pro', 'fake')
             api_key: API key (or from environment)
+            provider: LLM provider (default: built from model)
+            cache: Response cache (None disables caching)
+            max_concurrency: Requests in flight (default: the provider's)
+            replay: Serve responses from the cache only
         """
-        self.model = model
-
-        if "gpt" in model.lower():
-            if not OPENAI_AVAILABLE:
-                raise ImportError("OpenAI package not installed")
-
-            api_key = api_key or os.getenv("OPENAI_API_KEY")
-            if not api_key:
-                raise ValueError("OPENAI_API_KEY not found in environment")
-
-            self.client = OpenAI(api_key=api_key)
-            self.provider = "openai"
-
-        elif "gemini" in model.lower():
-            # Check for Vertex AI Express key first (preferred)
-            vertex_key = os.getenv("VERTEX_AI_EXPRESS_KEY")
-            google_key = api_key or os.getenv("GOOGLE_API_KEY")
-
-            if vertex_key:
-                # Use Vertex AI Express REST API
-                self.api_key = vertex_key
-                self.provider = "vertex-express"
-                self.client = None
-                logger.info("Using Vertex AI Express API")
-            elif google_key:
-                # Use standard Google GenAI
-                if not GENAI_AVAILABLE:
-                    raise ImportError("Google GenAI package not installed")
-                genai.configure(api_key=google_key)
-                self.client = genai.GenerativeModel(model)
-                self.provider = "gemini"
-                logger.info("Using Google GenAI API")
-            else:
-                raise ValueError("GOOGLE_API_KEY or VERTEX_AI_EXPRESS_KEY not found in environment")
-
-        else:
-            raise ValueError(f"Unsupported model: {model}")
-
-        logger.info(f"Initialized LLM extractor with {model}")
+        self.llm = provider or create_provider(model, api_key)
+        self.model = self.llm.model
+        self.provider = self.llm.name
+        self.executor = ExtractionExecutor(
+            self.llm, cache, max_concurrency=max_concurrency, replay=replay, validate=_is_json_object
+        )
+
+        logger.info(f"Initialized LLM extractor with {self.model}{' (replay)' if replay else ''}")
+
+    @property
+    def stats(self) -> ExtractionStats:
+        """Requests, cache hits, tokens and cost so far"""
+        return self.executor.stats
 
     def extract_legal_entities(self, text: str, context: str = "legal case") -> Dict[str, Any]:
         """
@@ -108,97 +91,34 @@ class LLMExtractor:
         Returns:
             Dictionary with extracted entities
         """
-        prompt = self._create_extraction_prompt(text, context)
+        return self.extract_many([text], context)[0]
+
+    def extract_many(self, texts: List[str], context: str = "legal case") -> List[Dict[str, Any]]:
+        """
+        Extract legal entities from several texts concurrently
 
+        Args:
+            texts: Input texts
+            context: Context type ('legal case', 'statute', 'order')
+
+        Returns:
+            One result dictionary per text, in order
+        """
+        version = f"{PROMPT_TEMPLATE_VERSION}:{context}"
+        tasks = [ExtractionTask(text, self._create_extraction_prompt(text, context), version) for text in texts]
+        return [self._parse_response(completion) for completion in self.executor.run(tasks)]
+
+    def _parse_response(self, completion: Optional[Completion]) -> Dict[str, Any]:
+        if completion is None:
+            return {"entities": [], "relationships": [], "error": "no response"}
         try:
-            if self.provider == "openai":
-                response = self.client.chat.completions.create(
-                    model=self.model,
-                    messages=[
-                        {"role": "system", "content": "You are a legal text analysis expert. Extract structured information from legal documents."},
-                        {"role": "user", "content": prompt}
-                    ],
-                    response_format={"type": "json_object"},
-                    temperature=0.1,
-                    max_tokens=4000
-                )
-                result_text = response.choices[0].message.content
-
-            elif self.provider == "vertex-express":
-                # Use Vertex AI Express REST API
-                result_text = self._call_vertex_express(prompt)
-
-            else:  # gemini standard
-                response = self.client.generate_content(
-                    prompt,
-                    generation_config=genai.types.GenerationConfig(
-                        temperature=0.1,
-                        max_output_tokens=4000
-                    )
-                )
-                result_text = response.text
-
-            # Parse JSON
-            result = json.loads(result_text)
+            result = json.loads(completion.text)
             logger.debug(f"Extracted {len(result.get('entities', []))} entities")
-
             return result
-
         except Exception as e:
             logger.error(f"LLM extraction failed: {str(e)}")
             return {"entities": [], "relationships": [], "error": str(e)}
 
-    def _call_vertex_express(self, prompt: str) -> str:
-        """Call Vertex AI Express API"""
-        url = f"https://aiplatform.googleapis.com/v1/publishers/google/models/{self.model}:generateContent"
-
-        headers = {
-            "Content-Type": "application/json"
-        }
-
-        params = {
-            "key": self.api_key
-        }
-
-        payload = {
-            "contents": [{
-                "role": "user",
-                "parts": [{"text": prompt}]
-            }],
-            "generationConfig": {
-                "temperature": 0.1,
-                "maxOutputTokens": 4000,
-            }
-        }
-
-        response = requests.post(
-            url,
-            params=params,
-            headers=headers,
-            json=payload,
-            timeout=120
-        )
-        response.raise_for_status()
-
-        result = response.json()
-
-        # Extract text from response
-        if "candidates" in result and len(result["candidates"]) > 0:
-            candidate = result["candidates"][0]
-            if "content" in candidate and "parts" in candidate["content"]:
-                text = candidate["content"]["parts"][0].get("text", "")
-                # Clean markdown code blocks if present
-                text = text.strip()
-                if text.startswith("```json"):
-                    text = text[7:]
-                if text.startswith("```"):
-                    text = text[3:]
-                if text.endswith("```"):
-                    text = text[:-3]
-                return text.strip()
-
-        raise ValueError("No valid response from Vertex AI Express")
-
     def _create_extraction_prompt(self, text: str, context: str) -> str:
         """Create extraction prompt based on context"""
 
@@ -340,22 +260,17 @@ Return ONLY valid JSON, no markdown or explanation.
         logger.info(f"Processing PDF: {pdf_path}")
 
         doc = fitz.open(pdf_path)
-        full_text = ""
-
-        for page in doc:
-            full_text += page.get_text()
-
+        full_text, _ = join_pages(page.get_text() for page in doc)
         doc.close()
 
         # Split into chunks if too long
-        chunks = self._split_text(full_text, max_length=8000)
+        chunks = self._split_text(full_text, max_tokens=2000)
 
-        cases = []
-        for idx, chunk in enumerate(chunks):
-            logger.info(f"Processing chunk {idx + 1}/{len(chunks)}")
-
-            result = self.extract_legal_entities(chunk, context="legal case")
+        logger.info(f"Extracting {len(chunks)} chunks")
+        results = self.extract_many(chunks, context="legal case")
 
+        cases = []
+        for result in results:
             if "case" in result and result["case"]:
                 # Merge entities
                 case_data = result["case"]
@@ -412,60 +327,57 @@ Return ONLY valid JSON, no markdown or explanation.
         Returns:
             Enhanced case data
         """
-        full_text = case_record.get("full_text", "")
-        title = case_record.get("title", "")
-
-        if not full_text:
-            logger.warning(f"No full text for case: {title}")
-            return case_record
-
-        # Create combined text
-        text = f"Title: {title}\n\n{full_text[:8000]}"
-
-        result = self.extract_legal_entities(text, context="legal case")
-
-        # Merge with existing data
-        enhanced = case_record.copy()
-
-        if "case" in result:
-            # Add/update fields from LLM extraction
-            enhanced.update({
-                "llm_summary": result["case"].get("summary"),
-                "llm_facts": result["case"].get("facts"),
-                "llm_holding": result["case"].get("holding"),
-                "llm_reasoning": result["case"].get("reasoning"),
-                "llm_judges": result.get("judges", []),
-                "llm_sections": result.get("sections", []),
-                "llm_principles": result.get("principles", []),
-                "llm_citations": result.get("citations", []),
-                "llm_topics": result.get("topics", []),
-                "extracted_at": datetime.now().isoformat(),
-                "extracted_by": "llm_extractor",
-                "confidence_score": 0.80
-            })
-
-        return enhanced
-
-    def _split_text(self, text: str, max_length: int = 8000) -> List[str]:
-        """Split text into chunks"""
-        chunks = []
-        current_chunk = ""
-
-        # Split by paragraphs
-        paragraphs = text.split('\n\n')
-
-        for para in paragraphs:
-            if len(current_chunk) + len(para) > max_length:
-                if current_chunk:
-                    chunks.append(current_chunk)
-                current_chunk = para
-            else:
-                current_chunk += "\n\n" + para
-
-        if current_chunk:
-            chunks.append(current_chunk)
-
-        return chunks if chunks else [text[:max_length]]
+        return self.extract_from_database_cases([case_record])[0]
+
+    def extract_from_database_cases(self, case_records: List[Dict]) -> List[Dict]:
+        """
+        Extract enhanced entities for many database cases concurrently
+
+        Args:
+            case_records: Case records from database
+
+        Returns:
+            Enhanced case data, one per record (unchanged where there is no full text)
+        """
+        enhanced_cases = [record.copy() for record in case_records]
+        texts, targets = [], []
+
+        for enhanced in enhanced_cases:
+            full_text = enhanced.get("full_text", "")
+            title = enhanced.get("title", "")
+
+            if not full_text:
+                logger.warning(f"No full text for case: {title}")
+                continue
+
+            # Create combined text
+            texts.append(f"Title: {title}\n\n{full_text[:8000]}")
+            targets.append(enhanced)
+
+        for enhanced, result in zip(targets, self.extract_many(texts, context="legal case")):
+            if "case" in result:
+                # Add/update fields from LLM extraction
+                enhanced.update({
+                    "llm_summary": result["case"].get("summary"),
+                    "llm_facts": result["case"].get("facts"),
+                    "llm_holding": result["case"].get("holding"),
+                    "llm_reasoning": result["case"].get("reasoning"),
+                    "llm_judges": result.get("judges", []),
+                    "llm_sections": result.get("sections", []),
+                    "llm_principles": result.get("principles", []),
+                    "llm_citations": result.get("citations", []),
+                    "llm_topics": result.get("topics", []),
+                    "extracted_at": datetime.now().isoformat(),
+                    "extracted_by": "llm_extractor",
+                    "confidence_score": 0.80
+                })
+
+        return enhanced_cases
+
+    def _split_text(self, text: str, max_tokens: int = 2000) -> List[str]:
+        """Split text into chunks of at most max_tokens, at section and paragraph boundaries"""
+        chunks = [chunk.text for chunk in iter_chunks(text, max_tokens=max_tokens, overlap_tokens=0)]
+        return chunks if chunks else [text]
 
 
 # Convenience functions
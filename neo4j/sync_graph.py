@@ -0,0 +1,401 @@
+"""
+Incremental Knowledge Graph Sync from the Case Databases
+
+Pushes only new or modified cases (and their judges, courts, parties and
+sections) to Neo4j instead of re-reading every case with a LIMIT:
+
+- PostgreSQL: reads graph_change_log (data-collection migration 015) past
+  the last log id applied, so edits to judges, parties, sections or content
+  re-sync their case and deleted documents remove their Case node.
+- SQLite (Indian Kanoon): the same kind of log, filled by triggers on
+  legal_cases that the source installs on first use. Scrapers fill in
+  full_text after inserting a case, so a case without text is picked up
+  again when its text arrives.
+
+Cases are keyed by their source row (indian_case_<id>, document_<id>), so a
+title edit updates the existing Case node.
+
+Each source's watermark is recorded on a (:SyncState {source}) node after
+every batch. A batch may be applied twice after a crash; every write is a
+MERGE, so that is harmless.
+
+Usage:
+    python sync_graph.py --postgres "$DATABASE_URL"
+    python sync_graph.py --sqlite ../data-collection/data/indiankanoon.db --interval 300
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import argparse
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+from build_offline import POSTGRES_CASES_SELECT, postgres_case, postgres_case_id, sqlite_case, sqlite_case_id
+from utils.case_rows import CASE_STATEMENTS, case_rows
+from utils.graph_loader import GraphBatchLoader, UnwindStatement, DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 1000
+DEFAULT_SETTLE_SECONDS = 60
+
+# SQLite change log, installed by SQLiteChangeSource; existing rows are logged once
+SQLITE_CHANGE_LOG = """
+    CREATE TABLE graph_change_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        case_id INTEGER NOT NULL,
+        operation TEXT NOT NULL CHECK (operation IN ('I', 'U', 'D')),
+        changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    );
+
+    CREATE TRIGGER legal_cases_graph_insert AFTER INSERT ON legal_cases
+    BEGIN
+        INSERT INTO graph_change_log (case_id, operation) VALUES (NEW.id, 'I');
+    END;
+
+    -- Only the columns sqlite_case reads
+    CREATE TRIGGER legal_cases_graph_update
+    AFTER UPDATE OF title, citation, court, court_name, court_type, case_date, year, snippet, full_text
+    ON legal_cases
+    BEGIN
+        INSERT INTO graph_change_log (case_id, operation) VALUES (NEW.id, 'U');
+    END;
+
+    CREATE TRIGGER legal_cases_graph_delete AFTER DELETE ON legal_cases
+    BEGIN
+        INSERT INTO graph_change_log (case_id, operation) VALUES (OLD.id, 'D');
+    END;
+
+    INSERT INTO graph_change_log (case_id, operation) SELECT id, 'I' FROM legal_cases ORDER BY id;
+"""
+
+# Relationships rebuilt from the database on every sync of a case; LLM-only
+# relationships (ESTABLISHES, CITES, ...) are left alone
+DATABASE_RELATIONSHIPS = ("DECIDED_BY", "BEFORE_COURT", "PETITIONER", "RESPONDENT", "APPLIES_SECTION")
+
+CLEAR_CASE_LINKS = UnwindStatement("case_links", f"""
+    MATCH (c:Case {{case_id: row.case_id}})-[r:{'|'.join(DATABASE_RELATIONSHIPS)}]->()
+    DELETE r
+""")
+
+DELETE_CASES = UnwindStatement("deleted_cases", """
+    MATCH (c:Case {case_id: row.case_id})
+    DETACH DELETE c
+""")
+
+SYNC_STATEMENTS = [CLEAR_CASE_LINKS] + CASE_STATEMENTS
+
+
+@dataclass
+class ChangeBatch:
+    """Cases to upsert and case IDs to delete, up to a new watermark"""
+    watermark: int
+    cases: List[Dict] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SyncState:
+    """Progress of one source, stored on its :SyncState node"""
+    source: str
+    watermark: int = 0
+    cases: int = 0
+    deleted: int = 0
+    synced_at: Optional[str] = None
+
+
+@dataclass
+class SyncResult:
+    """Counts for one sync() pass"""
+    source: str
+    watermark: int
+    batches: int = 0
+    cases: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+
+
+class SQLiteChangeSource:
+    """Changed legal_cases rows, from the database's graph_change_log"""
+
+    CHANGES_QUERY = "SELECT id, case_id FROM graph_change_log WHERE id > ? ORDER BY id LIMIT ?"
+
+    # json_each keeps a page of ids to one bound parameter
+    CASES_QUERY = "SELECT * FROM legal_cases WHERE id IN (SELECT value FROM json_each(?)) ORDER BY id"
+
+    def __init__(self, db_path: str):
+        self.name = f"sqlite:{Path(db_path).name}"
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self._install_change_log()
+
+    def _install_change_log(self) -> None:
+        installed = self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'graph_change_log'"
+        ).fetchone()
+        if not installed:
+            # One write transaction: no row is inserted between the backfill and the triggers
+            self.conn.executescript(f"BEGIN IMMEDIATE; {SQLITE_CHANGE_LOG} COMMIT;")
+            logger.info(f"Installed graph_change_log in {self.name}")
+
+    def changes(self, watermark: int, limit: int) -> ChangeBatch:
+        entries = self.conn.execute(self.CHANGES_QUERY, (watermark, limit)).fetchall()
+        if not entries:
+            return ChangeBatch(watermark)
+
+        row_ids = sorted({entry["case_id"] for entry in entries})
+        rows = self.conn.execute(self.CASES_QUERY, (json.dumps(row_ids),)).fetchall()
+
+        present = {row["id"] for row in rows}
+        # Rows without text yet are logged again when the scraper fills it in
+        cases = [sqlite_case(dict(row)) for row in rows if row["full_text"]]
+        deleted = [sqlite_case_id(row_id) for row_id in row_ids if row_id not in present]
+        return ChangeBatch(entries[-1]["id"], cases, deleted)
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class PostgresChangeSource:
+    """
+    Changed case documents, from graph_change_log
+
+    Log ids are assigned when a change is written but become visible when
+    its transaction commits, so a missing id may still be in flight. Reading
+    stops before a gap until the gap itself has been open for settle_seconds
+    (timed from the first pass that saw it, however old the entries after
+    it are) and resumes there on the next pass; older gaps are rolled-back
+    writes.
+    """
+
+    CHANGES_QUERY = """
+        SELECT id, document_id, source_table
+        FROM graph_change_log
+        WHERE id > %s
+        ORDER BY id
+        LIMIT %s
+    """
+
+    CASES_QUERY = POSTGRES_CASES_SELECT + """
+        WHERE d.doc_type = 'CAS' AND d.id = ANY(%s)
+        ORDER BY d.id
+    """
+
+    def __init__(self, dsn: str, settle_seconds: float = DEFAULT_SETTLE_SECONDS):
+        try:
+            import psycopg2
+            import psycopg2.extras
+        except ImportError:
+            raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+        self.name = "postgres"
+        self.settle_seconds = settle_seconds
+        self.conn = psycopg2.connect(dsn)
+        self.conn.autocommit = True
+        self._cursor_factory = psycopg2.extras.RealDictCursor
+        # First missing log id of each open gap -> when a pass first saw it
+        self._gaps: Dict[int, float] = {}
+
+    def changes(self, watermark: int, limit: int) -> ChangeBatch:
+        with self.conn.cursor(cursor_factory=self._cursor_factory) as cursor:
+            cursor.execute(self.CHANGES_QUERY, (watermark, limit))
+            entries = []
+            expected = watermark + 1
+            for entry in cursor.fetchall():
+                if entry["id"] != expected and not self._gap_settled(expected):
+                    break
+                entries.append(entry)
+                expected = entry["id"] + 1
+
+            if not entries:
+                return ChangeBatch(watermark)
+
+            document_ids = sorted({entry["document_id"] for entry in entries})
+            cursor.execute(self.CASES_QUERY, (document_ids,))
+            records = cursor.fetchall()
+
+        watermark = entries[-1]["id"]
+        self._gaps = {log_id: seen for log_id, seen in self._gaps.items() if log_id > watermark}
+
+        # Deleted documents, and documents that are no longer cases
+        present = {record["id"] for record in records}
+        deleted = {
+            postgres_case_id(entry["document_id"])
+            for entry in entries
+            if entry["source_table"] == "documents" and entry["document_id"] not in present
+        }
+        return ChangeBatch(watermark, [postgres_case(record) for record in records], sorted(deleted))
+
+    def _gap_settled(self, log_id: int) -> bool:
+        """Whether the gap starting at log_id has been open for settle_seconds"""
+        now = time.monotonic()
+        first_seen = self._gaps.setdefault(log_id, now)
+        return now - first_seen >= self.settle_seconds
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class GraphSync:
+    """
+    Apply source changes to the graph in batches
+
+    Example:
+        sync = GraphSync(driver, database="neo4j")
+        result = sync.sync(PostgresChangeSource(dsn))
+    """
+
+    def __init__(
+        self,
+        driver,
+        database: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        page_size: int = DEFAULT_PAGE_SIZE
+    ):
+        """
+        Args:
+            driver: Neo4j driver
+            database: Database name (None for the server default)
+            batch_size: Cases per write transaction
+            page_size: Changes read from the source per round (one state update each)
+        """
+        self.driver = driver
+        self.database = database
+        self.page_size = page_size
+        self.loader = GraphBatchLoader(driver, database=database, batch_size=batch_size)
+
+    def load_state(self, source: str) -> SyncState:
+        with self.driver.session(database=self.database) as session:
+            record = session.execute_read(self._read_state, source)
+        return SyncState(source, **record) if record else SyncState(source)
+
+    def save_state(self, state: SyncState) -> None:
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self._write_state, state)
+
+    @staticmethod
+    def _read_state(tx, source: str) -> Optional[Dict]:
+        record = tx.run("""
+            MATCH (s:SyncState {source: $source})
+            RETURN s.watermark AS watermark, s.cases AS cases,
+                   s.deleted AS deleted, s.synced_at AS synced_at
+        """, source=source).single()
+        return dict(record) if record else None
+
+    @staticmethod
+    def _write_state(tx, state: SyncState) -> None:
+        tx.run("""
+            MERGE (s:SyncState {source: $source})
+            SET s.watermark = $watermark, s.cases = $cases,
+                s.deleted = $deleted, s.synced_at = $synced_at
+        """, source=state.source, watermark=state.watermark, cases=state.cases,
+               deleted=state.deleted, synced_at=state.synced_at).consume()
+
+    def sync(self, source, max_batches: Optional[int] = None) -> SyncResult:
+        """
+        Apply every change past the source's watermark
+
+        Args:
+            source: SQLiteChangeSource or PostgresChangeSource
+            max_batches: Stop after this many pages (None: until caught up)
+
+        Returns:
+            SyncResult
+        """
+        state = self.load_state(source.name)
+        result = SyncResult(source.name, state.watermark)
+        started = time.time()
+
+        while max_batches is None or result.batches < max_batches:
+            batch = source.changes(state.watermark, self.page_size)
+            if batch.watermark == state.watermark:
+                break
+
+            if batch.cases:
+                self.loader.load(batch.cases, self._rows, SYNC_STATEMENTS)
+            if batch.deleted:
+                self.loader.load_rows(DELETE_CASES, [{"case_id": case_id} for case_id in batch.deleted])
+
+            state.watermark = batch.watermark
+            state.cases += len(batch.cases)
+            state.deleted += len(batch.deleted)
+            state.synced_at = datetime.now().isoformat()
+            self.save_state(state)
+
+            result.batches += 1
+            result.cases += len(batch.cases)
+            result.deleted += len(batch.deleted)
+            result.watermark = batch.watermark
+
+        result.seconds = time.time() - started
+        logger.info(
+            f"Synced {source.name}: {result.cases} cases, {result.deleted} deleted "
+            f"in {result.batches} batches, watermark {result.watermark} ({result.seconds:.1f}s)"
+        )
+        return result
+
+    def run(self, sources: Sequence, interval: float) -> None:
+        """Sync every source, then again every `interval` seconds until interrupted"""
+        try:
+            while True:
+                for source in sources:
+                    self.sync(source)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            logger.info("Sync stopped")
+
+    @staticmethod
+    def _rows(case: Dict) -> Dict[str, List[Dict]]:
+        rows = case_rows(case)
+        rows[CLEAR_CASE_LINKS.name] = [{"case_id": rows["cases"][0]["case_id"]}]
+        return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Push new and changed cases to the knowledge graph")
+    parser.add_argument("--sqlite", help="Indian Kanoon SQLite database")
+    parser.add_argument("--postgres", help="PostgreSQL DSN of the case corpus (needs migration 015)")
+    parser.add_argument("--interval", type=float, help="Keep syncing every N seconds")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Cases per transaction")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="Changes per round")
+    parser.add_argument("--settle", type=float, default=DEFAULT_SETTLE_SECONDS,
+                        help="Seconds to wait on a change log gap before skipping it")
+    args = parser.parse_args()
+
+    if not (args.sqlite or args.postgres):
+        parser.error("give --sqlite and/or --postgres")
+
+    logging.basicConfig(level=logging.INFO)
+    load_dotenv()
+
+    sources = []
+    if args.sqlite:
+        sources.append(SQLiteChangeSource(args.sqlite))
+    if args.postgres:
+        sources.append(PostgresChangeSource(args.postgres, settle_seconds=args.settle))
+
+    driver = GraphDatabase.driver(
+        os.getenv("NEO4J_URL"), auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+    )
+    sync = GraphSync(driver, os.getenv("NEO4J_DATABASE", "neo4j"), args.batch_size, args.page_size)
+    try:
+        if args.interval:
+            sync.run(sources, args.interval)
+        else:
+            for source in sources:
+                sync.sync(source)
+    finally:
+        for source in sources:
+            source.close()
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
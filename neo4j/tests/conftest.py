@@ -4,6 +4,7 @@ Pytest configuration and fixtures for Neo4j Legal Knowledge Graph tests
 import pytest
 import os
 import json
+import importlib.util
 from pathlib import Path
 from unittest.mock import Mock, MagicMock
 from typing import Dict, Any
@@ -217,6 +218,38 @@ def neo4j_connection():
         pytest.skip(f"Neo4j not available for integration tests: {str(e)}")
 
 
+# PostgreSQL scratch databases built from the data-collection migrations
+def _load_postgres_fixtures():
+    path = Path(__file__).resolve().parents[2] / "data-collection" / "tests" / "fixtures.py"
+    spec = importlib.util.spec_from_file_location("data_collection_fixtures", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_postgres_fixtures = _load_postgres_fixtures()
+postgres_server_url = _postgres_fixtures.postgres_server_url
+
+
+@pytest.fixture
+def postgres_database(postgres_server_url):
+    """
+    Create scratch databases with the given migrations applied
+    Call with a list of data-collection migration files; returns the DSN.
+    Databases are dropped after the test.
+    """
+    created = []
+
+    def create(migrations):
+        name = f"neo4j_test_{len(created)}"
+        created.append(name)
+        return _postgres_fixtures.create_migrated_database(postgres_server_url, name, migrations)
+
+    yield create
+    for name in created:
+        _postgres_fixtures.drop_database(postgres_server_url, name)
+
+
 # Skip markers for tests that require external services
 def pytest_configure(config):
     """Configure custom markers"""
@@ -0,0 +1,135 @@
+"""
+Unit tests for the offline neo4j-admin import writer
+"""
+import csv
+import sqlite3
+
+import pytest
+
+from utils.bulk_import import BulkImportWriter, SchemaCatalog, coerce
+from utils.case_rows import generate_id
+from build_offline import iter_sqlite_cases
+
+
+CASE = {
+    "title": "Ram Kumar vs State of Delhi on 12 March, 2020",
+    "citation": "AIR 2020 SC 1",
+    "year": "2020",
+    "court": "Supreme Court of India",
+    "case_type": "CRIMINAL",
+    "judges": ["A. Sharma", {"name": "B. Rao", "title": "Chief Justice"}],
+    "parties": {"petitioners": ["Ram Kumar"], "respondents": ["State of Delhi"]},
+    "sections": ["Section 10"],
+    "authority_level": "Unknown",
+}
+
+
+def read_csv(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+@pytest.fixture(scope="module")
+def schema():
+    return SchemaCatalog()
+
+
+@pytest.mark.unit
+def test_schema_catalog_reads_both_layouts(schema):
+    assert schema.node("Case").id_property == "case_id"
+    assert schema.node("Court").id_property == "court_id"
+    assert schema.node("Party").properties["confidence_score"] == "float"
+    assert schema.relationship("DECIDED_BY")["created_at"] == "datetime"
+
+
+@pytest.mark.unit
+def test_headers_typed_from_schema(tmp_path, schema):
+    with BulkImportWriter(str(tmp_path), schema) as writer:
+        writer.write_case(CASE)
+
+    case_header = read_csv(tmp_path / "nodes_Case.csv")[0]
+    assert case_header[0] == "case_id:ID(Case)"
+    assert "confidence_score:double" in case_header
+    assert "case_type:string[]" in case_header
+    assert "created_at:datetime" in case_header
+    assert "year:long" in case_header
+
+    rel_header = read_csv(tmp_path / "rels_PETITIONER.csv")[0]
+    assert rel_header == [":START_ID(Case)", ":END_ID(Party)", "party_role", "created_at:datetime"]
+
+
+@pytest.mark.unit
+def test_nodes_and_relationships_deduplicated(tmp_path, schema):
+    other = dict(CASE, title="Second case", judges=["A. Sharma"], sections=["Section 10"])
+    with BulkImportWriter(str(tmp_path), schema) as writer:
+        writer.write_cases([CASE, other, CASE])
+
+    judges = read_csv(tmp_path / "nodes_Judge.csv")[1:]
+    assert sorted(row[0] for row in judges) == sorted([generate_id("A. Sharma"), generate_id("B. Rao")])
+    assert len(read_csv(tmp_path / "nodes_Case.csv")) == 3
+    assert len(read_csv(tmp_path / "rels_DECIDED_BY.csv")) == 4
+    assert writer.report.duplicate_relationships > 0
+    assert writer.report.nodes["Party"] == 2
+
+
+@pytest.mark.unit
+def test_uncoercible_values_dropped_and_counted(tmp_path, schema):
+    with BulkImportWriter(str(tmp_path), schema) as writer:
+        writer.write_case(CASE)
+
+    header, row = read_csv(tmp_path / "nodes_Case.csv")
+    values = dict(zip(header, row))
+    assert values["authority_level:long"] == ""
+    assert values["year:long"] == "2020"
+    assert values["case_type:string[]"] == "CRIMINAL"
+    assert writer.report.dropped_values == {"Case.authority_level": 1}
+
+
+@pytest.mark.unit
+def test_import_script_lists_all_files(tmp_path, schema):
+    with BulkImportWriter(str(tmp_path), schema, database="graph") as writer:
+        writer.write_case(CASE)
+
+    script = (tmp_path / "import.sh").read_text()
+    assert "--nodes=Party=nodes_Party.csv" in script
+    assert "--relationships=BEFORE_COURT=rels_BEFORE_COURT.csv" in script
+    assert script.rstrip().endswith("graph")
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("value,schema_type,expected", [
+    ("12 March, 2020", "date", "2020-03-12"),
+    ("2020-03-12T10:00:00", "date", "2020-03-12"),
+    ("yes", "boolean", None),
+    (["a;b", "c"], "string[]", "a,b;c"),
+    ([0.5, 1], "vector", "0.5;1.0"),
+    ("", "string", None),
+])
+def test_coerce(value, schema_type, expected):
+    assert coerce(value, schema_type) == expected
+
+
+@pytest.mark.unit
+def test_sqlite_source_streams_by_keyset(tmp_path):
+    db_path = tmp_path / "cases.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE legal_cases (id INTEGER PRIMARY KEY, title TEXT, court TEXT,
+                                  full_text TEXT, citation TEXT, year INTEGER)
+    """)
+    conn.executemany(
+        "INSERT INTO legal_cases VALUES (?, ?, 'Delhi High Court', ?, '', 2020)",
+        [(i, f"A{i} vs B{i} on 1 May, 2020", "Bench: X. Judge, Y. Judge\nSection 9 applies")
+         for i in range(1, 8)]
+    )
+    conn.execute("INSERT INTO legal_cases VALUES (8, 'No text', '', NULL, '', 2020)")
+    conn.commit()
+    conn.close()
+
+    cases = list(iter_sqlite_cases(str(db_path), fetch_size=3))
+    assert [case["id"] for case in cases] == list(range(1, 8))
+    assert cases[0]["judges"] == ["X. Judge", "Y. Judge"]
+    assert cases[0]["parties"] == {"petitioners": ["A1"], "respondents": ["B1"]}
+    assert cases[0]["sections"] == ["Section 9"]
+
+    assert len(list(iter_sqlite_cases(str(db_path), limit=5, fetch_size=2))) == 5
@@ -0,0 +1,90 @@
+"""
+Unit tests for bulk Chunk loading
+"""
+import pytest
+from unittest.mock import Mock
+
+from utils.chunk_loader import ChunkWriter, chunk_properties, chunk_statement
+from utils.embeddings_generator import Neo4jEmbeddingsLoader, TextChunk
+
+
+@pytest.fixture
+def driver(mock_neo4j_driver):
+    """Mock driver whose execute_write runs the work against the mock transaction"""
+    session = mock_neo4j_driver.session.return_value
+    tx = session.begin_transaction.return_value
+    session.execute_write = Mock(side_effect=lambda work, *args: work(tx, *args))
+    return mock_neo4j_driver
+
+
+def tx_calls(driver):
+    return driver.session.return_value.begin_transaction.return_value.run.call_args_list
+
+
+def make_chunk(i, source_type="case", embedding=(0.5, 1, 2), **metadata):
+    return TextChunk(
+        chunk_id=f"c{i}", text=f"chunk {i}", chunk_index=i, source_id="case-1",
+        source_type=source_type, metadata=metadata or {"start_pos": i * 10, "tokens": 5},
+        embedding=list(embedding) if embedding is not None else None
+    )
+
+
+@pytest.mark.unit
+class TestChunkWriter:
+    """Test ChunkWriter"""
+
+    def test_one_statement_per_source_type_per_batch(self, driver):
+        chunks = [make_chunk(i) for i in range(5)] + [make_chunk(5, "section"), make_chunk(6, "statute")]
+        writer = ChunkWriter(driver, dimension=3, batch_size=4)
+
+        stats = writer.write(chunks)
+
+        assert stats.batches == 2
+        assert stats.rows == {"case_chunks": 5, "section_chunks": 1, "other_chunks": 1}
+        # Batch 1: cases only; batch 2: case, section, statute
+        assert len(tx_calls(driver)) == 4
+        query, = tx_calls(driver)[0].args
+        assert "MERGE (ch:Chunk" in query and "MERGE (p)-[:HAS_CHUNK]->(ch)" in query
+        assert len(tx_calls(driver)[0].kwargs["rows"]) == 4
+
+    def test_rows_are_native_values(self, driver):
+        writer = ChunkWriter(driver, dimension=3)
+        chunk = make_chunk(0, section_title="Facts", pages=[1, 2], spans={"a": 1}, end_page=None)
+
+        row, = writer.rows(chunk)["case_chunks"]
+
+        assert row["embedding"] == [0.5, 1.0, 2.0]
+        assert all(isinstance(value, float) for value in row["embedding"])
+        assert row["properties"] == {"section_title": "Facts", "pages": [1, 2], "spans": '{"a": 1}'}
+
+    def test_wrong_dimension_is_rejected(self, driver):
+        writer = ChunkWriter(driver, dimension=4)
+        with pytest.raises(ValueError, match="4-dimension"):
+            writer.write([make_chunk(0)])
+        assert tx_calls(driver) == []
+
+    def test_missing_embedding_keeps_existing(self, driver):
+        row, = ChunkWriter(driver, dimension=3).rows(make_chunk(0, embedding=None))["case_chunks"]
+        assert row["embedding"] is None
+        assert "coalesce(row.embedding, ch.embedding)" in chunk_statement("case").query
+
+    def test_vector_procedure(self, driver):
+        ChunkWriter(driver, dimension=3, vector_procedure=True).write([make_chunk(0)])
+
+        query, = tx_calls(driver)[0].args
+        assert "db.create.setNodeVectorProperty(ch, 'embedding', row.embedding)" in query
+        assert "SET ch.embedding" not in query
+
+    def test_metadata_cannot_override_chunk_fields(self):
+        assert chunk_properties({"text": "x", "chunk_id": "y", "tokens": 3}) == {"tokens": 3}
+
+
+@pytest.mark.unit
+def test_embeddings_loader_uses_bulk_writer(driver):
+    loader = Neo4jEmbeddingsLoader(driver, dimension=3, database="neo4j")
+
+    stats = loader.load_chunks([make_chunk(i) for i in range(3)])
+
+    assert stats.loaded_records == 3
+    driver.session.assert_called_with(database="neo4j")
+    assert len(tx_calls(driver)) == 1
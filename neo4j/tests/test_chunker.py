@@ -0,0 +1,160 @@
+"""
+Unit tests for the offset-preserving chunker
+"""
+import time
+
+import pytest
+
+from utils.chunker import approximate_tokens, hierarchical_chunks, iter_chunks, join_pages
+from utils.embedding_backends import EmbeddingBackend
+from utils.embeddings_generator import EmbeddingsGenerator
+
+
+class LengthBackend(EmbeddingBackend):
+    model = "length"
+    dimension = 1
+
+    def embed(self, texts):
+        return [[float(len(text))] for text in texts]
+
+
+JUDGMENT_PAGES = [
+    "IN THE SUPREME COURT OF INDIA\n\nJUDGMENT\n\n"
+    "1. The appellant was convicted under Section 302. He appealed.\n\n"
+    "2. " + "The prosecution examined several witnesses at trial. " * 30,
+    "Section 302. Punishment for murder\n"
+    "Whoever commits murder shall be punished with death or imprisonment for life.\n\n"
+    "HELD:\nThe appeal is dismissed.",
+]
+
+
+def chunks_of(text, **kwargs):
+    kwargs.setdefault("tokenizer", approximate_tokens)
+    return list(iter_chunks(text, **kwargs))
+
+
+@pytest.mark.unit
+def test_offsets_slice_back_to_chunk_text():
+    text, offsets = join_pages(JUDGMENT_PAGES)
+    chunks = chunks_of(text, max_tokens=60, overlap_tokens=10, page_offsets=offsets)
+
+    assert len(chunks) > 3
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    for chunk in chunks:
+        assert text[chunk.start_char:chunk.end_char] == chunk.text
+        assert chunk.chunk_tokens == approximate_tokens(chunk.text) <= 60
+    assert chunks[-1].end_char == len(text)
+
+
+@pytest.mark.unit
+def test_pages_and_sections():
+    text, offsets = join_pages(JUDGMENT_PAGES)
+    chunks = chunks_of(text, max_tokens=60, overlap_tokens=0, page_offsets=offsets)
+
+    assert chunks[0].start_page == 1
+    assert chunks[-1].end_page == 2
+
+    murder = next(c for c in chunks if c.text.startswith("Section 302."))
+    assert murder.start_page == 2
+    assert (murder.section_number, murder.section_title) == ("302", "Punishment for murder")
+    assert chunks[-1].section_title == "HELD"
+
+    # Form feeds give the same pages without explicit offsets
+    assert [c.start_page for c in chunks_of(text, max_tokens=60, overlap_tokens=0)] == \
+        [c.start_page for c in chunks]
+
+
+@pytest.mark.unit
+def test_overlap_repeats_trailing_sentences():
+    text = " ".join(f"Sentence {i} is here." for i in range(60))
+    chunks = chunks_of(text, max_tokens=40, overlap_tokens=10)
+
+    assert len(chunks) > 1
+    for previous, chunk in zip(chunks, chunks[1:]):
+        assert previous.start_char < chunk.start_char < previous.end_char < chunk.end_char
+
+
+@pytest.mark.unit
+def test_document_chunk_columns():
+    chunk = chunks_of("Section 5. Definitions\nIn this Act, court means a civil court.")[0]
+    row = chunk.to_document_chunk()
+
+    assert row["start_char"] == 0 and row["end_char"] == row["chunk_chars"] == len(chunk.text)
+    assert row["chunk_tokens"] == chunk.chunk_tokens
+    assert row["chunk_words"] == 11
+    assert len(row["chunk_hash"]) == 16
+    assert row["section_number"] == "5"
+
+
+@pytest.mark.unit
+def test_generator_chunk_metadata_has_real_offsets():
+    generator = EmbeddingsGenerator(backend=LengthBackend())
+    text = "First paragraph of the order.\n\n   Second   paragraph, oddly spaced.  "
+
+    chunks = generator.chunk_text(text, chunk_size=12, overlap=0, source_id="case1")
+
+    assert [c.text for c in chunks] == ["First paragraph of the order.", "Second   paragraph, oddly spaced."]
+    for chunk in chunks:
+        assert text[chunk.metadata["start_pos"]:chunk.metadata["end_pos"]] == chunk.text
+
+
+@pytest.mark.unit
+def test_large_document_is_linear():
+    paragraph = "The court considered the submissions of counsel at length. " * 8
+    text = "\n\n".join(f"{i}. {paragraph}" for i in range(800))
+    assert len(text) > 350_000
+
+    started = time.time()
+    chunks = chunks_of(text, max_tokens=512, overlap_tokens=50)
+    elapsed = time.time() - started
+
+    assert chunks[-1].end_char == len(text.rstrip())
+    assert elapsed < 5
+
+
+@pytest.mark.unit
+def test_hierarchical_chunks_tree():
+    text, offsets = join_pages(JUDGMENT_PAGES)
+    chunks = hierarchical_chunks(text, max_tokens=60, context_chars=40, page_offsets=offsets,
+                                 tokenizer=approximate_tokens)
+
+    document = chunks[0]
+    assert (document.chunk_level, document.chunk_depth, document.parent_index) == ("document", 0, None)
+    assert [c.chunk_index for c in chunks] == list(range(len(chunks)))
+    for chunk in chunks[1:]:
+        parent = chunks[chunk.parent_index]
+        assert parent.chunk_index < chunk.chunk_index and chunk.chunk_depth == parent.chunk_depth + 1
+        assert parent.start_char <= chunk.start_char < chunk.end_char <= parent.end_char
+        assert text[chunk.start_char:chunk.end_char] == chunk.text
+    for chunk in chunks:
+        assert chunk.child_count == sum(1 for c in chunks if c.parent_index == chunk.chunk_index)
+
+    # leaves tile the text without overlap, as iter_chunks without overlap would
+    leaves = [c for c in chunks if c.is_leaf]
+    assert all(c.chunk_level == "paragraph" for c in leaves)
+    assert [(c.start_char, c.end_char) for c in leaves] == \
+        [(c.start_char, c.end_char) for c in chunks_of(text, max_tokens=60, overlap_tokens=0)]
+
+    judgment = next(c for c in chunks if c.chunk_level == "section")
+    assert judgment.section_title == "JUDGMENT" and judgment.child_count > 1
+    # one-paragraph sections are not repeated as section chunks
+    held = next(c for c in chunks if c.section_title == "HELD")
+    assert held.is_leaf and held.parent_index == 0
+
+
+@pytest.mark.unit
+def test_hierarchical_leaf_context_and_columns():
+    text = "\n\n".join(f"{i}. " + f"Paragraph {i} discusses the evidence. " * 6 for i in range(1, 6))
+    chunks = hierarchical_chunks(text, max_tokens=50, context_chars=30, tokenizer=approximate_tokens)
+
+    assert chunks[0].chunk_level == "document" and all(c.parent_index == 0 for c in chunks[1:])
+    second = chunks[2]
+    assert second.context_before and text[:second.start_char].rstrip().endswith(second.context_before)
+    assert second.context_after and text[second.end_char:].lstrip().startswith(second.context_after)
+    assert len(second.context_before) <= 30 and not second.context_before.startswith("vidence")
+    assert chunks[1].context_before is None and chunks[-1].context_after is None
+
+    row = second.to_document_chunk(parent_chunk_id=41)
+    assert (row["chunk_level"], row["chunk_depth"], row["parent_chunk_id"]) == ("paragraph", 1, 41)
+    assert row["child_chunk_count"] == 0 and chunks[0].to_document_chunk()["child_chunk_count"] == len(chunks) - 1
+    assert hierarchical_chunks("Short order.", tokenizer=approximate_tokens)[0].parent_index is None
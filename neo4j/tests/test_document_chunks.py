@@ -0,0 +1,107 @@
+"""
+Tests for writing hierarchical chunks to document_chunks
+Run against a scratch PostgreSQL database with the data-collection
+migrations (partitioned chunks, migration 017's 'document' level).
+"""
+import pytest
+
+from utils.chunker import approximate_tokens, hierarchical_chunks, iter_chunks
+from utils.document_chunks import chunk_documents, insert_document_chunks
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+pytestmark = pytest.mark.integration
+
+MIGRATIONS = [
+    "001_create_core_tables.sql",
+    "002_create_content_tables.sql",
+    "005_create_rag_tables.sql",
+    "013_partition_documents.sql",
+    "017_hierarchical_chunks.sql",
+]
+
+TEXT = "\n\n".join([
+    "JUDGMENT",
+    *(f"{i}. " + f"The appellant relied on paragraph {i} of the deed. " * 5 for i in range(1, 4)),
+    "HELD",
+    *(f"{i}. " + f"The appeal fails on ground {i} and is dismissed. " * 5 for i in range(4, 6)),
+])
+
+
+@pytest.fixture
+def database(postgres_database):
+    """(connection, document id) of one BD case in a migrated database"""
+    conn = psycopg2.connect(postgres_database(MIGRATIONS))
+    with conn, conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code, doc_type,
+                                   title_full, doc_year, source_url, source_domain, chunk_strategy)
+            VALUES ('BD00000001', 'a.pdf', 'h', 'BD', 'CAS', 'A vs State', 2019, 'https://a', 'a', 'semantic')
+            RETURNING id
+        """)
+        document_id = cursor.fetchone()[0]
+    yield conn, document_id
+    conn.close()
+
+
+def rows(conn, sql, params=()):
+    with conn.cursor() as cursor:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+
+
+def test_parent_links_round_trip(database):
+    conn, document_id = database
+    chunks = hierarchical_chunks(TEXT, max_tokens=60, context_chars=40, tokenizer=approximate_tokens)
+    assert any(c.chunk_level == "section" for c in chunks) and any(c.chunk_depth == 2 for c in chunks)
+
+    with conn, conn.cursor() as cursor:
+        ids = insert_document_chunks(cursor, document_id, "BD", chunks)
+
+    written = {index: (row_id, parent, children, level) for row_id, index, parent, children, level in rows(
+        conn, "SELECT id, chunk_index, parent_chunk_id, child_chunk_count, chunk_level FROM document_chunks")}
+    assert sorted(written) == [c.chunk_index for c in chunks]
+    for chunk in chunks:
+        row_id, parent, children, level = written[chunk.chunk_index]
+        assert ids[chunk.chunk_index] == row_id and (children, level) == (chunk.child_count, chunk.chunk_level)
+        assert parent == (None if chunk.parent_index is None else ids[chunk.parent_index])
+    # parents are inserted before their children
+    assert all(written[c.parent_index][0] < written[c.chunk_index][0] for c in chunks if c.parent_index is not None)
+    assert rows(conn, "SELECT chunk_count, chunk_strategy, embedding_status FROM documents") == \
+        [(len(chunks), "hierarchical", "pending")]
+
+
+def test_rewrite_replaces_chunks_and_flat_chunks_pass_through(database):
+    conn, document_id = database
+    with conn, conn.cursor() as cursor:
+        insert_document_chunks(cursor, document_id, "BD",
+                               hierarchical_chunks(TEXT, max_tokens=60, tokenizer=approximate_tokens))
+
+    flat = list(iter_chunks(TEXT, max_tokens=60, tokenizer=approximate_tokens))
+    with conn, conn.cursor() as cursor:
+        insert_document_chunks(cursor, document_id, "BD", flat)
+
+    assert rows(conn, "SELECT count(*), count(parent_chunk_id) FROM document_chunks") == [(len(flat), 0)]
+
+
+def test_missing_parent_is_rejected(database):
+    conn, document_id = database
+    chunks = hierarchical_chunks(TEXT, max_tokens=60, tokenizer=approximate_tokens)
+    with pytest.raises(ValueError):
+        with conn, conn.cursor() as cursor:
+            insert_document_chunks(cursor, document_id, "BD", chunks[1:])
+    assert rows(conn, "SELECT count(*) FROM document_chunks") == [(0,)]
+
+
+def test_chunk_documents_chunks_documents_with_text(database):
+    conn, document_id = database
+    with conn, conn.cursor() as cursor:
+        cursor.execute("INSERT INTO content (document_id, full_text) VALUES (%s, %s)", (document_id, TEXT))
+
+    documents, written = chunk_documents(conn.dsn, max_tokens=60)
+
+    assert documents == 1 and written > 0
+    assert rows(conn, "SELECT chunk_count FROM documents") == [(written,)]
+    assert rows(conn, "SELECT count(*), count(*) FILTER (WHERE chunk_level = 'document') FROM document_chunks") == \
+        [(written, 1)]
+    assert chunk_documents(conn.dsn) == (0, 0)
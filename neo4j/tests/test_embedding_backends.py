@@ -0,0 +1,99 @@
+"""
+Unit tests for embedding backends and the backend-agnostic generator
+"""
+import pytest
+
+from utils.embedding_backends import EmbeddingBackend, create_backend, plan_batches
+from utils.embeddings_generator import EmbeddingsGenerator
+
+
+class CountingBackend(EmbeddingBackend):
+    """In-process backend: vector = [text length, batch size]"""
+    model = "counting"
+    dimension = 2
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def embed(self, texts):
+        if self.fail:
+            raise RuntimeError("backend down")
+        self.batches.append(list(texts))
+        return [[float(len(text)), float(len(texts))] for text in texts]
+
+
+@pytest.mark.unit
+def test_plan_batches_covers_every_text_within_budget():
+    lengths = [5, 300, 12, 300, 7, 120, 64, 64, 1, 250]
+    batches = plan_batches(lengths, max_tokens=600, max_batch_size=3)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    for batch in batches:
+        assert len(batch) <= 3
+        assert len(batch) * max(lengths[i] for i in batch) <= 600 or len(batch) == 1
+    # Longest texts are batched together
+    assert set(batches[0]) == {1, 3}
+
+
+@pytest.mark.unit
+def test_plan_batches_oversized_text_gets_own_batch():
+    assert plan_batches([1000, 10], max_tokens=100, max_batch_size=8) == [[0], [1]]
+
+
+@pytest.mark.unit
+def test_generator_uses_backend():
+    backend = CountingBackend()
+    generator = EmbeddingsGenerator(backend=backend)
+
+    assert generator.dimension == 2
+    assert generator.model == "counting"
+    assert generator.generate_case_embedding({"title": "A v B"}) == [len("Title: A v B"), 1.0]
+    assert generator.embed_batch(["x", "  yy  "]) == [[1.0, 2.0], [2.0, 2.0]]
+
+
+@pytest.mark.unit
+def test_generator_chunks_then_embeds_with_backend():
+    backend = CountingBackend()
+    generator = EmbeddingsGenerator(backend=backend)
+    text = " ".join(f"Sentence number {i} of the judgment." for i in range(400))
+
+    chunks = generator.chunk_text(text, chunk_size=128, source_id="case1")
+    vectors = generator.generate_batch_embeddings([chunk.text for chunk in chunks])
+
+    assert len(chunks) > 1
+    assert len(vectors) == len(chunks)
+    assert all(len(vector) == 2 for vector in vectors)
+
+
+@pytest.mark.unit
+def test_generator_batch_failure_falls_back_but_embed_batch_raises():
+    generator = EmbeddingsGenerator(backend=CountingBackend(fail=True))
+
+    assert generator.generate_batch_embeddings(["a", "b"]) == [[0.0, 0.0], [0.0, 0.0]]
+    with pytest.raises(RuntimeError):
+        generator.embed_batch(["a"])
+
+
+@pytest.mark.unit
+def test_create_backend_validates_name(monkeypatch):
+    with pytest.raises(ValueError, match="Unknown embedding backend"):
+        create_backend("tpu")
+
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    with pytest.raises(ValueError, match="OPENAI_API_KEY"):
+        create_backend("openai")
+
+
+@pytest.mark.slow
+def test_local_backend_embeds_on_cpu():
+    pytest.importorskip("sentence_transformers")
+    from utils.embedding_backends import LocalBackend
+
+    backend = LocalBackend(quantize=True, max_batch_size=2)
+    texts = ["Section 10 of the Code of Civil Procedure", "res judicata", "stay of suit"]
+    vectors = EmbeddingsGenerator(backend=backend).embed_batch(texts)
+
+    assert len(vectors) == 3
+    assert all(len(vector) == backend.dimension for vector in vectors)
+    assert sum(v * v for v in vectors[0]) == pytest.approx(1.0, abs=1e-3)
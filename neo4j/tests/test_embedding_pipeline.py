@@ -0,0 +1,133 @@
+"""
+Unit tests for the batched embedding pipeline
+"""
+import time
+
+import pytest
+from unittest.mock import Mock
+
+from utils.embedding_pipeline import (
+    EmbeddingPipeline, EmbeddingCache, RateLimiter, StubEmbeddingClient, CASE_TARGET
+)
+
+
+class FailingClient(StubEmbeddingClient):
+    """Stub that fails every request containing a given word"""
+
+    def __init__(self, poison):
+        super().__init__(dimension=8)
+        self.poison = poison
+
+    def embed_batch(self, texts):
+        if any(self.poison in text for text in texts):
+            raise RuntimeError("upstream error")
+        return super().embed_batch(texts)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EmbeddingCache(tmp_path / "embeddings.db")
+    yield cache
+    cache.close()
+
+
+def graph_driver(mock_neo4j_driver, nodes):
+    """Mock driver serving `nodes` by keyset and recording UNWIND writes"""
+    session = mock_neo4j_driver.session.return_value
+    tx = session.begin_transaction.return_value
+
+    def read(work):
+        tx.run = Mock(side_effect=lambda query, after, limit: [
+            n for n in nodes if n["node_id"] > after][:limit])
+        return work(tx)
+
+    session.execute_read = Mock(side_effect=read)
+    session.execute_write = Mock(side_effect=lambda work, *args: work(Mock(), *args))
+    return mock_neo4j_driver
+
+
+def written_rows(driver):
+    rows = []
+    for call in driver.session.return_value.execute_write.call_args_list:
+        for _query, batch in call.args[1]:
+            rows.extend(batch)
+    return rows
+
+
+@pytest.mark.unit
+def test_embed_texts_dedupes_and_caches(cache):
+    client = StubEmbeddingClient(dimension=16)
+    pipeline = EmbeddingPipeline(None, client, cache, batch_size=2, max_workers=3)
+
+    texts = ["alpha", "beta", "alpha", "", "gamma"]
+    vectors = pipeline.embed_texts(texts)
+
+    assert vectors[0] == vectors[2]
+    assert vectors[3] is None
+    assert len(vectors[4]) == 16
+    assert client.calls == 2          # 3 unique texts, 2 per request
+    assert len(cache) == 3
+
+    again = pipeline.embed_texts(texts)
+    assert client.calls == 2
+    assert again[1] == pytest.approx(vectors[1], abs=1e-6)
+
+
+@pytest.mark.unit
+def test_failed_batches_yield_none_not_zero_vectors():
+    pipeline = EmbeddingPipeline(None, FailingClient("bad"), batch_size=1, max_attempts=1)
+    vectors = pipeline.embed_texts(["good text", "bad text"])
+
+    assert vectors[0] is not None
+    assert vectors[1] is None
+
+
+@pytest.mark.unit
+def test_run_streams_pages_and_writes_with_unwind(mock_neo4j_driver, cache):
+    nodes = [{"node_id": f"c{i:02d}", "title": f"Case {i % 4}", "summary": None,
+              "facts": None, "holding": None, "reasoning": None} for i in range(10)]
+    nodes.append({"node_id": "c99", "title": None, "summary": None,
+                  "facts": None, "holding": None, "reasoning": None})
+    driver = graph_driver(mock_neo4j_driver, nodes)
+    client = StubEmbeddingClient(dimension=8)
+
+    pipeline = EmbeddingPipeline(driver, client, cache, page_size=4, batch_size=10)
+    stats = pipeline.run(CASE_TARGET)
+
+    assert stats.nodes == 11
+    assert stats.embedded == 10
+    assert stats.skipped == 1
+    assert stats.cache_hits + stats.duplicates == 6   # only 4 distinct titles
+    assert driver.session.return_value.execute_read.call_count == 4   # 3 pages + empty
+
+    rows = written_rows(driver)
+    assert sorted(row["id"] for row in rows) == [f"c{i:02d}" for i in range(10)]
+    assert all(len(row["embedding"]) == 8 for row in rows)
+
+
+@pytest.mark.unit
+def test_run_respects_limit(mock_neo4j_driver):
+    nodes = [{"node_id": f"c{i}", "title": f"t{i}", "summary": None, "facts": None,
+              "holding": None, "reasoning": None} for i in range(9)]
+    driver = graph_driver(mock_neo4j_driver, nodes)
+
+    stats = EmbeddingPipeline(driver, StubEmbeddingClient(dimension=4), page_size=4).run(CASE_TARGET, limit=5)
+    assert stats.nodes == 5
+
+
+@pytest.mark.unit
+def test_rate_limiter_spaces_requests():
+    limiter = RateLimiter(requests_per_minute=600)    # 10/s, bucket starts full
+    limiter._requests = 0
+    started = time.monotonic()
+    for _ in range(3):
+        limiter.acquire()
+    assert time.monotonic() - started >= 0.25
+
+
+@pytest.mark.unit
+def test_stub_client_is_deterministic_and_normalized():
+    client = StubEmbeddingClient(dimension=32)
+    first, second = client.embed_batch(["Section 10 CPC", "Section 10 CPC"])
+    assert first == second
+    assert sum(v * v for v in first) == pytest.approx(1.0)
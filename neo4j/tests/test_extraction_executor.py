@@ -0,0 +1,127 @@
+"""
+Unit tests for concurrent, cached LLM extraction
+"""
+import time
+
+import pytest
+
+from llm_extractor import LLMExtractor
+from utils.extraction_executor import ExtractionExecutor, ExtractionTask, ResponseCache
+from utils.llm_providers import FakeProvider, estimate_cost
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(tmp_path / "llm_responses.db")
+    yield cache
+    cache.close()
+
+
+def tasks_for(texts, version="1:legal case"):
+    return [ExtractionTask(text, f"Extract.\nTEXT:\n{text}", version) for text in texts]
+
+
+@pytest.mark.unit
+def test_duplicates_and_cache_avoid_repeat_calls(cache):
+    provider = FakeProvider()
+    executor = ExtractionExecutor(provider, cache)
+
+    first = executor.run(tasks_for(["judgment a", "judgment b", "judgment a"]))
+    assert provider.calls == 2
+    assert first[0].text == first[2].text
+    assert executor.stats.duplicates == 1 and executor.stats.requests == 2
+
+    second = ExtractionExecutor(provider, cache).run(tasks_for(["judgment a", "judgment b"]))
+    assert provider.calls == 2
+    assert [c.text for c in second] == [first[0].text, first[1].text]
+
+
+@pytest.mark.unit
+def test_prompt_version_and_model_are_part_of_the_key(cache):
+    provider = FakeProvider()
+    ExtractionExecutor(provider, cache).run(tasks_for(["judgment a"]))
+    ExtractionExecutor(provider, cache).run(tasks_for(["judgment a"], version="2:legal case"))
+    ExtractionExecutor(FakeProvider(model="fake-other"), cache).run(tasks_for(["judgment a"]))
+
+    assert provider.calls == 2
+    assert len(cache) == 3
+
+
+@pytest.mark.unit
+def test_concurrency_is_bounded():
+    provider = FakeProvider(latency=0.05)
+    executor = ExtractionExecutor(provider, max_concurrency=4)
+
+    started = time.time()
+    results = executor.run(tasks_for([f"chunk {i}" for i in range(8)]))
+    elapsed = time.time() - started
+
+    assert all(results)
+    assert 0.09 <= elapsed < 0.35
+
+
+@pytest.mark.unit
+def test_replay_serves_cache_only(cache):
+    ExtractionExecutor(FakeProvider(), cache).run(tasks_for(["judgment a"]))
+
+    provider = FakeProvider()
+    executor = ExtractionExecutor(provider, cache, replay=True)
+    results = executor.run(tasks_for(["judgment a", "judgment new"]))
+
+    assert provider.calls == 0
+    assert results[0] is not None and results[1] is None
+    assert executor.stats.cache_hits == 1 and executor.stats.misses == 1
+
+    with pytest.raises(ValueError):
+        ExtractionExecutor(provider, replay=True)
+
+
+@pytest.mark.unit
+def test_failures_and_invalid_responses_are_not_cached(cache):
+    def responder(prompt):
+        if "broken" in prompt:
+            raise RuntimeError("provider down")
+        return "not json"
+
+    executor = ExtractionExecutor(FakeProvider(responder), cache, max_attempts=1,
+                                  validate=lambda text: text.startswith("{"))
+    results = executor.run(tasks_for(["broken chunk", "odd chunk"]))
+
+    assert results[0] is None and results[1].text == "not json"
+    assert executor.stats.failed == 1
+    assert len(cache) == 0
+
+
+@pytest.mark.unit
+def test_token_and_cost_accounting(cache):
+    provider = FakeProvider(model="gpt-4o-mini")
+    executor = ExtractionExecutor(provider, cache)
+    executor.run(tasks_for(["judgment a", "judgment b"]))
+    stats = executor.stats
+
+    assert stats.input_tokens > 0 and stats.output_tokens > 0
+    assert stats.cost_usd == pytest.approx(estimate_cost("gpt-4o-mini", stats.input_tokens, stats.output_tokens))
+
+    executor.run(tasks_for(["judgment a"]))
+    assert stats.saved_usd > 0
+    assert stats.tasks == 3
+
+
+@pytest.mark.unit
+def test_extractor_with_fake_provider(cache):
+    def responder(prompt):
+        return {"case": {"title": "A v B", "summary": "Appeal"}, "judges": [{"name": "X J."}]}
+
+    extractor = LLMExtractor(provider=FakeProvider(responder), cache=cache)
+    records = [{"title": "A v B", "full_text": "text of the judgment"}, {"title": "Empty", "full_text": ""}]
+
+    enhanced = extractor.extract_from_database_cases(records)
+
+    assert enhanced[0]["llm_summary"] == "Appeal"
+    assert enhanced[0]["llm_judges"] == [{"name": "X J."}]
+    assert "llm_summary" not in enhanced[1]
+    assert extractor.extract_legal_entities("text")["case"]["title"] == "A v B"
+
+    replayed = LLMExtractor(provider=FakeProvider(), cache=cache, replay=True)
+    assert replayed.extract_from_database_cases(records[:1])[0]["llm_summary"] == "Appeal"
+    assert replayed.llm.calls == 0
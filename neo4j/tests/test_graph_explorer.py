@@ -0,0 +1,162 @@
+"""
+Unit tests for the interactive graph explorer (sampling, layout cache, API)
+"""
+import pytest
+from unittest.mock import Mock
+
+from utils.graph_explorer import (
+    GraphExplorer, GraphNode, Subgraph, AUTHORITY_SEEDS_QUERY, NEIGHBOURS_QUERY, NODE_QUERY, SEEDS_QUERY
+)
+from utils.graph_layout import LayoutCache, force_layout
+
+
+def record(data):
+    return Mock(data=Mock(return_value=data))
+
+
+def hit(source, target, degree=1, label="Case"):
+    return {
+        "id": f"r-{source}-{target}", "type": "CITES_PRECEDENT", "source": source, "target": target,
+        "node": {"id": target, "labels": [label], "degree": degree, "properties": {"name": target}}
+    }
+
+
+def explorer_for(mock_neo4j_driver, neighbours, max_nodes=300):
+    """Explorer whose session answers NODE_QUERY for any id and NEIGHBOURS_QUERY from `neighbours`"""
+    session = mock_neo4j_driver.session.return_value
+
+    def run(query, **params):
+        if query == NODE_QUERY:
+            return [record({"id": params["node_id"], "labels": ["Case"], "degree": 4,
+                            "properties": {"name": params["node_id"], "embedding": None}})]
+        assert query == NEIGHBOURS_QUERY
+        return [record({"node_id": node_id,
+                        "neighbours": [h for h in neighbours.get(node_id, []) if h["node"]["id"] not in params["exclude"]]})
+                for node_id in params["frontier"]]
+
+    session.run = Mock(side_effect=run)
+    return GraphExplorer(mock_neo4j_driver, "neo4j", max_nodes=max_nodes), session
+
+
+@pytest.mark.unit
+class TestForceLayout:
+    def test_deterministic(self):
+        nodes = [f"n{i}" for i in range(20)]
+        edges = [(f"n{i}", f"n{i + 1}") for i in range(19)]
+        assert force_layout(nodes, edges) == force_layout(nodes, edges)
+
+    def test_pinned_nodes_stay_put(self):
+        positions = force_layout(["a", "b", "c"], [("a", "b"), ("a", "c")], pinned={"a": (120.0, -40.0)})
+        assert positions["a"] == (120.0, -40.0)
+        assert positions["b"] != positions["a"]
+
+    def test_cache_reuses_layout(self):
+        cache = LayoutCache(max_entries=1)
+        first = cache.layout(["a", "b"], [("a", "b")])
+        assert cache.layout(["b", "a"], [("a", "b")]) is first
+        cache.layout(["a", "c"], [("a", "c")])
+        assert (cache.hits, cache.misses, len(cache)) == (1, 2, 1)
+
+
+@pytest.mark.unit
+class TestGraphExplorer:
+    def test_ego_network_two_hops(self, mock_neo4j_driver):
+        explorer, _ = explorer_for(mock_neo4j_driver, {
+            "root": [hit("root", "a", degree=3), hit("root", "b")],
+            "a": [hit("a", "c"), hit("a", "root")],
+        })
+
+        view = explorer.ego("root", hops=2)
+
+        assert [node.id for node in view.nodes] == ["root", "a", "b", "c"]
+        assert len(view.edges) == 3
+        assert not view.truncated
+        hidden = {node.id: node.hidden for node in view.nodes}
+        assert hidden == {"root": 2, "a": 1, "b": 0, "c": 0}
+        assert all(node.x is not None for node in view.nodes)
+        assert "embedding" not in view.nodes[0].properties
+
+    def test_ego_is_cached(self, mock_neo4j_driver):
+        explorer, session = explorer_for(mock_neo4j_driver, {"root": [hit("root", "a")]})
+        assert explorer.ego("root") is explorer.ego("root")
+        assert session.run.call_count == 2
+
+    def test_max_nodes_truncates(self, mock_neo4j_driver):
+        explorer, _ = explorer_for(mock_neo4j_driver, {"root": [hit("root", f"n{i}") for i in range(10)]},
+                                   max_nodes=4)
+        view = explorer.ego("root")
+        assert len(view.nodes) == 4
+        assert view.truncated
+
+    def test_expand_excludes_shown_and_keeps_positions(self, mock_neo4j_driver):
+        explorer, session = explorer_for(mock_neo4j_driver, {"a": [hit("a", "root"), hit("a", "x")]})
+
+        more = explorer.expand("a", shown=["root", "a"], positions={"a": (300.0, 200.0), "root": (0.0, 0.0)})
+
+        assert [node.id for node in more.nodes] == ["x"]
+        assert set(session.run.call_args.kwargs["exclude"]) == {"root", "a"}
+        assert (more.nodes[0].x, more.nodes[0].y) != (None, None)
+
+    def test_unknown_node(self, mock_neo4j_driver):
+        mock_neo4j_driver.session.return_value.run = Mock(return_value=[])
+        assert GraphExplorer(mock_neo4j_driver).ego("missing") is None
+
+    def test_seeds_use_label_and_authority_index(self, mock_neo4j_driver):
+        seed = {"id": "s1", "labels": ["Case"], "degree": 3, "properties": {"title": "Seed"}}
+        session = mock_neo4j_driver.session.return_value
+        session.run = Mock(return_value=[record(seed)])
+        explorer = GraphExplorer(mock_neo4j_driver)
+
+        assert [node.id for node in explorer.seeds("Case", 5)] == ["s1"]
+        assert session.run.call_args.args[0] == AUTHORITY_SEEDS_QUERY
+        assert "MATCH (n:Case) WHERE n.authority IS NOT NULL" in AUTHORITY_SEEDS_QUERY
+
+        explorer.seeds("Court", 5)
+        assert "MATCH (n:Court)" in session.run.call_args.args[0]
+
+    def test_seeds_fall_back_to_degree_before_metrics(self, mock_neo4j_driver):
+        session = mock_neo4j_driver.session.return_value
+        session.run = Mock(side_effect=lambda query, **params: [] if query == AUTHORITY_SEEDS_QUERY else [
+            record({"id": "s1", "labels": ["Case"], "degree": 3, "properties": {}})])
+        assert [node.id for node in GraphExplorer(mock_neo4j_driver).seeds("Case")] == ["s1"]
+        assert session.run.call_args.args[0] == SEEDS_QUERY.format(label="Case")
+
+    def test_seeds_reject_unknown_label(self, mock_neo4j_driver):
+        with pytest.raises(ValueError):
+            GraphExplorer(mock_neo4j_driver).seeds("Case) DETACH DELETE (n")
+
+
+@pytest.mark.unit
+class TestVisualizationServer:
+    @pytest.fixture
+    def client(self):
+        pytest.importorskip("flask")
+        from visualization_server import create_app
+
+        explorer = Mock()
+        explorer.seeds.return_value = [GraphNode("s1", "Case", "Seed", 7)]
+        explorer.ego.side_effect = lambda node_id, **kwargs: (
+            Subgraph(nodes=[GraphNode(node_id, "Case", "Root", 1)], root=node_id) if node_id == "root" else None
+        )
+        explorer.expand.return_value = Subgraph(root="root")
+        return create_app(explorer).test_client(), explorer
+
+    def test_seeds(self, client):
+        client, _ = client
+        assert client.get("/api/seeds").get_json()[0]["id"] == "s1"
+
+    def test_ego_parses_filters(self, client):
+        client, explorer = client
+        response = client.get("/api/ego?id=root&hops=2&limit=500&labels=Case,Court")
+        assert response.status_code == 200
+        assert response.get_json()["root"] == "root"
+        kwargs = explorer.ego.call_args.kwargs
+        assert (kwargs["hops"], kwargs["limit"], kwargs["labels"], kwargs["types"]) == (2, 100, ["Case", "Court"], None)
+        assert client.get("/api/ego?id=missing").status_code == 404
+
+    def test_expand(self, client):
+        client, explorer = client
+        response = client.post("/api/expand", json={"id": "root", "shown": ["root"], "positions": {"root": [1, 2]}})
+        assert response.status_code == 200
+        assert explorer.expand.call_args.kwargs["positions"] == {"root": (1, 2)}
+        assert client.post("/api/expand", json={}).status_code == 400
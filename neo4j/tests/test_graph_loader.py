@@ -0,0 +1,118 @@
+"""
+Unit tests for the batched UNWIND graph loader
+"""
+import pytest
+from unittest.mock import Mock
+from neo4j.exceptions import ClientError
+
+from utils.graph_loader import GraphBatchLoader, UnwindStatement
+
+
+CASES = UnwindStatement("cases", "MERGE (c:Case {id: row.id})")
+JUDGES = UnwindStatement("judges", """
+    MERGE (j:Judge {name: row.name})
+    WITH j, row
+    MATCH (c:Case {id: row.case_id})
+    MERGE (c)-[:DECIDED_BY]->(j)
+""")
+
+
+def case_rows(case):
+    return {
+        "cases": [{"id": case["id"]}],
+        "judges": [{"name": name, "case_id": case["id"]} for name in case["judges"]],
+    }
+
+
+@pytest.fixture
+def driver(mock_neo4j_driver):
+    """Mock driver whose execute_write runs the work against the mock transaction"""
+    session = mock_neo4j_driver.session.return_value
+    tx = session.begin_transaction.return_value
+    session.execute_write = Mock(side_effect=lambda work, *args: work(tx, *args))
+    return mock_neo4j_driver
+
+
+def tx_calls(driver):
+    return driver.session.return_value.begin_transaction.return_value.run.call_args_list
+
+
+@pytest.mark.unit
+class TestUnwindStatement:
+    """Test UnwindStatement"""
+
+    def test_query_prefixes_unwind(self):
+        assert CASES.query == "UNWIND $rows AS row\nMERGE (c:Case {id: row.id})"
+
+
+@pytest.mark.unit
+class TestGraphBatchLoader:
+    """Test GraphBatchLoader"""
+
+    def test_one_statement_per_entity_type_per_batch(self, driver):
+        cases = [{"id": i, "judges": ["A", "B"]} for i in range(5)]
+        loader = GraphBatchLoader(driver, batch_size=2)
+
+        stats = loader.load(cases, case_rows, [CASES, JUDGES])
+
+        assert stats.batches == 3
+        assert stats.records == 5
+        assert stats.rows == {"cases": 5, "judges": 10}
+        # 3 transactions x 2 statements, instead of 5 x 3 per-entity runs
+        calls = tx_calls(driver)
+        assert len(calls) == 6
+        assert [len(c.kwargs["rows"]) for c in calls] == [2, 4, 2, 4, 1, 2]
+        assert calls[0].args[0].startswith("UNWIND $rows AS row")
+
+    def test_statements_without_rows_are_skipped(self, driver):
+        loader = GraphBatchLoader(driver, batch_size=10)
+
+        loader.load([{"id": 1, "judges": []}], case_rows, [CASES, JUDGES])
+
+        assert len(tx_calls(driver)) == 1
+
+    def test_load_rows(self, driver):
+        loader = GraphBatchLoader(driver, batch_size=100)
+
+        stats = loader.load_rows(CASES, [{"id": i} for i in range(250)])
+
+        assert stats.batches == 3
+        assert stats.rows == {"cases": 250}
+
+    def test_unknown_statement_rejected(self, driver):
+        loader = GraphBatchLoader(driver)
+
+        with pytest.raises(ValueError):
+            loader.load([1], lambda record: {"missing": [{}]}, [CASES])
+
+    def test_invalid_batch_size(self, driver):
+        with pytest.raises(ValueError):
+            GraphBatchLoader(driver, batch_size=0)
+
+    def test_error_raises_by_default(self, driver):
+        session = driver.session.return_value
+        session.execute_write = Mock(side_effect=ClientError("bad row"))
+        loader = GraphBatchLoader(driver)
+
+        with pytest.raises(ClientError):
+            loader.load([{"id": 1, "judges": []}], case_rows, [CASES, JUDGES])
+
+    def test_skip_failed_isolates_bad_records(self, driver):
+        session = driver.session.return_value
+        tx = session.begin_transaction.return_value
+
+        def execute_write(work, batches):
+            ids = [row["id"] for query, rows in batches for row in rows if "id" in row]
+            if 2 in ids:
+                raise ClientError("bad row")
+            return work(tx, batches)
+
+        session.execute_write = Mock(side_effect=execute_write)
+        cases = [{"id": i, "judges": []} for i in range(4)]
+        loader = GraphBatchLoader(driver, batch_size=4, skip_failed=True)
+
+        stats = loader.load(cases, case_rows, [CASES, JUDGES])
+
+        assert stats.failed_records == 1
+        assert stats.loaded_records == 3
+        assert stats.rows == {"cases": 3, "judges": 0}
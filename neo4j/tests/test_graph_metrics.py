@@ -0,0 +1,140 @@
+"""
+Unit tests for precomputed graph metrics
+"""
+import pytest
+from unittest.mock import Mock
+
+from utils.graph_metrics import (
+    CaseMetrics, GraphMetrics, TTLCache, citation_metrics, court_metrics, graph_counts, pagerank
+)
+
+
+def result(values=None, single=None, records=()):
+    run = Mock()
+    run.value.return_value = values
+    run.single.return_value = single
+    run.__iter__ = Mock(return_value=iter(records))
+    return run
+
+
+def count_store_session():
+    """Session answering the count-store queries of a tiny graph"""
+    answers = {
+        "CALL db.labels()": result(values=["Case", "Court", "SyncState"]),
+        "CALL db.relationshipTypes()": result(values=["BEFORE_COURT", "CITES_PRECEDENT"]),
+        "MATCH (n:`Case`)": result(single={"n": 3}),
+        "MATCH (n:`Court`)": result(single={"n": 1}),
+        "MATCH (n:`SyncState`)": result(single={"n": 1}),
+        "MATCH ()-[r:`BEFORE_COURT`]": result(single={"n": 3}),
+        "MATCH ()-[r:`CITES_PRECEDENT`]": result(single={"n": 2}),
+        "MATCH (n) RETURN": result(single={"n": 5}),
+        "MATCH ()-[r]->() RETURN": result(single={"n": 5}),
+    }
+    session = Mock()
+    session.run = Mock(side_effect=lambda query, **params: next(
+        answer for prefix, answer in answers.items() if query.startswith(prefix)
+    ))
+    return session, answers
+
+
+def cases(n, court=None):
+    return [CaseMetrics(node=f"n{i}", case_id=f"c{i}", title=f"Case {i}",
+                        court_node=court and f"court-{court}", court=court) for i in range(n)]
+
+
+@pytest.mark.unit
+class TestPageRank:
+    """Test pagerank and citation_metrics"""
+
+    def test_scores_sum_to_one_and_favour_cited_nodes(self):
+        scores, iterations = pagerank(4, [(0, 3), (1, 3), (2, 3), (3, 0)])
+        assert sum(scores) == pytest.approx(1.0)
+        assert scores[3] == max(scores)
+        assert scores[0] > scores[1] == pytest.approx(scores[2])
+        assert iterations < 100
+
+    def test_dangling_nodes_keep_scores_normalised(self):
+        scores, _ = pagerank(3, [(0, 1)])
+        assert sum(scores) == pytest.approx(1.0)
+        assert scores[1] > scores[0] == pytest.approx(scores[2])
+        assert pagerank(0, []) == ([], 0)
+
+    def test_degrees_ignore_repeats_self_citations_and_non_cases(self):
+        graph = cases(3)
+        edges = [("n0", "n1"), ("n0", "n1"), ("n2", "n1"), ("n1", "n1"), ("n0", "elsewhere")]
+
+        citation_metrics(graph, edges)
+
+        assert [(c.cites_count, c.cited_by_count) for c in graph] == [(1, 0), (0, 2), (1, 0)]
+        assert graph[1].authority_rank == 1
+        assert sorted(c.authority_rank for c in graph) == [1, 2, 3]
+
+
+@pytest.mark.unit
+def test_court_aggregates():
+    graph = cases(2, court="SC") + cases(1, court="HC")
+    graph[2].node = "n2-hc"
+    citation_metrics(graph, [("n0", "n1"), ("n2-hc", "n1")])
+
+    courts = {court.name: court for court in court_metrics(graph)}
+
+    assert courts["SC"].case_count == 2
+    assert courts["SC"].citations_received == 2 and courts["SC"].citations_made == 1
+    assert courts["SC"].top_case_title == "Case 1"
+    assert courts["HC"].citations_made == 1 and courts["HC"].citations_received == 0
+
+
+@pytest.mark.unit
+def test_counts_come_from_single_label_queries():
+    session, _ = count_store_session()
+
+    counts = graph_counts(session)
+
+    assert counts.labels == {"Case": 3, "Court": 1}
+    assert counts.relationships == {"BEFORE_COURT": 3, "CITES_PRECEDENT": 2}
+    assert counts.nodes == 4
+    queries = [call.args[0] for call in session.run.call_args_list]
+    assert not any("labels(n)" in query or "type(r)" in query for query in queries)
+
+
+@pytest.mark.unit
+def test_compute_writes_case_and_court_metrics(mock_neo4j_driver):
+    session, answers = count_store_session()
+    case_records = [Mock(data=Mock(return_value={
+        "node": f"n{i}", "case_id": f"c{i}", "title": f"Case {i}", "court_node": "court-1", "court": "SC"
+    })) for i in range(3)]
+    answers["\n        MATCH (c:Case)"] = result(records=case_records)
+    answers["\n        MATCH (a:Case)"] = result(records=[{"source": "n0", "target": "n2"}, {"source": "n1", "target": "n2"}])
+    answers["CREATE INDEX"] = result()
+
+    writes = []
+    session.execute_write = Mock(side_effect=lambda work, *args: writes.append(args) or work(Mock(), *args))
+    mock_neo4j_driver.session.return_value.__enter__ = Mock(return_value=session)
+
+    metrics = GraphMetrics(mock_neo4j_driver).compute()
+
+    assert metrics.citations == 2
+    assert metrics.cases[2].cited_by_count == 2 and metrics.cases[2].authority_rank == 1
+    assert metrics.courts[0].case_count == 3
+    # case metrics batch, court metrics batch, GraphStats counts
+    assert len(writes) == 3
+    case_rows = writes[0][0][0][1]
+    assert {row["node"] for row in case_rows} == {"n0", "n1", "n2"}
+
+
+@pytest.mark.unit
+def test_ttl_cache_expires():
+    now = [0.0]
+    cache = TTLCache(ttl=10, clock=lambda: now[0])
+    loader = Mock(side_effect=[1, 2])
+
+    assert cache.get_or_load("counts", loader) == 1
+    now[0] = 9
+    assert cache.get_or_load("counts", loader) == 1
+    now[0] = 11
+    assert cache.get_or_load("counts", loader) == 2
+    assert loader.call_count == 2
+
+    cache.invalidate()
+    with pytest.raises(StopIteration):
+        cache.get_or_load("counts", loader)
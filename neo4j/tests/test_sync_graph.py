@@ -0,0 +1,231 @@
+"""
+Unit tests for incremental graph sync
+"""
+import time
+import sqlite3
+from unittest.mock import Mock
+
+import pytest
+
+from sync_graph import CLEAR_CASE_LINKS, DELETE_CASES, ChangeBatch, GraphSync, SQLiteChangeSource
+
+
+def graph_driver(mock_neo4j_driver, states):
+    """Mock driver keeping :SyncState nodes in `states` and recording UNWIND writes"""
+    session = mock_neo4j_driver.session.return_value
+    writes = []
+
+    def read(work, *args):
+        tx = Mock()
+        tx.run = Mock(side_effect=lambda query, source: Mock(single=Mock(return_value=states.get(source))))
+        return work(tx, *args)
+
+    def write(work, *args):
+        tx = Mock()
+
+        def run(query, rows=None, source=None, **state):
+            if "SyncState" in query:
+                states[source] = state
+            else:
+                writes.append((query, rows))
+            return Mock()
+
+        tx.run = Mock(side_effect=run)
+        return work(tx, *args)
+
+    session.execute_read = Mock(side_effect=read)
+    session.execute_write = Mock(side_effect=write)
+    mock_neo4j_driver.writes = writes
+    return mock_neo4j_driver
+
+
+def add_cases(db_path, ids, text="Bench: X. Judge\nSection 9 applies"):
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS legal_cases (id INTEGER PRIMARY KEY, title TEXT, court TEXT, court_name TEXT,
+                                                court_type TEXT, case_date TEXT, snippet TEXT,
+                                                full_text TEXT, citation TEXT, year INTEGER)
+    """)
+    conn.executemany(
+        "INSERT INTO legal_cases (id, title, court, full_text, citation, year) "
+        "VALUES (?, ?, 'Delhi High Court', ?, '', 2020)",
+        [(i, f"A{i} vs B{i} on 1 May, 2020", text) for i in ids]
+    )
+    conn.commit()
+    conn.close()
+
+
+def update_cases(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def written_case_ids(driver):
+    return [row["case_id"] for query, rows in driver.writes if "MERGE (c:Case" in query for row in rows]
+
+
+@pytest.mark.unit
+def test_sqlite_sync_pushes_new_and_changed_cases(tmp_path, mock_neo4j_driver):
+    db_path = str(tmp_path / "cases.db")
+    add_cases(db_path, range(1, 6))
+    add_cases(db_path, [6], text=None)
+
+    states = {}
+    driver = graph_driver(mock_neo4j_driver, states)
+    sync = GraphSync(driver, page_size=2)
+    source = SQLiteChangeSource(db_path)
+
+    result = sync.sync(source)
+    assert (result.cases, result.batches, result.watermark) == (5, 3, 6)
+    assert states[source.name]["watermark"] == 6
+    assert states[source.name]["cases"] == 5
+
+    # Caught up: nothing read, nothing written
+    writes = len(driver.writes)
+    assert sync.sync(source).batches == 0
+    assert len(driver.writes) == writes
+
+    # The scraper fills in the text of case 6 later
+    update_cases(db_path, "UPDATE legal_cases SET full_text = 'Section 9 applies' WHERE id = 6")
+    add_cases(db_path, [7, 8])
+    result = sync.sync(source)
+    assert (result.cases, result.watermark) == (3, 9)
+    assert written_case_ids(driver)[-3:] == ["indian_case_6", "indian_case_7", "indian_case_8"]
+    assert states[source.name]["cases"] == 8
+    source.close()
+
+
+@pytest.mark.unit
+def test_sqlite_title_edit_updates_the_same_case(tmp_path, mock_neo4j_driver):
+    db_path = str(tmp_path / "cases.db")
+    add_cases(db_path, [1])
+    driver = graph_driver(mock_neo4j_driver, {})
+    sync = GraphSync(driver)
+    source = SQLiteChangeSource(db_path)
+
+    sync.sync(source)
+    update_cases(db_path, "UPDATE legal_cases SET title = 'A1 vs State on 1 May, 2020' WHERE id = 1")
+    assert sync.sync(source).cases == 1
+
+    assert written_case_ids(driver) == ["indian_case_1", "indian_case_1"]
+    source.close()
+
+
+@pytest.mark.unit
+def test_sqlite_deleted_rows_are_detached(tmp_path, mock_neo4j_driver):
+    db_path = str(tmp_path / "cases.db")
+    add_cases(db_path, [1, 2])
+    driver = graph_driver(mock_neo4j_driver, {})
+    sync = GraphSync(driver)
+    source = SQLiteChangeSource(db_path)
+
+    sync.sync(source)
+    update_cases(db_path, "DELETE FROM legal_cases WHERE id = 2")
+    result = sync.sync(source)
+
+    assert (result.cases, result.deleted) == (0, 1)
+    assert driver.writes[-1] == (DELETE_CASES.query, [{"case_id": "indian_case_2"}])
+    source.close()
+
+
+@pytest.mark.unit
+def test_synced_cases_replace_their_database_relationships(tmp_path, mock_neo4j_driver):
+    db_path = str(tmp_path / "cases.db")
+    add_cases(db_path, [1])
+    driver = graph_driver(mock_neo4j_driver, {})
+
+    GraphSync(driver).sync(SQLiteChangeSource(db_path))
+
+    queries = [query for query, _rows in driver.writes]
+    assert queries[0] == CLEAR_CASE_LINKS.query
+    assert driver.writes[0][1] == [{"case_id": driver.writes[1][1][0]["case_id"]}]
+    assert any("DECIDED_BY" in query and "MERGE" in query for query in queries[1:])
+
+
+@pytest.mark.unit
+def test_deleted_cases_are_detached(mock_neo4j_driver):
+    states = {}
+    driver = graph_driver(mock_neo4j_driver, states)
+    source = Mock()
+    source.name = "postgres"
+    source.changes = Mock(side_effect=[ChangeBatch(42, [], ["document_7"]), ChangeBatch(42)])
+
+    result = GraphSync(driver).sync(source)
+
+    assert result.deleted == 1
+    assert driver.writes == [(DELETE_CASES.query, [{"case_id": "document_7"}])]
+    assert states["postgres"]["watermark"] == 42
+    source.changes.assert_called_with(42, 1000)
+
+
+POSTGRES_MIGRATIONS = [
+    "001_create_core_tables.sql",
+    "002_create_content_tables.sql",
+    "003_create_reference_tables.sql",
+    "015_graph_change_log.sql",
+]
+
+
+def insert_document(conn, title):
+    with conn.cursor() as cursor:
+        cursor.execute("""
+            INSERT INTO documents (global_id, filename_universal, content_hash, country_code, doc_type,
+                                   doc_subtype, title_full, doc_year, source_url, source_domain)
+            VALUES ('BD00000001', 'case.pdf', 'h', 'BD', 'CAS', 'HCD', %s, 2020, 'https://example.org', 'example.org')
+            RETURNING id
+        """, (title,))
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.integration
+def test_postgres_sync_waits_for_open_transactions(postgres_database, mock_neo4j_driver):
+    psycopg2 = pytest.importorskip("psycopg2")
+    from sync_graph import PostgresChangeSource
+
+    dsn = postgres_database(POSTGRES_MIGRATIONS)
+    writer, slow_writer = psycopg2.connect(dsn), psycopg2.connect(dsn)
+    writer.autocommit = True
+    states = {}
+    sync = GraphSync(graph_driver(mock_neo4j_driver, states))
+    source = PostgresChangeSource(dsn, settle_seconds=3600)
+
+    document_id = insert_document(writer, "A vs B")
+    assert sync.sync(source).cases == 1
+
+    # Log id 2 is taken by a transaction that stays open; id 3 commits first
+    with slow_writer.cursor() as cursor:
+        cursor.execute("INSERT INTO judges (document_id, judge_name) VALUES (%s, 'X. Judge')", (document_id,))
+    with writer.cursor() as cursor:
+        cursor.execute("UPDATE documents SET title_full = 'A vs State' WHERE id = %s", (document_id,))
+    assert sync.sync(source).batches == 0
+
+    slow_writer.commit()
+    result = sync.sync(source)
+    assert (result.cases, result.watermark) == (1, 3)
+    assert written_case_ids(sync.driver) == [f"document_{document_id}"] * 2
+
+    with writer.cursor() as cursor:
+        cursor.execute("DELETE FROM documents WHERE id = %s", (document_id,))
+    assert sync.sync(source).deleted == 1
+    assert sync.driver.writes[-1] == (DELETE_CASES.query, [{"case_id": f"document_{document_id}"}])
+
+    source.close()
+    writer.close()
+    slow_writer.close()
+
+
+@pytest.mark.unit
+def test_postgres_gap_settles_after_its_own_age():
+    from sync_graph import PostgresChangeSource
+
+    source = PostgresChangeSource.__new__(PostgresChangeSource)
+    source.settle_seconds = 0.05
+    source._gaps = {}
+
+    assert not source._gap_settled(5)
+    time.sleep(0.06)
+    assert source._gap_settled(5)
+    # A later gap is timed from when it was first seen
+    assert not source._gap_settled(9)
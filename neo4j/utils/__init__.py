@@ -10,6 +10,28 @@ from .error_handling import (
     batch_operation
 )
 
+from .graph_loader import (
+    GraphBatchLoader,
+    UnwindStatement,
+    LoadStats
+)
+
+from .chunk_loader import ChunkWriter
+
+from .graph_metrics import (
+    GraphMetrics,
+    GraphMetricsReader,
+    TTLCache
+)
+
+from .graph_explorer import GraphExplorer
+from .graph_layout import LayoutCache
+
+from .bulk_import import (
+    BulkImportWriter,
+    SchemaCatalog
+)
+
 from .monitoring import (
     setup_logging,
     init_monitoring,
@@ -25,6 +47,45 @@ from .pdf_extractor import (
     extract_pdf_to_json
 )
 
+from .embedding_pipeline import (
+    EmbeddingPipeline,
+    EmbeddingCache,
+    RateLimiter,
+    StubEmbeddingClient
+)
+
+from .chunker import (
+    Chunk,
+    iter_chunks,
+    hierarchical_chunks,
+    join_pages,
+    count_tokens
+)
+
+from .document_chunks import (
+    insert_document_chunks,
+    chunk_documents
+)
+
+from .llm_providers import (
+    LLMProvider,
+    FakeProvider,
+    create_provider
+)
+
+from .extraction_executor import (
+    ExtractionExecutor,
+    ExtractionTask,
+    ResponseCache
+)
+
+from .embedding_backends import (
+    EmbeddingBackend,
+    OpenAIBackend,
+    LocalBackend,
+    create_backend
+)
+
 from .embeddings_generator import (
     EmbeddingsGenerator,
     Neo4jEmbeddingsLoader,
@@ -42,6 +103,25 @@ __all__ = [
     'sanitize_neo4j_string',
     'batch_operation',
 
+    # Batched graph loading
+    'GraphBatchLoader',
+    'UnwindStatement',
+    'LoadStats',
+    'ChunkWriter',
+
+    # Precomputed metrics
+    'GraphMetrics',
+    'GraphMetricsReader',
+    'TTLCache',
+
+    # Interactive exploration
+    'GraphExplorer',
+    'LayoutCache',
+
+    # Offline bulk import
+    'BulkImportWriter',
+    'SchemaCatalog',
+
     # Monitoring
     'setup_logging',
     'init_monitoring',
@@ -55,10 +135,35 @@ __all__ = [
     'LegalCase',
     'extract_pdf_to_json',
 
+    # Chunking
+    'Chunk',
+    'iter_chunks',
+    'hierarchical_chunks',
+    'join_pages',
+    'count_tokens',
+    'insert_document_chunks',
+    'chunk_documents',
+
+    # LLM extraction
+    'LLMProvider',
+    'FakeProvider',
+    'create_provider',
+    'ExtractionExecutor',
+    'ExtractionTask',
+    'ResponseCache',
+
     # Embeddings & RAG
     'EmbeddingsGenerator',
     'Neo4jEmbeddingsLoader',
     'TextChunk',
     'generate_embeddings_for_cases',
-    'create_chunks_with_embeddings'
+    'create_chunks_with_embeddings',
+    'EmbeddingPipeline',
+    'EmbeddingCache',
+    'RateLimiter',
+    'StubEmbeddingClient',
+    'EmbeddingBackend',
+    'OpenAIBackend',
+    'LocalBackend',
+    'create_backend'
 ]
@@ -0,0 +1,446 @@
+"""
+Offline bulk import for Neo4j
+Writes case rows (see case_rows.py) as node and relationship CSV files for
+`neo4j-admin database import`, with headers typed from the JSON schema in
+legal-knowledge-graph/schema. Nodes are deduplicated by their generated IDs,
+so a full rebuild is one sequential pass over the source databases.
+"""
+import csv
+import json
+import shlex
+import logging
+from datetime import date, datetime
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .case_rows import case_rows, prepare_case_properties
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEMA_DIR = Path(__file__).resolve().parents[2] / "legal-knowledge-graph" / "schema"
+
+# Schema property type -> neo4j-admin header type
+IMPORT_TYPES = {
+    "string": "string",
+    "text": "string",
+    "enum": "string",
+    "integer": "long",
+    "float": "double",
+    "boolean": "boolean",
+    "date": "date",
+    "datetime": "datetime",
+    "string[]": "string[]",
+    "vector": "float[]",
+    "list<json>": "string",
+}
+
+ARRAY_DELIMITER = ";"
+
+# Non-ISO date layouts seen in the case databases ("12 March, 2020")
+DATE_FORMATS = ("%d %B, %Y", "%d %B %Y", "%d-%m-%Y", "%d/%m/%Y")
+
+
+@dataclass
+class NodeSchema:
+    """Properties of one node label, in schema order"""
+    label: str
+    id_property: Optional[str]
+    properties: Dict[str, str] = field(default_factory=dict)
+
+
+class SchemaCatalog:
+    """
+    Node and relationship property types from the JSON schema files
+
+    Both schema layouts are supported: `node_type` + `properties` mapping,
+    and `label` + `required_properties`/`optional_properties` lists.
+    """
+
+    def __init__(self, schema_dir: Path = DEFAULT_SCHEMA_DIR):
+        self.schema_dir = Path(schema_dir)
+        self.nodes: Dict[str, NodeSchema] = {}
+        self.relationships: Dict[str, Dict[str, str]] = {}
+
+        for path in sorted((self.schema_dir / "nodes").glob("*.json")):
+            node = self._parse_node(self._load(path))
+            if node:
+                self.nodes[node.label] = node
+
+        for path in sorted((self.schema_dir / "relationships").glob("*.json")):
+            data = self._load(path)
+            rel_type = data.get("relationship_type")
+            if rel_type:
+                self.relationships[rel_type] = {
+                    name: spec.get("type", "string")
+                    for name, spec in data.get("properties", {}).items()
+                }
+
+        if not self.nodes:
+            logger.warning(f"No node schemas found in {self.schema_dir}")
+
+    @staticmethod
+    def _load(path: Path) -> Dict:
+        try:
+            return json.loads(path.read_text())
+        except json.JSONDecodeError as e:
+            logger.warning(f"Skipping unreadable schema file {path.name}: {e}")
+            return {}
+
+    @staticmethod
+    def _parse_node(data: Dict) -> Optional[NodeSchema]:
+        if "node_type" in data:
+            node = NodeSchema(data["node_type"], None)
+            for name, spec in data.get("properties", {}).items():
+                node.properties[name] = spec.get("type", "string")
+                if spec.get("unique") and node.id_property is None:
+                    node.id_property = name
+            return node
+
+        if "label" in data:
+            node = NodeSchema(data["label"], None)
+            for spec in data.get("required_properties", []) + data.get("optional_properties", []):
+                node.properties[spec["name"]] = spec.get("type", "string")
+                if "UNIQUE" in spec.get("constraints", []) and node.id_property is None:
+                    node.id_property = spec["name"]
+            return node
+
+        return None
+
+    def node(self, label: str) -> NodeSchema:
+        return self.nodes.get(label) or NodeSchema(label, None)
+
+    def relationship(self, rel_type: str) -> Dict[str, str]:
+        return self.relationships.get(rel_type, {})
+
+
+@dataclass(frozen=True)
+class RowMapping:
+    """
+    How one case_rows() statement maps to a node file and a Case relationship
+
+    `extra_types` types row fields the schema does not declare; `rel_properties`
+    are constant relationship properties (the online loader sets the same).
+    """
+    statement: str
+    label: str
+    id_field: str
+    schema_label: Optional[str] = None
+    rel_type: Optional[str] = None
+    rel_schema: Optional[str] = None
+    node_properties: Tuple[Tuple[str, Any], ...] = ()
+    rel_properties: Tuple[Tuple[str, Any], ...] = ()
+    extra_types: Tuple[Tuple[str, str], ...] = ()
+
+
+# Mirrors CASE_STATEMENTS: same labels, relationship types and direction
+CASE_MAPPINGS = [
+    RowMapping("cases", "Case", "case_id",
+               extra_types=(("date", "string"), ("holding", "text"), ("facts", "text"),
+                            ("reasoning", "text"), ("year", "integer"))),
+    RowMapping("judges", "Judge", "judge_id", rel_type="DECIDED_BY",
+               extra_types=(("title", "string"),)),
+    RowMapping("courts", "Court", "court_id", rel_type="BEFORE_COURT"),
+    RowMapping("petitioners", "Party", "party_id", rel_type="PETITIONER",
+               node_properties=(("role", "Petitioner"),),
+               rel_properties=(("party_role", "Petitioner"),),
+               extra_types=(("role", "string"),)),
+    RowMapping("respondents", "Party", "party_id", rel_type="RESPONDENT",
+               node_properties=(("role", "Respondent"),),
+               rel_properties=(("party_role", "Respondent"),),
+               extra_types=(("role", "string"),)),
+    RowMapping("sections", "Section", "section_id", rel_type="APPLIES_SECTION",
+               extra_types=(("statute", "string"), ("description", "text"))),
+    RowMapping("principles", "Principle", "principle_id", schema_label="LegalPrinciple",
+               rel_type="ESTABLISHES", rel_schema="ESTABLISHES_PRINCIPLE",
+               extra_types=(("category", "string"),)),
+]
+
+# Row fields that are not node properties
+ROW_KEYS = {"case_id", "properties"}
+
+
+def _parse_date(value: Any) -> Optional[str]:
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10]).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            continue
+    return None
+
+
+def coerce(value: Any, schema_type: str) -> Optional[str]:
+    """
+    Format a value for a CSV cell of the given schema type
+
+    Returns None when the value is empty or cannot be represented as that
+    type (neo4j-admin would otherwise reject the whole line).
+    """
+    if value is None or value == "" or value == []:
+        return None
+
+    try:
+        if schema_type == "integer":
+            if isinstance(value, bool):
+                return None
+            return str(int(float(value)) if isinstance(value, str) else int(value))
+        if schema_type == "float":
+            return repr(float(value))
+        if schema_type == "boolean":
+            if isinstance(value, str):
+                lowered = value.strip().lower()
+                if lowered not in ("true", "false"):
+                    return None
+                return lowered
+            return "true" if value else "false"
+        if schema_type == "date":
+            return _parse_date(value)
+        if schema_type == "datetime":
+            if isinstance(value, datetime):
+                return value.isoformat()
+            return datetime.fromisoformat(str(value)).isoformat()
+        if schema_type in ("string[]", "vector"):
+            items = value if isinstance(value, (list, tuple)) else [value]
+            if schema_type == "vector":
+                items = [repr(float(item)) for item in items]
+            return ARRAY_DELIMITER.join(str(item).replace(ARRAY_DELIMITER, ",") for item in items)
+        if schema_type == "list<json>":
+            return value if isinstance(value, str) else json.dumps(value)
+    except (TypeError, ValueError):
+        return None
+
+    return str(value)
+
+
+class _CsvFile:
+    """One header + body CSV file"""
+
+    def __init__(self, path: Path, header: List[str]):
+        self.path = path
+        self._handle = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(header)
+        self.rows = 0
+
+    def write(self, values: List[Any]) -> None:
+        self._writer.writerow(["" if v is None else v for v in values])
+        self.rows += 1
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+@dataclass
+class ImportReport:
+    """Counts for one offline build"""
+    cases: int = 0
+    nodes: Dict[str, int] = field(default_factory=dict)
+    relationships: Dict[str, int] = field(default_factory=dict)
+    duplicate_nodes: int = 0
+    duplicate_relationships: int = 0
+    dropped_values: Dict[str, int] = field(default_factory=dict)
+
+
+class BulkImportWriter:
+    """
+    Write case rows as neo4j-admin import CSVs
+
+    One node file per label and one relationship file per type. Node IDs
+    come from case_rows() (the same generate_id() hashes the online
+    loader merges on) and each label has its own ID space.
+
+    Example:
+        with BulkImportWriter("import/") as writer:
+            writer.write_cases(cases)
+        # then: sh import/import.sh
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        schema: Optional[SchemaCatalog] = None,
+        mappings: List[RowMapping] = CASE_MAPPINGS,
+        database: str = "neo4j"
+    ):
+        self.output_dir = Path(output_dir)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.schema = schema or SchemaCatalog()
+        self.mappings = {mapping.statement: mapping for mapping in mappings}
+        self.database = database
+        self.created_at = datetime.now().isoformat()
+        self.report = ImportReport()
+
+        self._seen_nodes: Dict[str, Set[str]] = {}
+        self._seen_rels: Dict[str, Set[Tuple[str, str]]] = {}
+        self._node_files: Dict[str, _CsvFile] = {}
+        self._node_columns: Dict[str, List[Tuple[str, str]]] = {}
+        self._rel_files: Dict[str, _CsvFile] = {}
+        self._rel_columns: Dict[str, List[Tuple[str, str]]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+
+    # ------------------------------------------------------------------
+    # Headers
+
+    def _node_file(self, mapping: RowMapping) -> _CsvFile:
+        label = mapping.label
+        if label not in self._node_files:
+            node = self.schema.node(mapping.schema_label or label)
+            types = dict(node.properties)
+            for name, schema_type in mapping.extra_types:
+                types.setdefault(name, schema_type)
+
+            # Columns: every property the rows carry, typed from the schema
+            fields = self._row_fields(mapping)
+            ordered = [name for name in node.properties if name in fields]
+            ordered += [name for name in fields if name not in node.properties]
+            columns = [(name, types.get(name, "string")) for name in ordered if name != mapping.id_field]
+
+            header = [f"{mapping.id_field}:ID({label})"]
+            header += [self._header_column(name, schema_type) for name, schema_type in columns]
+            self._node_columns[label] = columns
+            self._node_files[label] = _CsvFile(self.output_dir / f"nodes_{label}.csv", header)
+        return self._node_files[label]
+
+    def _rel_file(self, mapping: RowMapping) -> _CsvFile:
+        rel_type = mapping.rel_type
+        if rel_type not in self._rel_files:
+            declared = self.schema.relationship(mapping.rel_schema or rel_type)
+            columns = [(name, schema_type) for name, schema_type in declared.items()
+                       if name == "created_at" or name in dict(mapping.rel_properties)]
+            header = [":START_ID(Case)", f":END_ID({mapping.label})"]
+            header += [self._header_column(name, schema_type) for name, schema_type in columns]
+            self._rel_columns[rel_type] = columns
+            self._rel_files[rel_type] = _CsvFile(self.output_dir / f"rels_{rel_type}.csv", header)
+        return self._rel_files[rel_type]
+
+    @staticmethod
+    def _header_column(name: str, schema_type: str) -> str:
+        import_type = IMPORT_TYPES.get(schema_type, "string")
+        return name if import_type == "string" else f"{name}:{import_type}"
+
+    @staticmethod
+    def _row_fields(mapping: RowMapping) -> List[str]:
+        if mapping.statement == "cases":
+            return list(prepare_case_properties({}))
+        sample = case_rows(_SAMPLE_CASE)[mapping.statement][0]
+        fields = [name for name in sample if name not in ROW_KEYS]
+        return fields + [name for name, _ in mapping.node_properties]
+
+    # ------------------------------------------------------------------
+    # Rows
+
+    def write_cases(self, cases: Iterable[Dict]) -> ImportReport:
+        """Write every case; returns the running report"""
+        for case in cases:
+            self.write_case(case)
+        return self.report
+
+    def write_case(self, case: Dict) -> None:
+        rows = case_rows(case)
+        self.report.cases += 1
+        for statement, statement_rows in rows.items():
+            mapping = self.mappings.get(statement)
+            if mapping is None:
+                continue
+            for row in statement_rows:
+                self._write_row(mapping, row)
+
+    def _write_row(self, mapping: RowMapping, row: Dict) -> None:
+        node_id = row[mapping.id_field]
+        properties = dict(row.get("properties", row))
+        properties.update(mapping.node_properties)
+
+        seen = self._seen_nodes.setdefault(mapping.label, set())
+        if node_id in seen:
+            self.report.duplicate_nodes += 1
+        else:
+            seen.add(node_id)
+            node_file = self._node_file(mapping)
+            values = [node_id] + [
+                self._cell(mapping.label, name, properties.get(name), schema_type)
+                for name, schema_type in self._node_columns[mapping.label]
+            ]
+            node_file.write(values)
+            self.report.nodes[mapping.label] = self.report.nodes.get(mapping.label, 0) + 1
+
+        if mapping.rel_type:
+            self._write_relationship(mapping, row["case_id"], node_id)
+
+    def _write_relationship(self, mapping: RowMapping, case_id: str, node_id: str) -> None:
+        rel_type = mapping.rel_type
+        seen = self._seen_rels.setdefault(rel_type, set())
+        if (case_id, node_id) in seen:
+            self.report.duplicate_relationships += 1
+            return
+        seen.add((case_id, node_id))
+
+        rel_file = self._rel_file(mapping)
+        properties = dict(mapping.rel_properties, created_at=self.created_at)
+        values = [case_id, node_id] + [
+            self._cell(rel_type, name, properties.get(name), schema_type)
+            for name, schema_type in self._rel_columns[rel_type]
+        ]
+        rel_file.write(values)
+        self.report.relationships[rel_type] = self.report.relationships.get(rel_type, 0) + 1
+
+    def _cell(self, owner: str, name: str, value: Any, schema_type: str) -> Optional[str]:
+        cell = coerce(value, schema_type)
+        if cell is None and value not in (None, "", []):
+            key = f"{owner}.{name}"
+            self.report.dropped_values[key] = self.report.dropped_values.get(key, 0) + 1
+        return cell
+
+    # ------------------------------------------------------------------
+    # Output
+
+    def import_command(self) -> List[str]:
+        """neo4j-admin command line for the files written so far"""
+        command = ["neo4j-admin", "database", "import", "full"]
+        command += [f"--nodes={label}={f.path.name}" for label, f in self._node_files.items()]
+        command += [f"--relationships={rel_type}={f.path.name}" for rel_type, f in self._rel_files.items()]
+        command += [f"--array-delimiter={ARRAY_DELIMITER}", "--multiline-fields=true",
+                    "--overwrite-destination=true", self.database]
+        return command
+
+    def close(self) -> None:
+        """Flush CSV files and write import.sh and report.json"""
+        for csv_file in list(self._node_files.values()) + list(self._rel_files.values()):
+            csv_file.close()
+
+        script = self.output_dir / "import.sh"
+        script.write_text(
+            "#!/bin/sh\n"
+            "# Run with the target database stopped\n"
+            'cd "$(dirname "$0")"\n'
+            + " ".join(shlex.quote(part) for part in self.import_command()) + "\n"
+        )
+        script.chmod(0o755)
+
+        (self.output_dir / "report.json").write_text(json.dumps(self.report.__dict__, indent=2))
+        logger.info(
+            f"Wrote {sum(self.report.nodes.values())} nodes and "
+            f"{sum(self.report.relationships.values())} relationships to {self.output_dir}"
+        )
+
+
+# Minimal case with one row per statement, used to read row field names
+_SAMPLE_CASE = {
+    "case_id": "sample", "judges": ["j"], "court": "c",
+    "parties": {"petitioners": ["p"], "respondents": ["r"]},
+    "sections": ["s"], "principles": ["p"],
+}
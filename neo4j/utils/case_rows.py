@@ -0,0 +1,180 @@
+"""
+Case graph rows shared by the online and offline loaders
+Turns one extracted case (LLM, PDF or database output) into rows per
+entity type. LLMGraphBuilder writes them with UNWIND statements; the
+offline importer writes the same rows as neo4j-admin CSV files, so both
+paths produce identical node IDs.
+"""
+import hashlib
+from datetime import datetime
+from typing import Dict, List
+
+from .graph_loader import UnwindStatement
+
+
+# Batched case writes (schema v3.0), in execution order
+CASE_STATEMENTS = [
+    UnwindStatement("cases", """
+        MERGE (c:Case {case_id: row.case_id})
+        SET c += row.properties
+    """),
+    UnwindStatement("judges", """
+        MERGE (j:Judge {judge_id: row.judge_id})
+        SET j.name = row.name,
+            j.title = row.title
+        WITH j, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:DECIDED_BY]->(j)
+    """),
+    UnwindStatement("courts", """
+        MERGE (court:Court {court_id: row.court_id})
+        SET court.name = row.name
+        WITH court, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:BEFORE_COURT]->(court)
+    """),
+    UnwindStatement("petitioners", """
+        MERGE (p:Party {party_id: row.party_id})
+        SET p.name = row.name, p.role = 'Petitioner'
+        WITH p, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:PETITIONER]->(p)
+    """),
+    UnwindStatement("respondents", """
+        MERGE (p:Party {party_id: row.party_id})
+        SET p.name = row.name, p.role = 'Respondent'
+        WITH p, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:RESPONDENT]->(p)
+    """),
+    UnwindStatement("sections", """
+        MERGE (s:Section {section_id: row.section_id})
+        SET s.section_number = row.section_number,
+            s.statute = row.statute,
+            s.description = row.description
+        WITH s, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:APPLIES_SECTION]->(s)
+    """),
+    UnwindStatement("principles", """
+        MERGE (p:Principle {principle_id: row.principle_id})
+        SET p.name = row.name,
+            p.description = row.description,
+            p.category = row.category
+        WITH p, row
+        MATCH (c:Case {case_id: row.case_id})
+        MERGE (c)-[:ESTABLISHES]->(p)
+    """),
+]
+
+
+def generate_id(text: str) -> str:
+    """Generate ID from text"""
+    return hashlib.md5(text.encode()).hexdigest()[:16]
+
+
+def case_rows(case: Dict) -> Dict[str, List[Dict]]:
+    """Split one case into UNWIND rows per statement"""
+    case_props = prepare_case_properties(case)
+    case_id = case_props["case_id"]
+    rows = {statement.name: [] for statement in CASE_STATEMENTS}
+
+    rows["cases"].append({"case_id": case_id, "properties": case_props})
+
+    # Judges
+    for judge in case.get("judges", case.get("llm_judges", [])):
+        if isinstance(judge, dict):
+            judge_name = judge.get("name")
+            title = judge.get("title", "Justice")
+        else:
+            judge_name = str(judge)
+            title = "Justice"
+
+        if judge_name:
+            rows["judges"].append({
+                "judge_id": generate_id(judge_name), "name": judge_name,
+                "title": title, "case_id": case_id
+            })
+
+    # Court
+    court_name = case.get("court")
+    if court_name:
+        rows["courts"].append({
+            "court_id": generate_id(court_name), "name": court_name, "case_id": case_id
+        })
+
+    # Parties
+    parties = case.get("parties", {})
+    for petitioner in parties.get("petitioners", []):
+        rows["petitioners"].append({
+            "party_id": generate_id(petitioner), "name": petitioner, "case_id": case_id
+        })
+    for respondent in parties.get("respondents", []):
+        rows["respondents"].append({
+            "party_id": generate_id(respondent), "name": respondent, "case_id": case_id
+        })
+
+    # Sections
+    for section in case.get("sections", case.get("llm_sections", [])):
+        if isinstance(section, dict):
+            section_id_str = section.get("section_id")
+            statute = section.get("statute", "Unknown")
+            description = section.get("description", "")
+        else:
+            section_id_str = str(section)
+            statute = "Unknown"
+            description = ""
+
+        if section_id_str:
+            rows["sections"].append({
+                "section_id": generate_id(section_id_str), "section_number": section_id_str,
+                "statute": statute, "description": description, "case_id": case_id
+            })
+
+    # Principles
+    for principle in case.get("principles", case.get("llm_principles", [])):
+        if isinstance(principle, dict):
+            principle_name = principle.get("name")
+            description = principle.get("description", "")
+            category = principle.get("category", "Legal Principle")
+        else:
+            principle_name = str(principle)
+            description = ""
+            category = "Legal Principle"
+
+        if principle_name:
+            rows["principles"].append({
+                "principle_id": generate_id(principle_name), "name": principle_name,
+                "description": description, "category": category, "case_id": case_id
+            })
+
+    return rows
+
+def prepare_case_properties(case: Dict) -> Dict:
+    """Prepare case properties following schema v3.0"""
+    case_id = case.get("case_id", generate_id(case.get("title", case.get("citation", "unknown"))))
+
+    return {
+        "case_id": case_id,
+        "citation": case.get("citation", ""),
+        "title": case.get("title", case.get("name", "")),
+        "date": case.get("date", case.get("case_date", "")),
+        "year": case.get("year"),
+        "jurisdiction": case.get("jurisdiction", "Bangladesh"),
+        "case_type": case.get("case_type", "Unknown"),
+        "full_text": case.get("full_text", "")[:10000],  # Limit to 10k chars
+        "summary": case.get("summary", case.get("llm_summary", case.get("snippet", ""))),
+        "holding": case.get("holding", case.get("llm_holding", "")),
+        "facts": case.get("facts", case.get("llm_facts", "")),
+        "reasoning": case.get("reasoning", case.get("llm_reasoning", "")),
+        "outcome": case.get("outcome", ""),
+        "trust_score": case.get("trust_score", case.get("confidence_score", 0.75)),
+        "authority_level": case.get("authority_level", case.get("court_type", "Unknown")),
+        "source": case.get("source", ""),
+        "extracted_at": case.get("extracted_at", datetime.now().isoformat()),
+        "extracted_by": case.get("extracted_by", "llm_extractor"),
+        "confidence_score": case.get("confidence_score", 0.75),
+        "version": 1,
+        "created_at": datetime.now().isoformat(),
+        "updated_at": datetime.now().isoformat()
+    }
@@ -0,0 +1,165 @@
+"""
+Bulk Chunk loading for Neo4j
+Writes Chunk nodes, their embeddings and their HAS_CHUNK link to the parent
+Case or Section in one UNWIND statement per batch. Embeddings are stored as
+float lists of the vector index dimension (or through
+db.create.setNodeVectorProperty), and chunk metadata as plain, queryable
+properties.
+"""
+import json
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from .graph_loader import GraphBatchLoader, LoadStats, UnwindStatement, DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# source_type -> (parent label, parent key property)
+CHUNK_PARENTS = {
+    "case": ("Case", "case_id"),
+    "section": ("Section", "section_id"),
+}
+
+# Set from the chunk itself; metadata keys with these names are ignored
+CHUNK_FIELDS = ("chunk_id", "text", "chunk_index", "source_id", "source_type", "embedding")
+
+
+def _set_embedding(vector_procedure: bool) -> str:
+    if vector_procedure:
+        # Stored as a float32 vector property; rows without an embedding keep theirs
+        return """
+            CALL {
+                WITH ch, row
+                WITH ch, row WHERE row.embedding IS NOT NULL
+                CALL db.create.setNodeVectorProperty(ch, 'embedding', row.embedding)
+            }
+        """
+    return "SET ch.embedding = coalesce(row.embedding, ch.embedding)"
+
+
+def _statement_name(source_type: Optional[str]) -> str:
+    return f"{source_type if source_type in CHUNK_PARENTS else 'other'}_chunks"
+
+
+def chunk_statement(source_type: Optional[str], vector_procedure: bool = False) -> UnwindStatement:
+    """
+    Statement writing the chunks of one source type
+
+    The chunk is merged before its parent is matched, so a chunk whose
+    parent is not in the graph yet is still written (without HAS_CHUNK).
+    """
+    link = ""
+    if source_type in CHUNK_PARENTS:
+        label, key = CHUNK_PARENTS[source_type]
+        link = f"""
+            WITH ch, row
+            MATCH (p:{label} {{{key}: row.source_id}})
+            MERGE (p)-[:HAS_CHUNK]->(ch)
+        """
+    return UnwindStatement(_statement_name(source_type), f"""
+        MERGE (ch:Chunk {{chunk_id: row.chunk_id}})
+        SET ch += row.properties,
+            ch.text = row.text,
+            ch.chunk_index = row.chunk_index,
+            ch.source_id = row.source_id,
+            ch.source_type = row.source_type
+        {_set_embedding(vector_procedure).strip()}
+        {link.strip()}
+    """)
+
+
+def _property_value(value: Any) -> Any:
+    """Neo4j property value for a metadata entry (nested values as JSON)"""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, (list, tuple)):
+        kinds = {type(item) for item in value}
+        if len(kinds) == 1 and kinds <= {str, bool, int, float}:
+            return list(value)
+    return json.dumps(value, default=str)
+
+
+def chunk_properties(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Flatten chunk metadata into Chunk node properties"""
+    properties = {}
+    for key, value in (metadata or {}).items():
+        if key in CHUNK_FIELDS:
+            continue
+        value = _property_value(value)
+        if value is not None:
+            properties[key] = value
+    return properties
+
+
+def vector_values(embedding: Optional[Sequence[float]], dimension: int) -> Optional[List[float]]:
+    """
+    Embedding as a plain float list of the index dimension
+
+    Raises:
+        ValueError: If the embedding has the wrong length
+    """
+    if embedding is None:
+        return None
+    values = [float(value) for value in embedding]
+    if len(values) != dimension:
+        raise ValueError(f"Expected a {dimension}-dimension embedding, got {len(values)}")
+    return values
+
+
+class ChunkWriter:
+    """
+    Write TextChunks to Neo4j in UNWIND batches
+
+    One write transaction per batch, with one statement per source type
+    present in the batch: MERGE the Chunk, set its properties and
+    embedding, MERGE the HAS_CHUNK edge from its parent.
+
+    Example:
+        writer = ChunkWriter(driver, database="neo4j", dimension=1536)
+        stats = writer.write(chunks)
+    """
+
+    def __init__(
+        self,
+        driver,
+        database: Optional[str] = None,
+        dimension: int = 1536,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        vector_procedure: bool = False
+    ):
+        """
+        Args:
+            driver: Neo4j driver
+            database: Database name (None for the server default)
+            dimension: Vector index dimension; other embedding sizes are rejected
+            batch_size: Chunks per transaction
+            vector_procedure: Set embeddings with db.create.setNodeVectorProperty
+                (Neo4j 5.11+) instead of a plain SET
+        """
+        self.dimension = dimension
+        self.vector_procedure = vector_procedure
+        self.loader = GraphBatchLoader(driver, database=database, batch_size=batch_size)
+        self.statements = [
+            chunk_statement(source_type, vector_procedure) for source_type in CHUNK_PARENTS
+        ] + [chunk_statement(None, vector_procedure)]
+
+    def rows(self, chunk) -> Dict[str, List[Dict[str, Any]]]:
+        """UNWIND row for one chunk, keyed by its statement"""
+        return {_statement_name(chunk.source_type): [{
+            "chunk_id": chunk.chunk_id,
+            "text": chunk.text,
+            "chunk_index": chunk.chunk_index,
+            "source_id": chunk.source_id,
+            "source_type": chunk.source_type,
+            "embedding": vector_values(chunk.embedding, self.dimension),
+            "properties": chunk_properties(chunk.metadata),
+        }]}
+
+    def write(self, chunks: Iterable) -> LoadStats:
+        """
+        Write chunks (TextChunk or anything with the same attributes)
+
+        Raises:
+            ValueError: If an embedding does not match the index dimension
+        """
+        return self.loader.load(chunks, self.rows, self.statements)
@@ -0,0 +1,490 @@
+"""
+Token-accurate text chunking for judgments and statutes
+
+One engine behind EmbeddingsGenerator.chunk_text and LLMExtractor._split_text.
+Chunks are slices of the original text, so start_char/end_char always
+satisfy text[start_char:end_char] == chunk.text, and pages are mapped from
+page start offsets. Breaks prefer section headings, then paragraphs, then
+sentences; each unit is tokenized once, so chunking is linear in the text.
+hierarchical_chunks builds a document -> section -> paragraph tree over the
+same chunks for parent-child retrieval: only the paragraphs are embedded.
+"""
+import re
+import hashlib
+import logging
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Try to import tiktoken
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+DEFAULT_ENCODING = "cl100k_base"  # text-embedding-3-* and gpt-4 family
+PAGE_BREAK = "\f"
+
+# Fallback when tiktoken (or its encoding file) is unavailable: words and
+# punctuation marks, which tracks BPE counts for English prose reasonably well
+_APPROX_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+# Statute and judgment headings: "Section 12.", "Article 21", "CHAPTER IV",
+# "Order XXXIX Rule 1", "JUDGMENT", "HELD:"
+_HEADING = (
+    r"(?:(?:Section|Sec\.|Article|Art\.|Chapter|Part|Rule|Order|Schedule)\s+[0-9IVXLC]+[A-Z]?\b"
+    r"|(?:CHAPTER|PART|SCHEDULE)\s+[0-9IVXLC]+\b"
+    r"|(?:JUDGMENT|JUDGEMENT|ORDER|FACTS|HELD|CONCLUSION|BACKGROUND|ISSUES?)\s*:?[ \t]*$)"
+)
+_HEADING_LINE = re.compile(rf"[ \t]*(?P<heading>{_HEADING})", re.MULTILINE)
+_HEADING_PARTS = re.compile(
+    r"(?P<kind>[A-Za-z.]+)\s+(?P<number>[0-9IVXLC]+[A-Z]?)\b[.:\-–— \t]*(?P<title>[^\n]*)"
+)
+
+# Block boundaries: blank lines, page breaks, or a line break before a
+# heading or a numbered paragraph ("12.", "(3)")
+_BLOCK_BREAK = re.compile(
+    rf"[ \t]*(?:\n[ \t]*\n|{PAGE_BREAK})\s*"
+    rf"|\n(?=[ \t]*(?:{_HEADING}|\d{{1,3}}\.\s|\(\d{{1,3}}\)\s))",
+    re.MULTILINE
+)
+
+# Sentence ends followed by the start of a new sentence
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?;:])\s+(?=[\"'(\[A-Z0-9])")
+
+_WORD = re.compile(r"\S+")
+
+# chunk_level values of hierarchical chunks, by depth
+LEVELS = ("document", "section", "paragraph")
+
+
+@lru_cache(maxsize=4)
+def get_encoding(name: str = DEFAULT_ENCODING):
+    """Cached tiktoken encoding, or None when it cannot be loaded"""
+    if not TIKTOKEN_AVAILABLE:
+        logger.warning("tiktoken not installed; approximating token counts. Run: pip install tiktoken")
+        return None
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception as e:
+        logger.warning(f"Could not load tiktoken encoding {name} ({e}); approximating token counts")
+        return None
+
+
+def approximate_tokens(text: str) -> int:
+    """Word-and-punctuation token estimate"""
+    return len(_APPROX_TOKEN.findall(text))
+
+
+def token_counter(encoding: str = DEFAULT_ENCODING) -> Callable[[str], int]:
+    """Token counting function for an encoding (falls back to approximate_tokens)"""
+    enc = get_encoding(encoding)
+    if enc is None:
+        return approximate_tokens
+    return lambda text: len(enc.encode(text, disallowed_special=()))
+
+
+def count_tokens(text: str, encoding: str = DEFAULT_ENCODING) -> int:
+    """Number of tokens in text"""
+    return token_counter(encoding)(text)
+
+
+@dataclass
+class Chunk:
+    """A chunk of a document, as a slice of the original text"""
+    text: str
+    chunk_index: int
+    start_char: int
+    end_char: int
+    chunk_tokens: int
+    start_page: Optional[int] = None
+    end_page: Optional[int] = None
+    section_title: Optional[str] = None
+    section_number: Optional[str] = None
+    is_heading: bool = False
+    chunk_level: Optional[str] = None
+    chunk_depth: int = 0
+    parent_index: Optional[int] = None
+    child_count: int = 0
+    context_before: Optional[str] = None
+    context_after: Optional[str] = None
+
+    @property
+    def chunk_words(self) -> int:
+        return len(_WORD.findall(self.text))
+
+    @property
+    def chunk_hash(self) -> str:
+        return hashlib.sha256(self.text.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def is_leaf(self) -> bool:
+        return self.child_count == 0
+
+    def to_document_chunk(self, chunk_level: Optional[str] = None, parent_chunk_id: Optional[int] = None) -> Dict:
+        """
+        Column values for a DocumentChunk row (data-collection schema)
+
+        Args:
+            chunk_level: Overrides the chunk's own level ("hybrid" when it has none)
+            parent_chunk_id: Row id of the parent chunk; hierarchical chunks come
+                parents first, so document_chunks.insert_document_chunks knows it
+                before inserting the child
+        """
+        return {
+            "chunk_index": self.chunk_index,
+            "chunk_text": self.text,
+            "chunk_hash": self.chunk_hash,
+            "chunk_level": chunk_level or self.chunk_level or "hybrid",
+            "start_char": self.start_char,
+            "end_char": self.end_char,
+            "start_page": self.start_page,
+            "end_page": self.end_page,
+            "chunk_tokens": self.chunk_tokens,
+            "chunk_words": self.chunk_words,
+            "chunk_chars": len(self.text),
+            "section_title": self.section_title,
+            "section_number": self.section_number,
+            "is_heading": self.is_heading,
+            "parent_chunk_id": parent_chunk_id,
+            "child_chunk_count": self.child_count,
+            "chunk_depth": self.chunk_depth,
+            "context_before": self.context_before,
+            "context_after": self.context_after,
+        }
+
+
+@dataclass
+class _Unit:
+    start: int
+    end: int
+    tokens: int
+    block_start: bool = False
+    heading: Optional[Tuple[Optional[str], Optional[str]]] = None
+
+
+def join_pages(pages: Iterable[str]) -> Tuple[str, List[int]]:
+    """
+    Join page texts with form feeds
+
+    Returns:
+        (text, page start offsets) for iter_chunks(page_offsets=...)
+    """
+    parts, offsets, position = [], [], 0
+    for page in pages:
+        offsets.append(position)
+        parts.append(page)
+        position += len(page) + len(PAGE_BREAK)
+    return PAGE_BREAK.join(parts), offsets
+
+
+def _trimmed(text: str, start: int, end: int) -> Tuple[int, int]:
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+def _blocks(text: str) -> Iterator[Tuple[int, int]]:
+    position = 0
+    for match in _BLOCK_BREAK.finditer(text):
+        start, end = _trimmed(text, position, match.start())
+        if start < end:
+            yield start, end
+        position = match.end()
+    start, end = _trimmed(text, position, len(text))
+    if start < end:
+        yield start, end
+
+
+def _heading(text: str, start: int, end: int):
+    line_end = text.find("\n", start, end)
+    line_end = end if line_end == -1 else line_end
+    match = _HEADING_LINE.match(text, start, line_end)
+    if not match:
+        return None
+    line = text[start:line_end].strip()
+    parts = _HEADING_PARTS.match(line)
+    if parts:
+        return parts.group("title").strip() or line, parts.group("number")
+    return line.rstrip(":").strip(), None
+
+
+class _Splitter:
+    def __init__(self, text: str, max_tokens: int, count: Callable[[str], int]):
+        self.text = text
+        self.max_tokens = max_tokens
+        self.count = count
+
+    def units(self) -> Iterator[_Unit]:
+        for start, end in _blocks(self.text):
+            heading = _heading(self.text, start, end)
+            first = True
+            for unit in self._block_units(start, end):
+                if first:
+                    unit.block_start = True
+                    unit.heading = heading
+                    first = False
+                yield unit
+
+    def _block_units(self, start: int, end: int) -> Iterator[_Unit]:
+        tokens = self.count(self.text[start:end])
+        if tokens <= self.max_tokens:
+            yield _Unit(start, end, tokens)
+            return
+        position = start
+        for match in _SENTENCE_BREAK.finditer(self.text, start, end):
+            yield from self._sentence_units(position, match.start())
+            position = match.end()
+        yield from self._sentence_units(position, end)
+
+    def _sentence_units(self, start: int, end: int) -> Iterator[_Unit]:
+        if start >= end:
+            return
+        tokens = self.count(self.text[start:end])
+        if tokens <= self.max_tokens:
+            yield _Unit(start, end, tokens)
+            return
+        # A run-on sentence: fall back to word windows
+        window_start, window_end, window_tokens = None, start, 0
+        for match in _WORD.finditer(self.text, start, end):
+            word_tokens = self.count(match.group())
+            if window_start is not None and window_tokens + word_tokens > self.max_tokens:
+                yield _Unit(window_start, window_end, window_tokens)
+                window_start, window_tokens = None, 0
+            if window_start is None:
+                window_start = match.start()
+            window_end = match.end()
+            window_tokens += word_tokens
+        if window_start is not None:
+            yield _Unit(window_start, window_end, window_tokens)
+
+
+def iter_chunks(
+    text: str,
+    max_tokens: int = 512,
+    overlap_tokens: int = 50,
+    page_offsets: Optional[Sequence[int]] = None,
+    first_page: int = 1,
+    encoding: str = DEFAULT_ENCODING,
+    tokenizer: Optional[Callable[[str], int]] = None
+) -> Iterator[Chunk]:
+    """
+    Yield chunks of text lazily
+
+    Units (blocks, or sentences and word windows of oversized blocks) are
+    packed greedily up to max_tokens. A section heading always starts a new
+    chunk; otherwise an overflowing chunk is cut at its last paragraph
+    boundary when that keeps it at least half full. Up to overlap_tokens of
+    trailing units are repeated at the start of the next chunk within the
+    same section.
+
+    Args:
+        text: Document text
+        max_tokens: Token budget per chunk
+        overlap_tokens: Tokens of context carried into the next chunk
+        page_offsets: Sorted start offset of each page (see join_pages);
+            derived from form feeds when omitted
+        first_page: Number of the first page
+        encoding: tiktoken encoding name
+        tokenizer: Token counting function (overrides encoding)
+
+    Yields:
+        Chunk objects in document order
+    """
+    if max_tokens < 1:
+        raise ValueError(f"max_tokens must be positive, got {max_tokens}")
+    if not text:
+        return
+
+    count = tokenizer or token_counter(encoding)
+    overlap_tokens = max(0, min(overlap_tokens, max_tokens // 2))
+    if page_offsets is None and PAGE_BREAK in text:
+        page_offsets = [0] + [m.end() for m in re.finditer(PAGE_BREAK, text)]
+
+    def page_of(offset: int) -> Optional[int]:
+        if not page_offsets:
+            return None
+        return first_page + max(0, bisect_right(page_offsets, offset) - 1)
+
+    index = 0
+    section: Tuple[Optional[str], Optional[str]] = (None, None)
+    current: List[_Unit] = []
+    carried_count = 0  # leading units of current repeated from the previous chunk
+
+    def emit(units: List[_Unit]) -> Chunk:
+        nonlocal index
+        start, end = units[0].start, units[-1].end
+        chunk_text = text[start:end]
+        chunk = Chunk(
+            text=chunk_text,
+            chunk_index=index,
+            start_char=start,
+            end_char=end,
+            chunk_tokens=count(chunk_text),
+            start_page=page_of(start),
+            end_page=page_of(end - 1),
+            section_title=section[0],
+            section_number=section[1],
+            is_heading=units[0].heading is not None and len(units) == 1,
+        )
+        index += 1
+        return chunk
+
+    def overlap_tail(units: List[_Unit]) -> List[_Unit]:
+        tail, tokens = [], 0
+        for unit in reversed(units):
+            if tokens + unit.tokens > overlap_tokens:
+                break
+            tail.append(unit)
+            tokens += unit.tokens
+        return tail[::-1]
+
+    def cost(units: List[_Unit]) -> int:
+        # Paragraph separators cost a token; spaces merge into the next word
+        return sum(u.tokens + u.block_start for u in units) - (units[0].block_start if units else 0)
+
+    current_cost = 0
+
+    for unit in _Splitter(text, max_tokens, count).units():
+        if unit.heading is not None:
+            if current:
+                yield emit(current)
+            current, carried_count, current_cost = [], 0, 0
+            section = unit.heading
+        elif current and current_cost + unit.block_start + unit.tokens > max_tokens:
+            # Cut at the last paragraph boundary that leaves the chunk half
+            # full and the remainder room for the new unit
+            cut, total, before = len(current), current_cost + unit.block_start + unit.tokens, 0
+            for position in range(1, len(current)):
+                previous = current[position - 1]
+                before += previous.tokens + (previous.block_start if position > 1 else 0)
+                # Splitting here drops the separator token at the boundary
+                if (position > carried_count
+                        and current[position].block_start
+                        and before >= max_tokens // 2
+                        and total - before - 1 <= max_tokens):
+                    cut = position
+            emitted, remainder = current[:cut], current[cut:]
+            yield emit(emitted)
+
+            carried = overlap_tail(emitted)
+            while carried and cost(carried + remainder + [unit]) > max_tokens:
+                carried.pop(0)
+            current, carried_count = carried + remainder, len(carried)
+            current_cost = cost(current)
+        current_cost += unit.tokens + (unit.block_start if current else 0)
+        current.append(unit)
+
+    if current:
+        yield emit(current)
+
+
+def _context(text: str, start: int, end: int) -> Optional[str]:
+    """text[start:end] without the words cut at its edges"""
+    start, end = max(0, start), min(len(text), end)
+    if start > 0 and not text[start - 1].isspace():
+        while start < end and not text[start].isspace():
+            start += 1
+    if end < len(text) and not text[end].isspace():
+        while end > start and not text[end - 1].isspace():
+            end -= 1
+    return text[start:end].strip() or None
+
+
+def hierarchical_chunks(
+    text: str,
+    max_tokens: int = 512,
+    context_chars: int = 200,
+    page_offsets: Optional[Sequence[int]] = None,
+    first_page: int = 1,
+    encoding: str = DEFAULT_ENCODING,
+    tokenizer: Optional[Callable[[str], int]] = None
+) -> List[Chunk]:
+    """
+    Document -> section -> paragraph chunks
+
+    The paragraphs are iter_chunks chunks without overlap (the leaves, the
+    only chunks to embed), each with up to context_chars of neighbouring text
+    in context_before / context_after. A heading starts a section; text before
+    the first heading is a section of its own. A section of one paragraph
+    and the paragraphs of a document without headings hang off the document
+    directly, so no chunk repeats its only child. Chunks are numbered in pre-order, so
+    every parent precedes its children; parent_index is the parent's
+    chunk_index.
+
+    Args:
+        text: Document text
+        max_tokens: Token budget per paragraph chunk
+        context_chars: Neighbouring characters kept on each side of a leaf
+        page_offsets: Sorted start offset of each page (see join_pages)
+        first_page: Number of the first page
+        encoding: tiktoken encoding name
+        tokenizer: Token counting function (overrides encoding)
+
+    Returns:
+        Chunks in chunk_index order, the document chunk first
+    """
+    count = tokenizer or token_counter(encoding)
+    leaves = list(iter_chunks(text, max_tokens=max_tokens, overlap_tokens=0, page_offsets=page_offsets,
+                              first_page=first_page, tokenizer=count))
+    if len(leaves) < 2:
+        for leaf in leaves:
+            leaf.chunk_level = LEVELS[-1]
+        return leaves
+
+    sections: List[List[Chunk]] = []
+    for leaf in leaves:
+        if not sections or _heading(text, leaf.start_char, leaf.end_char) is not None:
+            sections.append([])
+        sections[-1].append(leaf)
+    if len(sections) == 1 and _heading(text, leaves[0].start_char, leaves[0].end_char) is None:
+        sections = []  # no headings: paragraphs hang off the document
+
+    def parent_chunk(members: List[Chunk], level: str, parent: Optional[int], children: int) -> Chunk:
+        start, end = members[0].start_char, members[-1].end_char
+        return Chunk(
+            text=text[start:end],
+            chunk_index=0,
+            start_char=start,
+            end_char=end,
+            chunk_tokens=count(text[start:end]),
+            start_page=members[0].start_page,
+            end_page=members[-1].end_page,
+            section_title=members[0].section_title if level == "section" else None,
+            section_number=members[0].section_number if level == "section" else None,
+            chunk_level=level,
+            chunk_depth=LEVELS.index(level),
+            parent_index=parent,
+            child_count=children,
+        )
+
+    def add_leaves(members: List[Chunk], parent: Chunk):
+        for leaf in members:
+            leaf.chunk_index = len(ordered)
+            leaf.chunk_level = LEVELS[-1]
+            leaf.chunk_depth = parent.chunk_depth + 1
+            leaf.parent_index = parent.chunk_index
+            leaf.context_before = _context(text, leaf.start_char - context_chars, leaf.start_char)
+            leaf.context_after = _context(text, leaf.end_char, leaf.end_char + context_chars)
+            ordered.append(leaf)
+
+    ordered: List[Chunk] = []
+    document = parent_chunk(leaves, "document", None, len(sections) or len(leaves))
+    ordered.append(document)
+    if not sections:
+        add_leaves(leaves, document)
+    for members in sections:
+        if len(members) == 1:
+            add_leaves(members, document)  # the section would repeat its only paragraph
+            continue
+        section = parent_chunk(members, "section", document.chunk_index, len(members))
+        section.chunk_index = len(ordered)
+        ordered.append(section)
+        add_leaves(members, section)
+    return ordered
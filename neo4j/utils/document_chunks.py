@@ -0,0 +1,129 @@
+"""
+Hierarchical chunks in PostgreSQL (data-collection `document_chunks`)
+hierarchical_chunks numbers a document's chunks parents first, so
+insert_document_chunks writes them one depth at a time, each depth in a
+single INSERT ... RETURNING: every child row is inserted with the row id of
+its parent in parent_chunk_id. chunk_documents does this for documents with
+text but no chunks yet (needs migration 017 for chunk_level 'document').
+"""
+import logging
+from typing import Dict, List, Sequence, Tuple
+
+from .chunker import Chunk, DEFAULT_ENCODING, hierarchical_chunks
+
+logger = logging.getLogger(__name__)
+
+# Chunk.to_document_chunk keys, in insert order
+CHUNK_COLUMNS = (
+    "chunk_index", "chunk_text", "chunk_hash", "chunk_level", "start_char", "end_char",
+    "start_page", "end_page", "chunk_tokens", "chunk_words", "chunk_chars",
+    "section_title", "section_number", "is_heading",
+    "parent_chunk_id", "child_chunk_count", "chunk_depth", "context_before", "context_after",
+)
+
+COLUMNS = ("document_id", "country_code") + CHUNK_COLUMNS
+
+INSERT_CHUNKS = f"INSERT INTO document_chunks ({', '.join(COLUMNS)}) VALUES {{values}} RETURNING id, chunk_index"
+
+DELETE_CHUNKS = "DELETE FROM document_chunks WHERE document_id = %s AND country_code = %s"
+
+UPDATE_DOCUMENT = """
+    UPDATE documents
+    SET chunk_count = %s, chunk_strategy = 'hierarchical', embedding_status = 'pending'
+    WHERE id = %s AND country_code = %s
+"""
+
+UNCHUNKED_QUERY = r"""
+    SELECT d.id, d.country_code, c.full_text
+    FROM documents d
+    JOIN content c ON c.document_id = d.id
+    WHERE coalesce(d.chunk_count, 0) = 0 AND c.full_text ~ '\S'
+    ORDER BY d.id
+    LIMIT %s
+"""
+
+_ROW = "(" + ", ".join(["%s"] * len(COLUMNS)) + ")"
+
+
+def insert_document_chunks(cursor, document_id: int, country_code: str, chunks: Sequence[Chunk]) -> Dict[int, int]:
+    """
+    Replace the chunks of a document
+
+    Runs in the caller's transaction. Flat chunks (no parent_index) are
+    written as they are.
+
+    Args:
+        cursor: DB-API cursor (psycopg2)
+        document_id: documents.id
+        country_code: Partition key of the document
+        chunks: Chunks with parents before children (hierarchical_chunks order)
+
+    Returns:
+        chunk_index -> document_chunks.id
+
+    Raises:
+        ValueError: If a chunk's parent_index is not among the chunks
+    """
+    cursor.execute(DELETE_CHUNKS, (document_id, country_code))
+    ids: Dict[int, int] = {}
+    for depth in sorted({chunk.chunk_depth for chunk in chunks}):
+        params: List = []
+        level = [chunk for chunk in chunks if chunk.chunk_depth == depth]
+        for chunk in level:
+            parent_id = None
+            if chunk.parent_index is not None:
+                if chunk.parent_index not in ids:
+                    raise ValueError(f"Chunk {chunk.chunk_index} has no parent chunk {chunk.parent_index} "
+                                     f"at depth {depth - 1}")
+                parent_id = ids[chunk.parent_index]
+            row = chunk.to_document_chunk(parent_chunk_id=parent_id)
+            params.extend((document_id, country_code))
+            params.extend(row[column] for column in CHUNK_COLUMNS)
+        cursor.execute(INSERT_CHUNKS.format(values=", ".join([_ROW] * len(level))), params)
+        ids.update({chunk_index: row_id for row_id, chunk_index in cursor.fetchall()})
+    cursor.execute(UPDATE_DOCUMENT, (len(chunks), document_id, country_code))
+    return ids
+
+
+def chunk_documents(
+    dsn: str,
+    limit: int = 1000,
+    max_tokens: int = 512,
+    context_chars: int = 200,
+    encoding: str = DEFAULT_ENCODING
+) -> Tuple[int, int]:
+    """
+    Chunk documents that have text but no chunks, one transaction per document
+
+    Args:
+        dsn: PostgreSQL connection string
+        limit: Documents per run
+        max_tokens: Token budget per paragraph chunk
+        context_chars: Neighbouring characters kept on each side of a leaf
+        encoding: tiktoken encoding name
+
+    Returns:
+        (documents chunked, chunks written)
+    """
+    try:
+        import psycopg2
+    except ImportError:
+        raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+    documents = written = 0
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute(UNCHUNKED_QUERY, (limit,))
+            pending = cursor.fetchall()
+        for document_id, country_code, text in pending:
+            chunks = hierarchical_chunks(text, max_tokens=max_tokens, context_chars=context_chars, encoding=encoding)
+            with conn, conn.cursor() as cursor:
+                insert_document_chunks(cursor, document_id, country_code, chunks)
+            documents += 1
+            written += len(chunks)
+    finally:
+        conn.close()
+
+    logger.info(f"Wrote {written} chunks for {documents} documents")
+    return documents, written
@@ -0,0 +1,222 @@
+"""
+Embedding backends for EmbeddingsGenerator
+OpenAIBackend calls the embeddings API; LocalBackend runs a
+sentence-transformers model on CPU with length-sorted dynamic batching,
+optional int8 dynamic quantization and tokenization on a thread pool.
+"""
+import os
+import logging
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# Try to import OpenAI
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+# Try to import the local model stack
+try:
+    import torch
+    from sentence_transformers import SentenceTransformer
+    LOCAL_AVAILABLE = True
+except ImportError:
+    LOCAL_AVAILABLE = False
+
+DEFAULT_OPENAI_MODEL = "text-embedding-3-large"
+DEFAULT_LOCAL_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+# Approximate characters per token (English legal text)
+CHARS_PER_TOKEN = 4
+
+
+class EmbeddingBackend(ABC):
+    """
+    Turns texts into vectors
+
+    Implementations raise on failure; EmbeddingsGenerator decides whether
+    to fall back to zero vectors.
+    """
+    model: str
+    dimension: int
+
+    @abstractmethod
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        """Embed texts, returning vectors in input order"""
+
+
+class OpenAIBackend(EmbeddingBackend):
+    """OpenAI embeddings API"""
+
+    # Models that accept a reduced `dimensions` parameter
+    SHORTENABLE_MODELS = ("text-embedding-3-small", "text-embedding-3-large")
+
+    def __init__(self, model: str = DEFAULT_OPENAI_MODEL, api_key: Optional[str] = None,
+                 dimension: int = 1536):
+        if not OPENAI_AVAILABLE:
+            raise ImportError("OpenAI package not installed. Run: pip install openai")
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment")
+
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+        self.dimension = dimension
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        kwargs = {"dimensions": self.dimension} if self.model in self.SHORTENABLE_MODELS else {}
+        response = self.client.embeddings.create(
+            model=self.model,
+            input=texts,
+            encoding_format="float",
+            **kwargs
+        )
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+
+def plan_batches(lengths: Sequence[int], max_tokens: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group texts into padding-efficient batches
+
+    Texts are sorted by length so each batch holds similar lengths, and a
+    batch closes when (size x longest text) would exceed max_tokens.
+
+    Args:
+        lengths: Token length of each text
+        max_tokens: Padded tokens allowed per batch
+        max_batch_size: Texts allowed per batch
+
+    Returns:
+        Batches of indices into `lengths`
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+    batches: List[List[int]] = []
+    current: List[int] = []
+    longest = 0
+
+    for index in order:
+        length = max(1, lengths[index])
+        if current and (len(current) >= max_batch_size
+                        or (len(current) + 1) * max(longest, length) > max_tokens):
+            batches.append(current)
+            current, longest = [], 0
+        current.append(index)
+        longest = max(longest, length)
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+class LocalBackend(EmbeddingBackend):
+    """
+    sentence-transformers model on CPU
+
+    Example:
+        backend = LocalBackend(quantize=True)
+        generator = EmbeddingsGenerator(backend=backend)
+    """
+
+    def __init__(
+        self,
+        model: str = DEFAULT_LOCAL_MODEL,
+        device: str = "cpu",
+        quantize: bool = False,
+        max_batch_tokens: int = 16384,
+        max_batch_size: int = 128,
+        tokenizer_workers: int = 2,
+        num_threads: Optional[int] = None,
+        normalize: bool = True
+    ):
+        """
+        Args:
+            model: sentence-transformers model name or local path
+            device: Torch device
+            quantize: Apply int8 dynamic quantization to the Linear layers
+            max_batch_tokens: Padded tokens per forward pass
+            max_batch_size: Texts per forward pass
+            tokenizer_workers: Threads tokenizing upcoming batches
+            num_threads: Torch intra-op threads (default: torch's choice)
+            normalize: L2-normalize vectors (for cosine indexes)
+        """
+        if not LOCAL_AVAILABLE:
+            raise ImportError(
+                "Local embeddings need sentence-transformers. Run: pip install sentence-transformers"
+            )
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self._model = SentenceTransformer(model, device=device)
+        self._model.eval()
+        if quantize:
+            self._model = torch.quantization.quantize_dynamic(
+                self._model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+
+        self.model = model
+        self.device = device
+        self.quantized = quantize
+        self.dimension = self._model.get_sentence_embedding_dimension()
+        self.max_seq_length = self._model.max_seq_length
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.normalize = normalize
+        self._tokenizers = ThreadPoolExecutor(max_workers=tokenizer_workers)
+
+        logger.info(
+            f"Loaded local embedding model {model} ({self.dimension} dims"
+            f"{', int8' if quantize else ''}) on {device}"
+        )
+
+    def embed(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        lengths = [min(len(text) // CHARS_PER_TOKEN + 2, self.max_seq_length) for text in texts]
+        batches = plan_batches(lengths, self.max_batch_tokens, self.max_batch_size)
+
+        # Tokenize ahead on the pool while the model runs the current batch
+        pending = [self._tokenizers.submit(self._tokenize, [texts[i] for i in batch]) for batch in batches]
+
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+        with torch.inference_mode():
+            for batch, features in zip(batches, pending):
+                features = {name: tensor.to(self.device) for name, tensor in features.result().items()}
+                embeddings = self._model(features)["sentence_embedding"]
+                if self.normalize:
+                    embeddings = torch.nn.functional.normalize(embeddings, p=2, dim=1)
+                for index, vector in zip(batch, embeddings.cpu().tolist()):
+                    vectors[index] = vector
+        return vectors
+
+    def _tokenize(self, texts: List[str]):
+        return self._model.tokenize(texts)
+
+    def close(self) -> None:
+        self._tokenizers.shutdown(wait=False)
+
+
+def create_backend(name: Optional[str] = None, **kwargs) -> EmbeddingBackend:
+    """
+    Build a backend by name ('openai' or 'local')
+
+    Defaults come from the environment: EMBEDDING_BACKEND,
+    LOCAL_EMBEDDING_MODEL and EMBEDDING_QUANTIZE.
+    """
+    name = (name or os.getenv("EMBEDDING_BACKEND", "openai")).lower()
+
+    if name == "openai":
+        return OpenAIBackend(**kwargs)
+    if name == "local":
+        kwargs.pop("api_key", None)
+        kwargs.setdefault("model", os.getenv("LOCAL_EMBEDDING_MODEL", DEFAULT_LOCAL_MODEL))
+        kwargs.setdefault("quantize", os.getenv("EMBEDDING_QUANTIZE", "").lower() in ("1", "true", "yes"))
+        return LocalBackend(**kwargs)
+
+    raise ValueError(f"Unknown embedding backend: {name} (expected 'openai' or 'local')")
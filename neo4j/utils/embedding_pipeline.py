@@ -0,0 +1,394 @@
+"""
+Batched, concurrent embedding pipeline for Neo4j nodes
+Streams un-embedded nodes by keyset, skips texts already embedded (by
+content hash, in a persistent local cache), embeds the rest in concurrent
+batches within a rate budget, and writes vectors back with UNWIND.
+"""
+import os
+import time
+import array
+import hashlib
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from .graph_loader import GraphBatchLoader, UnwindStatement
+from .embeddings_generator import case_embedding_text, section_embedding_text
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("EMBEDDING_CACHE_PATH", Path(__file__).resolve().parents[1] / "cache" / "embeddings.db")
+)
+
+
+@dataclass(frozen=True)
+class EmbeddingTarget:
+    """Nodes of one label to embed, and how to build their text"""
+    label: str
+    id_property: str
+    fields: Tuple[str, ...]
+    text_for: Callable[[Dict], str]
+    embedding_property: str = "embedding"
+
+    def fetch_query(self) -> str:
+        returns = ", ".join(f"n.{name} AS {name}" for name in self.fields)
+        return f"""
+            MATCH (n:{self.label})
+            WHERE n.{self.embedding_property} IS NULL AND n.{self.id_property} > $after
+            RETURN n.{self.id_property} AS node_id, {returns}
+            ORDER BY n.{self.id_property}
+            LIMIT $limit
+        """
+
+    def write_statement(self) -> UnwindStatement:
+        return UnwindStatement(f"{self.label.lower()}_embeddings", f"""
+            MATCH (n:{self.label} {{{self.id_property}: row.id}})
+            SET n.{self.embedding_property} = row.embedding
+        """)
+
+
+CASE_TARGET = EmbeddingTarget(
+    "Case", "case_id", ("title", "summary", "facts", "holding", "reasoning"), case_embedding_text
+)
+SECTION_TARGET = EmbeddingTarget(
+    "Section", "section_id", ("section_id", "title", "description", "text"), section_embedding_text
+)
+
+
+def content_hash(model: str, text: str) -> str:
+    """Cache key: the same text embedded by the same model"""
+    return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Persistent vector cache keyed by content hash
+
+    Vectors are stored as float32 blobs in a local SQLite file, so re-running
+    a build (or embedding a reprinted judgment) costs no API calls.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                vector BLOB NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, List[float]]:
+        """Cached vectors for the given keys (missing keys are absent)"""
+        found = {}
+        keys = list(keys)
+        with self._lock:
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                )
+                for key, blob in rows:
+                    found[key] = array.array("f", blob).tolist()
+        return found
+
+    def put_many(self, model: str, items: Dict[str, List[float]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, model, dimension, vector) VALUES (?, ?, ?, ?)",
+                [(key, model, len(vector), array.array("f", vector).tobytes())
+                 for key, vector in items.items()]
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class RateLimiter:
+    """
+    Token-bucket budget shared by the worker threads
+
+    Limits requests and (approximate, 4 characters per token) input tokens
+    per minute; either limit may be None.
+    """
+
+    def __init__(self, requests_per_minute: Optional[int] = None, tokens_per_minute: Optional[int] = None):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 0) -> None:
+        """Block until one request of `tokens` tokens fits the budget"""
+        if not (self.requests_per_minute or self.tokens_per_minute):
+            return
+        if self.tokens_per_minute:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                elapsed = now - self._updated
+                self._updated = now
+                if self.requests_per_minute:
+                    self._requests = min(self.requests_per_minute,
+                                         self._requests + elapsed * self.requests_per_minute / 60)
+                if self.tokens_per_minute:
+                    self._tokens = min(self.tokens_per_minute,
+                                       self._tokens + elapsed * self.tokens_per_minute / 60)
+
+                requests_ok = not self.requests_per_minute or self._requests >= 1
+                tokens_ok = not self.tokens_per_minute or self._tokens >= tokens
+                if requests_ok and tokens_ok:
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    if self.tokens_per_minute:
+                        self._tokens -= tokens
+                    return
+
+                waits = []
+                if not requests_ok:
+                    waits.append((1 - self._requests) * 60 / self.requests_per_minute)
+                if not tokens_ok:
+                    waits.append((tokens - self._tokens) * 60 / self.tokens_per_minute)
+            time.sleep(max(waits))
+
+
+class StubEmbeddingClient:
+    """
+    Deterministic local embedding client for tests and offline benchmarks
+
+    Hashes word tokens into a fixed number of buckets and L2-normalizes, so
+    equal texts get equal vectors and similar texts similar ones. `latency`
+    simulates a remote call per batch.
+    """
+
+    def __init__(self, dimension: int = 1536, latency: float = 0.0, model: str = "stub-hashing"):
+        self.model = model
+        self.dimension = dimension
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> List[float]:
+        vector = [0.0] * self.dimension
+        for token in text.lower().split():
+            digest = hashlib.md5(token.encode("utf-8")).digest()
+            bucket = int.from_bytes(digest[:4], "little") % self.dimension
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = sum(v * v for v in vector) ** 0.5 or 1.0
+        return [v / norm for v in vector]
+
+
+@dataclass
+class EmbeddingStats:
+    """Counts for one pipeline run"""
+    nodes: int = 0
+    embedded: int = 0
+    cache_hits: int = 0
+    duplicates: int = 0
+    requests: int = 0
+    failed: int = 0
+    skipped: int = 0
+    seconds: float = 0.0
+    failed_ids: List[str] = field(default_factory=list)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+
+class EmbeddingPipeline:
+    """
+    Embed graph nodes (or plain texts) in concurrent batches
+
+    The client is anything with `model`, `dimension` and
+    `embed_batch(texts) -> vectors` that raises on failure: EmbeddingsGenerator
+    for OpenAI, or StubEmbeddingClient offline.
+
+    Example:
+        pipeline = EmbeddingPipeline(driver, EmbeddingsGenerator(), EmbeddingCache())
+        stats = pipeline.run(CASE_TARGET)
+    """
+
+    def __init__(
+        self,
+        driver,
+        client,
+        cache: Optional[EmbeddingCache] = None,
+        database: Optional[str] = None,
+        batch_size: int = 100,
+        page_size: int = 1000,
+        max_workers: int = 4,
+        rate_limiter: Optional[RateLimiter] = None,
+        max_attempts: int = 3
+    ):
+        """
+        Args:
+            driver: Neo4j driver (None for embed_texts only)
+            client: Embedding client
+            cache: Persistent vector cache (None disables caching)
+            database: Neo4j database name
+            batch_size: Texts per embedding request
+            page_size: Nodes fetched and written back per round
+            max_workers: Concurrent embedding requests
+            rate_limiter: Shared request/token budget
+            max_attempts: Attempts per request before its texts are skipped
+        """
+        self.driver = driver
+        self.client = client
+        self.cache = cache
+        self.database = database
+        self.batch_size = batch_size
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.loader = GraphBatchLoader(driver, database=database, batch_size=page_size) if driver else None
+        self._embed_with_retry = retry(
+            stop=stop_after_attempt(max_attempts),
+            wait=wait_exponential(multiplier=1, min=1, max=30),
+            reraise=True
+        )(self._embed_once)
+
+    def run(self, target: EmbeddingTarget = CASE_TARGET, limit: Optional[int] = None,
+            progress: Optional[Callable[[int], None]] = None) -> EmbeddingStats:
+        """
+        Embed every node of the target label that has no embedding yet
+
+        Returns:
+            EmbeddingStats
+        """
+        stats = EmbeddingStats()
+        started = time.time()
+        statement = target.write_statement()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for page in self._pages(target, limit):
+                stats.nodes += len(page)
+                texts = [target.text_for(record) for record in page]
+                vectors = self._embed_page(executor, texts, stats)
+
+                rows = []
+                for record, text, vector in zip(page, texts, vectors):
+                    if not text.strip():
+                        stats.skipped += 1
+                    elif vector is None:
+                        stats.failed_ids.append(record["node_id"])
+                    else:
+                        rows.append({"id": record["node_id"], "embedding": vector})
+
+                if rows:
+                    self.loader.load_rows(statement, rows)
+                stats.embedded += len(rows)
+                if progress:
+                    progress(len(page))
+
+        stats.seconds = time.time() - started
+        logger.info(
+            f"Embedded {stats.embedded}/{stats.nodes} {target.label} nodes in {stats.seconds:.1f}s "
+            f"({stats.cache_hits} cached, {stats.duplicates} duplicates, {stats.requests} requests, "
+            f"{stats.failed} failed)"
+        )
+        return stats
+
+    def embed_texts(self, texts: Sequence[str], stats: Optional[EmbeddingStats] = None) -> List[Optional[List[float]]]:
+        """
+        Embed texts without touching Neo4j
+
+        Returns:
+            One vector per text; None where the text is empty or its
+            request failed after all attempts
+        """
+        stats = stats or EmbeddingStats()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return self._embed_page(executor, list(texts), stats)
+
+    def _pages(self, target: EmbeddingTarget, limit: Optional[int]) -> Iterator[List[Dict]]:
+        after = ""
+        fetched = 0
+        query = target.fetch_query()
+        while limit is None or fetched < limit:
+            size = self.page_size if limit is None else min(self.page_size, limit - fetched)
+            with self.driver.session(database=self.database) as session:
+                page = session.execute_read(
+                    lambda tx: [dict(record) for record in tx.run(query, after=after, limit=size)]
+                )
+            if not page:
+                return
+            yield page
+            after = page[-1]["node_id"]
+            fetched += len(page)
+
+    def _embed_page(self, executor, texts: List[str], stats: EmbeddingStats) -> List[Optional[List[float]]]:
+        model = self.client.model
+        keys = [content_hash(model, text) if text.strip() else None for text in texts]
+
+        unique: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key is None:
+                continue
+            if key in unique:
+                stats.duplicates += 1
+            else:
+                unique[key] = text
+
+        vectors = self.cache.get_many(list(unique)) if self.cache is not None else {}
+        stats.cache_hits += len(vectors)
+
+        missing = [key for key in unique if key not in vectors]
+        batches = [missing[i:i + self.batch_size] for i in range(0, len(missing), self.batch_size)]
+        futures = [
+            (batch, executor.submit(self._embed_with_retry, [unique[key] for key in batch]))
+            for batch in batches
+        ]
+
+        for batch, future in futures:
+            stats.requests += 1
+            try:
+                embedded = dict(zip(batch, future.result()))
+            except Exception as e:
+                stats.failed += len(batch)
+                logger.error(f"Embedding request for {len(batch)} texts failed: {e}")
+                continue
+            vectors.update(embedded)
+            if self.cache is not None:
+                self.cache.put_many(model, embedded)
+
+        return [vectors.get(key) if key else None for key in keys]
+
+    def _embed_once(self, texts: List[str]) -> List[List[float]]:
+        self.rate_limiter.acquire(sum(len(text) for text in texts) // 4)
+        vectors = self.client.embed_batch(texts)
+        if len(vectors) != len(texts):
+            raise ValueError(f"Expected {len(texts)} embeddings, got {len(vectors)}")
+        return vectors
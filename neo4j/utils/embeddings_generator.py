@@ -1,10 +1,10 @@
 """
 Embeddings Generator for RAG-Enhanced Legal Knowledge Graph
 
-Generates embeddings using OpenAI's text-embedding-3-large model
-and creates chunk nodes for Retrieval-Augmented Generation.
+Generates embeddings with a pluggable backend (OpenAI's
+text-embedding-3-large by default, or a local CPU model) and creates
+chunk nodes for Retrieval-Augmented Generation.
 """
-import os
 import re
 from typing import List, Dict, Any, Optional
 from dataclasses import dataclass
@@ -18,15 +18,56 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Try to import OpenAI
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
+from .chunker import iter_chunks
+from .chunk_loader import ChunkWriter, vector_values
+from .graph_loader import LoadStats, DEFAULT_BATCH_SIZE
+from .embedding_backends import EmbeddingBackend, create_backend, OPENAI_AVAILABLE
+
+if not OPENAI_AVAILABLE:
     logger.warning("OpenAI not available. Install with: pip install openai")
 
 
+def case_embedding_text(case_data: Dict) -> str:
+    """Text embedded for a Case: title, summary, facts, holding, reasoning"""
+    parts = []
+
+    if case_data.get('title'):
+        parts.append(f"Title: {case_data['title']}")
+
+    if case_data.get('summary') or case_data.get('llm_summary'):
+        parts.append(f"Summary: {case_data.get('llm_summary') or case_data.get('summary')}")
+
+    if case_data.get('facts') or case_data.get('llm_facts'):
+        parts.append(f"Facts: {case_data.get('llm_facts') or case_data.get('facts')}")
+
+    if case_data.get('holding') or case_data.get('llm_holding'):
+        parts.append(f"Holding: {case_data.get('llm_holding') or case_data.get('holding')}")
+
+    if case_data.get('reasoning') or case_data.get('llm_reasoning'):
+        parts.append(f"Reasoning: {case_data.get('llm_reasoning') or case_data.get('reasoning')}")
+
+    return "\n\n".join(parts)
+
+
+def section_embedding_text(section_data: Dict) -> str:
+    """Text embedded for a Section: id, title, description, text"""
+    parts = []
+
+    if section_data.get('section_id'):
+        parts.append(f"Section: {section_data['section_id']}")
+
+    if section_data.get('title'):
+        parts.append(f"Title: {section_data['title']}")
+
+    if section_data.get('description'):
+        parts.append(f"Description: {section_data['description']}")
+
+    if section_data.get('text'):
+        parts.append(f"Text: {section_data['text']}")
+
+    return "\n\n".join(parts)
+
+
 @dataclass
 class TextChunk:
     """Represents a text chunk for embeddings"""
@@ -44,32 +85,40 @@ class EmbeddingsGenerator:
     Generate embeddings for legal documents
 
     Features:
-    - OpenAI text-embedding-3-large (1536 dimensions)
+    - OpenAI text-embedding-3-large (1536 dimensions) or a local CPU model
     - Intelligent text chunking (512 tokens, 50 overlap)
     - Batch processing
     - Multiple granularity levels (case, section, chunk)
     """
 
-    def __init__(self, model: str = "text-embedding-3-large", api_key: Optional[str] = None):
+    def __init__(
+        self,
+        model: Optional[str] = None,
+        api_key: Optional[str] = None,
+        backend: Optional[EmbeddingBackend] = None
+    ):
         """
         Initialize embeddings generator
 
         Args:
-            model: OpenAI embedding model
+            model: OpenAI embedding model (default: text-embedding-3-large)
             api_key: API key (or from environment)
+            backend: Embedding backend; when omitted, built from EMBEDDING_BACKEND
+                ('openai' by default, or 'local')
         """
-        if not OPENAI_AVAILABLE:
-            raise ImportError("OpenAI package not installed. Run: pip install openai")
-
-        api_key = api_key or os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            raise ValueError("OPENAI_API_KEY not found in environment")
+        if backend is None:
+            options = {}
+            if model:
+                options["model"] = model
+            if api_key:
+                options["api_key"] = api_key
+            backend = create_backend(**options)
 
-        self.client = OpenAI(api_key=api_key)
-        self.model = model
-        self.dimension = 1536  # text-embedding-3-large dimension
+        self.backend = backend
+        self.model = backend.model
+        self.dimension = backend.dimension
 
-        logger.info(f"Initialized embeddings generator with {model}")
+        logger.info(f"Initialized embeddings generator with {self.model} ({self.dimension} dims)")
 
     def generate_embedding(self, text: str) -> List[float]:
         """
@@ -79,7 +128,7 @@ class EmbeddingsGenerator:
             text: Input text
 
         Returns:
-            List of floats (1536 dimensions)
+            List of floats (self.dimension long)
         """
         if not text or len(text.strip()) == 0:
             logger.warning("Empty text provided, returning zero embedding")
@@ -92,13 +141,7 @@ class EmbeddingsGenerator:
             # Truncate if too long (max 8191 tokens for text-embedding-3-large)
             text = text[:32000]  # Approximate 8k tokens
 
-            response = self.client.embeddings.create(
-                model=self.model,
-                input=text,
-                encoding_format="float"
-            )
-
-            embedding = response.data[0].embedding
+            embedding = self.backend.embed([text])[0]
             logger.debug(f"Generated embedding with {len(embedding)} dimensions")
 
             return embedding
@@ -107,6 +150,21 @@ class EmbeddingsGenerator:
             logger.error(f"Failed to generate embedding: {str(e)}")
             return [0.0] * self.dimension
 
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed texts with a single backend call
+
+        Unlike generate_batch_embeddings, errors are raised rather than
+        replaced by zero vectors (used by EmbeddingPipeline, which retries).
+
+        Args:
+            texts: Input texts (at most 2048)
+
+        Returns:
+            List of embeddings, in input order
+        """
+        return self.backend.embed([self._clean_text(t)[:32000] for t in texts])
+
     def generate_batch_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
         Generate embeddings for multiple texts
@@ -130,13 +188,7 @@ class EmbeddingsGenerator:
                 # Clean texts
                 cleaned_batch = [self._clean_text(t)[:32000] for t in batch]
 
-                response = self.client.embeddings.create(
-                    model=self.model,
-                    input=cleaned_batch,
-                    encoding_format="float"
-                )
-
-                batch_embeddings = [item.embedding for item in response.data]
+                batch_embeddings = self.backend.embed(cleaned_batch)
                 embeddings.extend(batch_embeddings)
 
                 logger.info(f"Generated {len(batch_embeddings)} embeddings (batch {i//batch_size + 1})")
@@ -154,76 +206,46 @@ class EmbeddingsGenerator:
         chunk_size: int = 512,
         overlap: int = 50,
         source_id: str = "",
-        source_type: str = "case"
+        source_type: str = "case",
+        page_offsets: Optional[List[int]] = None
     ) -> List[TextChunk]:
         """
         Split text into overlapping chunks
 
         Args:
             text: Input text
-            chunk_size: Target chunk size in tokens (approximate)
+            chunk_size: Maximum chunk size in tokens
             overlap: Overlap size in tokens
             source_id: ID of source document
             source_type: Type of source
+            page_offsets: Start offset of each page, for page metadata
 
         Returns:
-            List of TextChunk objects
+            List of TextChunk objects; metadata start_pos/end_pos index into text
         """
         if not text:
             return []
 
-        # Approximate tokens by splitting on whitespace
-        # 1 token ≈ 4 characters for English
-        char_size = chunk_size * 4
-        char_overlap = overlap * 4
-
-        chunks = []
-        text = self._clean_text(text)
-
-        # Split into sentences for better chunk boundaries
-        sentences = self._split_sentences(text)
-
-        current_chunk = ""
-        chunk_index = 0
-
-        for sentence in sentences:
-            if len(current_chunk) + len(sentence) > char_size and current_chunk:
-                # Create chunk
-                chunk = TextChunk(
-                    chunk_id=f"{source_id}_chunk_{chunk_index}",
-                    text=current_chunk.strip(),
-                    chunk_index=chunk_index,
-                    source_id=source_id,
-                    source_type=source_type,
-                    metadata={
-                        "length": len(current_chunk),
-                        "start_pos": chunk_index * (char_size - char_overlap)
-                    }
-                )
-                chunks.append(chunk)
-
-                # Start new chunk with overlap
-                # Keep last few sentences for context
-                overlap_text = current_chunk[-char_overlap:] if len(current_chunk) > char_overlap else current_chunk
-                current_chunk = overlap_text + " " + sentence
-                chunk_index += 1
-            else:
-                current_chunk += " " + sentence
-
-        # Add final chunk
-        if current_chunk.strip():
-            chunk = TextChunk(
-                chunk_id=f"{source_id}_chunk_{chunk_index}",
-                text=current_chunk.strip(),
-                chunk_index=chunk_index,
+        chunks = [
+            TextChunk(
+                chunk_id=f"{source_id}_chunk_{chunk.chunk_index}",
+                text=chunk.text,
+                chunk_index=chunk.chunk_index,
                 source_id=source_id,
                 source_type=source_type,
                 metadata={
-                    "length": len(current_chunk),
-                    "start_pos": chunk_index * (char_size - char_overlap)
+                    "length": len(chunk.text),
+                    "start_pos": chunk.start_char,
+                    "end_pos": chunk.end_char,
+                    "tokens": chunk.chunk_tokens,
+                    "start_page": chunk.start_page,
+                    "end_page": chunk.end_page,
+                    "section_title": chunk.section_title
                 }
             )
-            chunks.append(chunk)
+            for chunk in iter_chunks(text, max_tokens=chunk_size, overlap_tokens=overlap,
+                                     page_offsets=page_offsets)
+        ]
 
         logger.info(f"Created {len(chunks)} chunks from {len(text)} characters")
         return chunks
@@ -238,26 +260,7 @@ class EmbeddingsGenerator:
         Returns:
             Embedding vector
         """
-        # Combine relevant fields
-        parts = []
-
-        if case_data.get('title'):
-            parts.append(f"Title: {case_data['title']}")
-
-        if case_data.get('summary') or case_data.get('llm_summary'):
-            parts.append(f"Summary: {case_data.get('llm_summary') or case_data.get('summary')}")
-
-        if case_data.get('facts') or case_data.get('llm_facts'):
-            parts.append(f"Facts: {case_data.get('llm_facts') or case_data.get('facts')}")
-
-        if case_data.get('holding') or case_data.get('llm_holding'):
-            parts.append(f"Holding: {case_data.get('llm_holding') or case_data.get('holding')}")
-
-        if case_data.get('reasoning') or case_data.get('llm_reasoning'):
-            parts.append(f"Reasoning: {case_data.get('llm_reasoning') or case_data.get('reasoning')}")
-
-        text = "\n\n".join(parts)
-        return self.generate_embedding(text)
+        return self.generate_embedding(case_embedding_text(case_data))
 
     def generate_section_embedding(self, section_data: Dict[str, Any]) -> List[float]:
         """
@@ -269,22 +272,7 @@ class EmbeddingsGenerator:
         Returns:
             Embedding vector
         """
-        parts = []
-
-        if section_data.get('section_id'):
-            parts.append(f"Section: {section_data['section_id']}")
-
-        if section_data.get('title'):
-            parts.append(f"Title: {section_data['title']}")
-
-        if section_data.get('description'):
-            parts.append(f"Description: {section_data['description']}")
-
-        if section_data.get('text'):
-            parts.append(f"Text: {section_data['text']}")
-
-        text = "\n\n".join(parts)
-        return self.generate_embedding(text)
+        return self.generate_embedding(section_embedding_text(section_data))
 
     def _clean_text(self, text: str) -> str:
         """Clean text for embedding"""
@@ -299,40 +287,48 @@ class EmbeddingsGenerator:
 
         return text.strip()
 
-    def _split_sentences(self, text: str) -> List[str]:
-        """Split text into sentences"""
-        # Simple sentence splitting
-        # This could be improved with nltk or spacy
-        sentences = re.split(r'(?<=[.!?])\s+', text)
-        return [s for s in sentences if s.strip()]
-
 
 class Neo4jEmbeddingsLoader:
     """
     Load embeddings into Neo4j
 
     Features:
-    - Create Chunk nodes
+    - Create Chunk nodes in UNWIND batches (ChunkWriter)
     - Add embedding properties to existing nodes
     - Create vector indexes
     - Link chunks to parent nodes
     """
 
-    def __init__(self, driver):
+    def __init__(
+        self,
+        driver,
+        dimension: int = 1536,
+        database: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        vector_procedure: bool = False
+    ):
         """
         Initialize loader
 
         Args:
             driver: Neo4j driver instance
+            dimension: Vector index dimension (EmbeddingsGenerator.dimension)
+            database: Database name (None for the server default)
+            batch_size: Chunks per write transaction
+            vector_procedure: Write embeddings with db.create.setNodeVectorProperty
         """
         self.driver = driver
+        self.dimension = dimension
+        self.database = database
+        self.vector_procedure = vector_procedure
+        self.chunk_writer = ChunkWriter(driver, database, dimension, batch_size, vector_procedure)
         logger.info("Initialized Neo4j embeddings loader")
 
     def create_vector_indexes(self):
         """Create vector indexes in Neo4j"""
         logger.info("Creating vector indexes...")
 
-        with self.driver.session() as session:
+        with self.driver.session(database=self.database) as session:
             # Create vector index for Case embeddings
             try:
                 session.run("""
@@ -340,10 +336,10 @@ class Neo4jEmbeddingsLoader:
                     FOR (c:Case)
                     ON c.embedding
                     OPTIONS {indexConfig: {
-                        `vector.dimensions`: 1536,
+                        `vector.dimensions`: $dimension,
                         `vector.similarity_function`: 'cosine'
                     }}
-                """)
+                """, dimension=self.dimension)
                 logger.info("✓ Created vector index for Case nodes")
             except Exception as e:
                 logger.warning(f"Case vector index might already exist: {str(e)}")
@@ -355,10 +351,10 @@ class Neo4jEmbeddingsLoader:
                     FOR (s:Section)
                     ON s.embedding
                     OPTIONS {indexConfig: {
-                        `vector.dimensions`: 1536,
+                        `vector.dimensions`: $dimension,
                         `vector.similarity_function`: 'cosine'
                     }}
-                """)
+                """, dimension=self.dimension)
                 logger.info("✓ Created vector index for Section nodes")
             except Exception as e:
                 logger.warning(f"Section vector index might already exist: {str(e)}")
@@ -370,106 +366,73 @@ class Neo4jEmbeddingsLoader:
                     FOR (ch:Chunk)
                     ON ch.embedding
                     OPTIONS {indexConfig: {
-                        `vector.dimensions`: 1536,
+                        `vector.dimensions`: $dimension,
                         `vector.similarity_function`: 'cosine'
                     }}
-                """)
+                """, dimension=self.dimension)
                 logger.info("✓ Created vector index for Chunk nodes")
             except Exception as e:
                 logger.warning(f"Chunk vector index might already exist: {str(e)}")
 
-    def load_chunks(self, chunks: List[TextChunk]):
+    def load_chunks(self, chunks: List[TextChunk]) -> LoadStats:
         """
-        Load chunks into Neo4j
+        Load chunks into Neo4j in UNWIND batches, linked to their parent nodes
 
         Args:
             chunks: List of TextChunk objects with embeddings
-        """
-        if not chunks:
-            return
 
+        Returns:
+            LoadStats
+        """
         logger.info(f"Loading {len(chunks)} chunks to Neo4j...")
-
-        with self.driver.session() as session:
-            for chunk in chunks:
-                try:
-                    session.run("""
-                        MERGE (ch:Chunk {chunk_id: $chunk_id})
-                        SET ch.text = $text,
-                            ch.chunk_index = $chunk_index,
-                            ch.source_type = $source_type,
-                            ch.embedding = $embedding,
-                            ch.metadata = $metadata
-                    """, {
-                        'chunk_id': chunk.chunk_id,
-                        'text': chunk.text,
-                        'chunk_index': chunk.chunk_index,
-                        'source_type': chunk.source_type,
-                        'embedding': chunk.embedding or [],
-                        'metadata': str(chunk.metadata)
-                    })
-
-                    # Link chunk to parent node
-                    if chunk.source_type == 'case':
-                        session.run("""
-                            MATCH (c:Case {case_id: $source_id})
-                            MATCH (ch:Chunk {chunk_id: $chunk_id})
-                            MERGE (c)-[:HAS_CHUNK]->(ch)
-                        """, {
-                            'source_id': chunk.source_id,
-                            'chunk_id': chunk.chunk_id
-                        })
-                    elif chunk.source_type == 'section':
-                        session.run("""
-                            MATCH (s:Section {section_id: $source_id})
-                            MATCH (ch:Chunk {chunk_id: $chunk_id})
-                            MERGE (s)-[:HAS_CHUNK]->(ch)
-                        """, {
-                            'source_id': chunk.source_id,
-                            'chunk_id': chunk.chunk_id
-                        })
-
-                except Exception as e:
-                    logger.error(f"Failed to load chunk {chunk.chunk_id}: {str(e)}")
-
-        logger.info(f"✓ Loaded {len(chunks)} chunks")
+        stats = self.chunk_writer.write(chunks)
+        logger.info(f"✓ Loaded {stats.loaded_records} chunks")
+        return stats
 
     def update_case_embeddings(self, case_id: str, embedding: List[float]):
         """Update embedding for a Case node"""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (c:Case {case_id: $case_id})
-                SET c.embedding = $embedding
-            """, {
-                'case_id': case_id,
-                'embedding': embedding
-            })
+        self._update_embedding("Case", "case_id", case_id, embedding)
 
     def update_section_embeddings(self, section_id: str, embedding: List[float]):
         """Update embedding for a Section node"""
-        with self.driver.session() as session:
-            session.run("""
-                MATCH (s:Section {section_id: $section_id})
-                SET s.embedding = $embedding
-            """, {
-                'section_id': section_id,
-                'embedding': embedding
-            })
+        self._update_embedding("Section", "section_id", section_id, embedding)
+
+    def _update_embedding(self, label: str, key: str, node_id: str, embedding: List[float]):
+        if self.vector_procedure:
+            query = f"""
+                MATCH (n:{label} {{{key}: $node_id}})
+                CALL db.create.setNodeVectorProperty(n, 'embedding', $embedding)
+            """
+        else:
+            query = f"""
+                MATCH (n:{label} {{{key}: $node_id}})
+                SET n.embedding = $embedding
+            """
+        with self.driver.session(database=self.database) as session:
+            session.run(query, {
+                'node_id': node_id,
+                'embedding': vector_values(embedding, self.dimension)
+            }).consume()
 
 
 # Convenience functions
-def generate_embeddings_for_cases(cases: List[Dict], api_key: Optional[str] = None) -> List[Dict]:
+def generate_embeddings_for_cases(
+    cases: List[Dict],
+    api_key: Optional[str] = None,
+    generator: Optional[EmbeddingsGenerator] = None
+) -> List[Dict]:
     """
     Generate embeddings for a list of cases
 
     Args:
         cases: List of case dictionaries
         api_key: OpenAI API key
+        generator: Existing generator to reuse (avoids reloading a local model)
 
     Returns:
         Cases with embedding field added
     """
-    generator = EmbeddingsGenerator(api_key=api_key)
+    generator = generator or EmbeddingsGenerator(api_key=api_key)
 
     for case in cases:
         embedding = generator.generate_case_embedding(case)
@@ -482,7 +445,8 @@ def create_chunks_with_embeddings(
     text: str,
     source_id: str,
     source_type: str = "case",
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    generator: Optional[EmbeddingsGenerator] = None
 ) -> List[TextChunk]:
     """
     Create text chunks and generate embeddings
@@ -492,11 +456,12 @@ def create_chunks_with_embeddings(
         source_id: Source document ID
         source_type: Type of source
         api_key: OpenAI API key
+        generator: Existing generator to reuse (avoids reloading a local model)
 
     Returns:
         List of TextChunk objects with embeddings
     """
-    generator = EmbeddingsGenerator(api_key=api_key)
+    generator = generator or EmbeddingsGenerator(api_key=api_key)
 
     # Create chunks
     chunks = generator.chunk_text(text, source_id=source_id, source_type=source_type)
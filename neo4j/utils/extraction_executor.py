@@ -0,0 +1,247 @@
+"""
+Concurrent, cached LLM extraction
+Runs extraction prompts with bounded concurrency per provider, serves
+repeated chunks from a persistent response cache keyed by (model, prompt
+template version, chunk hash), and accounts tokens and cost per run.
+"""
+import os
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from tenacity import retry, stop_after_attempt, wait_exponential
+
+from .llm_providers import Completion, LLMProvider, estimate_cost
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("LLM_CACHE_PATH", Path(__file__).resolve().parents[1] / "cache" / "llm_responses.db")
+)
+
+
+def chunk_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def response_key(model: str, prompt_version: str, text: str) -> str:
+    """Cache key: the same chunk sent to the same model with the same prompt template"""
+    return hashlib.sha256(f"{model}\x00{prompt_version}\x00{chunk_hash(text)}".encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class ExtractionTask:
+    """One prompt; `text` is the chunk it was built from (the cache identity)"""
+    text: str
+    prompt: str
+    prompt_version: str
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache
+
+    Responses are stored with their token usage in a local SQLite file, so
+    rebuilding the graph after a schema change re-reads extractions instead
+    of paying for them again.
+    """
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                response TEXT NOT NULL,
+                input_tokens INTEGER NOT NULL,
+                output_tokens INTEGER NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[Completion]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, input_tokens, output_tokens FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        return Completion(*row) if row else None
+
+    def put(self, key: str, model: str, prompt_version: str, completion: Completion) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, model, prompt_version, response, input_tokens, output_tokens, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, model, prompt_version, completion.text,
+                 completion.input_tokens, completion.output_tokens, time.time())
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+@dataclass
+class ExtractionStats:
+    """Calls, tokens and cost for one or more executor runs"""
+    tasks: int = 0
+    requests: int = 0
+    cache_hits: int = 0
+    duplicates: int = 0
+    misses: int = 0
+    failed: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    saved_usd: float = 0.0
+    seconds: float = 0.0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    def summary(self) -> str:
+        return (
+            f"{self.tasks} prompts: {self.requests} requests, {self.cache_hits} cached, "
+            f"{self.duplicates} duplicates, {self.misses} replay misses, {self.failed} failed; "
+            f"{self.input_tokens} in / {self.output_tokens} out tokens, "
+            f"${self.cost_usd:.4f} spent, ${self.saved_usd:.4f} saved by cache ({self.seconds:.1f}s)"
+        )
+
+
+class ExtractionExecutor:
+    """
+    Run extraction prompts concurrently through one provider
+
+    At most `max_concurrency` requests are in flight; provider calls run
+    on worker threads since the provider SDKs are synchronous. Identical
+    chunks within a run share one request. In replay mode only the cache
+    is consulted and misses come back as None.
+
+    Example:
+        executor = ExtractionExecutor(create_provider("gpt-4o"), ResponseCache())
+        completions = executor.run(tasks)
+        print(executor.stats.summary())
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        cache: Optional[ResponseCache] = None,
+        max_concurrency: Optional[int] = None,
+        replay: bool = False,
+        max_attempts: int = 3,
+        validate: Optional[Callable[[str], bool]] = None
+    ):
+        """
+        Args:
+            provider: LLM provider
+            cache: Persistent response cache (None disables caching)
+            max_concurrency: Requests in flight (default: the provider's)
+            replay: Serve from the cache only, never call the provider
+            max_attempts: Attempts per request before it counts as failed
+            validate: Responses failing this check are returned but not cached
+        """
+        if replay and cache is None:
+            raise ValueError("replay mode needs a response cache")
+
+        self.provider = provider
+        self.cache = cache
+        self.max_concurrency = max_concurrency or provider.max_concurrency
+        self.replay = replay
+        self.validate = validate
+        self.stats = ExtractionStats()
+        self._lock = threading.Lock()
+        self._complete = retry(
+            stop=stop_after_attempt(max_attempts),
+            wait=wait_exponential(multiplier=1, min=1, max=30),
+            reraise=True
+        )(self._complete_once)
+
+    def run(self, tasks: Sequence[ExtractionTask]) -> List[Optional[Completion]]:
+        """
+        Run tasks and wait for all of them
+
+        Returns:
+            One Completion per task, in order; None where the request failed
+            after all attempts or (in replay mode) the cache had no entry
+        """
+        return asyncio.run(self.arun(tasks))
+
+    async def arun(self, tasks: Sequence[ExtractionTask]) -> List[Optional[Completion]]:
+        """Async form of run() for callers already inside an event loop"""
+        started = time.time()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        pending: Dict[str, asyncio.Future] = {}
+        jobs = []
+
+        for task in tasks:
+            key = response_key(self.provider.model, task.prompt_version, task.text)
+            if key in pending:
+                self._count(duplicates=1)
+            else:
+                pending[key] = asyncio.ensure_future(self._resolve(key, task, semaphore))
+            jobs.append(pending[key])
+
+        results = await asyncio.gather(*jobs)
+        self._count(tasks=len(tasks), seconds=time.time() - started)
+        return list(results)
+
+    async def _resolve(self, key: str, task: ExtractionTask,
+                       semaphore: asyncio.Semaphore) -> Optional[Completion]:
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self._count(
+                    cache_hits=1,
+                    saved_usd=estimate_cost(self.provider.model, cached.input_tokens, cached.output_tokens)
+                )
+                return cached
+        if self.replay:
+            logger.warning(f"Replay: no cached response for chunk {chunk_hash(task.text)[:12]}")
+            self._count(misses=1)
+            return None
+
+        async with semaphore:
+            try:
+                completion = await self._complete(task.prompt)
+            except Exception as e:
+                logger.error(f"LLM request failed: {str(e)}")
+                self._count(failed=1)
+                return None
+
+        self._count(
+            requests=1,
+            input_tokens=completion.input_tokens,
+            output_tokens=completion.output_tokens,
+            cost_usd=estimate_cost(self.provider.model, completion.input_tokens, completion.output_tokens)
+        )
+        if self.cache is not None and (self.validate is None or self.validate(completion.text)):
+            self.cache.put(key, self.provider.model, task.prompt_version, completion)
+        return completion
+
+    async def _complete_once(self, prompt: str) -> Completion:
+        return await asyncio.to_thread(self.provider.complete, prompt)
+
+    def _count(self, **amounts) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self.stats, name, getattr(self.stats, name) + amount)
@@ -0,0 +1,314 @@
+"""
+On-demand subgraphs for interactive exploration
+Serves ego networks and k-hop neighbourhoods instead of the whole graph:
+each hop keeps only the highest-degree neighbours of every frontier node
+(degree-based sampling), every node reports how many of its relationships
+are still hidden, and expand() adds one node's next neighbours around the
+nodes already on screen. Layouts are computed server-side and cached per
+subgraph.
+"""
+import logging
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from .graph_layout import LayoutCache, Position
+from .graph_metrics import TTLCache, DEFAULT_TTL
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NEIGHBOURS = 25
+DEFAULT_MAX_NODES = 300
+MAX_HOPS = 3
+
+# Neighbours scanned per node before ranking by degree (bounds work on hubs)
+SCAN_LIMIT = 2000
+
+# Large properties never sent to the browser
+HIDDEN_PROPERTIES = ("embedding", "text", "full_text", "snippet", "metadata")
+
+DISPLAY_PROPERTIES = ("name", "title", "citation", "section_id", "case_id")
+
+_PROJECTION = "{.*, " + ", ".join(f"{name}: null" for name in HIDDEN_PROPERTIES) + "}"
+
+NODE_QUERY = f"""
+    MATCH (n) WHERE elementId(n) = $node_id
+    RETURN elementId(n) AS id, labels(n) AS labels, COUNT {{ (n)--() }} AS degree,
+           n {_PROJECTION} AS properties
+"""
+
+NEIGHBOURS_QUERY = f"""
+    UNWIND $frontier AS node_id
+    MATCH (n) WHERE elementId(n) = node_id
+    CALL {{
+        WITH n
+        MATCH (n)-[r]-(m)
+        WHERE NOT elementId(m) IN $exclude
+          AND ($labels IS NULL OR any(label IN labels(m) WHERE label IN $labels))
+          AND ($types IS NULL OR type(r) IN $types)
+        WITH r, m LIMIT $scan_limit
+        WITH r, m, COUNT {{ (m)--() }} AS degree
+        ORDER BY degree DESC
+        LIMIT $limit
+        RETURN collect({{
+            id: elementId(r), type: type(r),
+            source: elementId(startNode(r)), target: elementId(endNode(r)),
+            node: {{id: elementId(m), labels: labels(m), degree: degree, properties: m {_PROJECTION}}}
+        }}) AS neighbours
+    }}
+    RETURN node_id, neighbours
+"""
+
+# Labels a seed list may be requested for (interpolated into SEEDS_QUERY)
+SEED_LABELS = ("Case", "Court", "Judge", "Statute", "Section", "Party", "Principle", "Topic")
+
+_SEED_RETURN = """
+    RETURN elementId(n) AS id, labels(n) AS labels, COUNT { (n)--() } AS degree,
+           n {.name, .title, .citation, .section_id, .case_id} AS properties
+"""
+
+# Top cases by PageRank authority, read in order from the case_authority
+# index written with the graph metrics (degree only for the returned rows)
+AUTHORITY_SEEDS_QUERY = """
+    MATCH (n:Case) WHERE n.authority IS NOT NULL
+    WITH n ORDER BY n.authority DESC
+    LIMIT $limit
+""" + _SEED_RETURN
+
+# Best connected nodes of one label (label scan; for labels without authority)
+SEEDS_QUERY = """
+    MATCH (n:{label})
+    WITH n, COUNT {{ (n)--() }} AS degree
+    ORDER BY degree DESC
+    LIMIT $limit
+    RETURN elementId(n) AS id, labels(n) AS labels, degree,
+           n {{.name, .title, .citation, .section_id, .case_id}} AS properties
+"""
+
+
+@dataclass
+class GraphNode:
+    """A node as sent to the browser"""
+    id: str
+    label: str
+    name: str
+    degree: int
+    properties: Dict[str, Any] = field(default_factory=dict)
+    hidden: int = 0
+    x: Optional[float] = None
+    y: Optional[float] = None
+
+
+@dataclass
+class GraphEdge:
+    id: str
+    source: str
+    target: str
+    type: str
+
+
+@dataclass
+class Subgraph:
+    """Nodes, edges and positions for one request"""
+    nodes: List[GraphNode] = field(default_factory=list)
+    edges: List[GraphEdge] = field(default_factory=list)
+    root: Optional[str] = None
+    truncated: bool = False
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+
+def _node(record: Dict) -> GraphNode:
+    properties = {key: value for key, value in (record.get("properties") or {}).items() if value is not None}
+    labels = record.get("labels") or []
+    label = labels[0] if labels else "Node"
+    name = next((str(properties[key]) for key in DISPLAY_PROPERTIES if properties.get(key)), label)
+    return GraphNode(record["id"], label, name, record.get("degree") or 0, properties)
+
+
+class GraphExplorer:
+    """
+    Bounded subgraph queries for the visualization API
+
+    Example:
+        explorer = GraphExplorer(driver, database="neo4j")
+        view = explorer.ego(case_node_id, hops=2)
+        more = explorer.expand(node_id, shown=[n.id for n in view.nodes])
+    """
+
+    def __init__(
+        self,
+        driver,
+        database: Optional[str] = None,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        ttl: float = DEFAULT_TTL,
+        layouts: Optional[LayoutCache] = None
+    ):
+        """
+        Args:
+            driver: Neo4j driver
+            database: Database name (None for the server default)
+            max_nodes: Upper bound on nodes per response
+            ttl: Seconds a neighbourhood response is reused
+            layouts: Layout cache (shared between explorers if given)
+        """
+        self.driver = driver
+        self.database = database
+        self.max_nodes = max_nodes
+        self.layouts = layouts or LayoutCache()
+        self.responses = TTLCache(ttl)
+
+    def node(self, node_id: str) -> Optional[GraphNode]:
+        records = self._run(NODE_QUERY, node_id=node_id)
+        return _node(records[0]) if records else None
+
+    def seeds(self, label: str = "Case", limit: int = 20) -> List[GraphNode]:
+        """
+        Starting points: the most authoritative (else best connected) nodes of a label
+
+        Cases come from the authority index once graph metrics have been
+        written; other labels, and cases before that, by degree.
+
+        Raises:
+            ValueError: If label is not one of SEED_LABELS
+        """
+        if label not in SEED_LABELS:
+            raise ValueError(f"Unknown seed label {label!r} (expected one of: {', '.join(SEED_LABELS)})")
+        return self.responses.get_or_load(("seeds", label, limit), lambda: self._seeds(label, limit))
+
+    def _seeds(self, label: str, limit: int) -> List[GraphNode]:
+        records = self._run(AUTHORITY_SEEDS_QUERY, limit=limit) if label == "Case" else []
+        if not records:
+            records = self._run(SEEDS_QUERY.format(label=label), limit=limit)
+        return [_node(record) for record in records]
+
+    def ego(
+        self,
+        node_id: str,
+        hops: int = 1,
+        limit: int = DEFAULT_NEIGHBOURS,
+        labels: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None
+    ) -> Optional[Subgraph]:
+        """
+        k-hop neighbourhood of a node, sampled by degree
+
+        Args:
+            node_id: Element ID of the centre node
+            hops: Neighbourhood radius (1 is the ego network), at most MAX_HOPS
+            limit: Neighbours kept per node and hop (highest degree first)
+            labels: Only neighbours with one of these labels
+            types: Only relationships of these types
+
+        Returns:
+            Subgraph with positions, or None if the node does not exist
+        """
+        hops = max(1, min(hops, MAX_HOPS))
+        key = ("ego", node_id, hops, limit, tuple(labels or ()), tuple(types or ()))
+        return self.responses.get_or_load(key, lambda: self._ego(node_id, hops, limit, labels, types))
+
+    def expand(
+        self,
+        node_id: str,
+        shown: Sequence[str] = (),
+        positions: Optional[Dict[str, Position]] = None,
+        limit: int = DEFAULT_NEIGHBOURS,
+        labels: Optional[Sequence[str]] = None,
+        types: Optional[Sequence[str]] = None
+    ) -> Subgraph:
+        """
+        Next neighbours of one node that are not on screen yet
+
+        Args:
+            node_id: Element ID of the node to expand
+            shown: Element IDs already displayed (excluded from the result)
+            positions: Current positions of displayed nodes; they stay put
+                and the new nodes are laid out around them
+
+        Returns:
+            Subgraph with only the new nodes and their edges
+        """
+        exclude = list(shown) + [node_id]
+        hits = self._neighbours([node_id], exclude, limit, labels, types)
+        subgraph = Subgraph(root=node_id)
+        self._add_hits(subgraph, hits, {node_id}, self.max_nodes)
+
+        # Lay out new nodes together with the expanded node (and any pinned positions)
+        pinned = dict(positions or {})
+        node_ids = [node_id] + [node.id for node in subgraph.nodes]
+        self._place(subgraph, node_ids, pinned)
+        return subgraph
+
+    def _ego(self, node_id, hops, limit, labels, types) -> Optional[Subgraph]:
+        centre = self.node(node_id)
+        if centre is None:
+            return None
+
+        subgraph = Subgraph(nodes=[centre], root=node_id)
+        seen = {node_id}
+        frontier = [node_id]
+        for _ in range(hops):
+            room = self.max_nodes - len(seen)
+            if not frontier or room <= 0:
+                break
+            hits = self._neighbours(frontier, list(seen), limit, labels, types)
+            frontier = self._add_hits(subgraph, hits, seen, room)
+
+        self._place(subgraph, [node.id for node in subgraph.nodes], {})
+        logger.debug(f"Ego network of {node_id}: {len(subgraph.nodes)} nodes, {len(subgraph.edges)} edges")
+        return subgraph
+
+    def _neighbours(self, frontier, exclude, limit, labels, types) -> List[Dict]:
+        records = self._run(
+            NEIGHBOURS_QUERY, frontier=list(frontier), exclude=list(exclude), limit=limit,
+            scan_limit=SCAN_LIMIT, labels=list(labels) if labels else None,
+            types=list(types) if types else None
+        )
+        return [hit for record in records for hit in record["neighbours"]]
+
+    @staticmethod
+    def _add_hits(subgraph: Subgraph, hits: List[Dict], seen: set, room: int) -> List[str]:
+        """Add sampled neighbours (up to `room` new nodes); returns the new node IDs"""
+        added = []
+        edge_ids = {edge.id for edge in subgraph.edges}
+        for hit in hits:
+            neighbour = hit["node"]
+            if neighbour["id"] not in seen:
+                if len(added) >= room:
+                    subgraph.truncated = True
+                    continue
+                seen.add(neighbour["id"])
+                subgraph.nodes.append(_node(neighbour))
+                added.append(neighbour["id"])
+            if hit["id"] not in edge_ids:
+                edge_ids.add(hit["id"])
+                subgraph.edges.append(GraphEdge(hit["id"], hit["source"], hit["target"], hit["type"]))
+        return added
+
+    @staticmethod
+    def _count_hidden(subgraph: Subgraph) -> None:
+        shown = {}
+        for edge in subgraph.edges:
+            shown[edge.source] = shown.get(edge.source, 0) + 1
+            shown[edge.target] = shown.get(edge.target, 0) + 1
+        for node in subgraph.nodes:
+            node.hidden = max(0, node.degree - shown.get(node.id, 0))
+
+    def _place(self, subgraph: Subgraph, node_ids: List[str], pinned: Dict[str, Position]) -> None:
+        self._count_hidden(subgraph)
+        edges = [(edge.source, edge.target) for edge in subgraph.edges]
+        positions = self.layouts.layout(node_ids, edges, pinned)
+        for node in subgraph.nodes:
+            node.x, node.y = positions.get(node.id, (None, None))
+
+    def warm(self, label: str = "Case", count: int = 20, hops: int = 1) -> int:
+        """Precompute ego networks (and their layouts) for the top seed nodes"""
+        seeds = self.seeds(label, count)
+        for seed in seeds:
+            self.ego(seed.id, hops=hops)
+        logger.info(f"Precomputed {len(seeds)} {label} neighbourhoods ({len(self.layouts)} layouts cached)")
+        return len(seeds)
+
+    def _run(self, query: str, **params) -> List[Dict]:
+        with self.driver.session(database=self.database) as session:
+            return [record.data() for record in session.run(query, **params)]
@@ -0,0 +1,149 @@
+"""
+Server-side graph layout
+Force-directed (Fruchterman-Reingold) positions for the small subgraphs the
+explorer serves, with pinned nodes for incremental expansion, and an LRU
+cache keyed by subgraph structure so a neighbourhood is laid out once.
+"""
+import zlib
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+Position = Tuple[float, float]
+
+# Layout units to output coordinates (vis-network pixels)
+SCALE = 1000.0
+
+
+def _seeded_position(node_id: str) -> np.ndarray:
+    """Deterministic start position per node, so equal inputs give equal layouts"""
+    rng = np.random.default_rng(zlib.crc32(node_id.encode("utf-8")))
+    return rng.uniform(-1.0, 1.0, 2)
+
+
+def force_layout(
+    node_ids: Sequence[str],
+    edges: Iterable[Tuple[str, str]],
+    pinned: Optional[Dict[str, Position]] = None,
+    iterations: int = 60,
+    scale: float = SCALE
+) -> Dict[str, Position]:
+    """
+    Lay out a subgraph
+
+    Args:
+        node_ids: Nodes to place
+        edges: (source, target) pairs; pairs with unknown nodes are ignored
+        pinned: Fixed positions (output coordinates) for nodes already on
+            screen; new nodes start next to a pinned neighbour
+        iterations: Simulation steps
+        scale: Output coordinates per layout unit
+
+    Returns:
+        {node id: (x, y)}
+    """
+    n = len(node_ids)
+    if n == 0:
+        return {}
+
+    index = {node_id: i for i, node_id in enumerate(node_ids)}
+    pinned = {node_id: pos for node_id, pos in (pinned or {}).items() if node_id in index}
+    pairs = np.array(
+        [(index[s], index[t]) for s, t in edges if s in index and t in index and s != t],
+        dtype=int
+    ).reshape(-1, 2)
+
+    position = np.array([_seeded_position(node_id) for node_id in node_ids])
+    fixed = np.zeros(n, dtype=bool)
+    for node_id, (x, y) in pinned.items():
+        position[index[node_id]] = (x / scale, y / scale)
+        fixed[index[node_id]] = True
+
+    # Start new nodes beside a pinned neighbour so expansions grow outward
+    if fixed.any():
+        for s, t in pairs:
+            for new, anchor in ((s, t), (t, s)):
+                if fixed[anchor] and not fixed[new]:
+                    position[new] = position[anchor] + 0.05 * _seeded_position(node_ids[new])
+
+    if n == 1 or fixed.all():
+        return {node_id: (float(x * scale), float(y * scale)) for node_id, (x, y) in zip(node_ids, position)}
+
+    k = np.sqrt(4.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        delta = position[:, None, :] - position[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 1e-3)
+        displacement = np.einsum("ijk,ij->ik", delta, k * k / distance ** 2)
+
+        if len(pairs):
+            edge_delta = position[pairs[:, 0]] - position[pairs[:, 1]]
+            edge_distance = np.maximum(np.linalg.norm(edge_delta, axis=-1), 1e-3)
+            pull = edge_delta * (edge_distance / k)[:, None]
+            np.add.at(displacement, pairs[:, 0], -pull)
+            np.add.at(displacement, pairs[:, 1], pull)
+
+        length = np.maximum(np.linalg.norm(displacement, axis=-1), 1e-9)
+        step = displacement * (np.minimum(length, temperature) / length)[:, None]
+        step[fixed] = 0.0
+        position += step
+        temperature -= cooling
+
+    return {node_id: (float(x * scale), float(y * scale)) for node_id, (x, y) in zip(node_ids, position)}
+
+
+def layout_key(
+    node_ids: Iterable[str],
+    edges: Iterable[Tuple[str, str]],
+    pinned: Optional[Dict[str, Position]] = None
+) -> str:
+    """Cache key for one subgraph structure (and its pinned positions)"""
+    digest = hashlib.sha1()
+    for node_id in sorted(node_ids):
+        digest.update(f"n{node_id}\x00".encode("utf-8"))
+    for source, target in sorted(edges):
+        digest.update(f"e{source}\x00{target}\x00".encode("utf-8"))
+    for node_id, (x, y) in sorted((pinned or {}).items()):
+        digest.update(f"p{node_id}\x00{round(x)}\x00{round(y)}\x00".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class LayoutCache:
+    """Thread-safe LRU cache of computed layouts"""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Position]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def layout(
+        self,
+        node_ids: List[str],
+        edges: List[Tuple[str, str]],
+        pinned: Optional[Dict[str, Position]] = None
+    ) -> Dict[str, Position]:
+        """Layout for the subgraph, computed on the first request only"""
+        key = layout_key(node_ids, edges, pinned)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+
+        positions = force_layout(node_ids, edges, pinned)
+        with self._lock:
+            self._entries[key] = positions
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return positions
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,203 @@
+"""
+Batched graph loading for Neo4j
+Groups records into batches and writes each entity type with a single
+parameterized UNWIND statement per batch, inside one retried write transaction.
+"""
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from neo4j.exceptions import Neo4jError
+
+from .error_handling import neo4j_retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+Rows = Dict[str, List[Dict[str, Any]]]
+
+
+@dataclass(frozen=True)
+class UnwindStatement:
+    """
+    One entity/relationship write, applied to every row of a batch
+
+    The Cypher body refers to the current row as `row`; it is prefixed
+    with `UNWIND $rows AS row` when executed.
+
+    Example:
+        JUDGES = UnwindStatement("judges", '''
+            MERGE (j:Judge {name: row.name})
+            WITH j, row
+            MATCH (c:Case {id: row.case_id})
+            MERGE (c)-[:DECIDED_BY]->(j)
+        ''')
+    """
+    name: str
+    cypher: str
+
+    @property
+    def query(self) -> str:
+        return f"UNWIND $rows AS row\n{self.cypher.strip()}"
+
+
+@dataclass
+class LoadStats:
+    """Counts for one GraphBatchLoader.load() call"""
+    records: int = 0
+    batches: int = 0
+    failed_records: int = 0
+    rows: Dict[str, int] = field(default_factory=dict)
+    seconds: float = 0.0
+
+    @property
+    def loaded_records(self) -> int:
+        return self.records - self.failed_records
+
+
+def _chunks(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class GraphBatchLoader:
+    """
+    Load records into Neo4j with UNWIND batches
+
+    Each batch of records becomes one write transaction with one statement
+    per entity type, so the round trips per batch equal the number of
+    statements rather than the number of entities. Transient failures are
+    retried by the driver's managed transaction; lost connections are
+    retried by neo4j_retry.
+
+    Example:
+        loader = GraphBatchLoader(driver, database="neo4j", batch_size=500)
+        stats = loader.load(cases, case_rows, [CASES, JUDGES, COURTS])
+    """
+
+    def __init__(
+        self,
+        driver,
+        database: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_attempts: int = 3,
+        skip_failed: bool = False
+    ):
+        """
+        Args:
+            driver: Neo4j driver
+            database: Database name (None for the server default)
+            batch_size: Records per transaction
+            max_attempts: Attempts per batch on connection errors
+            skip_failed: On a non-transient error, reload the batch one record
+                at a time and skip the records that still fail, instead of raising
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be positive, got {batch_size}")
+
+        self.driver = driver
+        self.database = database
+        self.batch_size = batch_size
+        self.skip_failed = skip_failed
+        self._write = neo4j_retry(max_attempts=max_attempts)(self._write_once)
+
+    def load(
+        self,
+        records: Iterable[Any],
+        rows_for: Callable[[Any], Rows],
+        statements: Sequence[UnwindStatement],
+        progress: Optional[Callable[[int], None]] = None
+    ) -> LoadStats:
+        """
+        Load records in batches
+
+        Args:
+            records: Source records (cases, sections, ...)
+            rows_for: Maps one record to {statement name: [row, ...]}
+            statements: Statements in execution order (nodes before the
+                relationships that MATCH them)
+            progress: Called with the number of records after each batch
+
+        Returns:
+            LoadStats
+        """
+        names = {statement.name for statement in statements}
+        stats = LoadStats(rows={statement.name: 0 for statement in statements})
+        started = time.time()
+
+        for batch in _chunks(records, self.batch_size):
+            per_record = [rows_for(record) for record in batch]
+            for rows in per_record:
+                unknown = set(rows) - names
+                if unknown:
+                    raise ValueError(f"Rows for unknown statements: {sorted(unknown)}")
+
+            stats.records += len(batch)
+            stats.batches += 1
+            try:
+                self._write(statements, self._merge_rows(per_record, statements))
+            except Neo4jError as e:
+                if not self.skip_failed:
+                    raise
+                logger.warning(f"Batch {stats.batches} failed ({e}); retrying record by record")
+                per_record = self._load_individually(per_record, statements, stats)
+            self._count_rows(stats, per_record)
+
+            if progress:
+                progress(len(batch))
+
+        stats.seconds = time.time() - started
+        logger.info(
+            f"Loaded {stats.loaded_records}/{stats.records} records in {stats.batches} batches "
+            f"({stats.seconds:.1f}s)"
+        )
+        return stats
+
+    def load_rows(self, statement: UnwindStatement, rows: Iterable[Dict[str, Any]]) -> LoadStats:
+        """Load plain rows with a single statement"""
+        return self.load(rows, lambda row: {statement.name: [row]}, [statement])
+
+    def _load_individually(self, per_record: List[Rows], statements, stats: LoadStats) -> List[Rows]:
+        loaded = []
+        for rows in per_record:
+            try:
+                self._write(statements, rows)
+                loaded.append(rows)
+            except Neo4jError as e:
+                stats.failed_records += 1
+                logger.error(f"Skipping record: {e}")
+        return loaded
+
+    @staticmethod
+    def _merge_rows(per_record: List[Rows], statements) -> Rows:
+        merged = {statement.name: [] for statement in statements}
+        for rows in per_record:
+            for name, statement_rows in rows.items():
+                merged[name].extend(statement_rows)
+        return merged
+
+    @staticmethod
+    def _count_rows(stats: LoadStats, per_record: List[Rows]) -> None:
+        for rows in per_record:
+            for name, statement_rows in rows.items():
+                stats.rows[name] += len(statement_rows)
+
+    def _write_once(self, statements: Sequence[UnwindStatement], rows: Rows) -> None:
+        work = [(s.query, rows[s.name]) for s in statements if rows.get(s.name)]
+        if not work:
+            return
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self._run_statements, work)
+
+    @staticmethod
+    def _run_statements(tx, work) -> None:
+        for query, rows in work:
+            tx.run(query, rows=rows).consume()
@@ -0,0 +1,466 @@
+"""
+Precomputed graph metrics
+Entity counts from the Neo4j count store, citation in/out degree and
+PageRank authority for Case nodes, and per-court aggregates. The metrics
+job writes them onto the nodes (and optionally to PostgreSQL), so
+statistics and dashboards read properties instead of scanning the graph;
+GraphMetricsReader serves them through a TTL cache.
+"""
+import time
+import logging
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .case_rows import generate_id
+from .graph_loader import GraphBatchLoader, UnwindStatement, DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Case -> Case relationships that count as a citation
+CITATION_RELATIONSHIPS = ("CITES_PRECEDENT", "OVERRULES", "AFFIRMS", "DISTINGUISHES")
+
+# Bookkeeping nodes left out of the label counts
+INTERNAL_LABELS = ("GraphStats", "SyncState")
+
+DEFAULT_TTL = 300
+
+CASE_METRICS = UnwindStatement("case_metrics", """
+    MATCH (c:Case) WHERE elementId(c) = row.node
+    SET c.cited_by_count = row.cited_by_count,
+        c.cites_count = row.cites_count,
+        c.authority = row.authority,
+        c.authority_rank = row.authority_rank,
+        c.metrics_at = row.metrics_at
+""")
+
+COURT_METRICS = UnwindStatement("court_metrics", """
+    MATCH (court:Court) WHERE elementId(court) = row.node
+    SET court.case_count = row.case_count,
+        court.citations_made = row.citations_made,
+        court.citations_received = row.citations_received,
+        court.mean_authority = row.mean_authority,
+        court.top_case_title = row.top_case_title,
+        court.top_case_authority = row.top_case_authority,
+        court.metrics_at = row.metrics_at
+""")
+
+
+@dataclass
+class GraphCounts:
+    """Nodes per label and relationships per type"""
+    labels: Dict[str, int]
+    relationships: Dict[str, int]
+    nodes: int
+    relationship_total: int
+    computed_at: str
+
+
+@dataclass
+class CaseMetrics:
+    """Citation metrics of one Case node"""
+    node: str
+    case_id: Optional[str]
+    title: Optional[str]
+    court_node: Optional[str] = None
+    court: Optional[str] = None
+    cited_by_count: int = 0
+    cites_count: int = 0
+    authority: float = 0.0
+    authority_rank: int = 0
+
+
+@dataclass
+class CourtMetrics:
+    """Citation aggregates over the cases before one court"""
+    node: str
+    name: Optional[str]
+    case_count: int = 0
+    citations_made: int = 0
+    citations_received: int = 0
+    mean_authority: float = 0.0
+    top_case_title: Optional[str] = None
+    top_case_authority: float = 0.0
+
+
+@dataclass
+class MetricsResult:
+    """Output of one GraphMetrics.compute() run"""
+    counts: GraphCounts
+    cases: List[CaseMetrics] = field(default_factory=list)
+    courts: List[CourtMetrics] = field(default_factory=list)
+    citations: int = 0
+    iterations: int = 0
+    seconds: float = 0.0
+
+
+def _quote(name: str) -> str:
+    return "`" + name.replace("`", "``") + "`"
+
+
+def graph_counts(session) -> GraphCounts:
+    """
+    Count nodes per label and relationships per type
+
+    Every query is a single-label or single-type count, which Neo4j
+    answers from its count store without touching the data.
+    """
+    labels = {}
+    for label in session.run("CALL db.labels() YIELD label RETURN label").value():
+        labels[label] = session.run(f"MATCH (n:{_quote(label)}) RETURN count(n) AS n").single()["n"]
+
+    relationships = {}
+    for rel_type in session.run("CALL db.relationshipTypes() YIELD relationshipType RETURN relationshipType").value():
+        relationships[rel_type] = session.run(
+            f"MATCH ()-[r:{_quote(rel_type)}]->() RETURN count(r) AS n"
+        ).single()["n"]
+
+    nodes = session.run("MATCH (n) RETURN count(n) AS n").single()["n"]
+    internal = sum(labels.pop(label, 0) for label in INTERNAL_LABELS)
+    return GraphCounts(
+        labels={label: count for label, count in labels.items() if count},
+        relationships={rel_type: count for rel_type, count in relationships.items() if count},
+        nodes=nodes - internal,
+        relationship_total=session.run("MATCH ()-[r]->() RETURN count(r) AS n").single()["n"],
+        computed_at=datetime.now().isoformat()
+    )
+
+
+def pagerank(
+    size: int,
+    edges: Sequence[Tuple[int, int]],
+    damping: float = 0.85,
+    tolerance: float = 1e-6,
+    max_iterations: int = 100
+) -> Tuple[List[float], int]:
+    """
+    PageRank by power iteration
+
+    Rank of nodes without outgoing edges is spread evenly over all nodes,
+    so the scores always sum to 1.
+
+    Args:
+        size: Number of nodes (0..size-1)
+        edges: (source, target) pairs, without duplicates
+
+    Returns:
+        (scores, iterations used)
+    """
+    if size == 0:
+        return [], 0
+
+    out_degree = [0] * size
+    for source, _ in edges:
+        out_degree[source] += 1
+    dangling = [i for i in range(size) if out_degree[i] == 0]
+
+    rank = [1.0 / size] * size
+    for iteration in range(1, max_iterations + 1):
+        share = [damping * rank[i] / out_degree[i] if out_degree[i] else 0.0 for i in range(size)]
+        base = (1.0 - damping) / size + damping * sum(rank[i] for i in dangling) / size
+        new_rank = [base] * size
+        for source, target in edges:
+            new_rank[target] += share[source]
+
+        delta = sum(abs(new - old) for new, old in zip(new_rank, rank))
+        rank = new_rank
+        if delta < tolerance:
+            break
+    return rank, iteration
+
+
+def citation_metrics(cases: List[CaseMetrics], edges: Sequence[Tuple[str, str]], **pagerank_options) -> int:
+    """
+    Fill in degree, authority and authority rank on `cases`
+
+    Args:
+        cases: One entry per Case node
+        edges: (citing node, cited node) element IDs; repeats and self-citations are ignored
+
+    Returns:
+        PageRank iterations used
+    """
+    index = {case.node: i for i, case in enumerate(cases)}
+    pairs = sorted({
+        (index[source], index[target]) for source, target in edges
+        if source != target and source in index and target in index
+    })
+
+    for source, target in pairs:
+        cases[source].cites_count += 1
+        cases[target].cited_by_count += 1
+
+    scores, iterations = pagerank(len(cases), pairs, **pagerank_options)
+    for case, score in zip(cases, scores):
+        case.authority = score
+    for rank, case in enumerate(sorted(cases, key=lambda c: -c.authority), start=1):
+        case.authority_rank = rank
+    return iterations
+
+
+def court_metrics(cases: Sequence[CaseMetrics]) -> List[CourtMetrics]:
+    """Aggregate case metrics per court"""
+    by_court: Dict[str, List[CaseMetrics]] = defaultdict(list)
+    for case in cases:
+        if case.court_node:
+            by_court[case.court_node].append(case)
+
+    courts = []
+    for node, members in by_court.items():
+        top = max(members, key=lambda c: c.authority)
+        courts.append(CourtMetrics(
+            node=node,
+            name=members[0].court,
+            case_count=len(members),
+            citations_made=sum(c.cites_count for c in members),
+            citations_received=sum(c.cited_by_count for c in members),
+            mean_authority=sum(c.authority for c in members) / len(members),
+            top_case_title=top.title,
+            top_case_authority=top.authority
+        ))
+    return sorted(courts, key=lambda c: -c.citations_received)
+
+
+class GraphMetrics:
+    """
+    Compute graph metrics and store them on the nodes
+
+    Example:
+        result = GraphMetrics(driver, database="neo4j").compute()
+        mirror_to_postgres(dsn, result)
+    """
+
+    CASES_QUERY = """
+        MATCH (c:Case)
+        OPTIONAL MATCH (c)-[:BEFORE_COURT]->(court:Court)
+        WITH c, collect(court)[0] AS court
+        RETURN elementId(c) AS node, coalesce(c.case_id, c.id) AS case_id,
+               coalesce(c.title, c.name) AS title,
+               elementId(court) AS court_node, court.name AS court
+    """
+
+    CITATIONS_QUERY = f"""
+        MATCH (a:Case)-[:{'|'.join(CITATION_RELATIONSHIPS)}]->(b:Case)
+        RETURN elementId(a) AS source, elementId(b) AS target
+    """
+
+    def __init__(self, driver, database: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Args:
+            driver: Neo4j driver
+            database: Database name (None for the server default)
+            batch_size: Nodes per write transaction
+        """
+        self.driver = driver
+        self.database = database
+        self.loader = GraphBatchLoader(driver, database=database, batch_size=batch_size)
+
+    def compute(self, write: bool = True) -> MetricsResult:
+        """
+        Compute counts, case and court metrics
+
+        Args:
+            write: Store the results on the Case, Court and GraphStats nodes
+
+        Returns:
+            MetricsResult
+        """
+        started = time.time()
+        with self.driver.session(database=self.database) as session:
+            counts = graph_counts(session)
+            cases = [CaseMetrics(**record.data()) for record in session.run(self.CASES_QUERY)]
+            edges = [(record["source"], record["target"]) for record in session.run(self.CITATIONS_QUERY)]
+
+        result = MetricsResult(counts, cases)
+        result.iterations = citation_metrics(cases, edges)
+        result.citations = sum(case.cites_count for case in cases)
+        result.courts = court_metrics(cases)
+
+        if write:
+            self.write(result)
+        result.seconds = time.time() - started
+        logger.info(
+            f"Graph metrics: {counts.nodes} nodes, {counts.relationship_total} relationships, "
+            f"{len(cases)} cases, {result.citations} citations, {len(result.courts)} courts "
+            f"(PageRank {result.iterations} iterations, {result.seconds:.1f}s)"
+        )
+        return result
+
+    def write(self, result: MetricsResult) -> None:
+        metrics_at = result.counts.computed_at
+        self.loader.load_rows(CASE_METRICS, (
+            {"node": c.node, "cited_by_count": c.cited_by_count, "cites_count": c.cites_count,
+             "authority": c.authority, "authority_rank": c.authority_rank, "metrics_at": metrics_at}
+            for c in result.cases
+        ))
+        self.loader.load_rows(COURT_METRICS, (
+            {"node": c.node, "case_count": c.case_count, "citations_made": c.citations_made,
+             "citations_received": c.citations_received, "mean_authority": c.mean_authority,
+             "top_case_title": c.top_case_title, "top_case_authority": c.top_case_authority,
+             "metrics_at": metrics_at}
+            for c in result.courts
+        ))
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self._write_counts, result.counts)
+            session.run("CREATE INDEX case_authority IF NOT EXISTS FOR (c:Case) ON (c.authority)").consume()
+
+    @staticmethod
+    def _write_counts(tx, counts: GraphCounts) -> None:
+        tx.run("""
+            MERGE (s:GraphStats {name: 'graph'})
+            SET s.labels = $labels, s.label_counts = $label_counts,
+                s.relationship_types = $types, s.relationship_counts = $type_counts,
+                s.nodes = $nodes, s.relationships = $relationships, s.computed_at = $computed_at
+        """, labels=list(counts.labels), label_counts=list(counts.labels.values()),
+               types=list(counts.relationships), type_counts=list(counts.relationships.values()),
+               nodes=counts.nodes, relationships=counts.relationship_total,
+               computed_at=counts.computed_at).consume()
+
+
+def mirror_to_postgres(dsn: str, result: MetricsResult) -> int:
+    """
+    Write case and court metrics to PostgreSQL (migration 016)
+
+    Documents are matched to Case nodes by case ID (the hash of the title,
+    as the graph loaders assign it). court_metrics is replaced as a whole.
+
+    Returns:
+        Number of documents updated
+    """
+    try:
+        import psycopg2
+        import psycopg2.extras
+    except ImportError:
+        raise ImportError("psycopg2 not installed. Install with: pip install psycopg2-binary")
+
+    by_case_id = {case.case_id: case for case in result.cases if case.case_id}
+    conn = psycopg2.connect(dsn)
+    try:
+        with conn, conn.cursor() as cursor:
+            cursor.execute("SELECT id, title_full FROM documents WHERE doc_type = 'CAS'")
+            rows = []
+            for document_id, title in cursor:
+                case = by_case_id.get(generate_id(title or ""))
+                if case:
+                    rows.append((document_id, case.cited_by_count, case.cites_count, case.authority))
+
+            psycopg2.extras.execute_values(cursor, """
+                UPDATE documents AS d
+                SET cited_by_count = v.cited_by_count, cites_count = v.cites_count,
+                    authority_score = v.authority, graph_metrics_at = NOW()
+                FROM (VALUES %s) AS v (id, cited_by_count, cites_count, authority)
+                WHERE d.id = v.id
+            """, rows, page_size=1000)
+
+            cursor.execute("DELETE FROM court_metrics")
+            psycopg2.extras.execute_values(cursor, """
+                INSERT INTO court_metrics (court_name, case_count, citations_made, citations_received,
+                                           mean_authority, top_case_title, top_case_authority)
+                VALUES %s
+                ON CONFLICT (court_name) DO NOTHING
+            """, [
+                (c.name, c.case_count, c.citations_made, c.citations_received,
+                 c.mean_authority, c.top_case_title, c.top_case_authority)
+                for c in result.courts if c.name
+            ])
+    finally:
+        conn.close()
+
+    logger.info(f"Mirrored metrics of {len(rows)} documents and {len(result.courts)} courts to PostgreSQL")
+    return len(rows)
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after `ttl` seconds"""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get_or_load(self, key, loader: Callable[[], Any]):
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+        value = loader()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+        return value
+
+    def invalidate(self, key=None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class GraphMetricsReader:
+    """
+    Cached reads of counts and precomputed metrics, for statistics and dashboards
+
+    Example:
+        reader = GraphMetricsReader(driver, database="neo4j", ttl=60)
+        print(format_counts(reader.counts()))
+        top = reader.top_cases(10)
+    """
+
+    def __init__(self, driver, database: Optional[str] = None, ttl: float = DEFAULT_TTL,
+                 cache: Optional[TTLCache] = None):
+        self.driver = driver
+        self.database = database
+        self.cache = cache or TTLCache(ttl)
+
+    def counts(self) -> GraphCounts:
+        """Current counts (from the count store, so always cheap)"""
+        return self.cache.get_or_load("counts", self._counts)
+
+    def top_cases(self, limit: int = 10) -> List[Dict]:
+        """Cases by authority, from the last metrics run"""
+        return self.cache.get_or_load(("top_cases", limit), lambda: self._records("""
+            MATCH (c:Case) WHERE c.authority IS NOT NULL
+            RETURN coalesce(c.case_id, c.id) AS case_id, coalesce(c.title, c.name) AS title,
+                   c.authority AS authority, c.authority_rank AS rank,
+                   c.cited_by_count AS cited_by_count, c.cites_count AS cites_count
+            ORDER BY c.authority DESC
+            LIMIT $limit
+        """, limit=limit))
+
+    def courts(self) -> List[Dict]:
+        """Court aggregates, from the last metrics run"""
+        return self.cache.get_or_load("courts", lambda: self._records("""
+            MATCH (court:Court) WHERE court.metrics_at IS NOT NULL
+            RETURN court.name AS court, court.case_count AS case_count,
+                   court.citations_made AS citations_made, court.citations_received AS citations_received,
+                   court.mean_authority AS mean_authority, court.top_case_title AS top_case_title
+            ORDER BY court.citations_received DESC
+        """))
+
+    def _counts(self) -> GraphCounts:
+        with self.driver.session(database=self.database) as session:
+            return graph_counts(session)
+
+    def _records(self, query: str, **params) -> List[Dict]:
+        with self.driver.session(database=self.database) as session:
+            return [record.data() for record in session.run(query, **params)]
+
+
+def format_counts(counts: GraphCounts, title: str = "KNOWLEDGE GRAPH STATISTICS", top: int = 15) -> str:
+    """Printable node and relationship counts"""
+    lines = ["", "=" * 60, title, "=" * 60]
+    for label, count in sorted(counts.labels.items(), key=lambda item: -item[1]):
+        lines.append(f"  {label:20} {count:4} nodes")
+
+    lines.append("\nTop Relationships:")
+    for rel_type, count in sorted(counts.relationships.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"  {rel_type:25} {count:4} relationships")
+
+    lines.append(f"\n{'TOTAL':20} {counts.nodes:4} nodes")
+    lines.append(f"{'TOTAL':20} {counts.relationship_total:4} relationships")
+    lines.append("=" * 60 + "\n")
+    return "\n".join(lines)
@@ -0,0 +1,280 @@
+"""
+LLM providers for LLMExtractor
+Each provider turns a prompt into a Completion (response text plus token
+usage). FakeProvider answers locally, so extraction can be tested and
+benchmarked without API calls.
+"""
+import os
+import json
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+import requests
+
+from .chunker import approximate_tokens
+
+logger = logging.getLogger(__name__)
+
+# Try to import LLM clients
+try:
+    from openai import OpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    OPENAI_AVAILABLE = False
+
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    GENAI_AVAILABLE = False
+
+SYSTEM_PROMPT = (
+    "You are a legal text analysis expert. Extract structured information from legal documents."
+)
+MAX_OUTPUT_TOKENS = 4000
+TEMPERATURE = 0.1
+
+# USD per million (input, output) tokens; the longest matching prefix wins
+MODEL_PRICES = {
+    "gpt-4": (30.00, 60.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gemini-2.5-pro": (1.25, 10.00),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-1.5-pro": (1.25, 5.00),
+    "gemini-1.5-flash": (0.075, 0.30),
+}
+
+
+def model_prices(model: str) -> Tuple[float, float]:
+    """(input, output) USD per million tokens, (0, 0) for unknown models"""
+    matches = [prefix for prefix in MODEL_PRICES if model.startswith(prefix)]
+    return MODEL_PRICES[max(matches, key=len)] if matches else (0.0, 0.0)
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int) -> float:
+    """Cost of one call in USD"""
+    input_price, output_price = model_prices(model)
+    return (input_tokens * input_price + output_tokens * output_price) / 1_000_000
+
+
+@dataclass
+class Completion:
+    """Response text and token usage of one call"""
+    text: str
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+def strip_code_fences(text: str) -> str:
+    """Remove a ```json ... ``` wrapper some models add around JSON"""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class LLMProvider(ABC):
+    """
+    Turns a prompt into a Completion
+
+    Implementations are synchronous and raise on failure; the
+    ExtractionExecutor runs them on worker threads with retries.
+    """
+    name: str
+    model: str
+    # Requests in flight the provider tolerates by default
+    max_concurrency: int = 4
+
+    @abstractmethod
+    def complete(self, prompt: str) -> Completion:
+        """Send one prompt"""
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI chat completions in JSON mode"""
+    name = "openai"
+    max_concurrency = 8
+
+    def __init__(self, model: str = "gpt-4", api_key: Optional[str] = None):
+        if not OPENAI_AVAILABLE:
+            raise ImportError("OpenAI package not installed")
+
+        api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OPENAI_API_KEY not found in environment")
+
+        self.client = OpenAI(api_key=api_key)
+        self.model = model
+
+    def complete(self, prompt: str) -> Completion:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            response_format={"type": "json_object"},
+            temperature=TEMPERATURE,
+            max_tokens=MAX_OUTPUT_TOKENS
+        )
+        usage = response.usage
+        return Completion(
+            response.choices[0].message.content,
+            usage.prompt_tokens if usage else 0,
+            usage.completion_tokens if usage else 0
+        )
+
+
+class VertexExpressProvider(LLMProvider):
+    """Vertex AI Express REST API (API key, no SDK)"""
+    name = "vertex-express"
+
+    def __init__(self, model: str, api_key: str):
+        self.model = model
+        self.api_key = api_key
+        self.session = requests.Session()
+
+    def complete(self, prompt: str) -> Completion:
+        url = f"https://aiplatform.googleapis.com/v1/publishers/google/models/{self.model}:generateContent"
+        payload = {
+            "contents": [{
+                "role": "user",
+                "parts": [{"text": prompt}]
+            }],
+            "generationConfig": {
+                "temperature": TEMPERATURE,
+                "maxOutputTokens": MAX_OUTPUT_TOKENS,
+            }
+        }
+
+        response = self.session.post(
+            url,
+            params={"key": self.api_key},
+            headers={"Content-Type": "application/json"},
+            json=payload,
+            timeout=120
+        )
+        response.raise_for_status()
+        result = response.json()
+
+        candidates = result.get("candidates") or []
+        if candidates and "parts" in candidates[0].get("content", {}):
+            usage = result.get("usageMetadata", {})
+            return Completion(
+                strip_code_fences(candidates[0]["content"]["parts"][0].get("text", "")),
+                usage.get("promptTokenCount", 0),
+                usage.get("candidatesTokenCount", 0)
+            )
+
+        raise ValueError("No valid response from Vertex AI Express")
+
+
+class GeminiProvider(LLMProvider):
+    """Google GenAI SDK"""
+    name = "gemini"
+
+    def __init__(self, model: str, api_key: str):
+        if not GENAI_AVAILABLE:
+            raise ImportError("Google GenAI package not installed")
+        genai.configure(api_key=api_key)
+        self.client = genai.GenerativeModel(model)
+        self.model = model
+
+    def complete(self, prompt: str) -> Completion:
+        response = self.client.generate_content(
+            prompt,
+            generation_config=genai.types.GenerationConfig(
+                temperature=TEMPERATURE,
+                max_output_tokens=MAX_OUTPUT_TOKENS
+            )
+        )
+        usage = getattr(response, "usage_metadata", None)
+        return Completion(
+            strip_code_fences(response.text),
+            getattr(usage, "prompt_token_count", 0) or 0,
+            getattr(usage, "candidates_token_count", 0) or 0
+        )
+
+
+def _echo_case(prompt: str) -> dict:
+    # The chunk follows the last "TEXT:" marker of the extraction prompts
+    text = prompt.rsplit("TEXT:", 1)[-1].replace("Return ONLY valid JSON, no markdown or explanation.", "")
+    first_line = next((line.strip() for line in text.splitlines() if line.strip()), "")
+    return {
+        "case": {"title": first_line[:200], "summary": " ".join(text.split())[:300]},
+        "judges": [],
+        "parties": {"petitioners": [], "respondents": []},
+        "sections": [],
+        "principles": [],
+        "citations": [],
+        "topics": [],
+    }
+
+
+class FakeProvider(LLMProvider):
+    """
+    Local provider for tests and offline benchmarks
+
+    Answers with `responder(prompt)` (by default a minimal case built from
+    the chunk text) after `latency` seconds, and counts tokens with the
+    chunker's approximation.
+    """
+    name = "fake"
+    max_concurrency = 16
+
+    def __init__(self, responder: Optional[Callable[[str], dict]] = None, latency: float = 0.0,
+                 model: str = "fake-extractor"):
+        self.model = model
+        self.responder = responder or _echo_case
+        self.latency = latency
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str) -> Completion:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        response = self.responder(prompt)
+        text = response if isinstance(response, str) else json.dumps(response)
+        return Completion(text, approximate_tokens(prompt), approximate_tokens(text))
+
+
+def create_provider(model: str, api_key: Optional[str] = None) -> LLMProvider:
+    """
+    Build the provider for a model name
+
+    'gpt-*' uses OpenAI; 'gemini-*' uses Vertex AI Express when
+    VERTEX_AI_EXPRESS_KEY is set, else Google GenAI; 'fake*' is local.
+    """
+    lowered = model.lower()
+
+    if "gpt" in lowered:
+        return OpenAIProvider(model, api_key)
+
+    if "gemini" in lowered:
+        # Check for Vertex AI Express key first (preferred)
+        vertex_key = os.getenv("VERTEX_AI_EXPRESS_KEY")
+        google_key = api_key or os.getenv("GOOGLE_API_KEY")
+        if vertex_key:
+            logger.info("Using Vertex AI Express API")
+            return VertexExpressProvider(model, vertex_key)
+        if google_key:
+            logger.info("Using Google GenAI API")
+            return GeminiProvider(model, google_key)
+        raise ValueError("GOOGLE_API_KEY or VERTEX_AI_EXPRESS_KEY not found in environment")
+
+    if lowered.startswith("fake"):
+        return FakeProvider(model=model)
+
+    raise ValueError(f"Unsupported model: {model}")
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Interactive Knowledge Graph Explorer
+Small JSON API over GraphExplorer plus a vis-network page: pick a seed
+case, load its (k-hop) neighbourhood, double-click a node to pull in its
+next neighbours. Only bounded, degree-sampled subgraphs ever leave Neo4j,
+with positions computed and cached on the server.
+
+API:
+    GET  /api/seeds?label=Case&limit=20
+    GET  /api/node?id=<element id>
+    GET  /api/ego?id=<element id>&hops=2&limit=25&labels=Case,Court&types=CITES_PRECEDENT
+    POST /api/expand  {"id": ..., "shown": [...], "positions": {id: [x, y]}, "limit": 25}
+
+Usage:
+    python visualization_server.py --port 5050 --warm 20
+"""
+import os
+import logging
+import argparse
+from typing import List, Optional
+
+from neo4j import GraphDatabase
+from dotenv import load_dotenv
+
+try:
+    from flask import Flask, jsonify, render_template, request
+    FLASK_AVAILABLE = True
+except ImportError:
+    FLASK_AVAILABLE = False
+
+from utils.graph_explorer import GraphExplorer, DEFAULT_NEIGHBOURS, DEFAULT_MAX_NODES
+
+logger = logging.getLogger(__name__)
+
+LIB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "lib")
+MAX_LIMIT = 100
+
+
+def _names(value: Optional[str]) -> Optional[List[str]]:
+    names = [name.strip() for name in (value or "").split(",") if name.strip()]
+    return names or None
+
+
+def _limit(value, default: int = DEFAULT_NEIGHBOURS) -> int:
+    return max(1, min(int(value or default), MAX_LIMIT))
+
+
+def create_app(explorer: GraphExplorer) -> "Flask":
+    """Flask app serving the explorer page and its JSON API"""
+    if not FLASK_AVAILABLE:
+        raise ImportError("Flask not installed. Install with: pip install flask")
+
+    app = Flask(__name__, static_folder=LIB_DIR, static_url_path="/lib")
+
+    @app.errorhandler(ValueError)
+    def bad_request(error):
+        return jsonify({"error": str(error)}), 400
+
+    @app.route("/")
+    def index():
+        return render_template("graph_explorer.html")
+
+    @app.route("/api/seeds")
+    def seeds():
+        nodes = explorer.seeds(request.args.get("label", "Case"), _limit(request.args.get("limit"), 20))
+        return jsonify([vars(node) for node in nodes])
+
+    @app.route("/api/node")
+    def node():
+        found = explorer.node(request.args["id"])
+        if found is None:
+            return jsonify({"error": "node not found"}), 404
+        return jsonify(vars(found))
+
+    @app.route("/api/ego")
+    def ego():
+        subgraph = explorer.ego(
+            request.args["id"],
+            hops=int(request.args.get("hops", 1)),
+            limit=_limit(request.args.get("limit")),
+            labels=_names(request.args.get("labels")),
+            types=_names(request.args.get("types"))
+        )
+        if subgraph is None:
+            return jsonify({"error": "node not found"}), 404
+        return jsonify(subgraph.to_dict())
+
+    @app.route("/api/expand", methods=["POST"])
+    def expand():
+        body = request.get_json(force=True) or {}
+        if not body.get("id"):
+            raise ValueError("expand needs the id of the node to expand")
+        positions = {node_id: tuple(xy) for node_id, xy in (body.get("positions") or {}).items()}
+        subgraph = explorer.expand(
+            body["id"],
+            shown=body.get("shown") or [],
+            positions=positions,
+            limit=_limit(body.get("limit")),
+            labels=body.get("labels"),
+            types=body.get("types")
+        )
+        return jsonify(subgraph.to_dict())
+
+    return app
+
+
+def serve(host: str = "127.0.0.1", port: int = 5050, max_nodes: int = DEFAULT_MAX_NODES, warm: int = 0):
+    """Connect to Neo4j (NEO4J_* environment variables) and run the explorer"""
+    load_dotenv()
+    driver = GraphDatabase.driver(
+        os.getenv("NEO4J_URL"), auth=(os.getenv("NEO4J_USERNAME"), os.getenv("NEO4J_PASSWORD"))
+    )
+    try:
+        explorer = GraphExplorer(driver, os.getenv("NEO4J_DATABASE", "neo4j"), max_nodes=max_nodes)
+        if warm:
+            explorer.warm("Case", warm)
+        create_app(explorer).run(host=host, port=port, threaded=True)
+    finally:
+        driver.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the interactive knowledge graph explorer")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5050)
+    parser.add_argument("--max-nodes", type=int, default=DEFAULT_MAX_NODES, help="Nodes per response at most")
+    parser.add_argument("--warm", type=int, default=0, metavar="N",
+                        help="Precompute the neighbourhoods of the top N cases at startup")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(args.host, args.port, args.max_nodes, args.warm)
+
+
+if __name__ == "__main__":
+    main()
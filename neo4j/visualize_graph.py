@@ -28,6 +28,12 @@ if not all([NEO4J_URL, NEO4J_USERNAME, NEO4J_PASSWORD]):
     )
 
 
+VISUALIZED_LABELS = ['Case', 'Judge', 'Party', 'Court', 'Section', 'Statute', 'Principle', 'Topic']
+
+# Nodes in the static HTML/PNG files
+DEFAULT_MAX_NODES = 2000
+
+
 class CPCGraphVisualizer:
     def __init__(self):
         self.driver = GraphDatabase.driver(NEO4J_URL, auth=(NEO4J_USERNAME, NEO4J_PASSWORD))
@@ -55,32 +61,40 @@ class CPCGraphVisualizer:
             'Topic': 'ellipse',
         }
 
-    def fetch_graph_data(self):
-        """Fetch all nodes and relationships from Neo4j"""
+    def fetch_graph_data(self, max_nodes: int = DEFAULT_MAX_NODES):
+        """
+        Fetch the best-connected nodes and the relationships among them
+
+        Static files stop being usable beyond a few thousand nodes; use
+        visualization_server.py to explore larger graphs on demand.
+        """
         with self.driver.session(database=NEO4J_DATABASE) as session:
-            # Get all nodes
+            # Highest-degree nodes (degree is read from the node, not by expanding it)
             nodes_result = session.run("""
                 MATCH (n)
-                WHERE labels(n)[0] IN ['Case', 'Judge', 'Party', 'Court', 'Section', 'Statute', 'Principle', 'Topic']
-                RETURN id(n) as id, labels(n)[0] as label, properties(n) as props
-            """)
+                WHERE labels(n)[0] IN $labels
+                WITH n, COUNT { (n)--() } AS degree
+                ORDER BY degree DESC
+                LIMIT $max_nodes
+                RETURN id(n) as id, labels(n)[0] as label,
+                       n {.*, embedding: null, text: null, full_text: null} as props
+            """, labels=VISUALIZED_LABELS, max_nodes=max_nodes)
 
             nodes = []
             for record in nodes_result:
                 node_data = {
                     'id': record['id'],
                     'label': record['label'],
-                    'props': record['props']
+                    'props': {k: v for k, v in record['props'].items() if v is not None}
                 }
                 nodes.append(node_data)
 
-            # Get all relationships
+            # Relationships among the sampled nodes
             rels_result = session.run("""
                 MATCH (source)-[r]->(target)
-                WHERE labels(source)[0] IN ['Case', 'Judge', 'Party', 'Court', 'Section', 'Statute', 'Principle', 'Topic']
-                  AND labels(target)[0] IN ['Case', 'Judge', 'Party', 'Court', 'Section', 'Statute', 'Principle', 'Topic']
+                WHERE id(source) IN $ids AND id(target) IN $ids
                 RETURN id(source) as source, id(target) as target, type(r) as type, properties(r) as props
-            """)
+            """, ids=[node['id'] for node in nodes])
 
             relationships = []
             for record in rels_result:
@@ -285,10 +299,10 @@ class CPCGraphVisualizer:
 
         return output_file
 
-    def visualize(self):
+    def visualize(self, max_nodes: int = DEFAULT_MAX_NODES):
         """Create all visualizations"""
         print("\n📊 Fetching graph data from Neo4j...")
-        nodes, relationships = self.fetch_graph_data()
+        nodes, relationships = self.fetch_graph_data(max_nodes)
 
         print(f"✓ Fetched {len(nodes)} nodes and {len(relationships)} relationships")
 